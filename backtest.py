@@ -0,0 +1,347 @@
+"""
+LIA Engineering Solutions - Trading Framework
+Backtest - Backtest Event-Driven con Broker Simulado
+
+Corre la estrategia completa (Trading Director, Signal Generator, Position
+Sizer, Risk Manager, Order Executor) sobre barras del almacén local, sin
+terminal MetaTrader 5:
+
+- ReplayDataProvider reproduce las barras y avanza un reloj virtual
+- SimulatedBroker atiende la API de MT5 con ese mismo reloj: ejecuta las
+  órdenes contra los precios reproducidos (spread, slippage, latencia),
+  dispara SL/TP y registra la curva de equity
+
+Con --vectorized corre en su lugar el VectorizedBacktester (misma lista de
+trades, órdenes de magnitud más rápido) para investigación.
+
+Solo se simula data_feed_mode='bars': el broker simulado no tiene ticks
+históricos (su recorrido intrabar son 4 puntos por barra) y el replay
+emite barras cerradas, por lo que el modo 'ticks' se rechaza.
+
+Uso:
+    python backtest.py [--start 2024-01-01] [--end 2024-06-01] [--vectorized]
+"""
+
+import argparse
+import sys
+from datetime import datetime, timezone
+from queue import Queue
+from typing import Dict, List, Optional
+import numpy as np
+
+from core.utils.virtual_clock import VirtualClock
+from modules.simulated_broker import simulated_broker
+from modules.simulated_broker.simulated_broker import SimulatedBroker, default_symbol_spec
+
+# Configuración
+from config.trading_config import get_default_config, TradingConfig
+
+# Datos
+from core.data.bar_store import BarStore
+from modules.vectorized_backtester.vectorized_backtester import VectorizedBacktester
+
+
+def check_feed_mode(config: TradingConfig) -> None:
+    """
+    Verifica que la configuración pueda simularse desde barras.
+    
+    Args:
+        config: Configuración del backtest
+    
+    Raises:
+        ValueError: Si data_feed_mode es 'ticks'
+    """
+    if config.data_feed_mode == "ticks":
+        raise ValueError(
+            "El backtest no soporta data_feed_mode='ticks': el broker "
+            "simulado no provee ticks históricos. Usar data_feed_mode='bars'"
+        )
+
+
+def run_backtest(
+    config: TradingConfig,
+    bar_store: BarStore,
+    start_time: int = None,
+    end_time: int = None,
+    symbol_specs: Optional[Dict[str, Dict]] = None
+) -> SimulatedBroker:
+    """
+    Ejecuta un backtest event-driven completo.
+    
+    Instala el MetaTrader5 simulado antes de importar los módulos del
+    framework, por lo que puede usarse en un proceso sin MT5 instalado.
+    
+    Args:
+        config: Configuración de la estrategia y del broker simulado
+        bar_store: Almacén con las barras de config.timeframe
+        start_time: Epoch inicial inclusivo, hora del servidor (None = todo)
+        end_time: Epoch final exclusivo, hora del servidor (None = todo)
+        symbol_specs: Kwargs de add_symbol() por símbolo
+            (default: default_symbol_spec)
+    
+    Returns:
+        Broker con los deals y la curva de equity del backtest
+    
+    Raises:
+        ValueError: Si la configuración usa data_feed_mode='ticks'
+    """
+    check_feed_mode(config)
+    
+    server_offset_seconds = int((config.server_time_offset_hours or 0) * 3600)
+    symbol_specs = symbol_specs or {}
+    
+    # 1. Reloj virtual y broker (antes de importar el framework)
+    clock = VirtualClock()
+    broker = SimulatedBroker(
+        clock=clock,
+        server_offset_seconds=server_offset_seconds,
+        balance=config.backtest_initial_balance,
+        spread_points=config.backtest_spread_points,
+        slippage_points=config.backtest_slippage_points,
+        latency_ms=config.backtest_latency_ms,
+        commission_per_lot=config.backtest_commission_per_lot
+    )
+    simulated_broker.install(broker)
+    
+    from core.utils.latency import LatencyMonitor
+    from modules.data_provider.replay_data_provider import ReplayDataProvider
+    from modules.portfolio.portfolio import Portfolio
+    from modules.signal_generator.signal_generator import SignalGenerator
+    from modules.position_sizer.position_sizer import PositionSizer
+    from modules.risk_manager.risk_manager import RiskManager
+    from modules.symbol_registry.symbol_registry import SymbolRegistry
+    from modules.order_executor.order_executor import OrderExecutor
+    from modules.order_executor.fill_reconciler import FillReconciler
+    from modules.notifications.notifications import NotificationService
+    from modules.scheduler.replay_scheduler import ReplayScheduler
+    from modules.trading_director.trading_director import TradingDirector
+    
+    # 2. Mercado: mismas barras para el replay y para el broker
+    point_sizes = {}
+    for symbol in config.symbols:
+        spec = symbol_specs.get(symbol) or default_symbol_spec(symbol)
+        broker.add_symbol(symbol, **spec)
+        broker.load_rates(
+            symbol,
+            bar_store.slice(symbol, config.timeframe, start_time, end_time),
+            config.timeframe
+        )
+        point_sizes[symbol] = spec['point']
+    
+    events_queue = Queue()
+    
+    data_provider = ReplayDataProvider(
+        events_queue=events_queue,
+        symbol_list=config.symbols,
+        timeframe=config.timeframe,
+        buffer_capacity=config.bar_buffer_capacity,
+        bar_store=bar_store,
+        start_time=start_time,
+        end_time=end_time,
+        server_offset_seconds=server_offset_seconds,
+        derived_timeframes=config.derived_timeframes,
+        point_sizes=point_sizes,
+        clock=clock
+    )
+    
+    # 3. Framework sin cambios, con el reloj virtual
+    symbol_registry = SymbolRegistry(
+        symbols=config.symbols,
+        refresh_interval_s=config.symbol_registry_refresh_s
+    )
+    
+    portfolio = Portfolio(
+        magic_number=config.magic_number,
+        reconcile_interval_s=config.portfolio_reconcile_interval_s,
+        clock=clock
+    )
+    
+    fill_reconciler = FillReconciler(
+        events_queue=events_queue,
+        timeout_s=config.fill_confirmation_timeout_s,
+        server_offset_seconds=server_offset_seconds,
+        clock=clock,
+        background=False
+    )
+    order_executor = OrderExecutor(
+        events_queue=events_queue,
+        portfolio=portfolio,
+        fill_reconciler=fill_reconciler,
+        symbol_registry=symbol_registry,
+        latency_monitor=LatencyMonitor(
+            log_dir=config.latency_log_dir,
+            dump_interval_s=config.latency_dump_interval_s
+        )
+    )
+    
+    signal_generator = SignalGenerator(
+        events_queue=events_queue,
+        data_provider=data_provider,
+        portfolio=portfolio,
+        order_executor=order_executor,
+        magic_number=config.magic_number,
+        timeframe=config.timeframe,
+        rsi_period=config.rsi_period,
+        rsi_upper=config.rsi_upper,
+        rsi_lower=config.rsi_lower,
+        sl_points=config.sl_points,
+        tp_points=config.tp_points,
+        symbol_registry=symbol_registry
+    )
+    
+    position_sizer = PositionSizer(
+        events_queue=events_queue,
+        fixed_volume=config.fixed_volume,
+        symbol_registry=symbol_registry
+    )
+    
+    risk_manager = RiskManager(
+        events_queue=events_queue,
+        data_provider=data_provider,
+        portfolio=portfolio,
+        max_leverage_factor=config.max_leverage_factor,
+        mark_interval_ms=config.exposure_mark_interval_ms,
+        symbol_registry=symbol_registry,
+        clock=clock
+    )
+    
+    trading_director = TradingDirector(
+        events_queue=events_queue,
+        data_provider=data_provider,
+        signal_generator=signal_generator,
+        position_sizer=position_sizer,
+        risk_manager=risk_manager,
+        order_executor=order_executor,
+        notification_service=NotificationService(telegram_enabled=False),
+        scheduler=ReplayScheduler(config.timeframe, len(config.symbols)),
+        dispatch_mode=config.dispatch_mode,
+        portfolio=portfolio
+    )
+    
+    trading_director.execute()
+    
+    return broker
+
+
+def print_report(broker: SimulatedBroker) -> None:
+    """
+    Imprime el resumen del backtest: trades, resultado y drawdown.
+    
+    Args:
+        broker: Broker de un backtest finalizado
+    """
+    exits = [d for d in broker.deals if d.entry == simulated_broker.C.DEAL_ENTRY_OUT]
+    pnl = [d.profit + d.commission for d in exits]
+    wins = sum(1 for p in pnl if p > 0)
+    
+    _, equity = broker.get_equity_curve()
+    max_drawdown = 0.0
+    if len(equity):
+        peak = equity[0]
+        for value in equity:
+            peak = max(peak, value)
+            max_drawdown = max(max_drawdown, peak - value)
+    
+    print("\n" + "="*60)
+    print("RESULTADO DEL BACKTEST")
+    print("="*60)
+    print(f"  - Trades cerrados: {len(exits)} (ganadores: {wins})")
+    print(f"  - Balance inicial: {broker.initial_balance:.2f} {broker.currency}")
+    print(f"  - Balance final:   {broker.balance:.2f} {broker.currency}")
+    print(f"  - Resultado neto:  {broker.balance - broker.initial_balance:+.2f}")
+    print(f"  - Max drawdown:    {max_drawdown:.2f}")
+    print("="*60 + "\n")
+
+
+def run_vectorized(
+    config: TradingConfig,
+    bar_store: BarStore,
+    start_time: int = None,
+    end_time: int = None,
+    symbol_specs: Optional[Dict[str, Dict]] = None
+) -> np.ndarray:
+    """
+    Ejecuta el camino vectorizado sobre las mismas barras que
+    run_backtest() (misma lista de trades, sin cola de eventos).
+    
+    Args:
+        config: Configuración de la estrategia y de costos
+        bar_store: Almacén con las barras de config.timeframe
+        start_time: Epoch inicial inclusivo, hora del servidor (None = todo)
+        end_time: Epoch final exclusivo, hora del servidor (None = todo)
+        symbol_specs: Kwargs de add_symbol() por símbolo
+    
+    Returns:
+        Array TRADE_DTYPE con los trades
+    
+    Raises:
+        ValueError: Si la configuración usa data_feed_mode='ticks'
+    """
+    check_feed_mode(config)
+    
+    bars = {
+        symbol: bar_store.slice(symbol, config.timeframe, start_time, end_time)
+        for symbol in config.symbols
+    }
+    backtester = VectorizedBacktester.from_config(config, bars, symbol_specs)
+    
+    return backtester.run_config(config)
+
+
+def print_vectorized_report(trades: np.ndarray, config: TradingConfig) -> None:
+    """
+    Imprime el resumen del backtest vectorizado.
+    
+    Args:
+        trades: Resultado de run_vectorized()
+        config: Configuración usada (balance inicial)
+    """
+    stats = VectorizedBacktester.summarize(trades)
+    balance = config.backtest_initial_balance
+    
+    print("\n" + "="*60)
+    print("RESULTADO DEL BACKTEST (vectorizado)")
+    print("="*60)
+    print(f"  - Trades cerrados: {stats['trades']} (win rate: {stats['win_rate']:.1%})")
+    print(f"  - Balance inicial: {balance:.2f}")
+    print(f"  - Resultado neto:  {stats['net_profit']:+.2f}")
+    print(f"  - Profit factor:   {stats['profit_factor']:.2f}")
+    print(f"  - Max drawdown:    {stats['max_drawdown']:.2f}")
+    print("="*60 + "\n")
+
+
+def parse_date(value: str) -> int:
+    """Fecha 'YYYY-MM-DD' (hora del servidor) a epoch."""
+    return int(datetime.strptime(value, "%Y-%m-%d").replace(tzinfo=timezone.utc).timestamp())
+
+
+def main(argv: List[str] = None):
+    parser = argparse.ArgumentParser(description="Backtest event-driven con broker simulado")
+    parser.add_argument("--start", type=parse_date, default=None, help="Fecha inicial (YYYY-MM-DD)")
+    parser.add_argument("--end", type=parse_date, default=None, help="Fecha final exclusiva (YYYY-MM-DD)")
+    parser.add_argument("--vectorized", action="store_true", help="Camino vectorizado (sin cola de eventos)")
+    args = parser.parse_args(argv)
+    
+    config = get_default_config()
+    if not config.bar_store_dir:
+        print("ERROR: El backtest requiere bar_store_dir (ej: 'data/bars') con barras descargadas")
+        sys.exit(1)
+    
+    try:
+        check_feed_mode(config)
+    except ValueError as e:
+        print(f"ERROR: {e}")
+        sys.exit(1)
+    
+    bar_store = BarStore(config.bar_store_dir)
+    
+    if args.vectorized:
+        print_vectorized_report(run_vectorized(config, bar_store, args.start, args.end), config)
+        return
+    
+    broker = run_backtest(config, bar_store, args.start, args.end)
+    print_report(broker)
+
+
+if __name__ == "__main__":
+    main()
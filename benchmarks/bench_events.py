@@ -0,0 +1,101 @@
+"""
+LIA Engineering Solutions - Trading Framework
+Benchmark - Costo de Construcción y Despacho de Eventos
+
+Compara los modelos pydantic (core/events/events.py) contra los eventos
+slotted (core/events/fast_events.py) en el recorrido completo de una barra:
+SIGNAL → SIZING → ORDER, más el despacho por EventType.
+
+Uso:
+    python -m benchmarks.bench_events [iteraciones]
+"""
+
+import sys
+import timeit
+from core.events import events as pydantic_events
+from core.events import fast_events
+from core.events.events import SignalType, OrderType
+
+
+def _pipeline(module):
+    """
+    Construye la cadena SIGNAL → SIZING → ORDER con el módulo dado.
+    Usa keywords en ambos casos para comparar en igualdad de condiciones.
+    """
+    signal = module.SignalEvent(
+        symbol="EURUSD",
+        signal=SignalType.BUY,
+        target_order=OrderType.MARKET,
+        target_price=1.08456,
+        magic_number=12345,
+        sl=1.07956,
+        tp=1.09456
+    )
+    fields = dict(
+        symbol=signal.symbol,
+        signal=signal.signal,
+        target_order=signal.target_order,
+        target_price=signal.target_price,
+        magic_number=signal.magic_number,
+        sl=signal.sl,
+        tp=signal.tp,
+        volume=0.01
+    )
+    sizing = module.SizingEvent(**fields)
+    order = module.OrderEvent(**fields)
+    return signal, sizing, order
+
+
+def _fast_pipeline_helpers():
+    """Cadena rápida usando los constructores from_* (camino real)."""
+    signal = fast_events.SignalEvent(
+        "EURUSD", SignalType.BUY, OrderType.MARKET, 1.08456, 12345, 1.07956, 1.09456
+    )
+    sizing = fast_events.SizingEvent.from_signal(signal, 0.01)
+    order = fast_events.OrderEvent.from_sizing(sizing)
+    return signal, sizing, order
+
+
+def _dispatch(events, handlers):
+    for event in events:
+        handlers[event.event_type](event)
+
+
+def run(iterations: int = 100_000) -> dict:
+    """
+    Ejecuta el benchmark y retorna el costo por evento en microsegundos.
+    
+    Args:
+        iterations: Repeticiones de la cadena de 3 eventos
+        
+    Returns:
+        Diccionario {caso: µs por evento}
+    """
+    handlers = {event_type: (lambda event: None) for event_type in ("SIGNAL", "SIZING", "ORDER")}
+    
+    pyd_events = _pipeline(pydantic_events)
+    fast_events_chain = _fast_pipeline_helpers()
+    
+    cases = {
+        "construccion_pydantic": lambda: _pipeline(pydantic_events),
+        "construccion_slotted": lambda: _pipeline(fast_events),
+        "construccion_slotted_from": _fast_pipeline_helpers,
+        "despacho_pydantic": lambda: _dispatch(pyd_events, handlers),
+        "despacho_slotted": lambda: _dispatch(fast_events_chain, handlers),
+    }
+    
+    results = {}
+    for name, case in cases.items():
+        elapsed = min(timeit.repeat(case, number=iterations, repeat=3))
+        results[name] = elapsed / (iterations * 3) * 1e6
+    
+    return results
+
+
+if __name__ == "__main__":
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    
+    print(f"{'Caso':<30}{'µs/evento':>12}")
+    print("-" * 42)
+    for name, micros in run(n).items():
+        print(f"{name:<30}{micros:>12.3f}")
@@ -0,0 +1,544 @@
+"""
+LIA Engineering Solutions - Trading Framework
+Benchmark - Latencia por Etapa del Pipeline de Eventos
+
+Mide cada etapa del pipeline con los módulos reales contra el
+SimulatedBroker (MetaTrader5 simulado, determinista y en proceso):
+
+- check_for_new_data: DataProvider, una llamada por cierre de barra
+- generate_signal: SignalGenerator, por DataEvent
+- size_signal: PositionSizer, por SignalEvent
+- assess_order: RiskManager, por SizingEvent
+- execute_order: OrderExecutor, por OrderEvent (incluye la confirmación
+  del deal: el FillReconciler corre sin hilo)
+- dispatch: TradingDirector, un ciclo completo de cierre de barra
+  (sondeo + despacho en lote + mantenimiento en reposo)
+
+Barre cantidad de símbolos y de posiciones abiertas (de otra estrategia
+de la cuenta: cargan el libro del Portfolio y el matching del broker sin
+bloquear las señales) y reporta eventos/s, latencia p50/p99 y memoria
+asignada por llamada. Las asignaciones se miden con tracemalloc en pasos
+adicionales, para no sesgar los tiempos. Los resultados se guardan en
+JSON para comparar versiones (--baseline).
+
+Uso:
+    python -m benchmarks.bench_pipeline [--symbols 1 10 50] [--positions 0 100 1000]
+        [--steps 300] [--output resultados.json] [--baseline anterior.json]
+"""
+
+import argparse
+import contextlib
+import itertools
+import json
+import os
+import platform
+import string
+import subprocess
+import sys
+import time
+import tracemalloc
+from datetime import datetime, timezone
+from queue import Empty, Queue
+from typing import Callable, Dict, List, Tuple
+import numpy as np
+
+from core.data.bar_buffer import BAR_DTYPE
+from core.utils.logger import get_log_writer
+from core.utils.virtual_clock import VirtualClock
+from modules.simulated_broker import simulated_broker
+from modules.simulated_broker.simulated_broker import C, SimulatedBroker
+
+
+STAGES = (
+    'check_for_new_data', 'generate_signal', 'size_signal',
+    'assess_order', 'execute_order', 'dispatch'
+)
+
+# Barras sintéticas de 1 minuto desde 2024-01-01 (hora del servidor = UTC)
+START_TIME = 1704067200
+BAR_SECONDS = 60
+
+MAGIC_NUMBER = 12345
+
+# Magic de las posiciones precargadas (otra estrategia de la cuenta)
+OTHER_MAGIC = 54321
+
+
+def symbol_names(count: int) -> List[str]:
+    """Símbolos sintéticos cotizados en USD (AAAUSD, AABUSD, ...)."""
+    codes = itertools.product(string.ascii_uppercase, repeat=3)
+    return ["".join(code) + "USD" for code in itertools.islice(codes, count)]
+
+
+def synthetic_bars(rng: np.random.Generator, count: int, start_price: float = 1.1) -> np.ndarray:
+    """
+    Random walk reproducible en formato BAR_DTYPE.
+    
+    Args:
+        rng: Generador con semilla fija
+        count: Barras a generar
+        start_price: Precio de apertura de la primera barra
+    
+    Returns:
+        Array BAR_DTYPE ordenado por tiempo
+    """
+    close = start_price * np.exp(np.cumsum(rng.normal(0.0, 0.0002, count)))
+    open_ = np.concatenate(([start_price], close[:-1]))
+    wicks = np.abs(rng.normal(0.0, 0.0001, (2, count)))
+    
+    bars = np.zeros(count, dtype=BAR_DTYPE)
+    bars['time'] = START_TIME + np.arange(count) * BAR_SECONDS
+    bars['open'] = np.round(open_, 5)
+    bars['close'] = np.round(close, 5)
+    bars['high'] = np.round(np.maximum(open_, close) + wicks[0], 5)
+    bars['low'] = np.round(np.minimum(open_, close) - wicks[1], 5)
+    bars['tickvol'] = 100
+    bars['spread'] = 10
+    
+    return bars
+
+
+class StageRecorder:
+    """
+    Latencias (fase medida) y asignaciones (fase trazada) de una etapa.
+    """
+    
+    __slots__ = ('latencies_ns', 'events', 'alloc_bytes', 'retained_bytes', 'traced_calls')
+    
+    def __init__(self):
+        self.latencies_ns: List[int] = []
+        self.events = 0
+        self.alloc_bytes = 0
+        self.retained_bytes = 0
+        self.traced_calls = 0
+    
+    
+    def measure(self, traced: bool, fn: Callable, *args):
+        """
+        Ejecuta fn(*args) midiendo su latencia o, con traced, la memoria
+        que asigna (pico) y la que retiene al terminar.
+        
+        Returns:
+            Resultado de fn
+        """
+        if traced:
+            before, _ = tracemalloc.get_traced_memory()
+            tracemalloc.reset_peak()
+            result = fn(*args)
+            after, peak = tracemalloc.get_traced_memory()
+            
+            self.alloc_bytes += peak - before
+            self.retained_bytes += after - before
+            self.traced_calls += 1
+            return result
+        
+        start = time.perf_counter_ns()
+        result = fn(*args)
+        self.latencies_ns.append(time.perf_counter_ns() - start)
+        return result
+    
+    
+    def summary(self) -> Dict[str, float]:
+        """
+        Returns:
+            Llamadas, eventos, eventos/s, latencias en µs (media, p50,
+            p99, máximo) y bytes asignados/retenidos por llamada
+        """
+        latencies = np.asarray(self.latencies_ns, dtype=np.float64) / 1e3
+        total_s = float(latencies.sum()) / 1e6
+        traced = max(self.traced_calls, 1)
+        
+        if len(latencies) == 0:
+            latencies = np.zeros(1)
+        
+        return {
+            'calls': len(self.latencies_ns),
+            'events': self.events,
+            'total_s': total_s,
+            'events_per_s': self.events / total_s if total_s else 0.0,
+            'mean_us': float(latencies.mean()),
+            'p50_us': float(np.percentile(latencies, 50)),
+            'p99_us': float(np.percentile(latencies, 99)),
+            'max_us': float(latencies.max()),
+            'alloc_bytes_per_call': self.alloc_bytes / traced,
+            'retained_bytes_per_call': self.retained_bytes / traced,
+        }
+
+
+class PipelineHarness:
+    """
+    Framework completo sobre un broker simulado con barras sintéticas.
+    """
+    
+    def __init__(
+        self,
+        num_symbols: int,
+        num_positions: int,
+        total_steps: int,
+        buffer_capacity: int = 500,
+        seed: int = 7
+    ):
+        """
+        Construye broker, módulos y posiciones precargadas.
+        
+        Args:
+            num_symbols: Símbolos del universo
+            num_positions: Posiciones abiertas de otra estrategia,
+                repartidas entre los símbolos
+            total_steps: Cierres de barra que se van a reproducir
+            buffer_capacity: Barras en memoria por símbolo (se precargan)
+            seed: Semilla de los precios sintéticos
+        """
+        self.buffer_capacity = buffer_capacity
+        self.clock = VirtualClock()
+        self.broker = SimulatedBroker(clock=self.clock, balance=1e9, spread_points=10)
+        simulated_broker.install(self.broker)
+        
+        from modules.data_provider.data_provider import DataProvider
+        from modules.portfolio.portfolio import Portfolio
+        from modules.signal_generator.signal_generator import SignalGenerator
+        from modules.position_sizer.position_sizer import PositionSizer
+        from modules.risk_manager.risk_manager import RiskManager
+        from modules.symbol_registry.symbol_registry import SymbolRegistry
+        from modules.order_executor.order_executor import OrderExecutor
+        from modules.order_executor.fill_reconciler import FillReconciler
+        from modules.notifications.notifications import NotificationService
+        from modules.trading_director.trading_director import TradingDirector
+        
+        self.symbols = symbol_names(num_symbols)
+        rng = np.random.default_rng(seed)
+        
+        for symbol in self.symbols:
+            self.broker.add_symbol(symbol)
+            self.broker.load_rates(
+                symbol, synthetic_bars(rng, buffer_capacity + total_steps + 1), "1min"
+            )
+        
+        # Buffers llenos desde el inicio: la última barra cerrada es la
+        # buffer_capacity-ésima
+        self.advance(0)
+        
+        for i in range(num_positions):
+            self.broker.order_send({
+                "action": C.TRADE_ACTION_DEAL,
+                "symbol": self.symbols[i % num_symbols],
+                "volume": 0.01,
+                "type": C.ORDER_TYPE_BUY if i % 2 == 0 else C.ORDER_TYPE_SELL,
+                "magic": OTHER_MAGIC,
+            })
+        
+        self.events_queue = Queue()
+        
+        self.data_provider = DataProvider(
+            events_queue=self.events_queue,
+            symbol_list=self.symbols,
+            timeframe="1min",
+            buffer_capacity=buffer_capacity,
+            server_offset_seconds=0
+        )
+        self.symbol_registry = SymbolRegistry(symbols=self.symbols)
+        self.portfolio = Portfolio(magic_number=MAGIC_NUMBER, clock=self.clock)
+        
+        fill_reconciler = FillReconciler(
+            events_queue=self.events_queue,
+            clock=self.clock,
+            background=False
+        )
+        self.order_executor = OrderExecutor(
+            events_queue=self.events_queue,
+            portfolio=self.portfolio,
+            fill_reconciler=fill_reconciler,
+            symbol_registry=self.symbol_registry
+        )
+        
+        # Umbrales en 50: señal en cada barra de un símbolo sin posición
+        self.signal_generator = SignalGenerator(
+            events_queue=self.events_queue,
+            data_provider=self.data_provider,
+            portfolio=self.portfolio,
+            order_executor=self.order_executor,
+            magic_number=MAGIC_NUMBER,
+            rsi_upper=50.0,
+            rsi_lower=50.0,
+            symbol_registry=self.symbol_registry
+        )
+        self.position_sizer = PositionSizer(
+            events_queue=self.events_queue,
+            symbol_registry=self.symbol_registry
+        )
+        self.risk_manager = RiskManager(
+            events_queue=self.events_queue,
+            data_provider=self.data_provider,
+            portfolio=self.portfolio,
+            symbol_registry=self.symbol_registry,
+            clock=self.clock
+        )
+        self.trading_director = TradingDirector(
+            events_queue=self.events_queue,
+            data_provider=self.data_provider,
+            signal_generator=self.signal_generator,
+            position_sizer=self.position_sizer,
+            risk_manager=self.risk_manager,
+            order_executor=self.order_executor,
+            notification_service=NotificationService(telegram_enabled=False),
+            portfolio=self.portfolio
+        )
+    
+    
+    def advance(self, step: int) -> None:
+        """Mueve el reloj al cierre de la barra del paso (+1s)."""
+        self.clock.advance_to(START_TIME + (self.buffer_capacity + step) * BAR_SECONDS + 1)
+    
+    
+    def _take(self) -> List:
+        events = []
+        while True:
+            try:
+                events.append(self.events_queue.get_nowait())
+            except Empty:
+                return events
+    
+    
+    def _idle(self) -> None:
+        """Mantenimiento del loop en reposo (como en _run_drain_loop)."""
+        self.portfolio.maybe_reconcile()
+        self.risk_manager.maybe_mark_to_market()
+        self.symbol_registry.maybe_refresh()
+    
+    
+    def run_stages(self, steps: int, traced_steps: int) -> Dict[str, StageRecorder]:
+        """
+        Reproduce los cierres de barra despachando cada etapa por separado.
+        
+        Los eventos de ejecución y el mantenimiento se procesan fuera de
+        la medición para que el estado evolucione como en el loop real.
+        
+        Args:
+            steps: Cierres de barra medidos
+            traced_steps: Cierres adicionales con tracemalloc
+        
+        Returns:
+            Registro por etapa
+        """
+        records = {stage: StageRecorder() for stage in STAGES[:-1]}
+        handlers = (
+            ('generate_signal', self.signal_generator.generate_signal),
+            ('size_signal', self.position_sizer.size_signal),
+            ('assess_order', self.risk_manager.assess_order),
+            ('execute_order', self.order_executor.execute_order),
+        )
+        
+        for step in range(1, steps + traced_steps + 1):
+            traced = step > steps
+            if traced and not tracemalloc.is_tracing():
+                tracemalloc.start()
+            
+            self.advance(step)
+            self.data_provider.TICK_CACHE.begin_cycle()
+            
+            record = records['check_for_new_data']
+            new_bars = record.measure(traced, self.data_provider.check_for_new_data)
+            if not traced:
+                record.events += new_bars
+            
+            for stage, handler in handlers:
+                record = records[stage]
+                for event in self._take():
+                    record.measure(traced, handler, event)
+                    if not traced:
+                        record.events += 1
+            
+            for event in self._take():
+                self.trading_director._dispatch(event)
+            self._idle()
+        
+        tracemalloc.stop()
+        return records
+    
+    
+    def run_director(self, steps: int, traced_steps: int) -> StageRecorder:
+        """
+        Reproduce los cierres de barra con el TradingDirector: sondeo,
+        despacho en lote de toda la cadena y mantenimiento.
+        
+        Args:
+            steps: Cierres de barra medidos
+            traced_steps: Cierres adicionales con tracemalloc
+        
+        Returns:
+            Registro del ciclo completo (eventos = eventos despachados)
+        """
+        record = StageRecorder()
+        
+        def cycle() -> int:
+            self.data_provider.TICK_CACHE.begin_cycle()
+            self.data_provider.check_for_new_data()
+            dispatched = self.trading_director._drain_events()
+            self._idle()
+            return dispatched
+        
+        for step in range(1, steps + traced_steps + 1):
+            traced = step > steps
+            if traced and not tracemalloc.is_tracing():
+                tracemalloc.start()
+            
+            self.advance(step)
+            dispatched = record.measure(traced, cycle)
+            if not traced:
+                record.events += dispatched
+        
+        tracemalloc.stop()
+        self.trading_director.NOTIFICATIONS.shutdown()
+        return record
+
+
+def run_scenario(num_symbols: int, num_positions: int, steps: int, traced_steps: int) -> Dict:
+    """
+    Mide todas las etapas para un escenario (dos corridas idénticas:
+    etapas por separado y TradingDirector).
+    
+    Returns:
+        Diccionario con el escenario y el resumen por etapa
+    """
+    total_steps = steps + traced_steps + 1
+    
+    # Los módulos informan por consola en cada evento: el costo de
+    # registrar se mide (con el hilo de logging activo, como en el loop
+    # del TradingDirector), la salida se descarta
+    log_writer = get_log_writer()
+    with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+        harness = PipelineHarness(num_symbols, num_positions, total_steps)
+        log_writer.start()
+        try:
+            records = harness.run_stages(steps, traced_steps)
+        
+            harness = PipelineHarness(num_symbols, num_positions, total_steps)
+            records['dispatch'] = harness.run_director(steps, traced_steps)
+        finally:
+            log_writer.stop()
+    
+    return {
+        'symbols': num_symbols,
+        'positions': num_positions,
+        'stages': {stage: records[stage].summary() for stage in STAGES},
+    }
+
+
+def _git_revision() -> str:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True, text=True, check=True,
+            cwd=os.path.dirname(os.path.abspath(__file__))
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return ""
+
+
+def run(
+    symbol_counts: List[int],
+    position_counts: List[int],
+    steps: int = 300,
+    traced_steps: int = 30
+) -> Dict:
+    """
+    Ejecuta el barrido completo.
+    
+    Args:
+        symbol_counts: Tamaños de universo a medir
+        position_counts: Posiciones abiertas a medir
+        steps: Cierres de barra medidos por escenario
+        traced_steps: Cierres adicionales con tracemalloc
+    
+    Returns:
+        Resultado serializable a JSON (metadatos + escenarios)
+    """
+    scenarios = []
+    for num_symbols, num_positions in itertools.product(symbol_counts, position_counts):
+        scenarios.append(run_scenario(num_symbols, num_positions, steps, traced_steps))
+        print_scenario(scenarios[-1])
+    
+    return {
+        'meta': {
+            'created': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+            'revision': _git_revision(),
+            'python': platform.python_version(),
+            'numpy': np.__version__,
+            'platform': platform.platform(),
+            'steps': steps,
+            'traced_steps': traced_steps,
+        },
+        'scenarios': scenarios,
+    }
+
+
+def print_scenario(scenario: Dict) -> None:
+    print(f"\n{scenario['symbols']} símbolos, {scenario['positions']} posiciones")
+    print(f"{'Etapa':<22}{'eventos':>9}{'eventos/s':>12}{'p50 µs':>10}{'p99 µs':>10}{'KB/llamada':>12}")
+    print("-" * 75)
+    for stage, stats in scenario['stages'].items():
+        print(
+            f"{stage:<22}{stats['events']:>9}{stats['events_per_s']:>12.0f}"
+            f"{stats['p50_us']:>10.1f}{stats['p99_us']:>10.1f}"
+            f"{stats['alloc_bytes_per_call'] / 1024:>12.1f}"
+        )
+
+
+def compare(baseline: Dict, current: Dict) -> None:
+    """
+    Imprime la variación de p50, p99 y eventos/s contra otra corrida
+    (solo escenarios y etapas presentes en ambas).
+    """
+    def index(result: Dict) -> Dict[Tuple[int, int], Dict]:
+        return {(s['symbols'], s['positions']): s['stages'] for s in result['scenarios']}
+    
+    previous = index(baseline)
+    revision = baseline['meta'].get('revision') or '?'
+    
+    print(f"\nComparación contra {revision} (actual / base)")
+    print(f"{'Escenario':<14}{'Etapa':<22}{'p50':>8}{'p99':>8}{'eventos/s':>11}")
+    print("-" * 63)
+    
+    for key, stages in index(current).items():
+        if key not in previous:
+            continue
+        for stage, stats in stages.items():
+            base = previous[key].get(stage)
+            if not base or not base['p50_us'] or not base['events_per_s']:
+                continue
+            print(
+                f"{f'{key[0]}s/{key[1]}p':<14}{stage:<22}"
+                f"{stats['p50_us'] / base['p50_us']:>8.2f}"
+                f"{stats['p99_us'] / base['p99_us']:>8.2f}"
+                f"{stats['events_per_s'] / base['events_per_s']:>11.2f}"
+            )
+
+
+def main(argv: List[str] = None):
+    parser = argparse.ArgumentParser(description="Benchmark por etapa del pipeline de eventos")
+    parser.add_argument("--symbols", type=int, nargs="+", default=[1, 10, 50], help="Tamaños de universo")
+    parser.add_argument("--positions", type=int, nargs="+", default=[0, 100, 1000], help="Posiciones abiertas")
+    parser.add_argument("--steps", type=int, default=300, help="Cierres de barra medidos por escenario")
+    parser.add_argument("--traced-steps", type=int, default=30, help="Cierres adicionales con tracemalloc")
+    parser.add_argument("--output", default=None, help="Archivo JSON de resultados")
+    parser.add_argument("--baseline", default=None, help="JSON de una corrida anterior a comparar")
+    args = parser.parse_args(argv)
+    
+    result = run(args.symbols, args.positions, args.steps, args.traced_steps)
+    
+    output = args.output or os.path.join(
+        os.path.dirname(os.path.abspath(__file__)), "results",
+        f"pipeline_{datetime.now(timezone.utc):%Y%m%d_%H%M%S}.json"
+    )
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, "w") as f:
+        json.dump(result, f, indent=2)
+    print(f"\nResultados guardados en {output}")
+    
+    if args.baseline:
+        with open(args.baseline) as f:
+            compare(json.load(f), result)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -7,7 +7,7 @@ Centraliza configuración para facilitar ajustes.
 """
 
 from dataclasses import dataclass
-from typing import List
+from typing import List, Optional
 
 
 @dataclass
@@ -24,7 +24,67 @@ class TradingConfig:
     """Lista de símbolos a operar (ej: ['EURUSD', 'GBPUSD'])"""
     
     timeframe: str = "1min"
-    """Timeframe de operación (ej: '1min', '5min', '1h')"""
+    """Timeframe de operación (ej: '1min', '5min', '1h'; '10s', '15s' solo en modo 'ticks')"""
+    
+    derived_timeframes: List[str] = None
+    """Timeframes superiores derivados del feed de 'timeframe' sin consultas extra (ej: ['5min', '1h'])"""
+    
+    bar_buffer_capacity: int = 500
+    """Barras cerradas retenidas en memoria por símbolo (buffer circular)"""
+    
+    bar_store_dir: Optional[str] = None
+    """
+    Directorio del almacén local de barras memory-mapped (ej: 'data/bars').
+    None = sin persistencia (default): el arranque en vivo solo descarga
+    bar_buffer_capacity barras. Requerido por backtest.py y optimize.py.
+    """
+    
+    bar_store_history_bars: int = 50000
+    """Barras descargadas de MT5 al crear una serie del almacén (y máximo por hueco)"""
+    
+    symbol_registry_refresh_s: float = 3600.0
+    """Intervalo de refresco de las especificaciones de símbolos"""
+    
+    data_feed_mode: str = "bars"
+    """
+    Fuente de barras:
+    'bars' = consulta la última barra cerrada con copy_rates_from_pos
+    'ticks' = construye barras localmente desde ticks incrementales
+    """
+    
+    tick_bar_close_grace_ms: int = 200
+    """Modo 'ticks': espera tras el cierre de una barra sin ticks antes de emitirla"""
+    
+    data_poll_workers: int = 0
+    """Hilos para consultar símbolos en paralelo en cada sondeo (0 = secuencial)"""
+    
+    tick_cache_staleness_ms: int = 0
+    """Antigüedad máxima para reutilizar un tick entre ciclos (0 = solo mismo ciclo)"""
+    
+    
+    # ========================================================================
+    # PLANIFICACIÓN DE CONSULTAS (CIERRE DE BARRA)
+    # ========================================================================
+    
+    server_time_offset_hours: float = None
+    """Hora del servidor del broker - UTC (None = detectar desde ticks; con
+    el mercado cerrado no hay ticks nuevos y se asume 0 con un aviso)"""
+    
+    scheduler_lead_ms: int = 50
+    """Anticipación con la que se despierta antes de cada cierre de barra"""
+    
+    scheduler_poll_interval_ms: int = 10
+    """Intervalo entre consultas dentro de la ventana de sondeo"""
+    
+    scheduler_poll_window_ms: int = 2000
+    """Duración máxima de la ventana de sondeo tras cada cierre"""
+    
+    dispatch_mode: str = "drain"
+    """
+    Modo de despacho de eventos:
+    'drain' = procesa en lote todos los eventos listos (sin sleeps)
+    'poll' = un evento por iteración con sleep de 10ms (modo original)
+    """
     
     
     # ========================================================================
@@ -49,10 +109,13 @@ class TradingConfig:
     """Nivel de sobreventa del RSI (señal BUY)"""
     
     sl_points: int = 50
-    """Stop Loss en puntos (0.0001 para pares no-JPY, 0.01 para JPY)"""
+    """Stop Loss en pips. El nombre se conserva por compatibilidad: en
+    divisas de 5 o 3 dígitos un pip son 10 points (0.0001 en pares no-JPY,
+    0.01 en JPY); en el resto de los símbolos un pip es 1 point
+    (ver core.data.pips)"""
     
     tp_points: int = 100
-    """Take Profit en puntos"""
+    """Take Profit en pips (misma unidad que sl_points)"""
     
     
     # ========================================================================
@@ -73,6 +136,83 @@ class TradingConfig:
     Ej: 3.0 = exposición máxima de 3x el equity
     """
     
+    exposure_mark_interval_ms: int = 1000
+    """Intervalo de revaluación (mark-to-market) del ledger de exposición"""
+    
+    
+    # ========================================================================
+    # EJECUCIÓN
+    # ========================================================================
+    
+    fill_poll_interval_ms: int = 50
+    """Intervalo de consulta de deals en el hilo de confirmación"""
+    
+    fill_confirmation_timeout_s: float = 10.0
+    """Espera máxima de un deal antes de usar el resultado de order_send"""
+    
+    portfolio_reconcile_interval_s: float = 5.0
+    """Intervalo de reconciliación del libro de posiciones contra MT5"""
+    
+    
+    # ========================================================================
+    # MÉTRICAS DE LATENCIA
+    # ========================================================================
+    
+    latency_log_dir: str = "logs"
+    """Directorio de los volcados de histogramas de latencia (None = sin volcado)"""
+    
+    latency_dump_interval_s: float = 60.0
+    """Intervalo entre volcados de histogramas de latencia (0 = solo al detenerse)"""
+    
+    
+    # ========================================================================
+    # LOGGING
+    # ========================================================================
+    
+    log_console_level: str = "INFO"
+    """Nivel mínimo de log en consola (None = sin consola)"""
+    
+    log_file_level: str = "DEBUG"
+    """Nivel mínimo de log en archivo (None = sin archivo)"""
+    
+    log_dir: str = "logs"
+    """Directorio de los archivos de log rotativos (None = sin archivo)"""
+    
+    log_file_format: str = "jsonl"
+    """Formato del archivo de log: 'jsonl' (un objeto JSON por línea) o 'text'"""
+    
+    log_max_bytes: int = 10 * 1024 * 1024
+    """Tamaño a partir del cual rota el archivo de log (0 = nunca)"""
+    
+    log_backup_count: int = 5
+    """Archivos de log rotados que se conservan"""
+    
+    log_buffer_capacity: int = 100000
+    """Registros retenidos en el buffer en memoria (si se llena se descartan los más viejos)"""
+    
+    log_flush_interval_ms: int = 100
+    """Intervalo entre escrituras del hilo de logging"""
+    
+    
+    # ========================================================================
+    # BACKTEST (broker simulado)
+    # ========================================================================
+    
+    backtest_initial_balance: float = 10000.0
+    """Balance inicial de la cuenta simulada"""
+    
+    backtest_spread_points: int = None
+    """Spread fijo en puntos (None = el spread registrado en cada barra)"""
+    
+    backtest_slippage_points: int = 0
+    """Deslizamiento adverso en órdenes a mercado, STOP y stop loss"""
+    
+    backtest_latency_ms: int = 0
+    """Demora simulada entre el envío de una orden y su ejecución"""
+    
+    backtest_commission_per_lot: float = 0.0
+    """Comisión por lote y por lado, en divisa de cuenta"""
+    
     
     # ========================================================================
     # NOTIFICACIONES
@@ -87,6 +227,21 @@ class TradingConfig:
     telegram_chat_id: str = None
     """Chat ID para recibir notificaciones"""
     
+    notification_file_path: str = None
+    """Archivo JSON lines donde registrar notificaciones (None = sin archivo)"""
+    
+    notification_http_url: str = None
+    """Endpoint HTTP(S) que recibe cada notificación como POST JSON (None = sin HTTP)"""
+    
+    notification_queue_capacity: int = 1000
+    """Notificaciones pendientes por cola (si se llena se descartan las más viejas)"""
+    
+    notification_digest_window_s: float = 1.0
+    """Espera para agrupar ráfagas en un único mensaje resumen (Telegram, HTTP)"""
+    
+    notification_rate_limit_per_min: float = 20.0
+    """Máximo de mensajes por minuto en Telegram y HTTP (0 = sin límite)"""
+    
     
     def __post_init__(self):
         """Validación de configuración al inicializar."""
@@ -99,11 +254,49 @@ class TradingConfig:
         if self.rsi_period < 2:
             raise ValueError("rsi_period debe ser >= 2")
         
+        # Validar buffer de barras
+        if self.bar_buffer_capacity < self.rsi_period + 1:
+            raise ValueError("bar_buffer_capacity debe ser >= rsi_period + 1")
+        
+        if self.bar_store_history_bars <= 0:
+            raise ValueError("bar_store_history_bars debe ser > 0")
+        
+        if self.symbol_registry_refresh_s <= 0:
+            raise ValueError("symbol_registry_refresh_s debe ser > 0")
+        
+        if self.data_feed_mode not in ("bars", "ticks"):
+            raise ValueError("data_feed_mode debe ser 'bars' o 'ticks'")
+        
+        if self.timeframe.endswith("s") and self.data_feed_mode != "ticks":
+            raise ValueError("Los timeframes sub-minuto requieren data_feed_mode='ticks'")
+        
+        if self.tick_bar_close_grace_ms < 0:
+            raise ValueError("tick_bar_close_grace_ms debe ser >= 0")
+        
+        if self.data_poll_workers < 0:
+            raise ValueError("data_poll_workers debe ser >= 0")
+        
+        if self.tick_cache_staleness_ms < 0:
+            raise ValueError("tick_cache_staleness_ms debe ser >= 0")
+        
         if not (0 < self.rsi_lower < self.rsi_upper < 100):
             raise ValueError(
                 "rsi_lower debe ser < rsi_upper, y ambos entre 0 y 100"
             )
         
+        # Validar planificador
+        if self.scheduler_lead_ms < 0:
+            raise ValueError("scheduler_lead_ms debe ser >= 0")
+        
+        if self.scheduler_poll_interval_ms <= 0:
+            raise ValueError("scheduler_poll_interval_ms debe ser > 0")
+        
+        if self.scheduler_poll_window_ms <= 0:
+            raise ValueError("scheduler_poll_window_ms debe ser > 0")
+        
+        if self.dispatch_mode not in ("drain", "poll"):
+            raise ValueError("dispatch_mode debe ser 'drain' o 'poll'")
+        
         # Validar SL y TP
         if self.sl_points <= 0:
             raise ValueError("sl_points debe ser > 0")
@@ -119,6 +312,58 @@ class TradingConfig:
         if self.max_leverage_factor <= 0:
             raise ValueError("max_leverage_factor debe ser > 0")
         
+        if self.exposure_mark_interval_ms <= 0:
+            raise ValueError("exposure_mark_interval_ms debe ser > 0")
+        
+        # Validar ejecución
+        if self.fill_poll_interval_ms <= 0:
+            raise ValueError("fill_poll_interval_ms debe ser > 0")
+        
+        if self.fill_confirmation_timeout_s <= 0:
+            raise ValueError("fill_confirmation_timeout_s debe ser > 0")
+        
+        if self.portfolio_reconcile_interval_s <= 0:
+            raise ValueError("portfolio_reconcile_interval_s debe ser > 0")
+        
+        if self.latency_dump_interval_s < 0:
+            raise ValueError("latency_dump_interval_s debe ser >= 0")
+        
+        # Validar logging
+        for level in (self.log_console_level, self.log_file_level):
+            if level is not None and level.upper() not in ("DEBUG", "INFO", "WARNING", "ERROR", "CRITICAL"):
+                raise ValueError(f"Nivel de log '{level}' no válido")
+        
+        if self.log_file_format not in ("jsonl", "text"):
+            raise ValueError("log_file_format debe ser 'jsonl' o 'text'")
+        
+        if self.log_max_bytes < 0:
+            raise ValueError("log_max_bytes debe ser >= 0")
+        
+        if self.log_backup_count < 0:
+            raise ValueError("log_backup_count debe ser >= 0")
+        
+        if self.log_buffer_capacity <= 0:
+            raise ValueError("log_buffer_capacity debe ser > 0")
+        
+        if self.log_flush_interval_ms <= 0:
+            raise ValueError("log_flush_interval_ms debe ser > 0")
+        
+        # Validar backtest
+        if self.backtest_initial_balance <= 0:
+            raise ValueError("backtest_initial_balance debe ser > 0")
+        
+        if self.backtest_spread_points is not None and self.backtest_spread_points < 0:
+            raise ValueError("backtest_spread_points debe ser >= 0")
+        
+        if self.backtest_slippage_points < 0:
+            raise ValueError("backtest_slippage_points debe ser >= 0")
+        
+        if self.backtest_latency_ms < 0:
+            raise ValueError("backtest_latency_ms debe ser >= 0")
+        
+        if self.backtest_commission_per_lot < 0:
+            raise ValueError("backtest_commission_per_lot debe ser >= 0")
+        
         # Validar Telegram
         if self.telegram_enabled:
             if not self.telegram_token or not self.telegram_chat_id:
@@ -126,6 +371,16 @@ class TradingConfig:
                     "Si telegram_enabled=True, debe proporcionar "
                     "telegram_token y telegram_chat_id"
                 )
+        
+        # Validar notificaciones
+        if self.notification_queue_capacity <= 0:
+            raise ValueError("notification_queue_capacity debe ser > 0")
+        
+        if self.notification_digest_window_s < 0:
+            raise ValueError("notification_digest_window_s debe ser >= 0")
+        
+        if self.notification_rate_limit_per_min < 0:
+            raise ValueError("notification_rate_limit_per_min debe ser >= 0")
 
 
 # ============================================================================
@@ -143,6 +398,22 @@ def get_default_config() -> TradingConfig:
         # Símbolos
         symbols=['EURUSD', 'GBPUSD', 'USDJPY'],
         timeframe='1min',
+        derived_timeframes=[],
+        bar_buffer_capacity=500,
+        bar_store_dir=None,
+        bar_store_history_bars=50000,
+        symbol_registry_refresh_s=3600.0,
+        data_feed_mode="bars",
+        tick_bar_close_grace_ms=200,
+        data_poll_workers=0,
+        tick_cache_staleness_ms=0,
+        
+        # Planificación
+        server_time_offset_hours=None,
+        scheduler_lead_ms=50,
+        scheduler_poll_interval_ms=10,
+        scheduler_poll_window_ms=2000,
+        dispatch_mode="drain",
         
         # Estrategia
         magic_number=12345,
@@ -159,9 +430,41 @@ def get_default_config() -> TradingConfig:
         
         # Risk
         max_leverage_factor=3.0,
+        exposure_mark_interval_ms=1000,
+        
+        # Execution
+        fill_poll_interval_ms=50,
+        fill_confirmation_timeout_s=10.0,
+        portfolio_reconcile_interval_s=5.0,
+        
+        # Latencia
+        latency_log_dir="logs",
+        latency_dump_interval_s=60.0,
+        
+        # Logging
+        log_console_level="INFO",
+        log_file_level="DEBUG",
+        log_dir="logs",
+        log_file_format="jsonl",
+        log_max_bytes=10 * 1024 * 1024,
+        log_backup_count=5,
+        log_buffer_capacity=100000,
+        log_flush_interval_ms=100,
+        
+        # Backtest
+        backtest_initial_balance=10000.0,
+        backtest_spread_points=None,
+        backtest_slippage_points=0,
+        backtest_latency_ms=0,
+        backtest_commission_per_lot=0.0,
         
         # Notifications
         telegram_enabled=False,
         telegram_token=None,
-        telegram_chat_id=None
+        telegram_chat_id=None,
+        notification_file_path=None,
+        notification_http_url=None,
+        notification_queue_capacity=1000,
+        notification_digest_window_s=1.0,
+        notification_rate_limit_per_min=20.0
     )
@@ -0,0 +1,88 @@
+"""
+LIA Engineering Solutions - Trading Framework
+Bar - Registro Compacto de una Barra OHLCV
+
+Reemplaza a pd.Series como payload de DataEvent: una barra cerrada es un
+registro slotted de 8 campos, sin índice, sin dtype por columna y sin
+conversión de fechas en el camino crítico.
+"""
+
+from datetime import datetime, timezone
+from typing import Any
+
+
+class Bar:
+    """
+    Barra OHLCV cerrada.
+    
+    Atributos:
+        time: Apertura de la barra en epoch segundos (hora del servidor)
+        open, high, low, close: Precios
+        tickvol: Volumen de ticks
+        vol: Volumen real
+        spread: Spread en puntos
+    """
+    __slots__ = ('time', 'open', 'high', 'low', 'close', 'tickvol', 'vol', 'spread')
+    
+    def __init__(
+        self,
+        time: int,
+        open: float,
+        high: float,
+        low: float,
+        close: float,
+        tickvol: int = 0,
+        vol: int = 0,
+        spread: int = 0
+    ):
+        self.time = time
+        self.open = open
+        self.high = high
+        self.low = low
+        self.close = close
+        self.tickvol = tickvol
+        self.vol = vol
+        self.spread = spread
+    
+    
+    @classmethod
+    def from_record(cls, record: Any) -> "Bar":
+        """
+        Crea una barra desde una fila de un array con dtype BAR_DTYPE.
+        
+        Args:
+            record: Fila de array estructurado (core/data/bar_buffer.py)
+            
+        Returns:
+            Instancia de Bar con tipos nativos de Python
+        """
+        # item() convierte todos los campos a tipos nativos en una llamada
+        return cls(*record.item())
+    
+    
+    @property
+    def datetime(self) -> datetime:
+        """Apertura de la barra como datetime (naive, hora del servidor)."""
+        return datetime.fromtimestamp(self.time, tz=timezone.utc).replace(tzinfo=None)
+    
+    
+    def __getitem__(self, field: str) -> Any:
+        """Acceso por nombre de campo, compatible con bar['close']."""
+        try:
+            return getattr(self, field)
+        except AttributeError:
+            raise KeyError(field) from None
+    
+    
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, Bar):
+            return NotImplemented
+        return all(getattr(self, f) == getattr(other, f) for f in self.__slots__)
+    
+    
+    def __repr__(self) -> str:
+        return (
+            f"Bar(time={self.time}, open={self.open}, high={self.high}, "
+            f"low={self.low}, close={self.close}, tickvol={self.tickvol}, "
+            f"vol={self.vol}, spread={self.spread})"
+        )
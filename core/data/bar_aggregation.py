@@ -0,0 +1,92 @@
+"""
+LIA Engineering Solutions - Trading Framework
+Bar Aggregation - Reducción Vectorizada de Lotes a Barras
+
+Bloque común del BarResampler (barras base → timeframe superior) y del
+TickBarAggregator (ticks → barras):
+- aggregate_segments(): segmenta un lote ordenado por apertura de barra
+  y reduce cada segmento con reduceat, sin iterar en Python
+- merge_forming(): continúa la barra en formación con la primera barra
+  del lote, o la devuelve cerrada si el lote ya empieza en otra
+"""
+
+from typing import Optional
+import numpy as np
+from core.data.bar_buffer import BAR_DTYPE
+
+
+def aggregate_segments(
+    buckets: np.ndarray,
+    opens: np.ndarray,
+    highs: np.ndarray,
+    lows: np.ndarray,
+    closes: np.ndarray,
+    vol: np.ndarray,
+    tickvol: Optional[np.ndarray] = None,
+    spread: Optional[np.ndarray] = None
+) -> np.ndarray:
+    """
+    Reduce un lote a una barra por segmento de igual apertura.
+    
+    Args:
+        buckets: Apertura de la barra de cada elemento (no decreciente)
+        opens, highs, lows, closes: Precios de cada elemento
+        vol: Volumen real de cada elemento (se suma)
+        tickvol: Volumen de ticks de cada elemento (se suma; None = contar
+            los elementos del segmento)
+        spread: Spread de cada elemento (se toma el mínimo; None = 0)
+        
+    Returns:
+        Array BAR_DTYPE con una barra por segmento (vacío si no hay elementos)
+    """
+    n = len(buckets)
+    if n == 0:
+        return np.empty(0, dtype=BAR_DTYPE)
+    
+    starts = np.flatnonzero(np.r_[True, buckets[1:] != buckets[:-1]])
+    ends = np.r_[starts[1:], n]
+    
+    bars = np.zeros(len(starts), dtype=BAR_DTYPE)
+    bars['time'] = buckets[starts]
+    bars['open'] = opens[starts]
+    bars['high'] = np.maximum.reduceat(highs, starts)
+    bars['low'] = np.minimum.reduceat(lows, starts)
+    bars['close'] = closes[ends - 1]
+    bars['tickvol'] = ends - starts if tickvol is None else np.add.reduceat(tickvol, starts)
+    bars['vol'] = np.add.reduceat(vol, starts)
+    
+    if spread is not None:
+        bars['spread'] = np.minimum.reduceat(spread, starts)
+    
+    return bars
+
+
+def merge_forming(forming: Optional[np.ndarray], bars: np.ndarray) -> Optional[np.ndarray]:
+    """
+    Une la barra en formación con la primera barra de un lote agregado.
+    
+    Si ambas abren a la misma hora, la primera barra del lote pasa a
+    incluir la barra en formación (se modifica en el lugar). Si no, la
+    barra en formación quedó cerrada.
+    
+    Args:
+        forming: Barra en formación (array BAR_DTYPE de 1 elemento) o None
+        bars: Resultado no vacío de aggregate_segments()
+        
+    Returns:
+        La barra en formación si quedó cerrada, None en otro caso
+    """
+    if forming is None:
+        return None
+    
+    if forming['time'][0] != bars['time'][0]:
+        return forming
+    
+    first = bars[0]
+    first['open'] = forming['open'][0]
+    first['high'] = max(first['high'], forming['high'][0])
+    first['low'] = min(first['low'], forming['low'][0])
+    first['tickvol'] += forming['tickvol'][0]
+    first['vol'] += forming['vol'][0]
+    first['spread'] = min(first['spread'], forming['spread'][0])
+    return None
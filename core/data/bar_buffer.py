@@ -0,0 +1,203 @@
+"""
+LIA Engineering Solutions - Trading Framework
+Bar Ring Buffer - Buffer Circular de Barras OHLCV
+
+Almacena las últimas N barras cerradas de un (símbolo, timeframe) en un
+array estructurado de NumPy de capacidad fija.
+
+Implementación:
+- Cada barra se escribe dos veces (posición i e i + capacidad), de modo
+  que las últimas N barras siempre forman un bloque contiguo en memoria
+- Las lecturas devuelven vistas (zero-copy) de solo lectura
+- Las escrituras son O(1) y no generan allocations
+"""
+
+import numpy as np
+import pandas as pd
+
+
+# Layout de una barra OHLCV (tiempo en epoch segundos, hora del servidor)
+BAR_DTYPE = np.dtype([
+    ('time', np.int64),
+    ('open', np.float64),
+    ('high', np.float64),
+    ('low', np.float64),
+    ('close', np.float64),
+    ('tickvol', np.int64),
+    ('vol', np.int64),
+    ('spread', np.int32),
+])
+
+BAR_COLUMNS = ['open', 'high', 'low', 'close', 'tickvol', 'vol', 'spread']
+
+
+def rates_to_bars(rates: np.ndarray) -> np.ndarray:
+    """
+    Convierte el array devuelto por mt5.copy_rates_* al layout BAR_DTYPE.
+    
+    Args:
+        rates: Array estructurado de MT5 (time, open, ..., tick_volume, real_volume)
+        
+    Returns:
+        Array estructurado con dtype BAR_DTYPE
+    """
+    bars = np.empty(len(rates), dtype=BAR_DTYPE)
+    
+    bars['time'] = rates['time']
+    bars['open'] = rates['open']
+    bars['high'] = rates['high']
+    bars['low'] = rates['low']
+    bars['close'] = rates['close']
+    bars['tickvol'] = rates['tick_volume']
+    bars['vol'] = rates['real_volume']
+    bars['spread'] = rates['spread']
+    
+    return bars
+
+
+def bars_to_dataframe(bars: np.ndarray) -> pd.DataFrame:
+    """
+    Convierte un array BAR_DTYPE al DataFrame estándar del framework.
+    
+    Args:
+        bars: Array estructurado con dtype BAR_DTYPE
+        
+    Returns:
+        DataFrame indexado por 'time' con columnas OHLCV
+    """
+    df = pd.DataFrame(bars[BAR_COLUMNS])
+    df.index = pd.to_datetime(bars['time'], unit='s')
+    df.index.name = 'time'
+    return df
+
+
+class BarRingBuffer:
+    """
+    Buffer circular de capacidad fija para barras cerradas.
+    """
+    
+    def __init__(self, capacity: int):
+        """
+        Inicializa el buffer.
+        
+        Args:
+            capacity: Máximo de barras retenidas
+            
+        Raises:
+            ValueError: Si la capacidad no es positiva
+        """
+        if capacity <= 0:
+            raise ValueError("capacity debe ser > 0")
+        
+        self.capacity = capacity
+        
+        # Doble longitud: cada barra se replica en i e i + capacity
+        self._data = np.zeros(2 * capacity, dtype=BAR_DTYPE)
+        self._head = -1   # Último slot escrito en [0, capacity)
+        self._size = 0
+        
+        # Total histórico de barras agregadas (no se reinicia al rotar)
+        self.total_appended = 0
+    
+    
+    def __len__(self) -> int:
+        return self._size
+    
+    
+    @property
+    def last_time(self) -> int:
+        """Epoch de la última barra almacenada (-1 si está vacío)."""
+        if self._size == 0:
+            return -1
+        return int(self._data['time'][self._head])
+    
+    
+    def append_bar(self, bar) -> bool:
+        """
+        Agrega una barra si es posterior a la última almacenada.
+        
+        Args:
+            bar: Registro con campos BAR_DTYPE (fila de array estructurado)
+            
+        Returns:
+            True si la barra fue agregada
+        """
+        if self._size > 0 and bar['time'] <= self._data['time'][self._head]:
+            return False
+        
+        head = self._head + 1
+        if head == self.capacity:
+            head = 0
+        
+        self._data[head] = bar
+        self._data[head + self.capacity] = bar
+        
+        self._head = head
+        if self._size < self.capacity:
+            self._size += 1
+        self.total_appended += 1
+        
+        return True
+    
+    
+    def extend(self, bars: np.ndarray) -> int:
+        """
+        Agrega un bloque de barras ordenadas por tiempo.
+        Las barras anteriores o iguales a la última almacenada se ignoran.
+        
+        Args:
+            bars: Array con dtype BAR_DTYPE
+            
+        Returns:
+            Cantidad de barras agregadas
+        """
+        if len(bars) == 0:
+            return 0
+        
+        if self._size > 0:
+            bars = bars[bars['time'] > self.last_time]
+        
+        added = 0
+        for bar in bars[-self.capacity:]:
+            if self.append_bar(bar):
+                added += 1
+        
+        # Las barras descartadas por capacidad cuentan en el total histórico
+        skipped = max(0, len(bars) - self.capacity)
+        self.total_appended += skipped
+        
+        return added + skipped
+    
+    
+    def view(self, num_bars: int = None) -> np.ndarray:
+        """
+        Retorna una vista de solo lectura de las últimas barras (zero-copy).
+        
+        La vista referencia la memoria interna del buffer: sus valores
+        cambian cuando el buffer rota. Copiarla si debe conservarse.
+        
+        Args:
+            num_bars: Cantidad de barras (None = todas las disponibles)
+            
+        Returns:
+            Array BAR_DTYPE ordenado de la más antigua a la más reciente
+        """
+        n = self._size if num_bars is None else max(0, min(num_bars, self._size))
+        
+        end = self._head + self.capacity + 1
+        window = self._data[end - n:end]
+        window.flags.writeable = False
+        
+        return window
+    
+    
+    def latest(self):
+        """
+        Retorna la última barra almacenada.
+        
+        Returns:
+            Registro BAR_DTYPE o None si el buffer está vacío
+        """
+        if self._size == 0:
+            return None
+        return self._data[self._head]
@@ -0,0 +1,138 @@
+"""
+LIA Engineering Solutions - Trading Framework
+Bar Resampler - Timeframes Superiores desde un Único Feed
+
+Agrega incrementalmente barras cerradas de un timeframe base (ej: 1min)
+en un timeframe superior (ej: 5min, 1h, 1w), con la alineación de MT5
+en hora del servidor (ver core.data.timeframes).
+
+La barra superior se cierra en cuanto llega la barra base que completa
+su período (ej: la M1 de 10:04 cierra la M5 de 10:00), sin esperar a la
+siguiente. Si esa barra base no existe (minuto sin ticks), se cierra al
+llegar la primera barra base del período siguiente.
+"""
+
+from typing import Optional
+import numpy as np
+from core.data.bar_aggregation import aggregate_segments, merge_forming
+from core.data.bar_buffer import BAR_DTYPE
+from core.data.timeframes import TIMEFRAME_SECONDS, bar_close_time, bar_open_times
+
+
+def can_resample(base_timeframe: str, target_timeframe: str) -> bool:
+    """
+    Indica si target_timeframe puede derivarse de base_timeframe.
+    
+    Args:
+        base_timeframe: Timeframe del feed
+        target_timeframe: Timeframe a derivar
+    
+    Returns:
+        True si el objetivo es mayor y cada barra base cae entera
+        dentro de una barra objetivo
+    """
+    base = TIMEFRAME_SECONDS.get(base_timeframe)
+    target = TIMEFRAME_SECONDS.get(target_timeframe, 0)
+    
+    if base is None or target_timeframe == base_timeframe:
+        return False
+    
+    if target is None:
+        return 86400 % base == 0  # MN1: cualquier base que divida el día
+    
+    return target > base and target % base == 0 and (
+        target_timeframe != '1w' or 86400 % base == 0
+    )
+
+
+class BarResampler:
+    """
+    Convierte barras base cerradas en barras de un timeframe superior.
+    """
+    
+    def __init__(self, base_timeframe: str, target_timeframe: str):
+        """
+        Inicializa el resampler.
+        
+        Args:
+            base_timeframe: Timeframe de las barras de entrada
+            target_timeframe: Timeframe de las barras de salida
+        
+        Raises:
+            ValueError: Si target_timeframe no puede derivarse del base
+        """
+        if not can_resample(base_timeframe, target_timeframe):
+            raise ValueError(
+                f"No se puede derivar '{target_timeframe}' desde '{base_timeframe}'"
+            )
+        
+        self.base_timeframe = base_timeframe
+        self.timeframe = target_timeframe
+        
+        # Barra en formación (registro BAR_DTYPE)
+        self._forming: Optional[np.ndarray] = None
+    
+    
+    @property
+    def forming_bar(self) -> Optional[np.void]:
+        """Barra superior en formación (None si no hay)."""
+        return None if self._forming is None else self._forming[0]
+    
+    
+    def seed_forming(self, bar: np.void) -> None:
+        """
+        Inicializa la barra en formación con una barra parcial externa
+        (ej: la barra en curso de MT5 cuando el feed base no cubre el
+        inicio del período).
+        
+        Args:
+            bar: Registro BAR_DTYPE de la barra superior en curso
+        """
+        self._forming = np.array([bar], dtype=BAR_DTYPE)
+    
+    
+    def update(self, bars: np.ndarray) -> np.ndarray:
+        """
+        Incorpora barras base cerradas, ordenadas por tiempo.
+        
+        Args:
+            bars: Array BAR_DTYPE de barras base
+        
+        Returns:
+            Array BAR_DTYPE con las barras superiores que quedaron cerradas
+        """
+        if self._forming is not None:
+            bars = bars[bars['time'] >= self._forming['time'][0]]
+        
+        if len(bars) == 0:
+            return np.empty(0, dtype=BAR_DTYPE)
+        
+        out = aggregate_segments(
+            bar_open_times(bars['time'], self.timeframe),
+            bars['open'], bars['high'], bars['low'], bars['close'], bars['vol'],
+            tickvol=bars['tickvol'], spread=bars['spread']
+        )
+        
+        closed = []
+        previous = merge_forming(self._forming, out)
+        if previous is not None:
+            closed.append(previous)
+        
+        if len(out) > 1:
+            closed.append(out[:-1])
+        
+        # La última barra queda cerrada si la barra base final completa su período
+        last = out[-1:].copy()
+        last_close = bar_close_time(int(last['time'][0]), self.timeframe)
+        base_close = bar_close_time(int(bars['time'][-1]), self.base_timeframe)
+        
+        if base_close >= last_close:
+            closed.append(last)
+            self._forming = None
+        else:
+            self._forming = last
+        
+        if not closed:
+            return np.empty(0, dtype=BAR_DTYPE)
+        
+        return np.concatenate(closed)
@@ -0,0 +1,255 @@
+"""
+LIA Engineering Solutions - Trading Framework
+Bar Store - Almacén Local de Barras en Disco
+
+Persiste las barras cerradas de cada (símbolo, timeframe) en un archivo
+propio bajo un directorio de datos, con acceso memory-mapped.
+
+Implementación:
+- Un archivo '<root>/<símbolo>/<timeframe>.bars' por serie, con registros
+  BAR_DTYPE contiguos (sin cabecera) ordenados por tiempo
+- Escrituras append-only: solo se agregan barras posteriores a la última
+  almacenada; un registro parcial (ej: corte durante una escritura) se
+  descarta al abrir el archivo
+- Lecturas zero-copy: np.memmap de solo lectura; cada columna ('close',
+  'time', ...) es una vista sobre el archivo, sin cargarlo en memoria
+- Índice compacto por tiempo: el epoch de una de cada INDEX_STRIDE barras
+  se mantiene en memoria; una búsqueda toca el índice y un único bloque
+  del archivo
+"""
+
+import os
+from typing import Dict, Optional, Tuple
+import numpy as np
+from core.data.bar_buffer import BAR_DTYPE
+
+
+class BarSeries:
+    """
+    Serie de barras de un (símbolo, timeframe) persistida en un archivo.
+    """
+    
+    # Barras por entrada del índice en memoria
+    INDEX_STRIDE = 1024
+    
+    def __init__(self, path: str):
+        """
+        Abre (o crea) el archivo de la serie.
+        
+        Args:
+            path: Ruta del archivo de barras
+        """
+        self.path = path
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        
+        itemsize = BAR_DTYPE.itemsize
+        size = os.path.getsize(path) if os.path.exists(path) else 0
+        
+        # Descartar un registro incompleto al final del archivo
+        if size % itemsize:
+            size -= size % itemsize
+            with open(path, "r+b") as f:
+                f.truncate(size)
+        
+        self._length = size // itemsize
+        self._map: Optional[np.ndarray] = None
+        self._file = open(path, "ab")
+        
+        bars = self.bars
+        self._last_time = int(bars['time'][-1]) if self._length else -1
+        self._index = np.array(bars['time'][::self.INDEX_STRIDE], dtype=np.int64)
+    
+    
+    def __len__(self) -> int:
+        return self._length
+    
+    
+    @property
+    def last_time(self) -> int:
+        """Epoch de la última barra almacenada (-1 si está vacía)."""
+        return self._last_time
+    
+    
+    @property
+    def first_time(self) -> int:
+        """Epoch de la primera barra almacenada (-1 si está vacía)."""
+        return int(self._index[0]) if self._length else -1
+    
+    
+    @property
+    def bars(self) -> np.ndarray:
+        """
+        Todas las barras almacenadas como memmap de solo lectura.
+        
+        El mapeo se renueva tras cada append; las vistas obtenidas antes
+        siguen siendo válidas pero no incluyen las barras nuevas.
+        """
+        if self._length == 0:
+            return np.empty(0, dtype=BAR_DTYPE)
+        
+        if self._map is None or len(self._map) != self._length:
+            self._map = np.memmap(self.path, dtype=BAR_DTYPE, mode="r", shape=(self._length,))
+        
+        return self._map
+    
+    
+    def append(self, bars: np.ndarray) -> int:
+        """
+        Agrega al final del archivo las barras posteriores a la última
+        almacenada.
+        
+        Args:
+            bars: Array BAR_DTYPE (o registro único) ordenado por tiempo
+        
+        Returns:
+            Cantidad de barras escritas
+        
+        Raises:
+            ValueError: Si las barras nuevas no están en orden estricto
+        """
+        bars = np.atleast_1d(np.asarray(bars, dtype=BAR_DTYPE))
+        new = bars[bars['time'] > self._last_time]
+        
+        if len(new) == 0:
+            return 0
+        
+        times = new['time']
+        if len(new) > 1 and np.any(times[1:] <= times[:-1]):
+            raise ValueError(f"Barras fuera de orden para {self.path}")
+        
+        self._file.write(new.tobytes())
+        self._file.flush()
+        
+        # Nuevas entradas del índice: filas múltiplo de INDEX_STRIDE
+        start = self._length
+        first_row = -(-start // self.INDEX_STRIDE) * self.INDEX_STRIDE
+        rows = np.arange(first_row, start + len(new), self.INDEX_STRIDE) - start
+        if len(rows) > 0:
+            self._index = np.concatenate((self._index, times[rows]))
+        
+        self._length += len(new)
+        self._last_time = int(times[-1])
+        
+        return len(new)
+    
+    
+    def _locate(self, epoch: int, side: str) -> int:
+        """
+        Posición de epoch en la serie (semántica de np.searchsorted).
+        """
+        stride = self.INDEX_STRIDE
+        block = int(np.searchsorted(self._index, epoch, side))
+        
+        lo = max(block - 1, 0) * stride
+        hi = min(block * stride, self._length)
+        
+        return lo + int(np.searchsorted(self.bars['time'][lo:hi], epoch, side))
+    
+    
+    def slice(self, start_time: int = None, end_time: int = None) -> np.ndarray:
+        """
+        Retorna una vista zero-copy de las barras con start_time <= time < end_time.
+        
+        Args:
+            start_time: Epoch inicial inclusivo (None = desde el principio)
+            end_time: Epoch final exclusivo (None = hasta la última barra)
+        
+        Returns:
+            Array BAR_DTYPE de solo lectura respaldado por el archivo
+        """
+        lo = 0 if start_time is None else self._locate(start_time, "left")
+        hi = self._length if end_time is None else self._locate(end_time, "left")
+        
+        return self.bars[lo:max(lo, hi)]
+    
+    
+    def tail(self, num_bars: int) -> np.ndarray:
+        """
+        Retorna una vista zero-copy de las últimas barras almacenadas.
+        
+        Args:
+            num_bars: Cantidad de barras
+        
+        Returns:
+            Array BAR_DTYPE de solo lectura (puede tener menos de num_bars)
+        """
+        num_bars = max(0, min(num_bars, self._length))
+        return self.bars[self._length - num_bars:]
+    
+    
+    def close(self) -> None:
+        """
+        Cierra el archivo. Las vistas ya entregadas siguen siendo válidas.
+        """
+        self._file.close()
+        self._map = None
+
+
+class BarStore:
+    """
+    Directorio de series de barras, una por (símbolo, timeframe).
+    """
+    
+    FILE_EXTENSION = ".bars"
+    
+    def __init__(self, root_dir: str):
+        """
+        Inicializa el almacén. Las series se abren bajo demanda.
+        
+        Args:
+            root_dir: Directorio raíz de los archivos de barras
+        """
+        self.root_dir = root_dir
+        self._series: Dict[Tuple[str, str], BarSeries] = {}
+        
+        os.makedirs(root_dir, exist_ok=True)
+    
+    
+    def path(self, symbol: str, timeframe: str) -> str:
+        """
+        Ruta del archivo de un (símbolo, timeframe).
+        """
+        return os.path.join(self.root_dir, symbol, timeframe + self.FILE_EXTENSION)
+    
+    
+    def series(self, symbol: str, timeframe: str) -> BarSeries:
+        """
+        Retorna la serie de un (símbolo, timeframe), abriéndola si hace falta.
+        
+        Args:
+            symbol: Símbolo
+            timeframe: Timeframe de las barras
+        
+        Returns:
+            Serie persistida (vacía si no existía)
+        """
+        key = (symbol, timeframe)
+        series = self._series.get(key)
+        
+        if series is None:
+            series = BarSeries(self.path(symbol, timeframe))
+            self._series[key] = series
+        
+        return series
+    
+    
+    def slice(
+        self,
+        symbol: str,
+        timeframe: str,
+        start_time: int = None,
+        end_time: int = None
+    ) -> np.ndarray:
+        """
+        Atajo de series(symbol, timeframe).slice(start_time, end_time).
+        """
+        return self.series(symbol, timeframe).slice(start_time, end_time)
+    
+    
+    def close(self) -> None:
+        """
+        Cierra todos los archivos abiertos.
+        """
+        for series in self._series.values():
+            series.close()
+        self._series.clear()
@@ -0,0 +1,35 @@
+"""
+LIA Engineering Solutions - Trading Framework
+Pips - Tamaño del Pip por Símbolo
+
+Las distancias de SL/TP de la estrategia (sl_points, tp_points) se
+expresan en pips, la unidad de las divisas: en cotizaciones fraccionales
+(5 dígitos, o 3 en pares JPY) un pip son 10 points. En el resto de los
+símbolos (índices, metales, acciones) un pip es un point, aunque tengan
+3 o 5 decimales.
+
+Regla compartida por SymbolSpec y el VectorizedBacktester (que no
+importa MetaTrader5), para que ambos caminos usen las mismas distancias.
+"""
+
+
+# Modos de cálculo de MT5 que identifican divisas
+# (SYMBOL_CALC_MODE_FOREX, SYMBOL_CALC_MODE_FOREX_NO_LEVERAGE)
+FOREX_CALC_MODES = (0, 5)
+
+
+def pip_size(point: float, digits: int, calc_mode: int) -> float:
+    """
+    Calcula el tamaño del pip de un símbolo.
+    
+    Args:
+        point: Tamaño del punto
+        digits: Decimales del precio
+        calc_mode: Modo de cálculo de MT5 (symbol_info().trade_calc_mode)
+        
+    Returns:
+        10 points en divisas con cotización fraccional, 1 point en el resto
+    """
+    if calc_mode in FOREX_CALC_MODES and digits in (3, 5):
+        return point * 10
+    return point
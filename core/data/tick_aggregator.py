@@ -0,0 +1,137 @@
+"""
+LIA Engineering Solutions - Trading Framework
+Tick Bar Aggregator - Construcción Local de Barras desde Ticks
+
+Agrega ticks (precio bid) en barras OHLCV de cualquier timeframe,
+incluidos los sub-minuto ('10s', '15s', ...), con la misma alineación
+que MT5 (ver core.data.timeframes).
+
+Implementación:
+- Cada lote de ticks se segmenta por barra con operaciones vectorizadas
+  (core.data.bar_aggregation), sin iterar tick por tick en Python
+- La última barra del lote queda "en formación" hasta que llega un tick
+  de la barra siguiente o se invoca close_due() pasado su cierre
+- Ticks anteriores a la barra en formación (o a la última barra
+  cerrada) se descartan y se cuentan en late_ticks
+
+El spread no está disponible en puntos sin la especificación del
+símbolo, por lo que las barras agregadas lo registran en 0.
+"""
+
+from typing import Optional
+import numpy as np
+from core.data.bar_aggregation import aggregate_segments, merge_forming
+from core.data.bar_buffer import BAR_DTYPE
+from core.data.timeframes import bar_close_time, bar_open_times
+
+
+class TickBarAggregator:
+    """
+    Construye barras de un (símbolo, timeframe) a partir de ticks.
+    """
+    
+    def __init__(self, timeframe: str):
+        """
+        Inicializa el agregador.
+        
+        Args:
+            timeframe: Clave de TIMEFRAME_SECONDS (ej: '10s', '1min', '1h')
+        """
+        self.timeframe = timeframe
+        
+        # Barra en formación (registro BAR_DTYPE) y su cierre
+        self._forming: Optional[np.ndarray] = None
+        self._forming_close = 0
+        
+        # Apertura mínima aceptada (cierre de la última barra emitida)
+        self._min_open = 0
+        
+        # Estadísticas
+        self.ticks_processed = 0
+        self.late_ticks = 0
+    
+    
+    @property
+    def forming_bar(self) -> Optional[np.void]:
+        """Barra en formación (None si todavía no hubo ticks)."""
+        return None if self._forming is None else self._forming[0]
+    
+    
+    def update(
+        self,
+        times_msc: np.ndarray,
+        prices: np.ndarray,
+        volumes: np.ndarray = None
+    ) -> np.ndarray:
+        """
+        Incorpora un lote de ticks ordenados por tiempo.
+        
+        Args:
+            times_msc: Hora de cada tick en milisegundos (hora del servidor)
+            prices: Precio de cada tick (bid)
+            volumes: Volumen real de cada tick (opcional)
+        
+        Returns:
+            Array BAR_DTYPE con las barras que quedaron cerradas
+            (vacío si el lote no cruzó ningún cierre)
+        """
+        times_msc = np.asarray(times_msc, dtype=np.int64)
+        prices = np.asarray(prices, dtype=np.float64)
+        volumes = (
+            np.zeros(len(prices), dtype=np.int64) if volumes is None
+            else np.asarray(volumes, dtype=np.int64)
+        )
+        
+        buckets = bar_open_times(times_msc // 1000, self.timeframe)
+        
+        min_open = self._forming['time'][0] if self._forming is not None else self._min_open
+        on_time = buckets >= min_open
+        if not on_time.all():
+            self.late_ticks += int(len(on_time) - on_time.sum())
+            buckets, prices, volumes = buckets[on_time], prices[on_time], volumes[on_time]
+        
+        n = len(prices)
+        if n == 0:
+            return np.empty(0, dtype=BAR_DTYPE)
+        
+        self.ticks_processed += n
+        
+        # Una barra por segmento del lote (tickvol = cantidad de ticks)
+        bars = aggregate_segments(buckets, prices, prices, prices, prices, volumes)
+        
+        closed = []
+        previous = merge_forming(self._forming, bars)
+        if previous is not None:
+            closed.append(previous)
+        
+        if len(bars) > 1:
+            closed.append(bars[:-1])
+        
+        self._forming = bars[-1:].copy()
+        self._forming_close = bar_close_time(int(self._forming['time'][0]), self.timeframe)
+        self._min_open = int(self._forming['time'][0])
+        
+        if not closed:
+            return np.empty(0, dtype=BAR_DTYPE)
+        
+        return np.concatenate(closed)
+    
+    
+    def close_due(self, server_time: float) -> np.ndarray:
+        """
+        Cierra la barra en formación si server_time ya pasó su cierre
+        (emisión sin esperar al primer tick de la barra siguiente).
+        
+        Args:
+            server_time: Epoch segundos en hora del servidor
+        
+        Returns:
+            Array BAR_DTYPE con la barra cerrada (vacío si no corresponde)
+        """
+        if self._forming is None or server_time < self._forming_close:
+            return np.empty(0, dtype=BAR_DTYPE)
+        
+        closed = self._forming
+        self._forming = None
+        self._min_open = self._forming_close
+        return closed
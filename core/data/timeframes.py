@@ -0,0 +1,139 @@
+"""
+LIA Engineering Solutions - Trading Framework
+Timeframes - Duración y Alineación de Barras
+
+Funciones compartidas por el DataProvider, el agregador de ticks, el
+resampler y el BarCloseScheduler para ubicar una marca de tiempo (hora
+del servidor) dentro de su barra.
+
+Alineación (igual que MT5):
+- Intradía y D1: múltiplos de la duración desde epoch
+- W1: semanas que abren el domingo 00:00
+- MN1: primer día del mes 00:00 (duración variable)
+"""
+
+import calendar
+from datetime import datetime, timezone
+from typing import Optional
+import numpy as np
+
+
+# Duración de cada timeframe en segundos (None = duración variable)
+TIMEFRAME_SECONDS = {
+    '10s': 10,
+    '15s': 15,
+    '20s': 20,
+    '30s': 30,
+    '1min': 60,
+    '2min': 120,
+    '3min': 180,
+    '4min': 240,
+    '5min': 300,
+    '6min': 360,
+    '10min': 600,
+    '12min': 720,
+    '15min': 900,
+    '20min': 1200,
+    '30min': 1800,
+    '1h': 3600,
+    '2h': 7200,
+    '3h': 10800,
+    '4h': 14400,
+    '6h': 21600,
+    '8h': 28800,
+    '12h': 43200,
+    '1d': 86400,
+    '1w': 604800,
+    '1M': None,
+}
+
+# Las barras semanales de MT5 abren el domingo (epoch 0 = jueves)
+WEEK_ANCHOR_SECONDS = 3 * 86400
+
+
+def timeframe_seconds(timeframe: str) -> Optional[int]:
+    """
+    Retorna la duración de un timeframe.
+    
+    Args:
+        timeframe: Clave de TIMEFRAME_SECONDS
+    
+    Returns:
+        Segundos por barra (None para MN1)
+    
+    Raises:
+        ValueError: Si el timeframe no es válido
+    """
+    if timeframe not in TIMEFRAME_SECONDS:
+        raise ValueError(
+            f"Timeframe '{timeframe}' no válido. "
+            f"Opciones: {', '.join(TIMEFRAME_SECONDS.keys())}"
+        )
+    return TIMEFRAME_SECONDS[timeframe]
+
+
+def bar_open_time(server_time: float, timeframe: str) -> int:
+    """
+    Calcula la apertura de la barra que contiene server_time.
+    
+    Args:
+        server_time: Epoch segundos en hora del servidor
+        timeframe: Clave de TIMEFRAME_SECONDS
+    
+    Returns:
+        Apertura de la barra (epoch segundos, hora del servidor)
+    """
+    tf = timeframe_seconds(timeframe)
+    
+    if tf is None:
+        current = datetime.fromtimestamp(int(server_time), tz=timezone.utc)
+        return calendar.timegm((current.year, current.month, 1, 0, 0, 0))
+    
+    anchor = WEEK_ANCHOR_SECONDS if timeframe == '1w' else 0
+    return int((server_time - anchor) // tf * tf + anchor)
+
+
+def bar_close_time(server_time: float, timeframe: str) -> int:
+    """
+    Calcula el cierre (= apertura de la siguiente) de la barra que
+    contiene server_time. Siempre es estrictamente posterior a server_time.
+    
+    Args:
+        server_time: Epoch segundos en hora del servidor
+        timeframe: Clave de TIMEFRAME_SECONDS
+    
+    Returns:
+        Cierre de la barra (epoch segundos, hora del servidor)
+    """
+    tf = timeframe_seconds(timeframe)
+    open_time = bar_open_time(server_time, timeframe)
+    
+    if tf is None:
+        current = datetime.fromtimestamp(open_time, tz=timezone.utc)
+        year = current.year + (current.month // 12)
+        month = current.month % 12 + 1
+        return calendar.timegm((year, month, 1, 0, 0, 0))
+    
+    return open_time + tf
+
+
+def bar_open_times(server_times: np.ndarray, timeframe: str) -> np.ndarray:
+    """
+    Versión vectorizada de bar_open_time.
+    
+    Args:
+        server_times: Array int64 de epoch segundos (hora del servidor)
+        timeframe: Clave de TIMEFRAME_SECONDS
+    
+    Returns:
+        Array int64 con la apertura de la barra de cada elemento
+    """
+    server_times = np.asarray(server_times, dtype=np.int64)
+    tf = timeframe_seconds(timeframe)
+    
+    if tf is None:
+        months = server_times.astype('datetime64[s]').astype('datetime64[M]')
+        return months.astype('datetime64[s]').astype(np.int64)
+    
+    anchor = WEEK_ANCHOR_SECONDS if timeframe == '1w' else 0
+    return (server_times - anchor) // tf * tf + anchor
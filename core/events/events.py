@@ -4,13 +4,18 @@ Sistema de Eventos - Arquitectura Event-Driven
 
 Este módulo define todos los eventos que fluyen por el framework.
 Cada evento representa un estado o acción específica en el ciclo de trading.
+
+Los modelos pydantic de este módulo validan cada campo al construirse.
+El camino crítico usa las versiones slotted de core/events/fast_events.py
+(mismos nombres y campos); estos modelos se usan para validar en la
+frontera del sistema y en el modo estricto de los tests.
 """
 
 from enum import Enum
 from pydantic import BaseModel, Field
 from datetime import datetime
-import pandas as pd
 from typing import Optional
+from core.data.bar import Bar
 
 
 class EventType(str, Enum):
@@ -61,11 +66,13 @@ class DataEvent(BaseEvent):
     
     Atributos:
         symbol: Símbolo del instrumento financiero
-        data: Serie de pandas con OHLCV y otros datos de la barra
+        data: Registro Bar con OHLCV y otros datos de la barra
+        timeframe: Timeframe de la barra (ej: '1min', '1h')
     """
     event_type: EventType = EventType.DATA
     symbol: str
-    data: pd.Series
+    data: Bar
+    timeframe: str = ""
 
 
 # ============================================================================
@@ -152,6 +159,9 @@ class ExecutionEvent(BaseEvent):
     Atributos:
         fill_price: Precio al que se ejecutó la orden
         fill_time: Timestamp de ejecución
+        magic_number: Magic number de la orden
+        position_id: Ticket de la posición afectada
+        is_exit: True si el deal reduce o cierra la posición
     """
     event_type: EventType = EventType.EXECUTION
     symbol: str
@@ -159,6 +169,9 @@ class ExecutionEvent(BaseEvent):
     fill_price: float
     fill_time: datetime
     volume: float
+    magic_number: int = 0
+    position_id: int = 0
+    is_exit: bool = False
 
 
 # ============================================================================
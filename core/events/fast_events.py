@@ -0,0 +1,266 @@
+"""
+LIA Engineering Solutions - Trading Framework
+Eventos Rápidos - Representación Slotted del Sistema de Eventos
+
+Versión liviana de los eventos de core/events/events.py para el camino
+crítico (hot path):
+- Dataclasses con __slots__: sin __dict__ por instancia
+- event_type como atributo de clase: el despacho por EventType no cambia
+- Sin validación por construcción (los datos internos ya son confiables)
+- Marcas de tiempo monotónicas (perf_counter_ns) para medir latencias:
+  created_ns al construir el evento y origin_ns heredado a lo largo de la
+  cadena DATA → SIGNAL → SIZING → ORDER → EXECUTION (por defecto, la
+  creación; el DataProvider lo lleva al cierre de la barra en el broker)
+
+Mismos nombres de clase y de campos que los modelos pydantic, que se
+conservan para validar en la frontera del sistema (validate_event) y en
+el modo estricto opcional para tests (set_strict_mode o la variable de
+entorno LIA_STRICT_EVENTS=1).
+"""
+
+import os
+import time
+from dataclasses import dataclass, field, fields
+from datetime import datetime
+from typing import Any, ClassVar, Dict
+from core.data.bar import Bar
+from core.events import events as models
+from core.events.events import EventType, SignalType, OrderType
+
+
+# ============================================================================
+# MODO ESTRICTO
+# ============================================================================
+
+_STRICT_MODE = os.getenv("LIA_STRICT_EVENTS", "0") == "1"
+
+# Campos de medición de latencia (no forman parte de los modelos pydantic)
+TIMING_FIELDS = ('origin_ns', 'created_ns')
+
+
+def set_strict_mode(enabled: bool) -> None:
+    """
+    Activa o desactiva la validación pydantic en cada construcción.
+    
+    Args:
+        enabled: True para validar todos los eventos (tests)
+    """
+    global _STRICT_MODE
+    _STRICT_MODE = enabled
+
+
+def is_strict_mode() -> bool:
+    """Retorna True si el modo estricto está activo."""
+    return _STRICT_MODE
+
+
+def validate_event(event: Any) -> None:
+    """
+    Valida un evento rápido contra su modelo pydantic equivalente.
+    
+    Args:
+        event: Instancia de un evento de este módulo
+        
+    Raises:
+        pydantic.ValidationError: Si algún campo no es válido
+        TypeError: Si el objeto no es un evento conocido
+    """
+    model = _MODELS.get(type(event))
+    
+    if model is None:
+        raise TypeError(f"Evento no soportado: {type(event).__name__}")
+    
+    values: Dict[str, Any] = {
+        f.name: getattr(event, f.name) for f in fields(event)
+        if f.name not in TIMING_FIELDS
+    }
+    model.model_validate(values, strict=True)
+
+
+class _FastEvent:
+    """
+    Base común: marca la creación del evento (y su origen, si no se
+    heredó) y valida solo si el modo estricto está activo.
+    """
+    __slots__ = ()
+    
+    def __post_init__(self) -> None:
+        self.created_ns = time.perf_counter_ns()
+        if not self.origin_ns:
+            self.origin_ns = self.created_ns
+        
+        if _STRICT_MODE:
+            validate_event(self)
+
+
+# ============================================================================
+# DATA EVENT
+# ============================================================================
+
+@dataclass(slots=True)
+class DataEvent(_FastEvent):
+    """
+    Evento generado cuando hay nuevos datos de mercado disponibles.
+    
+    Atributos:
+        symbol: Símbolo del instrumento financiero
+        data: Registro Bar con OHLCV de la barra cerrada
+        timeframe: Timeframe de la barra (ej: '1min', '1h')
+    """
+    event_type: ClassVar[EventType] = EventType.DATA
+    symbol: str
+    data: Bar
+    timeframe: str = ""
+    origin_ns: int = field(default=0, repr=False, compare=False)
+    created_ns: int = field(default=0, init=False, repr=False, compare=False)
+
+
+# ============================================================================
+# SIGNAL EVENT
+# ============================================================================
+
+@dataclass(slots=True)
+class SignalEvent(_FastEvent):
+    """
+    Evento generado cuando se identifica una oportunidad de trading.
+    """
+    event_type: ClassVar[EventType] = EventType.SIGNAL
+    symbol: str
+    signal: SignalType
+    target_order: OrderType
+    target_price: float
+    magic_number: int
+    sl: float = 0.0
+    tp: float = 0.0
+    origin_ns: int = field(default=0, repr=False, compare=False)
+    created_ns: int = field(default=0, init=False, repr=False, compare=False)
+
+
+# ============================================================================
+# SIZING EVENT
+# ============================================================================
+
+@dataclass(slots=True)
+class SizingEvent(_FastEvent):
+    """
+    Evento con los datos del SignalEvent más el volumen calculado.
+    """
+    event_type: ClassVar[EventType] = EventType.SIZING
+    symbol: str
+    signal: SignalType
+    target_order: OrderType
+    target_price: float
+    magic_number: int
+    sl: float = 0.0
+    tp: float = 0.0
+    volume: float = 0.0
+    origin_ns: int = field(default=0, repr=False, compare=False)
+    created_ns: int = field(default=0, init=False, repr=False, compare=False)
+    
+    @classmethod
+    def from_signal(cls, event: SignalEvent, volume: float) -> "SizingEvent":
+        """Crea el SizingEvent de una señal con el volumen calculado."""
+        return cls(
+            event.symbol, event.signal, event.target_order, event.target_price,
+            event.magic_number, event.sl, event.tp, volume,
+            origin_ns=event.origin_ns
+        )
+
+
+# ============================================================================
+# ORDER EVENT
+# ============================================================================
+
+@dataclass(slots=True)
+class OrderEvent(_FastEvent):
+    """
+    Orden aprobada por el risk manager, lista para ser ejecutada.
+    """
+    event_type: ClassVar[EventType] = EventType.ORDER
+    symbol: str
+    signal: SignalType
+    target_order: OrderType
+    target_price: float
+    magic_number: int
+    sl: float = 0.0
+    tp: float = 0.0
+    volume: float = 0.0
+    origin_ns: int = field(default=0, repr=False, compare=False)
+    created_ns: int = field(default=0, init=False, repr=False, compare=False)
+    
+    @classmethod
+    def from_sizing(cls, event: SizingEvent, volume: float = None) -> "OrderEvent":
+        """Crea la orden de un SizingEvent (volumen opcionalmente ajustado)."""
+        return cls(
+            event.symbol, event.signal, event.target_order, event.target_price,
+            event.magic_number, event.sl, event.tp,
+            event.volume if volume is None else volume,
+            origin_ns=event.origin_ns
+        )
+
+
+# ============================================================================
+# EXECUTION EVENT
+# ============================================================================
+
+@dataclass(slots=True)
+class ExecutionEvent(_FastEvent):
+    """
+    Evento generado cuando una orden ha sido ejecutada exitosamente.
+    
+    position_id/is_exit identifican la posición afectada y si el deal
+    la abre (entrada) o la reduce/cierra (salida).
+    """
+    event_type: ClassVar[EventType] = EventType.EXECUTION
+    symbol: str
+    signal: SignalType
+    fill_price: float
+    fill_time: datetime
+    volume: float
+    magic_number: int = 0
+    position_id: int = 0
+    is_exit: bool = False
+    origin_ns: int = field(default=0, repr=False, compare=False)
+    created_ns: int = field(default=0, init=False, repr=False, compare=False)
+
+
+# ============================================================================
+# PENDING ORDER EVENT
+# ============================================================================
+
+@dataclass(slots=True)
+class PlacedPendingOrderEvent(_FastEvent):
+    """
+    Evento generado cuando una orden pending ha sido colocada exitosamente.
+    """
+    event_type: ClassVar[EventType] = EventType.PENDING
+    symbol: str
+    signal: SignalType
+    target_order: OrderType
+    target_price: float
+    magic_number: int
+    sl: float = 0.0
+    tp: float = 0.0
+    volume: float = 0.0
+    origin_ns: int = field(default=0, repr=False, compare=False)
+    created_ns: int = field(default=0, init=False, repr=False, compare=False)
+    
+    @classmethod
+    def from_order(cls, event: OrderEvent) -> "PlacedPendingOrderEvent":
+        """Crea el evento de pending colocada a partir de la orden."""
+        return cls(
+            event.symbol, event.signal, event.target_order, event.target_price,
+            event.magic_number, event.sl, event.tp, event.volume,
+            origin_ns=event.origin_ns
+        )
+
+
+# Modelo pydantic equivalente de cada evento rápido
+_MODELS = {
+    DataEvent: models.DataEvent,
+    SignalEvent: models.SignalEvent,
+    SizingEvent: models.SizingEvent,
+    OrderEvent: models.OrderEvent,
+    ExecutionEvent: models.ExecutionEvent,
+    PlacedPendingOrderEvent: models.PlacedPendingOrderEvent,
+}
@@ -0,0 +1,227 @@
+"""
+LIA Engineering Solutions - Trading Framework
+Indicator Engine - Evaluación Vectorizada Multi-Símbolo
+
+Mantiene los cierres de todo el universo de símbolos en una única matriz
+de NumPy (símbolos × barras) y el estado de los indicadores como vectores
+de longitud N_símbolos.
+
+Cuando varios símbolos cierran barra en el mismo timestamp, update()
+actualiza todos los indicadores de esos símbolos en una sola llamada
+vectorizada, en lugar de un cálculo independiente por símbolo.
+
+Indicadores soportados:
+- RSI de Wilder (ver core/indicators/rsi.py)
+"""
+
+import numpy as np
+from typing import Dict, List
+from core.indicators.rsi import rsi_from_averages, wilder_averages, wilder_rsi
+
+
+class UniverseIndicatorEngine:
+    """
+    Estado de indicadores para un universo fijo de símbolos.
+    """
+    
+    def __init__(self, symbols: List[str], rsi_period: int, capacity: int = 500):
+        """
+        Inicializa el motor de indicadores.
+        
+        Args:
+            symbols: Universo de símbolos (el orden define la fila de cada uno)
+            rsi_period: Período del RSI
+            capacity: Cierres retenidos por símbolo
+            
+        Raises:
+            ValueError: Si la capacidad no alcanza para el período del RSI
+        """
+        if capacity < rsi_period + 1:
+            raise ValueError("capacity debe ser >= rsi_period + 1")
+        
+        self.symbols = list(symbols)
+        self.symbol_index: Dict[str, int] = {
+            symbol: row for row, symbol in enumerate(self.symbols)
+        }
+        self.rsi_period = rsi_period
+        self.capacity = capacity
+        
+        n_symbols = len(self.symbols)
+        
+        # Matriz de cierres (buffer circular por fila, escritura doble)
+        self.closes = np.full((n_symbols, 2 * capacity), np.nan)
+        self._head = np.full(n_symbols, -1, dtype=np.int64)
+        self._size = np.zeros(n_symbols, dtype=np.int64)
+        self.last_time = np.full(n_symbols, -1, dtype=np.int64)
+        
+        # Estado del RSI por símbolo
+        self.last_close = np.full(n_symbols, np.nan)
+        self.avg_gain = np.full(n_symbols, np.nan)
+        self.avg_loss = np.full(n_symbols, np.nan)
+        self.rsi = np.full(n_symbols, np.nan)
+    
+    
+    # ========================================================================
+    # HISTÓRICO
+    # ========================================================================
+    
+    def load_history(self, symbol: str, times: np.ndarray, closes: np.ndarray) -> None:
+        """
+        Reemplaza el histórico de un símbolo y recalcula sus indicadores.
+        
+        Args:
+            symbol: Símbolo a cargar
+            times: Epoch de cada barra (ordenado, más antiguo primero)
+            closes: Cierres correspondientes
+        """
+        row = self.symbol_index[symbol]
+        cap = self.capacity
+        
+        closes = np.asarray(closes, dtype=np.float64)[-cap:]
+        times = np.asarray(times, dtype=np.int64)[-cap:]
+        n = len(closes)
+        
+        self.closes[row] = np.nan
+        self.closes[row, :n] = closes
+        self.closes[row, cap:cap + n] = closes
+        self._head[row] = n - 1
+        self._size[row] = n
+        self.last_time[row] = times[-1] if n else -1
+        self.last_close[row] = closes[-1] if n else np.nan
+        
+        self._warm_up_row(row)
+    
+    
+    def row_view(self, symbol: str, num_bars: int = None) -> np.ndarray:
+        """
+        Retorna una vista zero-copy de los últimos cierres de un símbolo.
+        
+        Args:
+            symbol: Símbolo a consultar
+            num_bars: Cantidad de cierres (None = todos los disponibles)
+            
+        Returns:
+            Array 1D de cierres (más antiguo primero)
+        """
+        return self._row_view(self.symbol_index[symbol], num_bars)
+    
+    
+    def _row_view(self, row: int, num_bars: int = None) -> np.ndarray:
+        size = int(self._size[row])
+        n = size if num_bars is None else max(0, min(num_bars, size))
+        end = int(self._head[row]) + self.capacity + 1
+        return self.closes[row, end - n:end]
+    
+    
+    def _warm_up_row(self, row: int) -> None:
+        """
+        Inicializa el estado del RSI de una fila desde sus cierres en memoria.
+        """
+        closes = self._row_view(row)
+        
+        self.avg_gain[row] = np.nan
+        self.avg_loss[row] = np.nan
+        self.rsi[row] = np.nan
+        
+        if len(closes) < self.rsi_period + 1:
+            return
+        
+        avg_gain, avg_loss = wilder_averages(closes, self.rsi_period)
+        self.avg_gain[row] = avg_gain[-1]
+        self.avg_loss[row] = avg_loss[-1]
+        self.rsi[row] = rsi_from_averages(avg_gain[-1], avg_loss[-1])
+    
+    
+    # ========================================================================
+    # ACTUALIZACIÓN VECTORIZADA
+    # ========================================================================
+    
+    def update(self, rows: np.ndarray, times: np.ndarray, closes: np.ndarray) -> np.ndarray:
+        """
+        Incorpora una barra nueva para cada fila indicada, en una sola pasada.
+        
+        Args:
+            rows: Índices de fila (ver symbol_index), sin repetidos
+            times: Epoch de la barra de cada fila
+            closes: Cierre de la barra de cada fila
+            
+        Returns:
+            RSI actualizado de cada fila (NaN si aún no hay datos suficientes)
+        """
+        rows = np.asarray(rows, dtype=np.intp)
+        closes = np.asarray(closes, dtype=np.float64)
+        cap = self.capacity
+        period = self.rsi_period
+        
+        # 1. Escribir cierres en la matriz
+        head = self._head[rows] + 1
+        head[head == cap] = 0
+        self.closes[rows, head] = closes
+        self.closes[rows, head + cap] = closes
+        self._head[rows] = head
+        self._size[rows] = np.minimum(self._size[rows] + 1, cap)
+        self.last_time[rows] = times
+        
+        # 2. Suavizado de Wilder (filas sin estado quedan en NaN)
+        delta = closes - self.last_close[rows]
+        gain = np.maximum(delta, 0.0)
+        loss = np.maximum(-delta, 0.0)
+        
+        self.avg_gain[rows] = (self.avg_gain[rows] * (period - 1) + gain) / period
+        self.avg_loss[rows] = (self.avg_loss[rows] * (period - 1) + loss) / period
+        self.last_close[rows] = closes
+        self.rsi[rows] = rsi_from_averages(self.avg_gain[rows], self.avg_loss[rows])
+        
+        # 3. Filas que recién alcanzan datos suficientes: warm-up puntual
+        for row in rows[np.isnan(self.avg_gain[rows])]:
+            if self._size[row] >= period + 1:
+                self._warm_up_row(row)
+        
+        return self.rsi[rows]
+    
+    
+    def get_rsi(self, symbol: str) -> float:
+        """
+        Retorna el último RSI calculado de un símbolo.
+        
+        Args:
+            symbol: Símbolo a consultar
+            
+        Returns:
+            RSI (NaN si no hay datos suficientes)
+        """
+        return float(self.rsi[self.symbol_index[symbol]])
+    
+    
+    def rsi_matrix(self, num_bars: int) -> np.ndarray:
+        """
+        Calcula la serie de RSI de todo el universo en un único cálculo
+        vectorizado sobre las últimas `num_bars` barras de cada símbolo.
+        
+        Las filas con menos de `num_bars` cierres (símbolos en warm-up)
+        calculan el RSI sobre los cierres disponibles, alineados a la
+        derecha: las columnas sin cierre quedan en NaN.
+        
+        Args:
+            num_bars: Cantidad de barras por símbolo
+            
+        Returns:
+            Matriz símbolos × num_bars de RSI
+        """
+        num_bars = min(num_bars, self.capacity)
+        
+        end = self._head + self.capacity + 1
+        columns = end[:, None] - num_bars + np.arange(num_bars)[None, :]
+        window = np.take_along_axis(self.closes, columns, axis=1)
+        
+        result = np.full(window.shape, np.nan)
+        
+        # Un cálculo por longitud disponible (todas las filas completas juntas)
+        available = np.minimum(self._size, num_bars)
+        for length in np.unique(available[available > self.rsi_period]).tolist():
+            rows = available == length
+            result[rows, num_bars - length:] = wilder_rsi(
+                window[rows, num_bars - length:], self.rsi_period
+            )
+        
+        return result
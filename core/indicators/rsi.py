@@ -0,0 +1,105 @@
+"""
+LIA Engineering Solutions - Trading Framework
+RSI - Relative Strength Index (suavizado de Wilder)
+
+Cálculo vectorizado de la serie completa (backfill y warm-up). La
+actualización incremental por barra la hace UniverseIndicatorEngine
+para todo el universo de símbolos a la vez.
+
+Definición (Wilder, 1978):
+- avg_gain/avg_loss iniciales = media simple de los primeros `period` cambios
+- avg_t = (avg_{t-1} * (period - 1) + x_t) / period
+- RSI = 100 - 100 / (1 + avg_gain / avg_loss)
+"""
+
+import numpy as np
+import pandas as pd
+from typing import Tuple
+
+
+def rsi_from_averages(avg_gain, avg_loss):
+    """
+    Calcula el RSI a partir de las medias de ganancias y pérdidas.
+    Acepta escalares o arrays de NumPy.
+    
+    Casos borde:
+    - avg_loss == 0 y avg_gain > 0 → 100
+    - avg_loss == 0 y avg_gain == 0 (precio plano) → 50 (neutro)
+    
+    Args:
+        avg_gain: Media suavizada de ganancias
+        avg_loss: Media suavizada de pérdidas
+        
+    Returns:
+        RSI (0-100) con la misma forma que las entradas
+    """
+    avg_gain = np.asarray(avg_gain, dtype=np.float64)
+    avg_loss = np.asarray(avg_loss, dtype=np.float64)
+    
+    with np.errstate(divide='ignore', invalid='ignore'):
+        rsi = 100.0 - 100.0 / (1.0 + avg_gain / avg_loss)
+    
+    rsi = np.where(avg_loss == 0.0, np.where(avg_gain == 0.0, 50.0, 100.0), rsi)
+    
+    return rsi if rsi.ndim else float(rsi)
+
+
+def wilder_averages(closes: np.ndarray, period: int) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Calcula las series de avg_gain/avg_loss de Wilder de forma vectorizada.
+    
+    Acepta una serie (1D) o un bloque de series alineadas (2D, una fila
+    por símbolo). La recursión se resuelve con ewm(adjust=False) de pandas,
+    que es exactamente el suavizado de Wilder con alpha = 1 / period.
+    
+    Args:
+        closes: Precios de cierre (1D) o matriz símbolos × barras (2D)
+        period: Período del RSI
+        
+    Returns:
+        Tupla (avg_gain, avg_loss) con la forma de `closes`.
+        Las primeras `period` posiciones son NaN.
+    """
+    closes = np.asarray(closes, dtype=np.float64)
+    matrix = np.atleast_2d(closes)
+    n_bars = matrix.shape[1]
+    
+    avg_gain = np.full(matrix.shape, np.nan)
+    avg_loss = np.full(matrix.shape, np.nan)
+    
+    if n_bars < period + 1:
+        return (avg_gain, avg_loss) if closes.ndim == 2 else (avg_gain[0], avg_loss[0])
+    
+    delta = np.diff(matrix, axis=1)
+    gains = np.maximum(delta, 0.0)
+    losses = np.maximum(-delta, 0.0)
+    
+    # Semilla: media simple de los primeros `period` cambios
+    alpha = 1.0 / period
+    for source, target in ((gains, avg_gain), (losses, avg_loss)):
+        seeded = source[:, period - 1:].copy()
+        seeded[:, 0] = source[:, :period].mean(axis=1)
+        
+        smoothed = pd.DataFrame(seeded.T).ewm(alpha=alpha, adjust=False).mean()
+        target[:, period:] = smoothed.to_numpy().T
+    
+    if closes.ndim == 2:
+        return avg_gain, avg_loss
+    return avg_gain[0], avg_loss[0]
+
+
+def wilder_rsi(closes: np.ndarray, period: int) -> np.ndarray:
+    """
+    Calcula la serie completa de RSI de Wilder (camino batch / backfill).
+    
+    Args:
+        closes: Precios de cierre (1D) o matriz símbolos × barras (2D)
+        period: Período del RSI
+        
+    Returns:
+        Array de RSI con la forma de `closes` (NaN durante el warm-up)
+    """
+    avg_gain, avg_loss = wilder_averages(closes, period)
+    rsi = rsi_from_averages(avg_gain, avg_loss)
+    
+    return np.where(np.isnan(avg_gain), np.nan, rsi)
@@ -0,0 +1,355 @@
+"""
+LIA Engineering Solutions - Trading Framework
+Latency - Histogramas de Latencia del Pipeline
+
+Histogramas de buckets fijos estilo HDR (log-lineales) para medir en
+producción, sin asignaciones por muestra:
+
+- Cada potencia de 2 se divide en 32 buckets lineales: error relativo
+  máximo ~3% en cualquier rango (ns a minutos)
+- Registrar una muestra es un cálculo de índice y un incremento
+- Los percentiles se calculan al consultar, nunca al registrar
+
+LatencyMonitor agrupa los histogramas por nombre ('<etapa>.<medida>'),
+se consulta en runtime con snapshot() y vuelca periódicamente a logs/
+(una línea JSON por volcado, con los buckets no vacíos para poder
+combinar volcados fuera de línea).
+"""
+
+import json
+import os
+import threading
+import time
+from datetime import datetime, timezone
+from typing import Callable, Dict, List, Optional
+from core.utils.logger import get_logger
+
+
+LOG = get_logger("latency")
+
+
+# Buckets lineales por potencia de 2 (2^SUB_BUCKET_BITS)
+SUB_BUCKET_BITS = 5
+SUB_BUCKET_COUNT = 1 << SUB_BUCKET_BITS
+
+# Máximo valor representable: 2^MAX_VALUE_BITS ns (~73 minutos)
+MAX_VALUE_BITS = 42
+
+# Percentiles del resumen
+SUMMARY_PERCENTILES = (50.0, 90.0, 99.0, 99.9)
+
+
+class LatencyHistogram:
+    """
+    Histograma de latencias en nanosegundos con buckets fijos.
+    """
+    
+    __slots__ = ('counts', 'count', 'total', 'min', 'max', '_max_index')
+    
+    def __init__(self):
+        self._max_index = self._index((1 << MAX_VALUE_BITS) - 1)
+        self.counts: List[int] = [0] * (self._max_index + 1)
+        self.count = 0
+        self.total = 0
+        self.min = 0
+        self.max = 0
+    
+    
+    @staticmethod
+    def _index(value: int) -> int:
+        """
+        Índice del bucket de un valor: valores < 64 exactos; luego 32
+        buckets por potencia de 2.
+        """
+        shift = value.bit_length() - SUB_BUCKET_BITS - 1
+        if shift <= 0:
+            return value
+        return (shift << SUB_BUCKET_BITS) + (value >> shift)
+    
+    
+    @staticmethod
+    def bucket_bounds(index: int) -> tuple:
+        """
+        Rango de valores [inferior, superior) de un bucket.
+        
+        Args:
+            index: Índice del bucket
+        
+        Returns:
+            Tupla (inferior, superior) en nanosegundos
+        """
+        shift = max(0, (index >> SUB_BUCKET_BITS) - 1)
+        mantissa = index - (shift << SUB_BUCKET_BITS)
+        return mantissa << shift, (mantissa + 1) << shift
+    
+    
+    def record(self, value_ns: int) -> None:
+        """
+        Registra una muestra (valores negativos cuentan como 0; los que
+        exceden el rango, en el último bucket).
+        
+        Args:
+            value_ns: Latencia en nanosegundos
+        """
+        if value_ns < 0:
+            value_ns = 0
+        
+        index = self._index(value_ns)
+        if index > self._max_index:
+            index = self._max_index
+        
+        self.counts[index] += 1
+        
+        if self.count == 0 or value_ns < self.min:
+            self.min = value_ns
+        if value_ns > self.max:
+            self.max = value_ns
+        
+        self.count += 1
+        self.total += value_ns
+    
+    
+    def percentile(self, q: float) -> int:
+        """
+        Valor del percentil q (punto medio del bucket que lo contiene,
+        acotado por el mínimo y el máximo observados).
+        
+        Args:
+            q: Percentil entre 0 y 100
+        
+        Returns:
+            Latencia en nanosegundos (0 sin muestras)
+        """
+        if self.count == 0:
+            return 0
+        
+        target = max(1, -(-self.count * q // 100))
+        seen = 0
+        
+        for index, bucket_count in enumerate(self.counts):
+            seen += bucket_count
+            if seen >= target:
+                lower, upper = self.bucket_bounds(index)
+                return int(min(max((lower + upper - 1) // 2, self.min), self.max))
+        
+        return self.max
+    
+    
+    def merge(self, other: "LatencyHistogram") -> None:
+        """Acumula las muestras de otro histograma."""
+        if other.count == 0:
+            return
+        
+        for index, bucket_count in enumerate(other.counts):
+            if bucket_count:
+                self.counts[index] += bucket_count
+        
+        self.min = other.min if self.count == 0 else min(self.min, other.min)
+        self.max = max(self.max, other.max)
+        self.count += other.count
+        self.total += other.total
+    
+    
+    def reset(self) -> None:
+        """Descarta todas las muestras."""
+        self.counts = [0] * (self._max_index + 1)
+        self.count = 0
+        self.total = 0
+        self.min = 0
+        self.max = 0
+    
+    
+    def summary(self) -> Dict[str, float]:
+        """
+        Returns:
+            count, mean, min, max y percentiles (p50, p90, p99, p99.9),
+            en microsegundos
+        """
+        stats = {
+            'count': self.count,
+            'mean_us': self.total / self.count / 1e3 if self.count else 0.0,
+            'min_us': self.min / 1e3,
+            'max_us': self.max / 1e3,
+        }
+        for q in SUMMARY_PERCENTILES:
+            stats[f"p{q:g}_us"] = self.percentile(q) / 1e3
+        return stats
+    
+    
+    def to_dict(self) -> Dict:
+        """Resumen más los buckets no vacíos ({índice: muestras})."""
+        data = self.summary()
+        data['buckets'] = {
+            index: bucket_count
+            for index, bucket_count in enumerate(self.counts) if bucket_count
+        }
+        return data
+
+
+class LatencyMonitor:
+    """
+    Histogramas de latencia por nombre, con volcado periódico a disco.
+    """
+    
+    def __init__(
+        self,
+        log_dir: Optional[str] = "logs",
+        dump_interval_s: float = 60.0,
+        clock: Callable[[], float] = time.monotonic
+    ):
+        """
+        Inicializa el monitor.
+        
+        Args:
+            log_dir: Directorio de los volcados (None = sin volcado)
+            dump_interval_s: Intervalo mínimo entre volcados (0 = sin volcado)
+            clock: Fuente de tiempo para el intervalo de volcado
+        """
+        self.log_dir = log_dir
+        self.dump_interval_s = dump_interval_s
+        self.clock = clock
+        
+        self._histograms: Dict[str, LatencyHistogram] = {}
+        self._dispatch_histograms: Dict[str, tuple] = {}
+        self._lock = threading.Lock()
+        self._last_dump = clock()
+    
+    
+    # ========================================================================
+    # REGISTRO
+    # ========================================================================
+    
+    def histogram(self, name: str) -> LatencyHistogram:
+        """
+        Histograma de un nombre (se crea en el primer uso).
+        
+        Args:
+            name: Nombre '<etapa>.<medida>' (ej: 'SIGNAL.handler')
+        
+        Returns:
+            LatencyHistogram
+        """
+        histogram = self._histograms.get(name)
+        if histogram is None:
+            with self._lock:
+                histogram = self._histograms.setdefault(name, LatencyHistogram())
+        return histogram
+    
+    
+    def record(self, name: str, value_ns: int) -> None:
+        """
+        Registra una latencia.
+        
+        Args:
+            name: Nombre del histograma
+            value_ns: Latencia en nanosegundos
+        """
+        self.histogram(name).record(value_ns)
+    
+    
+    def record_dispatch(self, event, started_ns: int, finished_ns: int) -> None:
+        """
+        Registra el paso de un evento por su handler:
+        - <tipo>.queue: desde la creación del evento hasta su despacho
+        - <tipo>.handler: duración del handler
+        - <tipo>.since_origin: desde el origen de la cadena (cierre de la
+          barra en el broker) hasta el fin del handler
+        
+        Args:
+            event: Evento despachado (con created_ns y origin_ns)
+            started_ns: perf_counter_ns() al iniciar el handler
+            finished_ns: perf_counter_ns() al terminar el handler
+        """
+        histograms = self._dispatch_histograms.get(event.event_type)
+        if histograms is None:
+            stage = getattr(event.event_type, 'value', event.event_type)
+            histograms = self._dispatch_histograms[stage] = (
+                self.histogram(f"{stage}.queue"),
+                self.histogram(f"{stage}.handler"),
+                self.histogram(f"{stage}.since_origin")
+            )
+        
+        queue, handler, since_origin = histograms
+        created_ns = getattr(event, 'created_ns', 0)
+        origin_ns = getattr(event, 'origin_ns', 0)
+        
+        if created_ns:
+            queue.record(started_ns - created_ns)
+        handler.record(finished_ns - started_ns)
+        if origin_ns:
+            since_origin.record(finished_ns - origin_ns)
+    
+    
+    # ========================================================================
+    # CONSULTA Y VOLCADO
+    # ========================================================================
+    
+    def snapshot(self) -> Dict[str, Dict[str, float]]:
+        """
+        Resumen actual de todos los histogramas.
+        
+        Returns:
+            Diccionario nombre -> summary() (latencias en µs)
+        """
+        with self._lock:
+            histograms = list(self._histograms.items())
+        
+        return {name: histogram.summary() for name, histogram in sorted(histograms)}
+    
+    
+    def reset(self) -> None:
+        """Descarta las muestras de todos los histogramas."""
+        with self._lock:
+            for histogram in self._histograms.values():
+                histogram.reset()
+    
+    
+    def dump(self) -> Optional[str]:
+        """
+        Agrega una línea JSON con todos los histogramas (acumulados desde
+        el inicio) a logs/latency_YYYYMMDD.jsonl.
+        
+        Returns:
+            Ruta del archivo, o None si no hay directorio configurado
+        """
+        self._last_dump = self.clock()
+        if not self.log_dir:
+            return None
+        
+        with self._lock:
+            histograms = list(self._histograms.items())
+        
+        now = datetime.now(timezone.utc)
+        record = {
+            'time': now.isoformat(timespec='seconds'),
+            'histograms': {name: histogram.to_dict() for name, histogram in sorted(histograms)},
+        }
+        
+        path = os.path.join(self.log_dir, f"latency_{now:%Y%m%d}.jsonl")
+        try:
+            os.makedirs(self.log_dir, exist_ok=True)
+            with open(path, "a") as f:
+                f.write(json.dumps(record) + "\n")
+        except OSError as e:
+            LOG.error("ERROR: No se pudo volcar latencias en {path}: {error}", path=path, error=e)
+            return None
+        
+        return path
+    
+    
+    def maybe_dump(self) -> bool:
+        """
+        Vuelca si pasó el intervalo configurado desde la última vez.
+        Pensado para llamarse desde el loop principal en reposo.
+        
+        Returns:
+            True si se ejecutó el volcado
+        """
+        if not self.dump_interval_s or not self.log_dir:
+            return False
+        
+        if self.clock() - self._last_dump < self.dump_interval_s:
+            return False
+        
+        self.dump()
+        return True
@@ -0,0 +1,546 @@
+"""
+LIA Engineering Solutions - Trading Framework
+Logger - Logging Estructurado Asíncrono
+
+Reemplaza print(f"{Utils.dateprint()} - ...") en el camino crítico:
+
+- Niveles (DEBUG, INFO, WARNING, ERROR, CRITICAL) filtrados con una sola
+  comparación antes de crear el registro
+- El hilo que registra solo agrega una tupla (hora, nivel, componente,
+  mensaje, campos) a un ring buffer (deque con maxlen: append atómico,
+  sin locks; si se llena se descartan los registros más viejos)
+- Un hilo escritor vacía el buffer en lotes: formatea (zona horaria y
+  prefijo por segundo cacheados), escribe a consola y a archivos
+  rotativos en logs/ (JSON lines o texto)
+- Los mensajes con campos son plantillas str.format: se renderizan en el
+  hilo escritor, nunca en el que registra
+
+Hasta que se llama start() (el Trading Director lo hace al iniciar el loop)
+los registros se escriben en el acto, por lo que la salida de arranque
+mantiene su orden con los print del punto de entrada.
+
+Uso:
+    LOG = get_logger("signal_generator")
+    LOG.info("📊 SEÑAL GENERADA: {signal} {symbol}", signal=signal, symbol=symbol)
+"""
+
+import atexit
+import json
+import os
+import sys
+import threading
+import time
+from collections import deque
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+from zoneinfo import ZoneInfo
+
+
+DEBUG = 10
+INFO = 20
+WARNING = 30
+ERROR = 40
+CRITICAL = 50
+
+LEVEL_NAMES = {DEBUG: "DEBUG", INFO: "INFO", WARNING: "WARNING", ERROR: "ERROR", CRITICAL: "CRITICAL"}
+LEVELS = {name: level for level, name in LEVEL_NAMES.items()}
+
+# Formatos de archivo soportados
+FILE_FORMATS = ("jsonl", "text")
+
+DEFAULT_TIMEZONE = "America/Argentina/Buenos_Aires"
+
+
+def parse_level(level) -> Optional[int]:
+    """
+    Nivel numérico desde un nombre ('INFO') o número (None = desactivado).
+    
+    Raises:
+        ValueError: Si el nombre no es un nivel válido
+    """
+    if level is None or isinstance(level, int):
+        return level
+    
+    if level.upper() not in LEVELS:
+        raise ValueError(f"Nivel de log '{level}' no válido. Opciones: {', '.join(LEVELS)}")
+    return LEVELS[level.upper()]
+
+
+# ============================================================================
+# FORMATO DE HORA
+# ============================================================================
+
+class TimestampFormatter:
+    """
+    Formatea epochs como 'dd/mm/yyyy HH:MM:SS.mmm' en una zona horaria.
+    
+    La zona se resuelve una vez y el prefijo hasta los segundos se
+    reutiliza mientras no cambie el segundo.
+    """
+    
+    __slots__ = ('tz', '_second', '_prefix', '_lock')
+    
+    def __init__(self, timezone: str = DEFAULT_TIMEZONE):
+        self.tz = ZoneInfo(timezone)
+        self._second = None
+        self._prefix = ""
+        self._lock = threading.Lock()
+    
+    
+    def format(self, epoch: float) -> str:
+        """
+        Args:
+            epoch: Epoch segundos (time.time())
+        
+        Returns:
+            String con formato dd/mm/yyyy HH:MM:SS.mmm
+        """
+        second = int(epoch)
+        millis = int((epoch - second) * 1000)
+        
+        with self._lock:
+            if second != self._second:
+                self._prefix = datetime.fromtimestamp(second, self.tz).strftime("%d/%m/%Y %H:%M:%S")
+                self._second = second
+            prefix = self._prefix
+        
+        return f"{prefix}.{millis:03d}"
+
+
+_FORMATTERS: Dict[str, TimestampFormatter] = {}
+
+
+def get_timestamp_formatter(timezone: str = DEFAULT_TIMEZONE) -> TimestampFormatter:
+    """Formateador compartido por zona horaria."""
+    formatter = _FORMATTERS.get(timezone)
+    if formatter is None:
+        formatter = _FORMATTERS.setdefault(timezone, TimestampFormatter(timezone))
+    return formatter
+
+
+# ============================================================================
+# ARCHIVO ROTATIVO
+# ============================================================================
+
+class RotatingFile:
+    """
+    Archivo de log que rota por tamaño: base → base.1 → ... → base.N.
+    Rota antes de escribir un lote si este no entra (un archivo vacío
+    recibe el lote completo).
+    """
+    
+    def __init__(self, path: str, max_bytes: int, backup_count: int):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.backup_count = backup_count
+        
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self._file = open(path, "a", encoding="utf-8")
+        self._size = self._file.tell()
+    
+    
+    def write(self, text: str) -> None:
+        size = len(text.encode("utf-8"))
+        
+        if self.max_bytes and self._size and self._size + size > self.max_bytes:
+            self._rotate()
+        
+        self._file.write(text)
+        self._size += size
+    
+    
+    def _rotate(self) -> None:
+        self._file.close()
+        
+        for i in range(self.backup_count - 1, 0, -1):
+            source = f"{self.path}.{i}"
+            if os.path.exists(source):
+                os.replace(source, f"{self.path}.{i + 1}")
+        
+        if self.backup_count > 0:
+            os.replace(self.path, f"{self.path}.1")
+        else:
+            os.remove(self.path)
+        
+        self._file = open(self.path, "a", encoding="utf-8")
+        self._size = 0
+    
+    
+    def flush(self) -> None:
+        self._file.flush()
+    
+    
+    def close(self) -> None:
+        self._file.close()
+
+
+# ============================================================================
+# ESCRITOR
+# ============================================================================
+
+# Registro en el buffer: (epoch, nivel, componente, mensaje, campos o None)
+Record = Tuple[float, int, str, str, Optional[dict]]
+
+
+class LogWriter:
+    """
+    Ring buffer de registros y su hilo escritor.
+    """
+    
+    def __init__(
+        self,
+        console_level: Optional[int] = INFO,
+        file_level: Optional[int] = None,
+        log_dir: Optional[str] = None,
+        file_format: str = "jsonl",
+        max_bytes: int = 10 * 1024 * 1024,
+        backup_count: int = 5,
+        capacity: int = 100000,
+        flush_interval_ms: int = 100,
+        timezone: str = DEFAULT_TIMEZONE
+    ):
+        """
+        Inicializa el escritor (modo síncrono hasta start()).
+        
+        Args:
+            console_level: Nivel mínimo en consola (None = sin consola)
+            file_level: Nivel mínimo en archivo (None = sin archivo)
+            log_dir: Directorio de los archivos de log
+            file_format: 'jsonl' (un objeto JSON por línea) o 'text'
+            max_bytes: Tamaño a partir del cual rota el archivo (0 = nunca)
+            backup_count: Archivos rotados que se conservan
+            capacity: Registros retenidos en el ring buffer
+            flush_interval_ms: Intervalo entre vaciados del hilo escritor
+            timezone: Zona horaria de las marcas de tiempo
+        
+        Raises:
+            ValueError: Si el formato no es válido
+        """
+        self._buffer: deque = deque(maxlen=capacity)
+        self._write_lock = threading.RLock()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._file: Optional[RotatingFile] = None
+        
+        self.dropped = 0
+        self.written = 0
+        
+        self.configure(
+            console_level=console_level,
+            file_level=file_level,
+            log_dir=log_dir,
+            file_format=file_format,
+            max_bytes=max_bytes,
+            backup_count=backup_count,
+            capacity=capacity,
+            flush_interval_ms=flush_interval_ms,
+            timezone=timezone
+        )
+    
+    
+    def configure(
+        self,
+        console_level: Optional[int] = INFO,
+        file_level: Optional[int] = None,
+        log_dir: Optional[str] = None,
+        file_format: str = "jsonl",
+        max_bytes: int = 10 * 1024 * 1024,
+        backup_count: int = 5,
+        capacity: int = 100000,
+        flush_interval_ms: int = 100,
+        timezone: str = DEFAULT_TIMEZONE
+    ) -> None:
+        """
+        Reconfigura destinos y niveles (los loggers existentes lo adoptan).
+        Mismos argumentos que el constructor.
+        """
+        if file_format not in FILE_FORMATS:
+            raise ValueError(
+                f"file_format '{file_format}' no válido. Opciones: {', '.join(FILE_FORMATS)}"
+            )
+        
+        with self._write_lock:
+            self._drain()
+            
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+            
+            self.console_level = parse_level(console_level)
+            self.file_level = parse_level(file_level) if log_dir else None
+            self.file_format = file_format
+            self.flush_interval_s = flush_interval_ms / 1000.0
+            self.formatter = get_timestamp_formatter(timezone)
+            
+            if self.file_level is not None:
+                extension = "jsonl" if file_format == "jsonl" else "log"
+                self._file = RotatingFile(
+                    os.path.join(log_dir, f"trading.{extension}"), max_bytes, backup_count
+                )
+            
+            if capacity != self._buffer.maxlen:
+                self._buffer = deque(self._buffer, maxlen=capacity)
+            
+            enabled = [lvl for lvl in (self.console_level, self.file_level) if lvl is not None]
+            self.min_level = min(enabled) if enabled else CRITICAL + 1
+    
+    
+    @property
+    def is_async(self) -> bool:
+        """True si el hilo escritor está activo."""
+        return self._thread is not None
+    
+    
+    # ========================================================================
+    # REGISTRO
+    # ========================================================================
+    
+    def emit(self, level: int, component: str, message: str, fields: Optional[dict]) -> None:
+        """
+        Registra un mensaje (solo lo encola si el hilo escritor está activo).
+        
+        Args:
+            level: Nivel numérico
+            component: Módulo que registra
+            message: Mensaje, o plantilla str.format si hay campos
+            fields: Campos estructurados (None = mensaje literal)
+        """
+        record = (time.time(), level, component, message, fields)
+        
+        if self._thread is None:
+            with self._write_lock:
+                self._write([record])
+            return
+        
+        buffer = self._buffer
+        if len(buffer) >= buffer.maxlen:
+            self.dropped += 1
+        buffer.append(record)
+    
+    
+    # ========================================================================
+    # CICLO DE VIDA
+    # ========================================================================
+    
+    def start(self) -> None:
+        """Pasa a modo asíncrono: arranca el hilo escritor (daemon)."""
+        with self._write_lock:
+            if self._thread is not None:
+                return
+            
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name="LogWriter", daemon=True)
+            self._thread.start()
+    
+    
+    def stop(self, timeout: float = 2.0) -> None:
+        """
+        Detiene el hilo escritor, escribe lo pendiente y vuelve al modo
+        síncrono.
+        """
+        thread = self._thread
+        if thread is not None:
+            self._stop.set()
+            thread.join(timeout)
+            self._thread = None
+        
+        self.flush()
+    
+    
+    def flush(self) -> None:
+        """Escribe todos los registros pendientes en el hilo actual."""
+        with self._write_lock:
+            self._drain()
+            if self._file is not None:
+                self._file.flush()
+    
+    
+    def _run(self) -> None:
+        while not self._stop.wait(self.flush_interval_s):
+            try:
+                with self._write_lock:
+                    self._drain()
+                    if self._file is not None:
+                        self._file.flush()
+            except Exception as e:
+                sys.stderr.write(f"LogWriter: error al escribir logs: {e}\n")
+    
+    
+    # ========================================================================
+    # ESCRITURA (hilo escritor, o el que registra en modo síncrono)
+    # ========================================================================
+    
+    def _drain(self) -> None:
+        buffer = self._buffer
+        records: List[Record] = []
+        
+        while True:
+            try:
+                records.append(buffer.popleft())
+            except IndexError:
+                break
+        
+        if self.dropped:
+            dropped, self.dropped = self.dropped, 0
+            records.insert(0, (
+                time.time(), WARNING, "logger",
+                "⚠️ Buffer de logs lleno: {dropped} registros descartados",
+                {'dropped': dropped}
+            ))
+        
+        if records:
+            self._write(records)
+    
+    
+    def _render(self, message: str, fields: Optional[dict]) -> str:
+        if not fields:
+            return message
+        try:
+            return message.format(**fields)
+        except (KeyError, IndexError, ValueError):
+            return f"{message} {fields}"
+    
+    
+    def _write(self, records: List[Record]) -> None:
+        console: List[str] = []
+        lines: List[str] = []
+        console_level, file_level = self.console_level, self.file_level
+        text_file = self.file_format == "text"
+        
+        for epoch, level, component, message, fields in records:
+            to_console = console_level is not None and level >= console_level
+            to_file = file_level is not None and level >= file_level
+            if not (to_console or to_file):
+                continue
+            
+            timestamp = self.formatter.format(epoch)
+            rendered = self._render(message, fields)
+            
+            if to_console:
+                console.append(f"{timestamp} - {rendered}")
+            
+            if to_file:
+                if text_file:
+                    lines.append(f"{timestamp} {LEVEL_NAMES.get(level, level)} [{component}] {rendered}")
+                else:
+                    entry = {
+                        'ts': round(epoch, 6),
+                        'time': timestamp,
+                        'level': LEVEL_NAMES.get(level, level),
+                        'component': component,
+                        'msg': rendered,
+                    }
+                    if fields:
+                        entry['fields'] = fields
+                    lines.append(json.dumps(entry, ensure_ascii=False, default=str))
+        
+        if console:
+            stream = sys.stdout
+            stream.write("\n".join(console) + "\n")
+            stream.flush()
+        
+        if lines:
+            self._file.write("\n".join(lines) + "\n")
+        
+        self.written += len(console) + len(lines)
+
+
+# ============================================================================
+# LOGGERS
+# ============================================================================
+
+class Logger:
+    """
+    Logger de un componente sobre el escritor compartido.
+    """
+    
+    __slots__ = ('component', 'writer')
+    
+    def __init__(self, component: str, writer: LogWriter):
+        self.component = component
+        self.writer = writer
+    
+    
+    def log(self, level: int, message: str, **fields) -> None:
+        """
+        Registra un mensaje si el nivel está habilitado.
+        
+        Args:
+            level: Nivel numérico
+            message: Mensaje literal, o plantilla str.format si hay campos
+            **fields: Campos estructurados (se renderizan en el escritor)
+        """
+        if level >= self.writer.min_level:
+            self.writer.emit(level, self.component, message, fields or None)
+    
+    
+    def debug(self, message: str, **fields) -> None:
+        if DEBUG >= self.writer.min_level:
+            self.writer.emit(DEBUG, self.component, message, fields or None)
+    
+    
+    def info(self, message: str, **fields) -> None:
+        if INFO >= self.writer.min_level:
+            self.writer.emit(INFO, self.component, message, fields or None)
+    
+    
+    def warning(self, message: str, **fields) -> None:
+        if WARNING >= self.writer.min_level:
+            self.writer.emit(WARNING, self.component, message, fields or None)
+    
+    
+    def error(self, message: str, **fields) -> None:
+        if ERROR >= self.writer.min_level:
+            self.writer.emit(ERROR, self.component, message, fields or None)
+    
+    
+    def critical(self, message: str, **fields) -> None:
+        if CRITICAL >= self.writer.min_level:
+            self.writer.emit(CRITICAL, self.component, message, fields or None)
+
+
+# Escritor compartido por todos los loggers del proceso
+_WRITER = LogWriter()
+atexit.register(_WRITER.stop)
+
+
+def get_logger(component: str) -> Logger:
+    """
+    Logger de un componente (usa el escritor compartido del proceso).
+    
+    Args:
+        component: Nombre del módulo (ej: 'signal_generator')
+    
+    Returns:
+        Logger
+    """
+    return Logger(component, _WRITER)
+
+
+def get_log_writer() -> LogWriter:
+    """Escritor compartido del proceso."""
+    return _WRITER
+
+
+def configure_logging(config) -> LogWriter:
+    """
+    Aplica la configuración de logging de un TradingConfig al escritor
+    compartido.
+    
+    Args:
+        config: TradingConfig
+    
+    Returns:
+        Escritor compartido
+    """
+    _WRITER.configure(
+        console_level=config.log_console_level,
+        file_level=config.log_file_level,
+        log_dir=config.log_dir,
+        file_format=config.log_file_format,
+        max_bytes=config.log_max_bytes,
+        backup_count=config.log_backup_count,
+        capacity=config.log_buffer_capacity,
+        flush_interval_ms=config.log_flush_interval_ms
+    )
+    return _WRITER
@@ -6,8 +6,8 @@ Funciones auxiliares reutilizables en todo el framework.
 """
 
 import MetaTrader5 as mt5
-from datetime import datetime
-from zoneinfo import ZoneInfo
+import time
+from core.utils.logger import get_timestamp_formatter
 from typing import Optional
 
 
@@ -27,86 +27,9 @@ class Utils:
         Returns:
             String con formato: dd/mm/yyyy HH:MM:SS.mmm
         """
-        return datetime.now(ZoneInfo(timezone)).strftime("%d/%m/%Y %H:%M:%S.%f")[:-3]
+        return get_timestamp_formatter(timezone).format(time.time())
     
     
-    @staticmethod
-    def convert_currency_amount_to_another_currency(
-        amount: float, 
-        from_ccy: str, 
-        to_ccy: str
-    ) -> float:
-        """
-        Convierte un monto de una divisa a otra usando tasas de MT5.
-        
-        Args:
-            amount: Monto a convertir
-            from_ccy: Divisa origen
-            to_ccy: Divisa destino
-            
-        Returns:
-            Monto convertido a la divisa destino
-            
-        Raises:
-            Exception: Si el símbolo FX no está disponible
-        """
-        # Si las divisas son iguales, no hay conversión
-        if from_ccy.upper() == to_ccy.upper():
-            return amount
-        
-        # Símbolos FX principales disponibles
-        all_fx_symbols = (
-            "AUDCAD", "AUDCHF", "AUDJPY", "AUDNZD", "AUDUSD", 
-            "CADCHF", "CADJPY", "CHFJPY", 
-            "EURAUD", "EURCAD", "EURCHF", "EURGBP", "EURJPY", "EURNZD", "EURUSD",
-            "GBPAUD", "GBPCAD", "GBPCHF", "GBPJPY", "GBPNZD", "GBPUSD",
-            "NZDCAD", "NZDCHF", "NZDJPY", "NZDUSD",
-            "USDCAD", "USDCHF", "USDJPY", "USDSEK", "USDNOK"
-        )
-        
-        from_ccy = from_ccy.upper()
-        to_ccy = to_ccy.upper()
-        
-        # Buscar símbolo que relacione ambas divisas
-        try:
-            fx_symbol = [
-                symbol for symbol in all_fx_symbols 
-                if from_ccy in symbol and to_ccy in symbol
-            ][0]
-        except IndexError:
-            raise Exception(
-                f"No se encontró símbolo FX para convertir {from_ccy} a {to_ccy}"
-            )
-        
-        # Identificar divisa base del par
-        fx_symbol_base = fx_symbol[:3]
-        
-        # Obtener último precio disponible
-        try:
-            tick = mt5.symbol_info_tick(fx_symbol)
-            if tick is None:
-                raise Exception(
-                    f"Símbolo {fx_symbol} no disponible en MT5. "
-                    "Verifica símbolos disponibles con tu broker."
-                )
-        except Exception as e:
-            print(
-                f"{Utils.dateprint()} - ERROR: No se pudo obtener tick de {fx_symbol}. "
-                f"MT5 error: {mt5.last_error()}, Exception: {e}"
-            )
-            return 0.0
-        
-        last_price = tick.bid
-        
-        # Realizar conversión según configuración del par
-        if fx_symbol_base == to_ccy:
-            converted_amount = amount / last_price
-        else:
-            converted_amount = amount * last_price
-            
-        return converted_amount
-
-
     @staticmethod
     def format_trade_log(
         action: str, 
@@ -0,0 +1,35 @@
+"""
+LIA Engineering Solutions - Trading Framework
+Virtual Clock - Reloj de Simulación
+
+Reloj que se invoca como time.time() pero solo avanza cuando la
+simulación lo mueve. Lo comparten el ReplayDataProvider, el
+SimulatedBroker y los módulos con intervalos de mantenimiento
+(Portfolio, RiskManager, FillReconciler) durante un backtest.
+"""
+
+
+class VirtualClock:
+    """
+    Reloj de la reproducción (epoch segundos, UTC).
+    """
+    
+    __slots__ = ('now',)
+    
+    def __init__(self, start: float = 0.0):
+        self.now = start
+    
+    
+    def __call__(self) -> float:
+        return self.now
+    
+    
+    def advance_to(self, epoch: float) -> None:
+        """
+        Mueve el reloj hacia adelante (nunca retrocede).
+        
+        Args:
+            epoch: Nuevo instante en epoch segundos UTC
+        """
+        if epoch > self.now:
+            self.now = epoch
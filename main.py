@@ -12,18 +12,28 @@ import sys
 # Módulos del framework
 from modules.platform_connector.platform_connector import PlatformConnector
 from modules.data_provider.data_provider import DataProvider
+from modules.data_provider.tick_cache import TickSnapshotCache
 from modules.portfolio.portfolio import Portfolio
 from modules.signal_generator.signal_generator import SignalGenerator
 from modules.position_sizer.position_sizer import PositionSizer
 from modules.risk_manager.risk_manager import RiskManager
+from modules.currency_converter.currency_converter import CurrencyConverter
+from modules.symbol_registry.symbol_registry import SymbolRegistry
 from modules.order_executor.order_executor import OrderExecutor
+from modules.order_executor.fill_reconciler import FillReconciler
 from modules.notifications.notifications import NotificationService
+from modules.scheduler.bar_close_scheduler import BarCloseScheduler
 from modules.trading_director.trading_director import TradingDirector
 
 # Configuración
 from config.trading_config import get_default_config, TradingConfig
 
+# Datos
+from core.data.bar_store import BarStore
+
 # Utilidades
+from core.utils.latency import LatencyMonitor
+from core.utils.logger import configure_logging
 from core.utils.utils import Utils
 
 
@@ -67,10 +77,13 @@ def main():
         print(f"  - Timeframe: {config.timeframe}")
         print(f"  - RSI: Period={config.rsi_period}, "
               f"Upper={config.rsi_upper}, Lower={config.rsi_lower}")
-        print(f"  - SL/TP: {config.sl_points}/{config.tp_points} puntos")
+        print(f"  - SL/TP: {config.sl_points}/{config.tp_points} pips")
         print(f"  - Volumen: {config.fixed_volume} lotes")
         print(f"  - Max Leverage: {config.max_leverage_factor}x\n")
         
+        # Logging asíncrono (consola + archivos rotativos en logs/)
+        configure_logging(config)
+        
         
         # ====================================================================
         # INICIALIZAR COLA DE EVENTOS
@@ -89,21 +102,57 @@ def main():
         # 1. Conectar con plataforma MT5
         platform = PlatformConnector(symbol_list=config.symbols)
         
-        # 2. Proveedor de datos
+        # 2. Proveedor de datos (detecta el desfase del servidor si no se configuró)
         data_provider = DataProvider(
             events_queue=events_queue,
             symbol_list=config.symbols,
-            timeframe=config.timeframe
+            timeframe=config.timeframe,
+            buffer_capacity=config.bar_buffer_capacity,
+            tick_cache=TickSnapshotCache(config.tick_cache_staleness_ms),
+            poll_workers=config.data_poll_workers,
+            feed_mode=config.data_feed_mode,
+            tick_close_grace_ms=config.tick_bar_close_grace_ms,
+            server_offset_seconds=(
+                None if config.server_time_offset_hours is None
+                else int(config.server_time_offset_hours * 3600)
+            ),
+            derived_timeframes=config.derived_timeframes,
+            bar_store=BarStore(config.bar_store_dir) if config.bar_store_dir else None,
+            store_history_bars=config.bar_store_history_bars
+        )
+        
+        # Desfase horario del servidor del broker
+        server_offset_seconds = data_provider.server_offset_seconds
+        
+        # Especificaciones de símbolos compartidas por todos los módulos
+        symbol_registry = SymbolRegistry(
+            symbols=config.symbols,
+            refresh_interval_s=config.symbol_registry_refresh_s
         )
         
         # 3. Portfolio
-        portfolio = Portfolio(magic_number=config.magic_number)
+        portfolio = Portfolio(
+            magic_number=config.magic_number,
+            reconcile_interval_s=config.portfolio_reconcile_interval_s
+        )
         print(f"{Utils.dateprint()} - ✓ Portfolio inicializado (Magic: {config.magic_number})")
         
         # 4. Order Executor
+        fill_reconciler = FillReconciler(
+            events_queue=events_queue,
+            poll_interval_ms=config.fill_poll_interval_ms,
+            timeout_s=config.fill_confirmation_timeout_s,
+            server_offset_seconds=server_offset_seconds
+        )
         order_executor = OrderExecutor(
             events_queue=events_queue,
-            portfolio=portfolio
+            portfolio=portfolio,
+            fill_reconciler=fill_reconciler,
+            symbol_registry=symbol_registry,
+            latency_monitor=LatencyMonitor(
+                log_dir=config.latency_log_dir,
+                dump_interval_s=config.latency_dump_interval_s
+            )
         )
         
         # 5. Signal Generator
@@ -118,13 +167,15 @@ def main():
             rsi_upper=config.rsi_upper,
             rsi_lower=config.rsi_lower,
             sl_points=config.sl_points,
-            tp_points=config.tp_points
+            tp_points=config.tp_points,
+            symbol_registry=symbol_registry
         )
         
         # 6. Position Sizer
         position_sizer = PositionSizer(
             events_queue=events_queue,
-            fixed_volume=config.fixed_volume
+            fixed_volume=config.fixed_volume,
+            symbol_registry=symbol_registry
         )
         
         # 7. Risk Manager
@@ -132,14 +183,35 @@ def main():
             events_queue=events_queue,
             data_provider=data_provider,
             portfolio=portfolio,
-            max_leverage_factor=config.max_leverage_factor
+            max_leverage_factor=config.max_leverage_factor,
+            mark_interval_ms=config.exposure_mark_interval_ms,
+            currency_converter=CurrencyConverter(
+                tick_cache=data_provider.TICK_CACHE
+            ),
+            symbol_registry=symbol_registry
         )
         
         # 8. Notification Service
         notifications = NotificationService(
             telegram_enabled=config.telegram_enabled,
             telegram_token=config.telegram_token,
-            telegram_chat_id=config.telegram_chat_id
+            telegram_chat_id=config.telegram_chat_id,
+            file_path=config.notification_file_path,
+            http_url=config.notification_http_url,
+            queue_capacity=config.notification_queue_capacity,
+            digest_window_s=config.notification_digest_window_s,
+            rate_limit_per_min=config.notification_rate_limit_per_min
+        )
+        
+        
+        # 9. Planificador de consultas por cierre de barra
+        scheduler = BarCloseScheduler(
+            timeframe=config.timeframe,
+            expected_symbols=len(config.symbols),
+            server_offset_seconds=server_offset_seconds,
+            lead_time_ms=config.scheduler_lead_ms,
+            poll_interval_ms=config.scheduler_poll_interval_ms,
+            poll_window_ms=config.scheduler_poll_window_ms
         )
         
         
@@ -154,7 +226,10 @@ def main():
             position_sizer=position_sizer,
             risk_manager=risk_manager,
             order_executor=order_executor,
-            notification_service=notifications
+            notification_service=notifications,
+            scheduler=scheduler,
+            dispatch_mode=config.dispatch_mode,
+            portfolio=portfolio
         )
         
         # Ejecutar loop principal
@@ -0,0 +1,200 @@
+"""
+LIA Engineering Solutions - Trading Framework
+Currency Converter - Conversión de Divisas
+
+Responsabilidades:
+- Construir el grafo de divisas a partir de los símbolos FX del broker
+- Mantener una matriz de tasas refrescada en una sola pasada por ciclo
+- Triangular vía divisas puente (USD/EUR) cuando no hay par directo
+- Convertir montos en O(1) desde la matriz cacheada
+
+Si no existe camino entre dos divisas se lanza ValueError en lugar de
+devolver 0.0, para no subestimar exposición.
+"""
+
+import MetaTrader5 as mt5
+import numpy as np
+from typing import Dict, Iterable, List, Optional, Tuple
+from core.utils.logger import get_logger
+from modules.data_provider.tick_cache import TickSnapshotCache
+
+
+LOG = get_logger("currency_converter")
+
+
+class CurrencyConverter:
+    """
+    Convierte montos entre divisas usando una matriz de tasas cacheada.
+    """
+    
+    def __init__(
+        self,
+        hub_currencies: Tuple[str, ...] = ("USD", "EUR"),
+        tick_cache: Optional[TickSnapshotCache] = None
+    ):
+        """
+        Inicializa el conversor y descubre los pares FX del broker.
+        
+        Args:
+            hub_currencies: Divisas puente para triangular conversiones
+            tick_cache: Snapshot de ticks compartido con el DataProvider
+        """
+        self.hub_currencies = tuple(ccy.upper() for ccy in hub_currencies)
+        self.TICK_CACHE = tick_cache or TickSnapshotCache()
+        
+        # Pares FX disponibles: (base, profit) -> símbolo
+        self._available_pairs: Dict[Tuple[str, str], str] = {}
+        self._discover_pairs()
+        
+        # Divisas de interés e índice en la matriz
+        self.currencies: List[str] = []
+        self._index: Dict[str, int] = {}
+        
+        # Pares a refrescar: (símbolo, índice base, índice profit)
+        self._pairs: List[Tuple[str, int, int]] = []
+        self._direct_rates = np.empty((0, 0))
+        self.rates = np.empty((0, 0))
+        
+        self.add_currencies(self.hub_currencies)
+    
+    
+    def _discover_pairs(self) -> None:
+        """
+        Lee los símbolos del broker y registra los pares FX disponibles.
+        Ante variantes del mismo par (ej: sufijos) se usa el nombre más corto.
+        """
+        symbols = mt5.symbols_get()
+        if symbols is None:
+            LOG.error(
+                "ERROR: No se pudieron obtener símbolos. MT5 error: {mt5_error}",
+                mt5_error=mt5.last_error()
+            )
+            return
+        
+        for info in symbols:
+            base = info.currency_base.upper()
+            profit = info.currency_profit.upper()
+            
+            if not base or not profit or base == profit:
+                continue
+            
+            current = self._available_pairs.get((base, profit))
+            if current is None or len(info.name) < len(current):
+                self._available_pairs[(base, profit)] = info.name
+    
+    
+    def add_currencies(self, currencies: Iterable[str]) -> None:
+        """
+        Agrega divisas a la matriz. Si hay nuevas, reconstruye el grafo
+        y refresca las tasas. Sin divisas nuevas es O(1).
+        
+        Args:
+            currencies: Divisas a incorporar
+        """
+        new = [
+            ccy.upper() for ccy in currencies
+            if ccy and ccy.upper() not in self._index
+        ]
+        if not new:
+            return
+        
+        for ccy in dict.fromkeys(new):
+            self._index[ccy] = len(self.currencies)
+            self.currencies.append(ccy)
+        
+        # Solo pares entre divisas de interés (incluye las divisas puente)
+        self._pairs = []
+        for (base, profit), symbol in self._available_pairs.items():
+            if base in self._index and profit in self._index:
+                if not mt5.symbol_select(symbol, True):
+                    continue
+                self._pairs.append((symbol, self._index[base], self._index[profit]))
+        
+        n = len(self.currencies)
+        self._direct_rates = np.full((n, n), np.nan)
+        self.refresh()
+    
+    
+    def refresh(self) -> int:
+        """
+        Refresca todas las tasas en una pasada y recalcula la matriz
+        triangulada. Un par sin tick conserva su última tasa.
+        
+        Returns:
+            Número de pares actualizados
+        """
+        direct = self._direct_rates
+        updated = 0
+        
+        for symbol, base, profit in self._pairs:
+            tick = self.TICK_CACHE.get(symbol)
+            if tick is None or tick.bid <= 0:
+                continue
+            
+            direct[base, profit] = tick.bid
+            direct[profit, base] = 1.0 / tick.bid
+            updated += 1
+        
+        rates = direct.copy()
+        np.fill_diagonal(rates, 1.0)
+        
+        # Triangulación: dos pasadas cubren caminos X -> USD -> EUR -> Y
+        hubs = [self._index[ccy] for ccy in self.hub_currencies]
+        for _ in range(2):
+            for hub in hubs:
+                via_hub = rates[:, hub, None] * rates[None, hub, :]
+                missing = np.isnan(rates)
+                rates[missing] = via_hub[missing]
+        
+        self.rates = rates
+        return updated
+    
+    
+    def get_rate(self, from_ccy: str, to_ccy: str) -> float:
+        """
+        Obtiene la tasa para convertir from_ccy en to_ccy.
+        
+        Args:
+            from_ccy: Divisa origen
+            to_ccy: Divisa destino
+        
+        Returns:
+            Unidades de to_ccy por unidad de from_ccy
+        
+        Raises:
+            ValueError: Si alguna divisa no está registrada o no hay camino
+        """
+        try:
+            rate = self.rates[self._index[from_ccy.upper()], self._index[to_ccy.upper()]]
+        except KeyError:
+            raise ValueError(
+                f"Divisa no registrada en el conversor: {from_ccy} o {to_ccy}"
+            )
+        
+        if np.isnan(rate):
+            raise ValueError(
+                f"No hay tasa disponible para convertir {from_ccy} a {to_ccy}"
+            )
+        
+        return float(rate)
+    
+    
+    def convert(self, amount: float, from_ccy: str, to_ccy: str) -> float:
+        """
+        Convierte un monto de una divisa a otra.
+        
+        Args:
+            amount: Monto a convertir
+            from_ccy: Divisa origen
+            to_ccy: Divisa destino
+        
+        Returns:
+            Monto convertido a la divisa destino
+        
+        Raises:
+            ValueError: Si no hay tasa disponible
+        """
+        if from_ccy.upper() == to_ccy.upper():
+            return amount
+        
+        return amount * self.get_rate(from_ccy, to_ccy)
@@ -7,15 +7,38 @@ Responsabilidades:
 - Detectar nuevas barras cerradas
 - Generar eventos de datos (DataEvent)
 - Gestionar último timestamp por símbolo
+- Mantener buffers circulares de barras cerradas por (símbolo, timeframe)
+- Servir ticks desde el snapshot por ciclo (TickSnapshotCache)
+- Consultar símbolos en paralelo (pool de hilos opcional)
+- Modo 'ticks': construir barras localmente desde ticks incrementales
+  (cursor time_msc por símbolo), incluidos timeframes sub-minuto
+- Derivar timeframes superiores desde el feed base (BarResampler), sin
+  consultas adicionales a MT5 después de la carga inicial
+- Persistir las barras cerradas en el BarStore local (opcional): arranque
+  en caliente desde disco y descarga solo del hueco desde la última barra
 """
 
 import MetaTrader5 as mt5
+import numpy as np
 import pandas as pd
-from typing import Dict, List
-from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional, Tuple
 from queue import Queue
-from core.events.events import DataEvent
-from core.utils.utils import Utils
+import time
+from core.data.bar import Bar
+from core.data.bar_buffer import (
+    BAR_DTYPE, BarRingBuffer, rates_to_bars, bars_to_dataframe
+)
+from core.data.bar_resampler import BarResampler, can_resample
+from core.data.bar_store import BarSeries, BarStore
+from core.data.tick_aggregator import TickBarAggregator
+from core.data.timeframes import TIMEFRAME_SECONDS, bar_close_time, bar_open_time
+from core.events.fast_events import DataEvent
+from core.utils.logger import get_logger
+from modules.data_provider.tick_cache import TickSnapshotCache
+
+
+LOG = get_logger("data_provider")
 
 
 class DataProvider:
@@ -48,8 +71,38 @@ class DataProvider:
         '1M': mt5.TIMEFRAME_MN1,
     }
     
+    # Duración de cada timeframe en segundos (None = duración variable).
+    # Incluye timeframes sub-minuto, disponibles solo en modo 'ticks'
+    TIMEFRAME_SECONDS = TIMEFRAME_SECONDS
+    
+    # Modos de alimentación de datos
+    FEED_MODES = ("bars", "ticks")
+    
+    # Máximo de ticks solicitados por símbolo en cada consulta
+    MAX_TICKS_PER_POLL = 100000
+    
+    # Espera máxima de un tick nuevo para detectar el desfase del servidor
+    OFFSET_DETECTION_TIMEOUT_S = 10.0
     
-    def __init__(self, events_queue: Queue, symbol_list: List[str], timeframe: str):
+    # El feed en vivo no termina (ReplayDataProvider lo activa al agotarse)
+    finished = False
+    
+    
+    def __init__(
+        self,
+        events_queue: Queue,
+        symbol_list: List[str],
+        timeframe: str,
+        buffer_capacity: int = 500,
+        tick_cache: Optional[TickSnapshotCache] = None,
+        poll_workers: int = 0,
+        feed_mode: str = "bars",
+        tick_close_grace_ms: int = 200,
+        server_offset_seconds: Optional[int] = None,
+        derived_timeframes: Optional[List[str]] = None,
+        bar_store: Optional[BarStore] = None,
+        store_history_bars: int = 50000
+    ):
         """
         Inicializa el proveedor de datos.
         
@@ -57,17 +110,119 @@ class DataProvider:
             events_queue: Cola de eventos del sistema
             symbol_list: Lista de símbolos a monitorear
             timeframe: Timeframe de las barras (ej: '1min', '5min', '1h')
+            buffer_capacity: Barras cerradas retenidas en memoria por
+                (símbolo, timeframe)
+            tick_cache: Snapshot de ticks compartido (default: uno nuevo
+                que reutiliza ticks solo dentro del mismo ciclo)
+            poll_workers: Hilos para consultar símbolos en paralelo en
+                check_for_new_data (0 = secuencial)
+            feed_mode: 'bars' (copy_rates_from_pos de la última barra
+                cerrada) o 'ticks' (barras construidas desde ticks)
+            tick_close_grace_ms: En modo 'ticks', espera tras el cierre de
+                una barra sin ticks nuevos antes de emitirla
+            server_offset_seconds: Hora del servidor - UTC (None = detectar
+                desde un tick nuevo, ver get_server_time_offset)
+            derived_timeframes: Timeframes superiores a derivar del feed
+                (también se derivan bajo demanda desde get_bar_buffer)
+            bar_store: Almacén local de barras (None = sin persistencia)
+            store_history_bars: Barras a descargar de MT5 cuando una serie
+                del almacén está vacía, y máximo a recuperar de un hueco
+            
+        Raises:
+            ValueError: Si el modo o algún timeframe no son válidos
         """
+        if feed_mode not in self.FEED_MODES:
+            raise ValueError(
+                f"feed_mode '{feed_mode}' no válido. Opciones: {', '.join(self.FEED_MODES)}"
+            )
+        
+        if timeframe not in self.TIMEFRAME_SECONDS or (
+            feed_mode == "bars" and timeframe not in self.TIMEFRAME_MAP
+        ):
+            raise ValueError(
+                f"Timeframe '{timeframe}' no válido en modo '{feed_mode}'. "
+                f"Los timeframes sub-minuto requieren feed_mode='ticks'"
+            )
+        
         self.events_queue = events_queue
         self.symbols = symbol_list
         self.timeframe = timeframe
+        self.buffer_capacity = buffer_capacity
+        self.feed_mode = feed_mode
+        self.tick_close_grace_s = tick_close_grace_ms / 1000.0
+        self.TICK_CACHE = tick_cache or TickSnapshotCache()
+        self.BAR_STORE = bar_store
+        self.store_history_bars = max(store_history_bars, buffer_capacity)
         
-        # Control de última barra vista por símbolo
-        self.last_bar_datetime: Dict[str, datetime] = {
-            symbol: datetime.min for symbol in self.symbols
+        self.server_offset_seconds = (
+            server_offset_seconds if server_offset_seconds is not None
+            else self.get_server_time_offset()
+        )
+        
+        # Control de última barra vista por símbolo (epoch segundos)
+        self.last_bar_time: Dict[str, int] = {
+            symbol: -1 for symbol in self.symbols
         }
         
-        print(f"{Utils.dateprint()} - ✓ Data Provider inicializado para {len(symbol_list)} símbolos")
+        # Buffers circulares de barras cerradas por (símbolo, timeframe)
+        self.bar_buffers: Dict[Tuple[str, str], BarRingBuffer] = {}
+        
+        # Total de barras agregadas por símbolo, como vector por timeframe
+        # (permite detectar en bloque qué símbolos tienen barras nuevas)
+        self.symbol_index: Dict[str, int] = {
+            symbol: i for i, symbol in enumerate(self.symbols)
+        }
+        self.bar_counts: Dict[str, np.ndarray] = {}
+        
+        # Latencia de la última consulta de barras por símbolo (ms)
+        self.fetch_latency_ms = np.zeros(len(self.symbols), dtype=np.float64)
+        
+        # Pool de consultas concurrentes (None = modo secuencial)
+        self.poll_workers = poll_workers
+        self._poll_pool: Optional[ThreadPoolExecutor] = (
+            ThreadPoolExecutor(max_workers=poll_workers, thread_name_prefix="data-poll")
+            if poll_workers > 0 else None
+        )
+        
+        # Modo 'ticks': agregador y cursor (time_msc, ticks ya leídos en ese ms)
+        self._aggregators: Dict[str, TickBarAggregator] = {}
+        self._tick_cursor_msc: Dict[str, int] = {}
+        self._tick_cursor_seen: Dict[str, int] = {}
+        
+        # Timeframes derivados del feed base: (símbolo, timeframe) -> resampler
+        self.derived_timeframes: List[str] = []
+        self._resamplers: Dict[Tuple[str, str], BarResampler] = {}
+        
+        self._init_feed()
+        
+        for derived in derived_timeframes or []:
+            if not can_resample(self.timeframe, derived):
+                raise ValueError(
+                    f"No se puede derivar '{derived}' desde '{self.timeframe}'"
+                )
+            for symbol in self.symbols:
+                self.get_bar_buffer(symbol, derived)
+        
+        LOG.info(
+            "✓ Data Provider inicializado para {symbols} símbolos "
+            "(buffer: {capacity} barras)",
+            symbols=len(symbol_list), capacity=buffer_capacity
+        )
+    
+    
+    def _init_feed(self) -> None:
+        """
+        Carga el feed base de cada símbolo: buffer con el histórico de MT5
+        (o del BarStore) y, en modo 'ticks', el cursor de ticks.
+        
+        Es la única carga del constructor que consulta a MT5: un proveedor
+        con otra fuente de barras (ReplayDataProvider) la reemplaza.
+        """
+        for symbol in self.symbols:
+            self._seed_bar_buffer(symbol, self.timeframe)
+            
+            if self.feed_mode == "ticks":
+                self._init_tick_stream(symbol)
     
     
     def _map_timeframe(self, timeframe: str) -> int:
@@ -91,58 +246,439 @@ class DataProvider:
         return self.TIMEFRAME_MAP[timeframe]
     
     
-    def get_latest_closed_bar(self, symbol: str, timeframe: str) -> pd.Series:
+    def _fetch_closed_rates(
+        self,
+        symbol: str,
+        timeframe: str,
+        num_bars: int
+    ) -> np.ndarray:
         """
-        Obtiene la última barra cerrada de un símbolo.
+        Obtiene las últimas barras cerradas directamente desde MT5.
         
         Args:
             symbol: Símbolo a consultar
-            timeframe: Timeframe de la barra
+            timeframe: Timeframe de las barras
+            num_bars: Cantidad de barras a obtener
             
         Returns:
-            Serie de pandas con datos OHLCV (vacía si hay error)
+            Array con dtype BAR_DTYPE (vacío si hay error)
         """
         tf = self._map_timeframe(timeframe)
         from_position = 1  # Posición 1 = última barra CERRADA
-        num_bars = 1
+        bars_count = max(1, num_bars)
         
         try:
-            # Obtener datos desde MT5
-            bars_array = mt5.copy_rates_from_pos(symbol, tf, from_position, num_bars)
+            rates = mt5.copy_rates_from_pos(symbol, tf, from_position, bars_count)
             
-            if bars_array is None:
-                print(
-                    f"{Utils.dateprint()} - ERROR: No se pudieron obtener datos "
-                    f"de {symbol}. MT5 error: {mt5.last_error()}"
+            if rates is None:
+                LOG.error(
+                    "ERROR: No se pudieron obtener {bars_count} "
+                    "barras de {symbol}. MT5 error: {mt5_error}",
+                    bars_count=bars_count, symbol=symbol, mt5_error=mt5.last_error()
                 )
-                return pd.Series()
-            
-            # Convertir a DataFrame
-            bars = pd.DataFrame(bars_array)
-            
-            # Configurar índice temporal
-            bars['time'] = pd.to_datetime(bars['time'], unit='s')
-            bars.set_index('time', inplace=True)
-            
-            # Renombrar y reorganizar columnas
-            bars.rename(
-                columns={
-                    'tick_volume': 'tickvol',
-                    'real_volume': 'vol'
-                },
-                inplace=True
-            )
-            bars = bars[['open', 'high', 'low', 'close', 'tickvol', 'vol', 'spread']]
+                return np.empty(0, dtype=BAR_DTYPE)
             
-            # Retornar última fila como Serie
-            return bars.iloc[-1] if not bars.empty else pd.Series()
+            return rates_to_bars(rates)
             
         except Exception as e:
-            print(
-                f"{Utils.dateprint()} - ERROR: Excepción al obtener datos de "
-                f"{symbol} {timeframe}. MT5 error: {mt5.last_error()}, Exception: {e}"
+            LOG.error(
+                "ERROR: Excepción al obtener {bars_count} barras "
+                "de {symbol} {timeframe}. MT5 error: {mt5_error}, Exception: {error}",
+                bars_count=bars_count, symbol=symbol, timeframe=timeframe,
+                mt5_error=mt5.last_error(), error=e
+            )
+            return np.empty(0, dtype=BAR_DTYPE)
+    
+    
+    # ========================================================================
+    # BUFFERS DE BARRAS
+    # ========================================================================
+    
+    def _seed_bar_buffer(self, symbol: str, timeframe: str) -> BarRingBuffer:
+        """
+        Crea y llena el buffer de un (símbolo, timeframe) con histórico de MT5.
+        Con BarStore, el histórico se lee del disco tras completar el hueco.
+        
+        Args:
+            symbol: Símbolo a cargar
+            timeframe: Timeframe de las barras
+            
+        Returns:
+            Buffer inicializado
+        """
+        buffer = BarRingBuffer(self.buffer_capacity)
+        series = self.BAR_STORE.series(symbol, timeframe) if self.BAR_STORE else None
+        
+        # Sub-minuto: MT5 no provee barras, se llenan desde ticks
+        if timeframe in self.TIMEFRAME_MAP:
+            if series is None:
+                buffer.extend(self._fetch_closed_rates(symbol, timeframe, self.buffer_capacity))
+            else:
+                self._backfill_store(symbol, timeframe, series)
+        
+        if series is not None:
+            buffer.extend(series.tail(self.buffer_capacity))
+        
+        self.bar_buffers[(symbol, timeframe)] = buffer
+        self._sync_bar_count(symbol, timeframe, buffer)
+        
+        return buffer
+    
+    
+    def _backfill_store(self, symbol: str, timeframe: str, series: BarSeries) -> int:
+        """
+        Completa una serie del almacén con las barras cerradas de MT5
+        posteriores a la última almacenada.
+        
+        Una serie vacía recibe store_history_bars barras. Si el hueco supera
+        ese máximo, las barras intermedias no se recuperan.
+        
+        Args:
+            symbol: Símbolo de la serie
+            timeframe: Timeframe de la serie (soportado por MT5)
+            series: Serie a completar
+            
+        Returns:
+            Cantidad de barras agregadas al almacén
+        """
+        if len(series) == 0:
+            num_bars = self.store_history_bars
+        else:
+            elapsed = int(time.time()) + self.server_offset_seconds - series.last_time
+            # MN1 (duración variable): 28 días sobreestima el hueco
+            tf_seconds = self.TIMEFRAME_SECONDS[timeframe] or 28 * 86400
+            num_bars = min(elapsed // tf_seconds, self.store_history_bars)
+            
+            if num_bars <= 0:
+                return 0
+        
+        added = series.append(self._fetch_closed_rates(symbol, timeframe, num_bars))
+        
+        if added > 0:
+            LOG.info(
+                "💾 BarStore {symbol} {timeframe}: "
+                "+{added} barras descargadas (total: {total})",
+                symbol=symbol, timeframe=timeframe, added=added, total=len(series)
+            )
+        
+        return added
+    
+    
+    def _persist(self, symbol: str, timeframe: str, bars: np.ndarray) -> None:
+        """
+        Agrega barras cerradas a la serie del almacén, si está habilitado.
+        """
+        if self.BAR_STORE is not None and len(bars) > 0:
+            self.BAR_STORE.series(symbol, timeframe).append(bars)
+    
+    
+    def _sync_bar_count(self, symbol: str, timeframe: str, buffer: BarRingBuffer) -> None:
+        """
+        Refleja el total de barras del buffer en el vector bar_counts.
+        """
+        row = self.symbol_index.get(symbol)
+        if row is None:
+            return
+        
+        counts = self.bar_counts.get(timeframe)
+        if counts is None:
+            counts = np.zeros(len(self.symbols), dtype=np.int64)
+            self.bar_counts[timeframe] = counts
+        
+        counts[row] = buffer.total_appended
+    
+    
+    def _append_to_bar_buffer(self, symbol: str, timeframe: str, bar) -> np.ndarray:
+        """
+        Extiende el buffer con una nueva barra cerrada.
+        
+        Si se detecta un hueco respecto a la última barra almacenada
+        (ej: el loop estuvo bloqueado), se recuperan las barras faltantes.
+        
+        Args:
+            symbol: Símbolo de la barra
+            timeframe: Timeframe de la barra
+            bar: Registro BAR_DTYPE de la nueva barra cerrada
+            
+        Returns:
+            Vista de las barras efectivamente agregadas (incluye el hueco)
+        """
+        buffer = self.get_bar_buffer(symbol, timeframe)
+        appended_before = buffer.total_appended
+        tf_seconds = self.TIMEFRAME_SECONDS.get(timeframe)
+        last_time = buffer.last_time
+        
+        if (
+            tf_seconds is not None
+            and last_time >= 0
+            and bar['time'] - last_time > tf_seconds
+        ):
+            missing = int((bar['time'] - last_time) // tf_seconds)
+            buffer.extend(
+                self._fetch_closed_rates(symbol, timeframe, min(missing, buffer.capacity))
+            )
+        
+        buffer.append_bar(bar)
+        self._sync_bar_count(symbol, timeframe, buffer)
+        
+        appended = buffer.view(buffer.total_appended - appended_before)
+        self._persist(symbol, timeframe, appended)
+        
+        return appended
+    
+    
+    # ========================================================================
+    # TIMEFRAMES DERIVADOS
+    # ========================================================================
+    
+    def _register_derived(self, symbol: str, timeframe: str) -> BarResampler:
+        """
+        Crea el buffer y el resampler de un timeframe derivado del feed.
+        
+        El histórico cerrado se carga una única vez (MT5 o, en sub-minuto,
+        desde el buffer base). La barra en curso se reconstruye desde el
+        buffer base si lo cubre; si no, se toma la barra en curso de MT5
+        sin el volumen de la barra base aún abierta, que llegará cerrada
+        al resampler.
+        
+        Args:
+            symbol: Símbolo a registrar
+            timeframe: Timeframe a derivar
+            
+        Returns:
+            Resampler registrado
+        """
+        resampler = BarResampler(self.timeframe, timeframe)
+        self._resamplers[(symbol, timeframe)] = resampler
+        
+        if timeframe not in self.derived_timeframes:
+            self.derived_timeframes.append(timeframe)
+        
+        buffer = self._seed_bar_buffer(symbol, timeframe)
+        base_bars = self.get_bars_view(symbol, self.timeframe)
+        
+        if len(buffer) > 0:
+            period_start = bar_close_time(buffer.last_time, timeframe)
+        elif len(base_bars) > 0:
+            # Primer período completo cubierto por el buffer base
+            first = int(base_bars['time'][0])
+            period_start = (
+                first if bar_open_time(first, timeframe) == first
+                else bar_close_time(first, timeframe)
             )
-            return pd.Series()
+        else:
+            return resampler
+        
+        covered = len(base_bars) > 0 and base_bars['time'][0] <= period_start
+        
+        if covered or timeframe not in self.TIMEFRAME_MAP:
+            closed = resampler.update(base_bars[base_bars['time'] >= period_start])
+            buffer.extend(closed)
+            self._persist(symbol, timeframe, closed)
+        else:
+            # El buffer base no llega al inicio del período en curso: se usa
+            # la barra en curso de MT5
+            current = mt5.copy_rates_from_pos(
+                symbol, self._map_timeframe(timeframe), 0, 1
+            )
+            if current is not None and len(current) > 0:
+                forming = rates_to_bars(current)[0]
+                open_base = self._open_base_bar(symbol)
+                
+                if open_base is not None and open_base['time'] >= forming['time']:
+                    forming['tickvol'] = max(0, forming['tickvol'] - open_base['tickvol'])
+                    forming['vol'] = max(0, forming['vol'] - open_base['vol'])
+                
+                resampler.seed_forming(forming)
+        
+        self._sync_bar_count(symbol, timeframe, buffer)
+        return resampler
+    
+    
+    def _open_base_bar(self, symbol: str) -> Optional[np.void]:
+        """
+        Barra del timeframe base aún abierta: la barra en formación del
+        agregador en modo 'ticks', o la barra en curso de MT5 en 'bars'.
+        
+        Args:
+            symbol: Símbolo a consultar
+            
+        Returns:
+            Registro BAR_DTYPE o None si no hay
+        """
+        if self.feed_mode == "ticks":
+            aggregator = self._aggregators.get(symbol)
+            return None if aggregator is None else aggregator.forming_bar
+        
+        current = mt5.copy_rates_from_pos(symbol, self._map_timeframe(self.timeframe), 0, 1)
+        if current is None or len(current) == 0:
+            return None
+        return rates_to_bars(current)[0]
+    
+    
+    def _resample(self, symbol: str, base_bars: np.ndarray) -> None:
+        """
+        Propaga barras base cerradas a los timeframes derivados del símbolo
+        y emite un DataEvent por cada barra derivada que se cierra.
+        
+        Args:
+            symbol: Símbolo de las barras
+            base_bars: Array BAR_DTYPE de barras base nuevas
+        """
+        for timeframe in self.derived_timeframes:
+            resampler = self._resamplers.get((symbol, timeframe))
+            if resampler is None:
+                continue
+            
+            closed = resampler.update(base_bars)
+            if len(closed) == 0:
+                continue
+            
+            buffer = self.bar_buffers[(symbol, timeframe)]
+            for record in closed:
+                if buffer.append_bar(record):
+                    self.events_queue.put(DataEvent(
+                        symbol=symbol,
+                        data=Bar.from_record(record),
+                        timeframe=timeframe,
+                        origin_ns=self._bar_close_origin_ns(int(record['time']), timeframe)
+                    ))
+            
+            self._persist(symbol, timeframe, closed)
+            self._sync_bar_count(symbol, timeframe, buffer)
+    
+    
+    def get_bar_buffer(self, symbol: str, timeframe: str = None) -> BarRingBuffer:
+        """
+        Retorna el buffer de barras de un (símbolo, timeframe).
+        Si no existe, se crea y se llena desde MT5 (una única vez). Los
+        timeframes superiores derivables del feed base se mantienen luego
+        por resampling, sin nuevas consultas.
+        
+        Args:
+            symbol: Símbolo a consultar
+            timeframe: Timeframe (default: timeframe del provider)
+            
+        Returns:
+            Buffer circular de barras cerradas
+        """
+        timeframe = timeframe or self.timeframe
+        buffer = self.bar_buffers.get((symbol, timeframe))
+        
+        if buffer is None:
+            if symbol in self.symbol_index and can_resample(self.timeframe, timeframe):
+                self._register_derived(symbol, timeframe)
+                buffer = self.bar_buffers[(symbol, timeframe)]
+            else:
+                buffer = self._seed_bar_buffer(symbol, timeframe)
+        
+        return buffer
+    
+    
+    def get_bars_view(
+        self,
+        symbol: str,
+        timeframe: str = None,
+        num_bars: int = None
+    ) -> np.ndarray:
+        """
+        Retorna una vista zero-copy de las últimas barras cerradas en memoria.
+        No realiza llamadas a MT5 una vez inicializado el buffer.
+        
+        Args:
+            symbol: Símbolo a consultar
+            timeframe: Timeframe (default: timeframe del provider)
+            num_bars: Cantidad de barras (None = todas las disponibles)
+            
+        Returns:
+            Array BAR_DTYPE de solo lectura (puede tener menos de num_bars)
+        """
+        return self.get_bar_buffer(symbol, timeframe).view(num_bars)
+    
+    
+    def get_history(
+        self,
+        symbol: str,
+        timeframe: str = None,
+        start_time: int = None,
+        end_time: int = None
+    ) -> np.ndarray:
+        """
+        Retorna las barras cerradas con start_time <= time < end_time.
+        
+        Con BarStore la vista está respaldada por el archivo memory-mapped
+        (zero-copy, sin límite de capacidad); sin él, se limita a las
+        barras del buffer en memoria.
+        
+        Args:
+            symbol: Símbolo a consultar
+            timeframe: Timeframe (default: timeframe del provider)
+            start_time: Epoch inicial inclusivo, hora del servidor (None = todo)
+            end_time: Epoch final exclusivo, hora del servidor (None = todo)
+            
+        Returns:
+            Array BAR_DTYPE de solo lectura
+        """
+        timeframe = timeframe or self.timeframe
+        buffer = self.get_bar_buffer(symbol, timeframe)
+        
+        if self.BAR_STORE is not None:
+            return self.BAR_STORE.slice(symbol, timeframe, start_time, end_time)
+        
+        bars = buffer.view()
+        times = bars['time']
+        lo = 0 if start_time is None else int(np.searchsorted(times, start_time, 'left'))
+        hi = len(bars) if end_time is None else int(np.searchsorted(times, end_time, 'left'))
+        
+        return bars[lo:max(lo, hi)]
+    
+    
+    def get_bar_counts(self, timeframe: str = None) -> np.ndarray:
+        """
+        Retorna el total de barras agregadas por símbolo (orden de self.symbols).
+        
+        Comparando contra un snapshot previo, un consumidor detecta en una
+        sola operación vectorizada qué símbolos recibieron barras nuevas.
+        
+        Args:
+            timeframe: Timeframe (default: timeframe del provider)
+            
+        Returns:
+            Vector int64 de longitud len(self.symbols)
+        """
+        timeframe = timeframe or self.timeframe
+        
+        if timeframe not in self.bar_counts:
+            for symbol in self.symbols:
+                self.get_bar_buffer(symbol, timeframe)
+        
+        return self.bar_counts[timeframe]
+    
+    
+    # ========================================================================
+    # CONSULTAS DE DATOS
+    # ========================================================================
+    
+    def get_latest_closed_bar(self, symbol: str, timeframe: str) -> Optional[Bar]:
+        """
+        Obtiene la última barra cerrada de un símbolo.
+        
+        Args:
+            symbol: Símbolo a consultar
+            timeframe: Timeframe de la barra
+            
+        Returns:
+            Registro Bar con datos OHLCV (None si hay error)
+        """
+        if timeframe in self.TIMEFRAME_MAP:
+            bars = self._fetch_closed_rates(symbol, timeframe, 1)
+        else:
+            bars = self.get_bars_view(symbol, timeframe, 1)
+        
+        if len(bars) == 0:
+            return None
+        
+        return Bar.from_record(bars[-1])
     
     
     def get_latest_closed_bars(
@@ -154,6 +690,9 @@ class DataProvider:
         """
         Obtiene múltiples barras cerradas de un símbolo.
         
+        Se sirven desde el buffer en memoria cuando alcanza la cantidad
+        pedida; en caso contrario se consultan a MT5.
+        
         Args:
             symbol: Símbolo a consultar
             timeframe: Timeframe de las barras
@@ -162,47 +701,26 @@ class DataProvider:
         Returns:
             DataFrame con datos OHLCV (vacío si hay error)
         """
-        tf = self._map_timeframe(timeframe)
-        from_position = 1
         bars_count = max(1, num_bars)
+        buffer = self.bar_buffers.get((symbol, timeframe))
         
-        try:
-            bars_array = mt5.copy_rates_from_pos(symbol, tf, from_position, bars_count)
-            
-            if bars_array is None:
-                print(
-                    f"{Utils.dateprint()} - ERROR: No se pudieron obtener {num_bars} "
-                    f"barras de {symbol}. MT5 error: {mt5.last_error()}"
-                )
-                return pd.DataFrame()
-            
-            bars = pd.DataFrame(bars_array)
-            
-            bars['time'] = pd.to_datetime(bars['time'], unit='s')
-            bars.set_index('time', inplace=True)
-            
-            bars.rename(
-                columns={
-                    'tick_volume': 'tickvol',
-                    'real_volume': 'vol'
-                },
-                inplace=True
-            )
-            bars = bars[['open', 'high', 'low', 'close', 'tickvol', 'vol', 'spread']]
+        if buffer is not None and len(buffer) >= bars_count:
+            bars = buffer.view(bars_count)
+        elif timeframe not in self.TIMEFRAME_MAP:
+            bars = self.get_bars_view(symbol, timeframe, bars_count)
+        else:
+            bars = self._fetch_closed_rates(symbol, timeframe, bars_count)
             
-            return bars
-            
-        except Exception as e:
-            print(
-                f"{Utils.dateprint()} - ERROR: Excepción al obtener {num_bars} barras "
-                f"de {symbol} {timeframe}. MT5 error: {mt5.last_error()}, Exception: {e}"
-            )
+        if len(bars) == 0:
             return pd.DataFrame()
+        
+        return bars_to_dataframe(bars)
     
     
     def get_latest_tick(self, symbol: str) -> dict:
         """
         Obtiene el último tick (precio actual) de un símbolo.
+        Dentro de un ciclo todos los consumidores ven el mismo tick.
         
         Args:
             symbol: Símbolo a consultar
@@ -211,43 +729,363 @@ class DataProvider:
             Diccionario con datos del tick (vacío si hay error)
         """
         try:
-            tick = mt5.symbol_info_tick(symbol)
+            tick = self.TICK_CACHE.get(symbol)
             
             if tick is None:
-                print(
-                    f"{Utils.dateprint()} - ERROR: No se pudo obtener tick de {symbol}. "
-                    f"MT5 error: {mt5.last_error()}"
+                LOG.error(
+                    "ERROR: No se pudo obtener tick de {symbol}. "
+                    "MT5 error: {mt5_error}",
+                    symbol=symbol, mt5_error=mt5.last_error()
                 )
                 return {}
             
             return tick._asdict()
             
         except Exception as e:
-            print(
-                f"{Utils.dateprint()} - ERROR: Excepción al obtener tick de {symbol}. "
-                f"MT5 error: {mt5.last_error()}, Exception: {e}"
+            LOG.error(
+                "ERROR: Excepción al obtener tick de {symbol}. "
+                "MT5 error: {mt5_error}, Exception: {error}",
+                symbol=symbol, mt5_error=mt5.last_error(), error=e
             )
             return {}
     
     
-    def check_for_new_data(self) -> None:
+    def get_server_time_offset(self) -> int:
+        """
+        Estima el desfase entre la hora del servidor del broker y UTC.
+        
+        Los ticks de MT5 están en hora del servidor, pero el último tick
+        disponible puede tener horas (fin de semana, símbolo ilíquido). Solo
+        se usa un tick que llega mientras se observan los símbolos: su hora
+        es la hora actual del servidor. El desfase se redondea a la media hora.
+        
+        Si no llega ningún tick nuevo en OFFSET_DETECTION_TIMEOUT_S (mercado
+        cerrado) se registra un aviso y se asume 0: el arranque no depende de
+        la actividad del mercado, pero el desfase debe configurarse con
+        server_time_offset_hours si el servidor no está en UTC.
+        
+        Returns:
+            Offset en segundos (0 si no pudo detectarse)
+        """
+        baseline = {symbol: self._tick_time_msc(symbol) for symbol in self.symbols}
+        deadline = time.monotonic() + self.OFFSET_DETECTION_TIMEOUT_S
+        
+        while time.monotonic() < deadline:
+            time.sleep(0.05)
+            
+            for symbol in self.symbols:
+                tick_msc = self._tick_time_msc(symbol)
+                if tick_msc > baseline[symbol]:
+                    raw_offset = tick_msc / 1000.0 - time.time()
+                    return int(round(raw_offset / 1800.0)) * 1800
+        
+        LOG.warning(
+            "No se pudo detectar el desfase horario del servidor: sin ticks "
+            "nuevos en {timeout}s (¿mercado cerrado?). Se asume UTC; "
+            "configurar server_time_offset_hours",
+            timeout=self.OFFSET_DETECTION_TIMEOUT_S
+        )
+        return 0
+        
+    
+    def _tick_time_msc(self, symbol: str) -> int:
+        """Hora del último tick de un símbolo en ms, sin cache (0 si no hay)."""
+        tick = mt5.symbol_info_tick(symbol)
+        return tick.time_msc if tick is not None else 0
+    
+    
+    def _timed_fetch_last_closed(self, symbol: str) -> np.ndarray:
+        """
+        Obtiene la última barra cerrada y registra la latencia de la consulta.
+        Puede ejecutarse en un hilo del pool: solo escribe su propia
+        posición de fetch_latency_ms.
+        
+        Args:
+            symbol: Símbolo a consultar
+            
+        Returns:
+            Array con dtype BAR_DTYPE (vacío si hay error)
+        """
+        start = time.perf_counter()
+        bars = self._fetch_closed_rates(symbol, self.timeframe, 1)
+        self.fetch_latency_ms[self.symbol_index[symbol]] = (
+            (time.perf_counter() - start) * 1000.0
+        )
+        return bars
+    
+    
+    def _bar_close_origin_ns(self, bar_time: int, timeframe: str) -> int:
+        """
+        Instante del cierre de una barra en el broker, en la escala de
+        time.perf_counter_ns(): origen de la cadena de eventos que dispara
+        (la latencia medida incluye la demora en detectar el cierre).
+        
+        Args:
+            bar_time: Apertura de la barra (epoch, hora del servidor)
+            timeframe: Timeframe de la barra
+        
+        Returns:
+            perf_counter_ns() menos la demora desde el cierre (el instante
+            actual si no hay demora positiva)
+        """
+        now_ns = time.perf_counter_ns()
+        close_utc = bar_close_time(bar_time, timeframe) - self.server_offset_seconds
+        lag_s = time.time() - close_utc
+        
+        return now_ns - int(lag_s * 1e9) if lag_s > 0 else now_ns
+    
+    
+    def get_fetch_latencies(self) -> Dict[str, float]:
+        """
+        Retorna la latencia de la última consulta de barras por símbolo.
+        
+        Returns:
+            Diccionario símbolo -> latencia en milisegundos
+        """
+        return {
+            symbol: float(self.fetch_latency_ms[i])
+            for i, symbol in enumerate(self.symbols)
+        }
+    
+    
+    # ========================================================================
+    # STREAMING DE TICKS
+    # ========================================================================
+    
+    def _init_tick_stream(self, symbol: str) -> None:
+        """
+        Prepara el agregador de un símbolo en modo 'ticks'.
+        
+        Reconstruye desde ticks lo que falta desde la última barra del
+        buffer (o el histórico completo en sub-minuto) y deja en formación
+        la barra actual, con el cursor en el último tick leído.
+        
+        Args:
+            symbol: Símbolo a inicializar
+        """
+        aggregator = TickBarAggregator(self.timeframe)
+        self._aggregators[symbol] = aggregator
+        
+        buffer = self.get_bar_buffer(symbol, self.timeframe)
+        server_now = int(time.time()) + self.server_offset_seconds
+        tf_seconds = self.TIMEFRAME_SECONDS[self.timeframe]
+        
+        if tf_seconds is not None:
+            start = bar_open_time(server_now - self.buffer_capacity * tf_seconds, self.timeframe)
+        else:
+            start = bar_open_time(server_now, self.timeframe)
+        
+        # Sin reconstruir más allá de buffer_capacity barras (ej: almacén
+        # con la última barra muy atrás)
+        if len(buffer) > 0:
+            start = max(start, bar_close_time(buffer.last_time, self.timeframe))
+        
+        self._tick_cursor_msc[symbol] = start * 1000
+        self._tick_cursor_seen[symbol] = 0
+        
+        ticks = mt5.copy_ticks_range(symbol, start, server_now + 60, mt5.COPY_TICKS_INFO)
+        if ticks is None or len(ticks) == 0:
+            return
+        
+        ticks = ticks[ticks['bid'] > 0]
+        closed = aggregator.update(ticks['time_msc'], ticks['bid'], ticks['volume'])
+        buffer.extend(closed)
+        self._persist(symbol, self.timeframe, closed)
+        self._sync_bar_count(symbol, self.timeframe, buffer)
+        
+        if len(buffer) > 0:
+            self.last_bar_time[symbol] = buffer.last_time
+        
+        if len(ticks) > 0:
+            last_msc = int(ticks['time_msc'][-1])
+            self._tick_cursor_msc[symbol] = last_msc
+            self._tick_cursor_seen[symbol] = int(np.count_nonzero(ticks['time_msc'] == last_msc))
+    
+    
+    def _fetch_new_ticks(self, symbol: str) -> Optional[np.ndarray]:
+        """
+        Obtiene los ticks posteriores al cursor del símbolo y lo avanza.
+        
+        Ticks con el mismo time_msc que el cursor ya leídos en la consulta
+        anterior se descartan. Puede ejecutarse en un hilo del pool: solo
+        modifica las entradas de su propio símbolo.
+        
+        Args:
+            symbol: Símbolo a consultar
+            
+        Returns:
+            Array de ticks nuevos (None si hay error)
+        """
+        start = time.perf_counter()
+        cursor = self._tick_cursor_msc[symbol]
+        
+        ticks = mt5.copy_ticks_from(
+            symbol, cursor // 1000, self.MAX_TICKS_PER_POLL, mt5.COPY_TICKS_INFO
+        )
+        self.fetch_latency_ms[self.symbol_index[symbol]] = (
+            (time.perf_counter() - start) * 1000.0
+        )
+        
+        if ticks is None:
+            LOG.error(
+                "ERROR: No se pudieron obtener ticks de {symbol}. "
+                "MT5 error: {mt5_error}",
+                symbol=symbol, mt5_error=mt5.last_error()
+            )
+            return None
+        
+        if len(ticks) == 0:
+            return ticks
+        
+        times = ticks['time_msc']
+        keep = times > cursor
+        at_cursor = np.flatnonzero(times == cursor)
+        keep[at_cursor[self._tick_cursor_seen[symbol]:]] = True
+        
+        last_msc = int(times[-1])
+        self._tick_cursor_seen[symbol] = int(np.count_nonzero(times == last_msc))
+        self._tick_cursor_msc[symbol] = last_msc
+        
+        new_ticks = ticks[keep]
+        return new_ticks[new_ticks['bid'] > 0]
+    
+    
+    def get_forming_bar(self, symbol: str) -> Optional[Bar]:
+        """
+        Retorna la barra en formación de un símbolo (solo modo 'ticks').
+        
+        Args:
+            symbol: Símbolo a consultar
+            
+        Returns:
+            Registro Bar con los datos intrabar (None si no disponible)
+        """
+        aggregator = self._aggregators.get(symbol)
+        
+        if aggregator is None or aggregator.forming_bar is None:
+            return None
+        
+        return Bar.from_record(aggregator.forming_bar)
+    
+    
+    def _check_for_new_ticks(self) -> int:
+        """
+        Modo 'ticks': lee los ticks nuevos de cada símbolo, los agrega y
+        emite un DataEvent por cada barra cerrada (en orden de símbolo y
+        tiempo). Una barra sin ticks posteriores se cierra al superar su
+        cierre más tick_close_grace_ms.
+        
+        Returns:
+            Cantidad de barras cerradas del timeframe base
+        """
+        new_bars = 0
+        
+        if self._poll_pool is not None:
+            results = self._poll_pool.map(self._fetch_new_ticks, self.symbols)
+        else:
+            results = map(self._fetch_new_ticks, self.symbols)
+        
+        server_now = time.time() + self.server_offset_seconds - self.tick_close_grace_s
+        
+        for symbol, ticks in zip(self.symbols, results):
+            aggregator = self._aggregators[symbol]
+            
+            if ticks is not None and len(ticks) > 0:
+                closed = aggregator.update(ticks['time_msc'], ticks['bid'], ticks['volume'])
+            else:
+                closed = np.empty(0, dtype=BAR_DTYPE)
+            
+            due = aggregator.close_due(server_now)
+            if len(due) > 0:
+                closed = np.concatenate((closed, due))
+            
+            if len(closed) == 0:
+                continue
+            
+            buffer = self.get_bar_buffer(symbol, self.timeframe)
+            
+            for record in closed:
+                buffer.append_bar(record)
+                self.events_queue.put(DataEvent(
+                    symbol=symbol,
+                    data=Bar.from_record(record),
+                    timeframe=self.timeframe,
+                    origin_ns=self._bar_close_origin_ns(int(record['time']), self.timeframe)
+                ))
+            
+            self._persist(symbol, self.timeframe, closed)
+            self._sync_bar_count(symbol, self.timeframe, buffer)
+            self.last_bar_time[symbol] = int(closed['time'][-1])
+            self._resample(symbol, closed)
+            new_bars += len(closed)
+        
+        return new_bars
+    
+    
+    def shutdown(self) -> None:
+        """
+        Libera el pool de consultas concurrentes y cierra el almacén de
+        barras, si existen.
+        """
+        if self._poll_pool is not None:
+            self._poll_pool.shutdown(wait=True)
+            self._poll_pool = None
+        
+        if self.BAR_STORE is not None:
+            self.BAR_STORE.close()
+    
+    
+    def check_for_new_data(self) -> int:
         """
         Verifica si hay nuevas barras cerradas para cada símbolo.
         Si detecta una nueva barra, genera un DataEvent y lo coloca en la cola.
         
-        Este método se llama continuamente en el loop principal.
+        Con poll_workers > 0 las consultas se reparten en el pool de hilos;
+        los resultados se procesan siempre en el orden de self.symbols,
+        por lo que los DataEvents se encolan en orden determinista.
+        
+        Este método se llama desde el loop principal según el BarCloseScheduler.
+        
+        Returns:
+            Cantidad de barras nuevas del timeframe base (no incluye las
+            barras derivadas, que también generan DataEvents)
         """
-        for symbol in self.symbols:
-            latest_bar = self.get_latest_closed_bar(symbol, self.timeframe)
+        if self.feed_mode == "ticks":
+            return self._check_for_new_ticks()
+        
+        new_bars = 0
+        
+        if self._poll_pool is not None:
+            results = self._poll_pool.map(self._timed_fetch_last_closed, self.symbols)
+        else:
+            results = map(self._timed_fetch_last_closed, self.symbols)
             
+        for symbol, bars in zip(self.symbols, results):
             # Validar que obtuvimos datos
-            if latest_bar is None or latest_bar.empty:
+            if len(bars) == 0:
                 continue
             
+            record = bars[-1]
+            bar_time = int(record['time'])
+            
             # Verificar si es una nueva barra
-            if latest_bar.name > self.last_bar_datetime[symbol]:
-                self.last_bar_datetime[symbol] = latest_bar.name
+            if bar_time > self.last_bar_time[symbol]:
+                self.last_bar_time[symbol] = bar_time
+                
+                # Extender buffer en memoria con la barra cerrada
+                appended = self._append_to_bar_buffer(symbol, self.timeframe, record)
                 
                 # Generar y encolar evento
-                data_event = DataEvent(symbol=symbol, data=latest_bar)
+                data_event = DataEvent(
+                    symbol=symbol,
+                    data=Bar.from_record(record),
+                    timeframe=self.timeframe,
+                    origin_ns=self._bar_close_origin_ns(bar_time, self.timeframe)
+                )
                 self.events_queue.put(data_event)
+                new_bars += 1
+                
+                # Timeframes derivados (incluye barras recuperadas del hueco)
+                self._resample(symbol, appended)
+        
+        return new_bars
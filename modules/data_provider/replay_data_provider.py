@@ -0,0 +1,444 @@
+"""
+LIA Engineering Solutions - Trading Framework
+Replay Data Provider - Reproducción Histórica de Barras
+
+Reemplazo directo del DataProvider para backtests event-driven: reproduce
+barras cerradas desde el BarStore local o desde archivos CSV a través de
+la misma cola de eventos, los mismos DataEvent y la misma API de consulta.
+
+Responsabilidades:
+- Unificar las series de todos los símbolos en una línea de tiempo común
+- Emitir en cada check_for_new_data() las barras del siguiente instante
+  (un DataEvent por símbolo, en orden de self.symbols)
+- Avanzar un reloj virtual al cierre de la barra reproducida
+- Servir ticks sintéticos desde la última barra de cada símbolo
+- Señalar el fin de la reproducción (finished)
+
+Sin sleeps ni consultas a MT5 para los símbolos reproducidos: el Trading
+Director, el Signal Generator y el Risk Manager corren sin cambios a la
+velocidad de la CPU. Las consultas nunca ven barras posteriores al reloj.
+"""
+
+import numpy as np
+import pandas as pd
+import time
+from collections import namedtuple
+from typing import Any, Dict, List, Optional
+from queue import Queue
+from core.data.bar import Bar
+from core.data.bar_buffer import BAR_DTYPE, BarRingBuffer, bars_to_dataframe
+from core.data.bar_store import BarStore
+from core.data.timeframes import bar_close_time
+from core.events.fast_events import DataEvent
+from core.utils.logger import get_logger
+from core.utils.virtual_clock import VirtualClock
+from modules.data_provider.data_provider import DataProvider
+from modules.data_provider.tick_cache import TickSnapshotCache
+
+
+LOG = get_logger("replay_data_provider")
+
+
+# Mismos campos que el Tick de mt5.symbol_info_tick()
+ReplayTick = namedtuple(
+    'ReplayTick', 'time bid ask last volume time_msc flags volume_real'
+)
+
+
+class ReplayTickCache(TickSnapshotCache):
+    """
+    TickSnapshotCache que sintetiza el tick de los símbolos reproducidos
+    desde su última barra cerrada (bid = close, ask = close + spread).
+    Los demás símbolos (ej: pares de conversión) se consultan a MT5.
+    """
+    
+    def __init__(self, provider: "ReplayDataProvider"):
+        """
+        Args:
+            provider: Replay cuyas barras definen los precios
+        """
+        super().__init__()
+        self.PROVIDER = provider
+    
+    
+    def get(self, symbol: str) -> Optional[Any]:
+        """
+        Retorna el tick sintético del símbolo al instante del reloj virtual.
+        
+        Args:
+            symbol: Símbolo a consultar
+        
+        Returns:
+            ReplayTick, tick de MT5 o None si no hay precio disponible
+        """
+        provider = self.PROVIDER
+        
+        if symbol not in provider.symbol_index:
+            return super().get(symbol)
+        
+        bar = provider.bar_buffers[(symbol, provider.timeframe)].latest()
+        if bar is None:
+            return None
+        
+        self.hits += 1
+        bid = float(bar['close'])
+        ask = bid + int(bar['spread']) * provider.point_sizes.get(symbol, 0.0)
+        server_time = bar_close_time(int(bar['time']), provider.timeframe)
+        
+        return ReplayTick(server_time, bid, ask, 0.0, 0, server_time * 1000, 0, 0.0)
+
+
+class ReplayDataProvider(DataProvider):
+    """
+    Reproduce barras históricas con la API del DataProvider.
+    """
+    
+    # El feed reproducido no tiene modos de alimentación
+    FEED_MODES = ("replay",)
+    
+    # Alias de columnas aceptados en CSV (exportación de MT5 incluida)
+    CSV_COLUMNS = {
+        'tick_volume': 'tickvol',
+        'real_volume': 'vol',
+        'volume': 'tickvol',
+    }
+    
+    
+    def __init__(
+        self,
+        events_queue: Queue,
+        symbol_list: List[str],
+        timeframe: str,
+        buffer_capacity: int = 500,
+        bar_store: Optional[BarStore] = None,
+        csv_paths: Optional[Dict[str, str]] = None,
+        start_time: int = None,
+        end_time: int = None,
+        server_offset_seconds: int = 0,
+        derived_timeframes: Optional[List[str]] = None,
+        point_sizes: Optional[Dict[str, float]] = None,
+        clock: Optional[VirtualClock] = None
+    ):
+        """
+        Inicializa el replay y construye la línea de tiempo común.
+        
+        Args:
+            events_queue: Cola de eventos del sistema
+            symbol_list: Símbolos a reproducir
+            timeframe: Timeframe de las barras reproducidas
+            buffer_capacity: Barras cerradas retenidas en memoria por
+                (símbolo, timeframe)
+            bar_store: Almacén local de origen (lectura zero-copy)
+            csv_paths: Archivo CSV por símbolo (alternativa a bar_store)
+            start_time: Epoch inicial inclusivo, hora del servidor (None = todo)
+            end_time: Epoch final exclusivo, hora del servidor (None = todo)
+            server_offset_seconds: Hora del servidor - UTC (para el reloj virtual)
+            derived_timeframes: Timeframes superiores a derivar del feed
+            point_sizes: Tamaño del punto por símbolo para el ask sintético
+                (sin entrada = ask igual a bid)
+            clock: Reloj virtual compartido con el resto de la simulación
+                (default: uno nuevo)
+        
+        Raises:
+            ValueError: Si falta la fuente, falta un símbolo en ella o
+                el timeframe no es válido
+        """
+        if bar_store is None and csv_paths is None:
+            raise ValueError("Se requiere bar_store o csv_paths")
+        
+        # Fuente de las barras (la lee _init_feed durante el constructor base)
+        self.SOURCE_STORE = bar_store
+        self._csv_paths = csv_paths
+        self._source_range = (start_time, end_time)
+        self.point_sizes = point_sizes or {}
+        self.clock = clock or VirtualClock()
+        
+        # El almacén de origen solo se lee: sin BarStore de persistencia
+        super().__init__(
+            events_queue,
+            symbol_list,
+            timeframe,
+            buffer_capacity=buffer_capacity,
+            tick_cache=ReplayTickCache(self),
+            feed_mode="replay",
+            server_offset_seconds=server_offset_seconds,
+            derived_timeframes=derived_timeframes,
+            bar_store=None,
+            store_history_bars=buffer_capacity
+        )
+        
+        LOG.info(
+            "✓ Replay Data Provider inicializado: "
+            "{symbols} símbolos | {bars} barras | {steps} pasos",
+            symbols=len(symbol_list), bars=len(self._rows), steps=self.total_steps
+        )
+    
+    
+    def _init_feed(self) -> None:
+        """
+        Carga la serie de origen de cada símbolo, crea sus buffers vacíos,
+        construye la línea de tiempo y ubica el reloj en la primera barra.
+        
+        Raises:
+            ValueError: Si falta un símbolo en la fuente o no tiene barras
+                en el rango pedido
+        """
+        start_time, end_time = self._source_range
+        
+        # Series de origen por fila de símbolo
+        self._series: List[np.ndarray] = []
+        for symbol in self.symbols:
+            if self.SOURCE_STORE is not None:
+                bars = self.SOURCE_STORE.slice(symbol, self.timeframe, start_time, end_time)
+            else:
+                if symbol not in self._csv_paths:
+                    raise ValueError(f"Sin archivo CSV para {symbol}")
+                bars = self.load_csv(self._csv_paths[symbol])
+                times = bars['time']
+                lo = 0 if start_time is None else np.searchsorted(times, start_time, 'left')
+                hi = len(bars) if end_time is None else np.searchsorted(times, end_time, 'left')
+                bars = bars[lo:hi]
+            
+            if len(bars) == 0:
+                raise ValueError(f"Sin barras de {symbol} {self.timeframe} en el rango pedido")
+            
+            self._series.append(bars)
+            self._seed_bar_buffer(symbol, self.timeframe)
+        
+        self._build_timeline()
+        
+        # Reloj al inicio de la primera barra reproducida
+        if self.total_steps > 0:
+            self.clock.advance_to(float(self._timeline[0]) - self.server_offset_seconds)
+    
+    
+    @classmethod
+    def load_csv(cls, path: str) -> np.ndarray:
+        """
+        Carga un CSV de barras al layout BAR_DTYPE.
+        
+        Acepta separador coma o tabulación, nombres de columna con o sin
+        '<>' (exportación de MT5) y tiempo como epoch, como fecha/hora en
+        una columna o como columnas DATE y TIME separadas.
+        
+        Args:
+            path: Ruta del archivo
+        
+        Returns:
+            Array BAR_DTYPE ordenado por tiempo
+        """
+        with open(path, 'r') as f:
+            header = f.readline()
+        
+        df = pd.read_csv(path, sep='\t' if '\t' in header else ',')
+        df.columns = [
+            cls.CSV_COLUMNS.get(c, c)
+            for c in (c.strip('<> ').lower() for c in df.columns)
+        ]
+        
+        if 'date' in df.columns and 'time' in df.columns:
+            times = pd.to_datetime(df['date'].astype(str) + ' ' + df['time'].astype(str))
+        elif pd.api.types.is_numeric_dtype(df['time']):
+            times = None
+        else:
+            times = pd.to_datetime(df['time'])
+        
+        bars = np.zeros(len(df), dtype=BAR_DTYPE)
+        bars['time'] = (
+            df['time'].to_numpy() if times is None
+            else times.to_numpy().astype('datetime64[s]').astype(np.int64)
+        )
+        
+        for column in ('open', 'high', 'low', 'close', 'tickvol', 'vol', 'spread'):
+            if column in df.columns:
+                bars[column] = df[column].to_numpy()
+        
+        return bars[np.argsort(bars['time'], kind='stable')]
+    
+    
+    def _seed_bar_buffer(self, symbol: str, timeframe: str) -> BarRingBuffer:
+        """
+        Crea el buffer vacío de un (símbolo, timeframe): en el replay los
+        buffers se llenan solo con las barras ya reproducidas.
+        """
+        buffer = BarRingBuffer(self.buffer_capacity)
+        self.bar_buffers[(symbol, timeframe)] = buffer
+        self._sync_bar_count(symbol, timeframe, buffer)
+        
+        return buffer
+    
+    
+    def _build_timeline(self) -> None:
+        """
+        Ordena todas las barras por (tiempo, símbolo) y marca los límites
+        de cada paso (barras con el mismo tiempo de apertura).
+        """
+        times = np.concatenate([bars['time'] for bars in self._series])
+        rows = np.concatenate([
+            np.full(len(bars), row, dtype=np.int64)
+            for row, bars in enumerate(self._series)
+        ])
+        positions = np.concatenate([
+            np.arange(len(bars), dtype=np.int64) for bars in self._series
+        ])
+        
+        order = np.lexsort((rows, times))
+        times = times[order]
+        
+        self._rows = rows[order]
+        self._positions = positions[order]
+        self._step_bounds = np.concatenate((
+            [0], np.flatnonzero(np.diff(times)) + 1, [len(times)]
+        ))
+        self._timeline = times[self._step_bounds[:-1]]
+        self.total_steps = len(self._timeline)
+        self._step = 0
+        self.finished = self.total_steps == 0
+    
+    
+    @property
+    def progress(self) -> float:
+        """Fracción de pasos reproducidos (0.0 a 1.0)."""
+        return self._step / self.total_steps if self.total_steps else 1.0
+    
+    
+    def check_for_new_data(self) -> int:
+        """
+        Reproduce el siguiente instante de la línea de tiempo.
+        
+        Agrega la barra de cada símbolo con datos en ese instante a su
+        buffer, encola un DataEvent por barra (y por cada barra derivada
+        que se cierra) y avanza el reloj virtual al cierre de la barra.
+        
+        Returns:
+            Cantidad de barras base emitidas (0 al terminar: finished = True)
+        """
+        if self._step >= self.total_steps:
+            self.finished = True
+            return 0
+        
+        lo = self._step_bounds[self._step]
+        hi = self._step_bounds[self._step + 1]
+        bar_time = int(self._timeline[self._step])
+        self._step += 1
+        
+        timeframe = self.timeframe
+        events_queue = self.events_queue
+        
+        for row, position in zip(self._rows[lo:hi].tolist(), self._positions[lo:hi].tolist()):
+            symbol = self.symbols[row]
+            record = self._series[row][position]
+            
+            buffer = self.bar_buffers[(symbol, timeframe)]
+            buffer.append_bar(record)
+            self.last_bar_time[symbol] = bar_time
+            
+            events_queue.put(DataEvent(
+                symbol=symbol,
+                data=Bar.from_record(record),
+                timeframe=timeframe
+            ))
+            
+            if self.derived_timeframes:
+                self._resample(symbol, buffer.view(1))
+        
+        counts = self.bar_counts[timeframe]
+        for row in self._rows[lo:hi].tolist():
+            counts[row] += 1
+        
+        self.clock.advance_to(
+            bar_close_time(bar_time, timeframe) - self.server_offset_seconds
+        )
+        
+        return hi - lo
+    
+    
+    # ========================================================================
+    # CONSULTAS (sin MT5 y sin barras posteriores al reloj)
+    # ========================================================================
+    
+    def get_latest_closed_bar(self, symbol: str, timeframe: str) -> Optional[Bar]:
+        """
+        Obtiene la última barra reproducida de un símbolo.
+        
+        Args:
+            symbol: Símbolo a consultar
+            timeframe: Timeframe de la barra
+        
+        Returns:
+            Registro Bar (None si aún no se reprodujo ninguna)
+        """
+        record = self.get_bar_buffer(symbol, timeframe).latest()
+        return None if record is None else Bar.from_record(record)
+    
+    
+    def get_latest_closed_bars(
+        self,
+        symbol: str,
+        timeframe: str,
+        num_bars: int = 100
+    ) -> pd.DataFrame:
+        """
+        Obtiene las últimas barras reproducidas de un símbolo.
+        
+        Args:
+            symbol: Símbolo a consultar
+            timeframe: Timeframe de las barras
+            num_bars: Cantidad de barras (acotada a buffer_capacity)
+        
+        Returns:
+            DataFrame con datos OHLCV (vacío si aún no hay barras)
+        """
+        bars = self.get_bars_view(symbol, timeframe, max(1, num_bars))
+        
+        if len(bars) == 0:
+            return pd.DataFrame()
+        
+        return bars_to_dataframe(bars)
+    
+    
+    def get_history(
+        self,
+        symbol: str,
+        timeframe: str = None,
+        start_time: int = None,
+        end_time: int = None
+    ) -> np.ndarray:
+        """
+        Retorna las barras reproducidas con start_time <= time < end_time.
+        
+        Para el timeframe base con BarStore de origen, la vista es
+        zero-copy sobre el archivo, truncada en la última barra reproducida.
+        
+        Args:
+            symbol: Símbolo a consultar
+            timeframe: Timeframe (default: timeframe del replay)
+            start_time: Epoch inicial inclusivo, hora del servidor
+            end_time: Epoch final exclusivo, hora del servidor
+        
+        Returns:
+            Array BAR_DTYPE de solo lectura
+        """
+        timeframe = timeframe or self.timeframe
+        replayed_end = self.get_bar_buffer(symbol, timeframe).last_time + 1
+        end_time = replayed_end if end_time is None else min(end_time, replayed_end)
+        
+        if self.SOURCE_STORE is not None and timeframe == self.timeframe:
+            return self.SOURCE_STORE.slice(symbol, timeframe, start_time, end_time)
+        
+        return super().get_history(symbol, timeframe, start_time, end_time)
+    
+    
+    def get_server_time_offset(self) -> int:
+        """
+        Retorna el desfase configurado (no hay ticks en vivo para estimarlo).
+        """
+        return self.server_offset_seconds
+    
+    
+    def _bar_close_origin_ns(self, bar_time: int, timeframe: str) -> int:
+        """
+        En el replay cada barra se emite en su cierre (reloj virtual): el
+        origen de la cadena es el instante actual.
+        """
+        return time.perf_counter_ns()
@@ -0,0 +1,113 @@
+"""
+LIA Engineering Solutions - Trading Framework
+Tick Cache - Snapshot de Ticks por Ciclo
+
+Responsabilidades:
+- Consultar el tick de cada símbolo como máximo una vez por ciclo de despacho
+- Reutilizar ticks dentro de una cota de antigüedad configurable (ms)
+- Dar a todos los consumidores una vista consistente de precios
+- Exponer contadores de aciertos y fallos
+
+Un ciclo comienza con begin_cycle(), que el Trading Director invoca en
+cada vuelta del loop principal.
+"""
+
+import MetaTrader5 as mt5
+import time
+from dataclasses import dataclass
+from typing import Any, Dict, Optional
+
+
+@dataclass(slots=True)
+class _TickEntry:
+    tick: Any
+    cycle: int
+    fetched_at: float
+
+
+class TickSnapshotCache:
+    """
+    Cache de ticks compartida por DataProvider, RiskManager y CurrencyConverter.
+    """
+    
+    def __init__(self, max_staleness_ms: int = 0):
+        """
+        Inicializa la cache.
+        
+        Args:
+            max_staleness_ms: Antigüedad máxima para reutilizar un tick de
+                un ciclo anterior (0 = solo dentro del mismo ciclo)
+        """
+        self.max_staleness_s = max_staleness_ms / 1000.0
+        self.cycle = 0
+        self._entries: Dict[str, _TickEntry] = {}
+        
+        # Contadores
+        self.hits = 0
+        self.misses = 0
+    
+    
+    def begin_cycle(self) -> None:
+        """
+        Marca el inicio de un nuevo ciclo de despacho. Los ticks del ciclo
+        anterior siguen sirviéndose mientras no superen max_staleness_ms.
+        """
+        self.cycle += 1
+    
+    
+    def get(self, symbol: str) -> Optional[Any]:
+        """
+        Obtiene el tick de un símbolo desde la cache o desde MT5.
+        
+        Args:
+            symbol: Símbolo a consultar
+        
+        Returns:
+            Tick de MT5 (namedtuple) o None si no está disponible
+        """
+        entry = self._entries.get(symbol)
+        
+        if entry is not None:
+            if entry.cycle == self.cycle or (
+                time.monotonic() - entry.fetched_at <= self.max_staleness_s
+            ):
+                self.hits += 1
+                return entry.tick
+        
+        self.misses += 1
+        tick = mt5.symbol_info_tick(symbol)
+        
+        if tick is None:
+            return None
+        
+        self._entries[symbol] = _TickEntry(tick, self.cycle, time.monotonic())
+        return tick
+    
+    
+    def invalidate(self, symbol: str = None) -> None:
+        """
+        Descarta el tick cacheado de un símbolo (o de todos).
+        
+        Args:
+            symbol: Símbolo a descartar (None = todos)
+        """
+        if symbol is None:
+            self._entries.clear()
+        else:
+            self._entries.pop(symbol, None)
+    
+    
+    def get_stats(self) -> Dict[str, float]:
+        """
+        Retorna estadísticas de la cache.
+        
+        Returns:
+            Diccionario con hits, misses, hit_rate y cycles
+        """
+        total = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / total if total else 0.0,
+            "cycles": self.cycle
+        }
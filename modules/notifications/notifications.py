@@ -5,11 +5,40 @@ Notification Service - Sistema de Notificaciones
 Soporta:
 - Notificaciones por consola (siempre activo)
 - Notificaciones por Telegram (opcional)
+- Archivo JSON lines y endpoint HTTP (opcionales)
+
+send_notification() solo encola: el envío ocurre en un hilo notificador
+con un único event loop de larga vida. Cada canal tiene su propia tarea,
+con rate limit y agrupación de ráfagas en mensajes resumen. Las colas son
+acotadas: bajo contrapresión se descartan las notificaciones más viejas.
 """
 
-from core.utils.utils import Utils
-from typing import Optional
 import asyncio
+import threading
+from collections import deque
+from typing import Dict, List, Optional
+from core.utils.logger import get_logger
+from modules.notifications.sinks import (
+    ConsoleSink, FileSink, HttpSink, Notification, NotificationSink,
+    TelegramSink, build_digest
+)
+
+
+LOG = get_logger("notifications")
+
+
+class _Channel:
+    """
+    Estado de un canal en el hilo notificador.
+    """
+    
+    def __init__(self, name: str, sink: NotificationSink, capacity: int):
+        self.name = name
+        self.sink = sink
+        self.pending: deque = deque(maxlen=capacity)
+        self.ready = asyncio.Event()
+        self.next_send = 0.0
+        self.stats = {"sent": 0, "digests": 0, "dropped": 0, "errors": 0}
 
 
 class NotificationService:
@@ -21,75 +50,267 @@ class NotificationService:
         self,
         telegram_enabled: bool = False,
         telegram_token: Optional[str] = None,
-        telegram_chat_id: Optional[str] = None
+        telegram_chat_id: Optional[str] = None,
+        file_path: Optional[str] = None,
+        http_url: Optional[str] = None,
+        sinks: Optional[List[NotificationSink]] = None,
+        queue_capacity: int = 1000,
+        digest_window_s: float = 1.0,
+        rate_limit_per_min: float = 20.0
     ):
         """
-        Inicializa el servicio de notificaciones.
+        Inicializa el servicio de notificaciones y arranca el hilo notificador.
         
         Args:
             telegram_enabled: Habilitar notificaciones por Telegram
             telegram_token: Token del bot de Telegram
             telegram_chat_id: Chat ID para enviar mensajes
+            file_path: Archivo JSON lines de notificaciones (None = sin archivo)
+            http_url: Endpoint para publicar notificaciones (None = sin HTTP)
+            sinks: Canales adicionales
+            queue_capacity: Notificaciones pendientes por cola (se descartan
+                las más viejas al superarla)
+            digest_window_s: Espera para agrupar ráfagas en canales con resumen
+            rate_limit_per_min: Máximo de mensajes por minuto en Telegram y HTTP
         """
         self.telegram_enabled = telegram_enabled
-        self.telegram_bot = None
         self.chat_id = telegram_chat_id
+        self.queue_capacity = queue_capacity
+        self.digest_window_s = digest_window_s
+        
+        remote_interval = 60.0 / rate_limit_per_min if rate_limit_per_min > 0 else 0.0
+        channel_sinks: List[NotificationSink] = [ConsoleSink()]
         
         # Inicializar Telegram si está habilitado
         if telegram_enabled and telegram_token and telegram_chat_id:
             try:
-                import telegram
-                self.telegram_bot = telegram.Bot(telegram_token)
-                print(f"{Utils.dateprint()} - ✓ Notificaciones Telegram habilitadas")
+                channel_sinks.append(
+                    TelegramSink(telegram_token, telegram_chat_id, min_interval_s=remote_interval)
+                )
+                LOG.info("✓ Notificaciones Telegram habilitadas")
             except ImportError:
-                print(
-                    f"{Utils.dateprint()} - WARNING: python-telegram-bot no instalado. "
+                LOG.warning(
+                    "WARNING: python-telegram-bot no instalado. "
                     "Solo se usarán notificaciones por consola."
                 )
                 self.telegram_enabled = False
             except Exception as e:
-                print(
-                    f"{Utils.dateprint()} - WARNING: Error al inicializar Telegram: {e}. "
-                    "Solo se usarán notificaciones por consola."
+                LOG.warning(
+                    "WARNING: Error al inicializar Telegram: {error}. "
+                    "Solo se usarán notificaciones por consola.",
+                    error=e
                 )
                 self.telegram_enabled = False
         else:
-            print(f"{Utils.dateprint()} - ℹ Notificaciones solo por consola")
+            self.telegram_enabled = False
+        
+        if file_path:
+            channel_sinks.append(FileSink(file_path))
+        if http_url:
+            channel_sinks.append(HttpSink(http_url, min_interval_s=remote_interval))
+        channel_sinks.extend(sinks or [])
+        
+        if len(channel_sinks) == 1:
+            LOG.info("ℹ Notificaciones solo por consola")
+        
+        # Cola de entrada (hilo de trading → hilo notificador)
+        self._queue: deque = deque(maxlen=queue_capacity)
+        self._wakeup_pending = False
+        self._closing = False
+        self.enqueued = 0
+        self.dropped = 0
+        
+        # Event loop de larga vida en el hilo notificador
+        self._loop = asyncio.new_event_loop()
+        self._wakeup = asyncio.Event()
+        self._draining = asyncio.Event()
+        self._channels: List[_Channel] = []
+        for sink in channel_sinks:
+            taken = sum(1 for channel in self._channels if channel.sink.name == sink.name)
+            name = f"{sink.name}_{taken + 1}" if taken else sink.name
+            self._channels.append(_Channel(name, sink, queue_capacity))
+        self._thread = threading.Thread(target=self._run, name="Notifier", daemon=True)
+        self._thread.start()
     
     
+    # ========================================================================
+    # API (hilo de trading)
+    # ========================================================================
+    
     def send_notification(self, title: str, message: str) -> None:
         """
-        Envía una notificación por todos los canales habilitados.
+        Encola una notificación para todos los canales (no bloquea).
         
         Args:
             title: Título de la notificación
             message: Contenido del mensaje
         """
-        # Notificación por consola (siempre activo)
-        full_message = f"\n{'='*60}\n📢 {title}\n{'-'*60}\n{message}\n{'='*60}\n"
-        print(full_message)
+        if self._closing:
+            return
         
-        # Notificación por Telegram (si está habilitado)
-        if self.telegram_enabled and self.telegram_bot:
-            try:
-                asyncio.run(self._send_telegram_message(title, message))
-            except Exception as e:
-                print(f"{Utils.dateprint()} - ERROR al enviar Telegram: {e}")
+        queue = self._queue
+        if len(queue) >= queue.maxlen:
+            self.dropped += 1
+        queue.append(Notification(title, message))
+        self.enqueued += 1
+        
+        # Un solo despertar por ráfaga: el notificador baja la marca antes de vaciar
+        if not self._wakeup_pending:
+            self._wakeup_pending = True
+            self._loop.call_soon_threadsafe(self._wakeup.set)
     
     
-    async def _send_telegram_message(self, title: str, message: str) -> None:
+    def shutdown(self, timeout: float = 5.0) -> None:
         """
-        Envía mensaje por Telegram de forma asíncrona.
+        Envía lo pendiente (sin esperas de agrupación ni rate limit),
+        cierra los canales y detiene el hilo notificador.
         
         Args:
-            title: Título del mensaje
-            message: Contenido del mensaje
+            timeout: Espera máxima en segundos
+        """
+        if self._closing:
+            return
+        
+        self._closing = True
+        if self._thread.is_alive():
+            self._loop.call_soon_threadsafe(self._wakeup.set)
+            self._thread.join(timeout)
+    
+    
+    def get_stats(self) -> Dict[str, Dict[str, int]]:
+        """
+        Estadísticas del servicio y de cada canal.
+        
+        Returns:
+            {'queue': {enqueued, dropped, pending}, '<canal>': {sent,
+            digests, dropped, errors}}
         """
-        full_text = f"📢 *{title}*\n\n{message}"
-        
-        async with self.telegram_bot:
-            await self.telegram_bot.send_message(
-                text=full_text,
-                chat_id=self.chat_id,
-                parse_mode='Markdown'
-            )
+        stats = {
+            "queue": {
+                "enqueued": self.enqueued,
+                "dropped": self.dropped,
+                "pending": len(self._queue),
+            }
+        }
+        for channel in self._channels:
+            stats[channel.name] = dict(channel.stats)
+        return stats
+    
+    
+    # ========================================================================
+    # HILO NOTIFICADOR
+    # ========================================================================
+    
+    def _run(self) -> None:
+        asyncio.set_event_loop(self._loop)
+        try:
+            self._loop.run_until_complete(self._main())
+        finally:
+            self._loop.close()
+    
+    
+    async def _main(self) -> None:
+        channels = []
+        for channel in self._channels:
+            try:
+                await channel.sink.start()
+                channels.append(channel)
+            except Exception as e:
+                LOG.error(
+                    "ERROR: No se pudo iniciar el canal {channel}: {error}",
+                    channel=channel.name, error=e
+                )
+        self._channels = channels
+        
+        tasks = [asyncio.create_task(self._channel_loop(channel)) for channel in channels]
+        
+        while True:
+            await self._wakeup.wait()
+            self._wakeup.clear()
+            self._wakeup_pending = False
+            
+            self._fan_out()
+            if self._closing:
+                break
+        
+        # Última entrega: los canales envían lo pendiente sin esperas y terminan
+        self._draining.set()
+        for channel in channels:
+            channel.ready.set()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        
+        for channel in channels:
+            try:
+                await channel.sink.close()
+            except Exception as e:
+                LOG.error(
+                    "ERROR: No se pudo cerrar el canal {channel}: {error}",
+                    channel=channel.name, error=e
+                )
+    
+    
+    def _fan_out(self) -> None:
+        """Reparte la cola de entrada entre las colas de los canales."""
+        notifications = []
+        queue = self._queue
+        while True:
+            try:
+                notifications.append(queue.popleft())
+            except IndexError:
+                break
+        
+        if not notifications:
+            return
+        
+        for channel in self._channels:
+            pending = channel.pending
+            channel.stats["dropped"] += max(0, len(pending) + len(notifications) - pending.maxlen)
+            pending.extend(notifications)
+            channel.ready.set()
+    
+    
+    async def _channel_loop(self, channel: _Channel) -> None:
+        """
+        Envía las notificaciones de un canal respetando su rate limit;
+        con resumen, agrupa lo acumulado durante la espera.
+        """
+        sink = channel.sink
+        loop = asyncio.get_running_loop()
+        
+        while True:
+            await channel.ready.wait()
+            channel.ready.clear()
+            
+            while channel.pending:
+                # Ventana de agrupación y rate limit del canal (se corta al cerrar)
+                delay = channel.next_send - loop.time()
+                if sink.digest:
+                    delay = max(delay, self.digest_window_s)
+                if delay > 0 and not self._draining.is_set():
+                    try:
+                        await asyncio.wait_for(self._draining.wait(), delay)
+                    except asyncio.TimeoutError:
+                        pass
+                
+                if sink.digest:
+                    batch = list(channel.pending)
+                    channel.pending.clear()
+                else:
+                    batch = [channel.pending.popleft()]
+                
+                try:
+                    await sink.send(build_digest(batch))
+                    channel.stats["sent"] += len(batch)
+                    if len(batch) > 1:
+                        channel.stats["digests"] += 1
+                except Exception as e:
+                    channel.stats["errors"] += 1
+                    LOG.error(
+                        "ERROR al enviar notificación por {channel}: {error}",
+                        channel=channel.name, error=e
+                    )
+                
+                channel.next_send = loop.time() + sink.min_interval_s
+            
+            if self._draining.is_set():
+                return
@@ -0,0 +1,289 @@
+"""
+LIA Engineering Solutions - Trading Framework
+Notification Sinks - Canales de Notificación
+
+Cada canal recibe lotes de notificaciones en el hilo del notificador
+(un único event loop de larga vida) y declara su política de envío:
+
+- min_interval_s: separación mínima entre envíos (rate limit del canal)
+- digest: si True, las notificaciones acumuladas se envían como un único
+  mensaje resumen; si False, una por una
+
+Canales incluidos: consola, archivo JSON lines, HTTP (POST JSON) y
+Telegram.
+"""
+
+import asyncio
+import http.client
+import json
+import os
+import time
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Dict, List, Optional
+from urllib.parse import urlsplit
+
+
+@dataclass(slots=True)
+class Notification:
+    """
+    Notificación encolada (o resumen de varias).
+    """
+    title: str
+    message: str
+    created: float = field(default_factory=time.time)
+    count: int = 1
+
+
+def build_digest(notifications: List[Notification]) -> Notification:
+    """
+    Combina varias notificaciones en un único mensaje resumen.
+    
+    Args:
+        notifications: Notificaciones en orden de llegada
+    
+    Returns:
+        La notificación original si es una sola, o el resumen
+    """
+    if len(notifications) == 1:
+        return notifications[0]
+    
+    body = "\n\n".join(
+        f"[{datetime.fromtimestamp(n.created):%H:%M:%S}] {n.title}\n{n.message}"
+        for n in notifications
+    )
+    return Notification(
+        title=f"{len(notifications)} notificaciones",
+        message=body,
+        created=notifications[0].created,
+        count=len(notifications)
+    )
+
+
+class NotificationSink:
+    """
+    Canal de notificaciones (clase base).
+    """
+    
+    name = "sink"
+    
+    def __init__(self, min_interval_s: float = 0.0, digest: bool = False):
+        """
+        Args:
+            min_interval_s: Separación mínima entre envíos (0 = sin límite)
+            digest: Enviar lo acumulado como un único resumen
+        """
+        self.min_interval_s = min_interval_s
+        self.digest = digest
+    
+    
+    async def start(self) -> None:
+        """Abre recursos del canal (en el hilo del notificador)."""
+    
+    
+    async def send(self, notification: Notification) -> None:
+        """
+        Envía una notificación (o resumen).
+        
+        Raises:
+            Exception: Si el envío falla (el servicio lo registra)
+        """
+        raise NotImplementedError
+    
+    
+    async def close(self) -> None:
+        """Libera recursos del canal."""
+
+
+class ConsoleSink(NotificationSink):
+    """
+    Imprime cada notificación en un recuadro por consola.
+    """
+    
+    name = "console"
+    
+    async def send(self, notification: Notification) -> None:
+        print(
+            f"\n{'='*60}\n📢 {notification.title}\n{'-'*60}\n"
+            f"{notification.message}\n{'='*60}\n",
+            flush=True
+        )
+
+
+class FileSink(NotificationSink):
+    """
+    Agrega cada notificación como una línea JSON a un archivo.
+    """
+    
+    name = "file"
+    
+    def __init__(self, path: str, min_interval_s: float = 0.0, digest: bool = False):
+        """
+        Args:
+            path: Archivo destino (se crea el directorio si no existe)
+            min_interval_s: Separación mínima entre envíos
+            digest: Enviar lo acumulado como un único resumen
+        """
+        super().__init__(min_interval_s, digest)
+        self.path = path
+        self._file = None
+    
+    
+    async def start(self) -> None:
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        self._file = open(self.path, "a", encoding="utf-8")
+    
+    
+    async def send(self, notification: Notification) -> None:
+        self._file.write(json.dumps({
+            'time': datetime.fromtimestamp(notification.created).isoformat(timespec='milliseconds'),
+            'title': notification.title,
+            'message': notification.message,
+            'count': notification.count,
+        }, ensure_ascii=False) + "\n")
+        self._file.flush()
+    
+    
+    async def close(self) -> None:
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+
+class HttpSink(NotificationSink):
+    """
+    Publica cada notificación como JSON (POST) a un endpoint HTTP(S),
+    reutilizando una conexión persistente.
+    """
+    
+    name = "http"
+    
+    def __init__(
+        self,
+        url: str,
+        headers: Optional[Dict[str, str]] = None,
+        timeout_s: float = 5.0,
+        min_interval_s: float = 1.0,
+        digest: bool = True
+    ):
+        """
+        Args:
+            url: Endpoint (http:// o https://)
+            headers: Headers adicionales (ej: autorización)
+            timeout_s: Timeout de conexión y respuesta
+            min_interval_s: Separación mínima entre envíos
+            digest: Enviar lo acumulado como un único resumen
+        
+        Raises:
+            ValueError: Si la URL no es http(s)
+        """
+        super().__init__(min_interval_s, digest)
+        
+        parts = urlsplit(url)
+        if parts.scheme not in ("http", "https") or not parts.hostname:
+            raise ValueError(f"URL de notificaciones '{url}' no válida")
+        
+        self.url = url
+        self.timeout_s = timeout_s
+        self.headers = {"Content-Type": "application/json", **(headers or {})}
+        self._parts = parts
+        self._path = (parts.path or "/") + (f"?{parts.query}" if parts.query else "")
+        self._connection: Optional[http.client.HTTPConnection] = None
+    
+    
+    def _connect(self) -> http.client.HTTPConnection:
+        if self._connection is None:
+            connection_class = (
+                http.client.HTTPSConnection if self._parts.scheme == "https"
+                else http.client.HTTPConnection
+            )
+            self._connection = connection_class(
+                self._parts.hostname, self._parts.port, timeout=self.timeout_s
+            )
+        return self._connection
+    
+    
+    def _post(self, body: bytes) -> int:
+        # Un reintento si el servidor cerró la conexión persistente
+        for attempt in range(2):
+            connection = self._connect()
+            try:
+                connection.request("POST", self._path, body=body, headers=self.headers)
+                response = connection.getresponse()
+                response.read()
+                return response.status
+            except (http.client.HTTPException, ConnectionError):
+                connection.close()
+                self._connection = None
+                if attempt:
+                    raise
+    
+    
+    async def send(self, notification: Notification) -> None:
+        body = json.dumps({
+            'title': notification.title,
+            'message': notification.message,
+            'time': notification.created,
+            'count': notification.count,
+        }, ensure_ascii=False).encode("utf-8")
+        
+        status = await asyncio.to_thread(self._post, body)
+        if status >= 400:
+            raise RuntimeError(f"HTTP {status} desde {self.url}")
+    
+    
+    async def close(self) -> None:
+        if self._connection is not None:
+            self._connection.close()
+            self._connection = None
+
+
+class TelegramSink(NotificationSink):
+    """
+    Envía notificaciones a un chat de Telegram con un único bot (y sesión
+    HTTP) durante toda la vida del servicio.
+    """
+    
+    name = "telegram"
+    
+    def __init__(
+        self,
+        token: str,
+        chat_id: str,
+        min_interval_s: float = 3.0,
+        digest: bool = True,
+        base_url: Optional[str] = None
+    ):
+        """
+        Args:
+            token: Token del bot de Telegram
+            chat_id: Chat ID destino
+            min_interval_s: Separación mínima entre mensajes
+            digest: Enviar lo acumulado como un único resumen
+            base_url: Endpoint de la Bot API (None = api.telegram.org;
+                ej: servidor Bot API propio)
+        
+        Raises:
+            ImportError: Si python-telegram-bot no está instalado
+        """
+        super().__init__(min_interval_s, digest)
+        
+        import telegram
+        self.bot = telegram.Bot(token, base_url=base_url) if base_url else telegram.Bot(token)
+        self.chat_id = chat_id
+    
+    
+    async def start(self) -> None:
+        await self.bot.initialize()
+    
+    
+    async def send(self, notification: Notification) -> None:
+        await self.bot.send_message(
+            text=f"📢 *{notification.title}*\n\n{notification.message}",
+            chat_id=self.chat_id,
+            parse_mode='Markdown'
+        )
+    
+    
+    async def close(self) -> None:
+        await self.bot.shutdown()
@@ -0,0 +1,441 @@
+"""
+LIA Engineering Solutions - Trading Framework
+Optimizer - Barrido de Parámetros y Walk-Forward de la Estrategia RSI
+
+Evalúa combinaciones de los parámetros del Signal Generator (rsi_period,
+rsi_upper, rsi_lower, sl_points, tp_points) con el VectorizedBacktester,
+repartidas en un pool de procesos.
+
+Implementación:
+- El proceso principal prepara una sola vez el estado del backtester
+  (recorridos de precios, pirámides, relojes) y lo guarda como .npy en un
+  directorio compartido (/dev/shm si existe)
+- Cada worker lo abre como memmap de solo lectura en su inicialización:
+  el histórico nunca se serializa y todos los procesos comparten las
+  mismas páginas de memoria
+- Las tareas son bloques de combinaciones ordenadas por rsi_period (el
+  RSI se calcula una vez por período y bloque); cada tarea devuelve solo
+  tuplas de métricas
+- Walk-forward: ventanas móviles de entrenamiento/prueba; el mejor set
+  de cada ventana de entrenamiento se evalúa fuera de muestra
+"""
+
+import itertools
+import os
+import random
+import shutil
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Optional, Sequence, Tuple
+import numpy as np
+import pandas as pd
+from core.data.bar_store import BarStore
+from modules.vectorized_backtester.vectorized_backtester import VectorizedBacktester
+
+
+# Parámetros optimizables (nombres de TradingConfig / SignalGenerator)
+PARAMETER_NAMES = ('rsi_period', 'rsi_upper', 'rsi_lower', 'sl_points', 'tp_points')
+
+# Métricas de VectorizedBacktester.summarize(), en orden de columnas
+METRIC_NAMES = ('trades', 'win_rate', 'net_profit', 'profit_factor', 'max_drawdown', 'sharpe')
+
+
+def parameter_grid(space: Dict[str, Sequence]) -> List[Dict]:
+    """
+    Producto cartesiano de los valores de cada parámetro.
+    
+    Descarta las combinaciones con rsi_lower >= rsi_upper.
+    
+    Args:
+        space: Valores por parámetro (ej: {'rsi_period': [7, 14, 21], ...});
+            los parámetros ausentes toman el valor del config al evaluar
+    
+    Returns:
+        Lista de combinaciones (dict parámetro → valor)
+    """
+    names = list(space)
+    combos = [dict(zip(names, values)) for values in itertools.product(*space.values())]
+    
+    return [combo for combo in combos if _is_valid(combo)]
+
+
+def random_parameters(space: Dict[str, object], num_samples: int, seed: int = None) -> List[Dict]:
+    """
+    Combinaciones aleatorias del espacio de parámetros.
+    
+    Args:
+        space: Por parámetro, una tupla (mínimo, máximo) -enteros si ambos
+            extremos son int, uniforme si no- o una lista de valores
+        num_samples: Combinaciones válidas a generar
+        seed: Semilla para reproducibilidad
+    
+    Returns:
+        Lista de combinaciones (dict parámetro → valor)
+    """
+    rng = random.Random(seed)
+    combos = []
+    
+    while len(combos) < num_samples:
+        combo = {}
+        for name, domain in space.items():
+            if isinstance(domain, tuple):
+                low, high = domain
+                if isinstance(low, int) and isinstance(high, int):
+                    combo[name] = rng.randint(low, high)
+                else:
+                    combo[name] = rng.uniform(low, high)
+            else:
+                combo[name] = rng.choice(list(domain))
+        
+        if _is_valid(combo):
+            combos.append(combo)
+    
+    return combos
+
+
+def _is_valid(combo: Dict) -> bool:
+    if 'rsi_lower' in combo and 'rsi_upper' in combo:
+        return combo['rsi_lower'] < combo['rsi_upper']
+    return True
+
+
+# ============================================================================
+# WORKERS
+# ============================================================================
+
+# Backtester del proceso worker (abierto por _init_worker)
+_WORKER_BACKTESTER: Optional[VectorizedBacktester] = None
+
+
+def _init_worker(state_dir: str) -> None:
+    global _WORKER_BACKTESTER
+    _WORKER_BACKTESTER = VectorizedBacktester.load(state_dir)
+
+
+def _evaluate_block(task: Tuple[List[Tuple], float, List[Tuple[int, int]]]) -> List[Tuple]:
+    """
+    Evalúa un bloque de combinaciones en cada ventana.
+    
+    Args:
+        task: (combinaciones como tuplas de PARAMETER_NAMES, volumen,
+            ventanas (start_time, end_time))
+    
+    Returns:
+        Por combinación y ventana: (índice de combinación, índice de
+        ventana, *métricas en orden METRIC_NAMES)
+    """
+    combos, volume, windows = task
+    backtester = _WORKER_BACKTESTER
+    results = []
+    
+    for index, params in combos:
+        for window, (start_time, end_time) in enumerate(windows):
+            trades = backtester.run(
+                *params, volume=volume, start_time=start_time, end_time=end_time
+            )
+            stats = backtester.summarize(trades)
+            results.append((index, window) + tuple(stats[name] for name in METRIC_NAMES))
+    
+    return results
+
+
+class ParameterOptimizer:
+    """
+    Barrido paralelo de parámetros y walk-forward sobre el histórico local.
+    """
+    
+    def __init__(
+        self,
+        backtester: VectorizedBacktester,
+        defaults: Dict,
+        volume: float = 0.01,
+        workers: int = 0,
+        block_size: int = 16,
+        state_dir: str = None
+    ):
+        """
+        Inicializa el optimizador (el pool arranca en la primera evaluación).
+        
+        Args:
+            backtester: Backtester preparado con el histórico completo
+            defaults: Valor de cada parámetro de PARAMETER_NAMES no barrido
+            volume: Volumen por trade
+            workers: Procesos del pool (0 = uno por CPU; 1 = sin pool)
+            block_size: Combinaciones por tarea
+            state_dir: Directorio para el estado compartido (default:
+                temporal en /dev/shm si existe)
+        """
+        self.BACKTESTER = backtester
+        self.defaults = {name: defaults[name] for name in PARAMETER_NAMES}
+        self.volume = volume
+        self.workers = workers or os.cpu_count() or 1
+        self.block_size = max(1, block_size)
+        
+        self._state_dir = state_dir
+        self._owns_state_dir = state_dir is None
+        self._pool: Optional[ProcessPoolExecutor] = None
+    
+    
+    @classmethod
+    def from_config(
+        cls,
+        config,
+        bar_store: BarStore,
+        start_time: int = None,
+        end_time: int = None,
+        symbol_specs: Optional[Dict[str, Dict]] = None,
+        workers: int = 0
+    ) -> "ParameterOptimizer":
+        """
+        Crea el optimizador con los símbolos, costos y parámetros por
+        defecto de un TradingConfig.
+        
+        Args:
+            config: TradingConfig
+            bar_store: Almacén con las barras de config.timeframe
+            start_time: Epoch inicial del histórico (None = todo)
+            end_time: Epoch final exclusivo del histórico (None = todo)
+            symbol_specs: Especificaciones por símbolo
+            workers: Procesos del pool (0 = uno por CPU)
+        
+        Returns:
+            ParameterOptimizer
+        """
+        bars = {
+            symbol: bar_store.slice(symbol, config.timeframe, start_time, end_time)
+            for symbol in config.symbols
+        }
+        backtester = VectorizedBacktester.from_config(config, bars, symbol_specs)
+        defaults = {name: getattr(config, name) for name in PARAMETER_NAMES}
+        
+        return cls(backtester, defaults, volume=config.fixed_volume, workers=workers)
+    
+    
+    # ========================================================================
+    # CICLO DE VIDA
+    # ========================================================================
+    
+    def _ensure_pool(self) -> None:
+        if self._pool is not None or self.workers <= 1:
+            return
+        
+        if self._state_dir is None:
+            root = "/dev/shm" if os.path.isdir("/dev/shm") else None
+            self._state_dir = tempfile.mkdtemp(prefix="lia-optimizer-", dir=root)
+        
+        self.BACKTESTER.save(self._state_dir)
+        self._pool = ProcessPoolExecutor(
+            max_workers=self.workers,
+            initializer=_init_worker,
+            initargs=(self._state_dir,)
+        )
+    
+    
+    def close(self) -> None:
+        """Detiene el pool y elimina el estado compartido temporal."""
+        if self._pool is not None:
+            self._pool.shutdown(wait=True)
+            self._pool = None
+        
+        if self._owns_state_dir and self._state_dir is not None:
+            shutil.rmtree(self._state_dir, ignore_errors=True)
+            self._state_dir = None
+    
+    
+    def __enter__(self) -> "ParameterOptimizer":
+        return self
+    
+    
+    def __exit__(self, *exc) -> None:
+        self.close()
+    
+    
+    # ========================================================================
+    # EVALUACIÓN
+    # ========================================================================
+    
+    def _complete(self, combo: Dict) -> Tuple:
+        params = {**self.defaults, **combo}
+        return tuple(params[name] for name in PARAMETER_NAMES)
+    
+    
+    def _evaluate(self, combos: List[Dict], windows: List[Tuple[int, int]]) -> np.ndarray:
+        """
+        Evalúa todas las combinaciones en todas las ventanas.
+        
+        Returns:
+            Array (combinaciones × ventanas × métricas)
+        """
+        params = sorted(
+            ((index, self._complete(combo)) for index, combo in enumerate(combos)),
+            key=lambda item: item[1][0]
+        )
+        tasks = [
+            (params[i:i + self.block_size], self.volume, windows)
+            for i in range(0, len(params), self.block_size)
+        ]
+        
+        self._ensure_pool()
+        if self._pool is None:
+            global _WORKER_BACKTESTER
+            _WORKER_BACKTESTER = self.BACKTESTER
+            blocks = map(_evaluate_block, tasks)
+        else:
+            blocks = self._pool.map(_evaluate_block, tasks)
+        
+        metrics = np.zeros((len(combos), len(windows), len(METRIC_NAMES)))
+        for block in blocks:
+            for index, window, *values in block:
+                metrics[index, window] = values
+        
+        return metrics
+    
+    
+    def _table(self, combos: List[Dict], metrics: np.ndarray, rank_by: str, min_trades: int) -> pd.DataFrame:
+        table = pd.DataFrame(
+            [dict(zip(PARAMETER_NAMES, self._complete(combo))) for combo in combos]
+        )
+        for i, name in enumerate(METRIC_NAMES):
+            table[name] = metrics[:, i]
+        
+        table['trades'] = table['trades'].astype(int)
+        table = table[table['trades'] >= min_trades]
+        
+        return table.sort_values(rank_by, ascending=False, kind='stable').reset_index(drop=True)
+    
+    
+    def sweep(
+        self,
+        combos: List[Dict],
+        start_time: int = None,
+        end_time: int = None,
+        rank_by: str = 'sharpe',
+        min_trades: int = 1
+    ) -> pd.DataFrame:
+        """
+        Evalúa las combinaciones en un mismo período y las ordena.
+        
+        Args:
+            combos: Combinaciones (parameter_grid / random_parameters)
+            start_time: Señales desde este epoch (None = todo el histórico)
+            end_time: Señales antes de este epoch (None = todo el histórico)
+            rank_by: Métrica de METRIC_NAMES para ordenar (mayor es mejor)
+            min_trades: Trades cerrados mínimos para figurar en la tabla
+        
+        Returns:
+            DataFrame con parámetros y métricas, mejor combinación primero
+        """
+        metrics = self._evaluate(combos, [(start_time, end_time)])
+        return self._table(combos, metrics[:, 0], rank_by, min_trades)
+    
+    
+    def walk_forward_windows(
+        self,
+        train_days: float,
+        test_days: float,
+        step_days: float = None
+    ) -> List[Tuple[int, int, int]]:
+        """
+        Ventanas móviles sobre el histórico del backtester.
+        
+        Args:
+            train_days: Duración del período de entrenamiento
+            test_days: Duración del período de prueba
+            step_days: Avance entre ventanas (default: test_days)
+        
+        Returns:
+            Lista de (inicio de entrenamiento, inicio de prueba, fin de prueba)
+        """
+        first = min(int(path.bar_times[0]) for path in self.BACKTESTER.paths)
+        last = max(int(path.bar_close_times[-1]) for path in self.BACKTESTER.paths)
+        train, test = int(train_days * 86400), int(test_days * 86400)
+        step = int((step_days or test_days) * 86400)
+        
+        windows = []
+        start = first
+        while start + train + test <= last:
+            windows.append((start, start + train, start + train + test))
+            start += step
+        
+        return windows
+    
+    
+    def walk_forward(
+        self,
+        combos: List[Dict],
+        train_days: float,
+        test_days: float,
+        step_days: float = None,
+        rank_by: str = 'sharpe',
+        min_trades: int = 1
+    ) -> pd.DataFrame:
+        """
+        Optimización walk-forward: en cada ventana elige la mejor
+        combinación en entrenamiento y la evalúa en el período siguiente.
+        
+        Todas las combinaciones se evalúan en todas las ventanas dentro de
+        una misma pasada del pool.
+        
+        Args:
+            combos: Combinaciones a evaluar
+            train_days: Duración del período de entrenamiento
+            test_days: Duración del período de prueba
+            step_days: Avance entre ventanas (default: test_days)
+            rank_by: Métrica de METRIC_NAMES a maximizar
+            min_trades: Trades mínimos en entrenamiento para elegir un set
+        
+        Returns:
+            DataFrame con una fila por ventana: fechas, 'selected', parámetros
+            elegidos, métrica en entrenamiento y métricas fuera de muestra
+            ('oos_*'). Si ninguna combinación alcanza min_trades (o la métrica
+            no está definida) la ventana queda con selected=False, sin
+            parámetros y sin operar fuera de muestra (oos_trades = 0)
+        
+        Raises:
+            ValueError: Si el histórico no alcanza para una ventana
+        """
+        windows = self.walk_forward_windows(train_days, test_days, step_days)
+        if not windows:
+            raise ValueError("El histórico no alcanza para una ventana de walk-forward")
+        
+        periods = []
+        for train_start, test_start, test_end in windows:
+            periods.append((train_start, test_start))
+            periods.append((test_start, test_end))
+        
+        metrics = self._evaluate(combos, periods)
+        rank = METRIC_NAMES.index(rank_by)
+        rows = []
+        
+        for w, (train_start, test_start, test_end) in enumerate(windows):
+            train = metrics[:, 2 * w]
+            eligible = (train[:, 0] >= min_trades) & ~np.isnan(train[:, rank])
+            
+            row = {
+                'train_start': pd.Timestamp(train_start, unit='s'),
+                'test_start': pd.Timestamp(test_start, unit='s'),
+                'test_end': pd.Timestamp(test_end, unit='s'),
+                'selected': bool(eligible.any()),
+            }
+            
+            if not eligible.any():
+                # Sin set elegible: la ventana no opera fuera de muestra
+                row.update(dict.fromkeys(PARAMETER_NAMES))
+                row[f'train_{rank_by}'] = np.nan
+                row.update({f'oos_{name}': np.nan for name in METRIC_NAMES})
+                row['oos_trades'] = 0
+                rows.append(row)
+                continue
+            
+            best = int(np.argmax(np.where(eligible, train[:, rank], -np.inf)))
+            row.update(dict(zip(PARAMETER_NAMES, self._complete(combos[best]))))
+            row[f'train_{rank_by}'] = train[best, rank]
+            row.update({
+                f'oos_{name}': value for name, value in zip(METRIC_NAMES, metrics[best, 2 * w + 1])
+            })
+            rows.append(row)
+        
+        table = pd.DataFrame(rows)
+        table['oos_trades'] = table['oos_trades'].astype(int)
+        
+        return table
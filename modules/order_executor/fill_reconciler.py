@@ -0,0 +1,326 @@
+"""
+LIA Engineering Solutions - Trading Framework
+Fill Reconciler - Confirmación Asíncrona de Ejecuciones
+
+Responsabilidades:
+- Registrar órdenes enviadas pendientes de confirmación (in-flight)
+- Consultar deals en un hilo de fondo con una única consulta por rango
+  de tiempo para todas las órdenes pendientes
+- Generar ExecutionEvent con el precio y la hora real del deal
+- Recurrir al resultado de order_send si el deal no aparece a tiempo
+
+El hilo del Trading Director nunca espera confirmaciones: solo encola
+órdenes en el reconciliador y recibe los ExecutionEvents por la cola.
+"""
+
+import threading
+import time
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from queue import Queue
+from typing import Callable, Dict, List, Set
+import MetaTrader5 as mt5
+from core.events.events import SignalType
+from core.events.fast_events import ExecutionEvent, validate_event
+from core.utils.logger import get_logger
+
+
+LOG = get_logger("fill_reconciler")
+
+
+@dataclass(slots=True)
+class InFlightOrder:
+    """
+    Orden enviada a MT5 cuyo deal aún no fue confirmado.
+    """
+    order: int
+    symbol: str
+    signal: SignalType
+    volume: float
+    price: float
+    sent_at: float
+    magic: int = 0
+    position_id: int = 0
+    is_exit: bool = False
+    filled_volume: float = 0.0
+    origin_ns: int = 0
+    seen_deals: Set[int] = field(default_factory=set)
+
+
+class FillReconciler:
+    """
+    Confirma ejecuciones en un hilo de fondo consultando deals en lote.
+    """
+    
+    def __init__(
+        self,
+        events_queue: Queue,
+        poll_interval_ms: int = 50,
+        timeout_s: float = 10.0,
+        server_offset_seconds: int = 0,
+        clock: Callable[[], float] = time.time,
+        background: bool = True
+    ):
+        """
+        Inicializa el reconciliador (el hilo arranca con start()).
+        
+        Args:
+            events_queue: Cola de eventos del sistema (thread-safe)
+            poll_interval_ms: Intervalo entre consultas de deals
+            timeout_s: Espera máxima de un deal antes de usar el
+                resultado de order_send
+            server_offset_seconds: Hora del servidor - UTC (los deals de
+                MT5 están en hora del servidor)
+            clock: Fuente de tiempo epoch UTC (en un backtest, el reloj
+                virtual del replay)
+            background: Si False no se usa hilo: track() reconcilia en el
+                acto (backtests deterministas con un broker en proceso)
+        """
+        self.events_queue = events_queue
+        self.poll_interval = poll_interval_ms / 1000.0
+        self.timeout_s = timeout_s
+        self.server_offset_seconds = server_offset_seconds
+        self.clock = clock
+        self.background = background
+        
+        self._in_flight: Dict[int, InFlightOrder] = {}
+        self._lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._stop = threading.Event()
+        self._thread = None
+        
+        # Estadísticas
+        self.confirmed = 0
+        self.timed_out = 0
+    
+    
+    # ========================================================================
+    # CICLO DE VIDA
+    # ========================================================================
+    
+    def start(self) -> None:
+        """Arranca el hilo de reconciliación (daemon)."""
+        if not self.background:
+            return
+        
+        if self._thread is not None and self._thread.is_alive():
+            return
+        
+        self._stop.clear()
+        self._thread = threading.Thread(
+            target=self._run,
+            name="FillReconciler",
+            daemon=True
+        )
+        self._thread.start()
+    
+    
+    def stop(self, timeout: float = 1.0) -> None:
+        """Detiene el hilo de reconciliación."""
+        self._stop.set()
+        self._wakeup.set()
+        
+        if self._thread is not None:
+            self._thread.join(timeout)
+    
+    
+    @property
+    def pending(self) -> int:
+        """Cantidad de órdenes pendientes de confirmación."""
+        with self._lock:
+            return len(self._in_flight)
+    
+    
+    # ========================================================================
+    # REGISTRO DE ÓRDENES
+    # ========================================================================
+    
+    def track(self, result, origin_ns: int = 0) -> None:
+        """
+        Registra una orden ejecutada para confirmar su deal en segundo plano.
+        No bloquea (sin hilo de fondo, reconcilia en el acto).
+        
+        Args:
+            result: Resultado de mt5.order_send()
+            origin_ns: Origen de la cadena de eventos de la orden, que
+                heredan sus ExecutionEvents (0 = sin origen)
+        """
+        # Cierres: la request referencia la posición; aperturas: la
+        # posición toma el ticket de la orden (cuentas hedging)
+        closed_position = getattr(result.request, 'position', 0) or 0
+        
+        order = InFlightOrder(
+            order=result.order,
+            symbol=result.request.symbol,
+            signal=(
+                SignalType.BUY if result.request.type == mt5.ORDER_TYPE_BUY
+                else SignalType.SELL
+            ),
+            volume=result.request.volume,
+            price=result.price,
+            sent_at=self.clock(),
+            magic=getattr(result.request, 'magic', 0) or 0,
+            position_id=closed_position or result.order,
+            is_exit=bool(closed_position),
+            origin_ns=origin_ns
+        )
+        
+        with self._lock:
+            self._in_flight[order.order] = order
+        
+        if not self.background:
+            self.reconcile()
+            return
+        
+        self._wakeup.set()
+    
+    
+    # ========================================================================
+    # RECONCILIACIÓN
+    # ========================================================================
+    
+    def _run(self) -> None:
+        """Loop del hilo: duerme sin órdenes pendientes, consulta con ellas."""
+        while not self._stop.is_set():
+            if self.pending == 0:
+                self._wakeup.wait()
+                self._wakeup.clear()
+                continue
+            
+            try:
+                self.reconcile()
+            except Exception as e:
+                LOG.error("ERROR: Reconciliación de deals falló: {error}", error=e)
+            
+            self._stop.wait(self.poll_interval)
+    
+    
+    def reconcile(self) -> int:
+        """
+        Consulta los deals de todas las órdenes pendientes en una sola
+        llamada por rango de tiempo y genera los ExecutionEvents.
+        
+        Returns:
+            Cantidad de ExecutionEvents generados
+        """
+        with self._lock:
+            orders = list(self._in_flight.values())
+        
+        if not orders:
+            return 0
+        
+        now = self.clock()
+        oldest = min(order.sent_at for order in orders)
+        
+        # Rango en hora del servidor, con margen por desfase de relojes
+        date_from = self._to_server_datetime(oldest - 60)
+        date_to = self._to_server_datetime(now + 86400)
+        
+        deals = mt5.history_deals_get(date_from, date_to) or ()
+        
+        by_order: Dict[int, InFlightOrder] = {order.order: order for order in orders}
+        emitted = 0
+        done: List[int] = []
+        
+        for deal in deals:
+            order = by_order.get(deal.order)
+            
+            # Cada consulta vuelve a traer los deals ya procesados
+            if order is None or deal.ticket in order.seen_deals:
+                continue
+            order.seen_deals.add(deal.ticket)
+            
+            fill_time = datetime.fromtimestamp(
+                deal.time_msc / 1000.0, tz=timezone.utc
+            ).replace(tzinfo=None)
+            
+            self._put_execution_event(
+                order, deal.price, fill_time, deal.volume,
+                position_id=deal.position_id or order.position_id,
+                is_exit=deal.entry != mt5.DEAL_ENTRY_IN
+            )
+            self.confirmed += 1
+            emitted += 1
+            
+            order.filled_volume += deal.volume
+            if order.filled_volume >= order.volume - 1e-9:
+                done.append(order.order)
+        
+        # Órdenes incompletas tras el timeout
+        for order in orders:
+            if order.order in done or now - order.sent_at <= self.timeout_s:
+                continue
+            
+            if order.filled_volume > 0:
+                # Ejecución parcial: lo confirmado ya se informó, el resto
+                # no se ejecutó
+                LOG.warning(
+                    "WARNING: Orden {order} ({symbol}) ejecutada parcialmente: "
+                    "{filled} de {volume} lotes en {timeout}s.",
+                    order=order.order, symbol=order.symbol,
+                    filled=order.filled_volume, volume=order.volume,
+                    timeout=self.timeout_s
+                )
+            else:
+                # Sin deal: usar datos de order_send
+                LOG.warning(
+                    "WARNING: Deal de la orden {order} ({symbol}) no confirmado "
+                    "en {timeout}s. Se usa el precio de order_send.",
+                    order=order.order, symbol=order.symbol, timeout=self.timeout_s
+                )
+                self._put_execution_event(
+                    order, order.price, self._to_server_datetime(now), order.volume,
+                    position_id=order.position_id,
+                    is_exit=order.is_exit
+                )
+                emitted += 1
+            
+            self.timed_out += 1
+            done.append(order.order)
+        
+        with self._lock:
+            for ticket in done:
+                self._in_flight.pop(ticket, None)
+        
+        return emitted
+    
+    
+    def _to_server_datetime(self, epoch: float) -> datetime:
+        return datetime.fromtimestamp(
+            epoch + self.server_offset_seconds, tz=timezone.utc
+        ).replace(tzinfo=None)
+    
+    
+    def _put_execution_event(
+        self,
+        order: InFlightOrder,
+        price: float,
+        fill_time: datetime,
+        volume: float,
+        position_id: int,
+        is_exit: bool
+    ) -> None:
+        """Crea, valida y encola el ExecutionEvent de un deal."""
+        execution_event = ExecutionEvent(
+            symbol=order.symbol,
+            signal=order.signal,
+            fill_price=float(price),
+            fill_time=fill_time,
+            volume=float(volume),
+            magic_number=int(order.magic),
+            position_id=int(position_id),
+            is_exit=bool(is_exit),
+            origin_ns=order.origin_ns
+        )
+        
+        # Datos provenientes del broker: validar en la frontera del sistema
+        try:
+            validate_event(execution_event)
+        except Exception as e:
+            LOG.error(
+                "ERROR: Datos de ejecución inválidos para {symbol}: {error}",
+                symbol=order.symbol, error=e
+            )
+            return
+        
+        self.events_queue.put(execution_event)
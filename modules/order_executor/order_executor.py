@@ -5,20 +5,23 @@ Order Executor - Ejecutor de Órdenes
 Responsabilidades:
 - Ejecutar órdenes de mercado y pending
 - Cerrar posiciones por ticket
-- Generar ExecutionEvents
+- Generar ExecutionEvents (vía FillReconciler, sin bloquear)
 - Manejo de errores de ejecución
 """
 
-from core.events.events import (
-    OrderEvent, ExecutionEvent, PlacedPendingOrderEvent, SignalType
-)
-from core.utils.utils import Utils
+from core.events.fast_events import OrderEvent, PlacedPendingOrderEvent
+from core.utils.latency import LatencyMonitor
+from core.utils.logger import get_logger
+from modules.order_executor.fill_reconciler import FillReconciler
 from modules.portfolio.portfolio import Portfolio
+from modules.symbol_registry.symbol_registry import SymbolRegistry
 from queue import Queue
-import MetaTrader5 as mt5
+from typing import Optional
 import time
-from datetime import datetime
-import pandas as pd
+import MetaTrader5 as mt5
+
+
+LOG = get_logger("order_executor")
 
 
 class OrderExecutor:
@@ -26,18 +29,36 @@ class OrderExecutor:
     Ejecuta órdenes en MetaTrader 5 y gestiona el ciclo de vida de trades.
     """
     
-    def __init__(self, events_queue: Queue, portfolio: Portfolio):
+    def __init__(
+        self,
+        events_queue: Queue,
+        portfolio: Portfolio,
+        fill_reconciler: Optional[FillReconciler] = None,
+        symbol_registry: Optional[SymbolRegistry] = None,
+        latency_monitor: Optional[LatencyMonitor] = None
+    ):
         """
         Inicializa el order executor.
         
         Args:
             events_queue: Cola de eventos del sistema
             portfolio: Gestor de portfolio
+            fill_reconciler: Confirmador de deals en segundo plano
+                (default: uno nuevo con parámetros por defecto)
+            symbol_registry: Registro de especificaciones de símbolos
+            latency_monitor: Histogramas de latencia del envío de órdenes
+                (default: uno nuevo, que el Trading Director comparte)
         """
         self.events_queue = events_queue
         self.PORTFOLIO = portfolio
+        self.SYMBOL_REGISTRY = symbol_registry or SymbolRegistry()
+        self.LATENCY = latency_monitor or LatencyMonitor()
         
-        print(f"{Utils.dateprint()} - ✓ Order Executor inicializado")
+        # Confirmación de ejecuciones fuera del hilo principal
+        self.FILL_RECONCILER = fill_reconciler or FillReconciler(events_queue)
+        self.FILL_RECONCILER.start()
+        
+        LOG.info("✓ Order Executor inicializado")
     
     
     def execute_order(self, order_event: OrderEvent) -> None:
@@ -71,8 +92,18 @@ class OrderExecutor:
         )
         
         # Obtener precio actual
-        symbol_info = mt5.symbol_info(symbol)
-        price = symbol_info.ask if signal == "BUY" else symbol_info.bid
+        spec = self.SYMBOL_REGISTRY.get(symbol)
+        tick = mt5.symbol_info_tick(symbol)
+        
+        if spec is None or tick is None:
+            LOG.error(
+                "❌ ERROR MARKET ORDER: {signal} {symbol} "
+                "| Sin especificación o tick disponible",
+                signal=signal, symbol=symbol
+            )
+            return
+        
+        price = tick.ask if signal == "BUY" else tick.bid
         
         # Crear request
         request = {
@@ -86,23 +117,24 @@ class OrderExecutor:
             "deviation": 10,  # Slippage permitido
             "magic": order_event.magic_number,
             "comment": "LIA Framework",
-            "type_filling": mt5.ORDER_FILLING_FOK,
+            "type_filling": spec.order_filling,
         }
         
         # Enviar orden
-        result = mt5.order_send(request)
+        result = self._timed_order_send(request, order_event)
         
         # Procesar resultado
         if self._check_execution_status(result):
-            print(
-                f"{Utils.dateprint()} - ✅ MARKET ORDER EJECUTADA: "
-                f"{signal} {symbol} | Vol: {volume} | Precio: {result.price}"
+            LOG.info(
+                "✅ MARKET ORDER EJECUTADA: {signal} {symbol} | Vol: {volume} | Precio: {price}",
+                signal=signal, symbol=symbol, volume=volume, price=result.price
             )
-            self._create_and_put_execution_event(result)
+            self._create_and_put_execution_event(result, order_event.origin_ns)
         else:
-            print(
-                f"{Utils.dateprint()} - ❌ ERROR MARKET ORDER: "
-                f"{signal} {symbol} | {result.comment} (code: {result.retcode})"
+            LOG.error(
+                "❌ ERROR MARKET ORDER: "
+                "{signal} {symbol} | {comment} (code: {retcode})",
+                signal=signal, symbol=symbol, comment=result.comment, retcode=result.retcode
             )
     
     
@@ -129,9 +161,18 @@ class OrderExecutor:
                 else mt5.ORDER_TYPE_SELL_LIMIT
             )
         else:
-            print(
-                f"{Utils.dateprint()} - ERROR: Tipo de orden pending "
-                f"'{target_order}' no válido"
+            LOG.error(
+                "ERROR: Tipo de orden pending '{target_order}' no válido",
+                target_order=target_order
+            )
+            return
+        
+        spec = self.SYMBOL_REGISTRY.get(symbol)
+        if spec is None:
+            LOG.error(
+                "❌ ERROR PENDING ORDER: {signal} {target_order} "
+                "{symbol} | Sin especificación disponible",
+                signal=signal, target_order=target_order, symbol=symbol
             )
             return
         
@@ -140,33 +181,36 @@ class OrderExecutor:
             "action": mt5.TRADE_ACTION_PENDING,
             "symbol": symbol,
             "volume": order_event.volume,
-            "price": order_event.target_price,
+            "price": spec.normalize_price(order_event.target_price),
             "sl": order_event.sl,
             "tp": order_event.tp,
             "type": order_type,
             "deviation": 0,
             "magic": order_event.magic_number,
             "comment": "LIA Framework Pending",
-            "type_filling": mt5.ORDER_FILLING_FOK,
+            "type_filling": spec.order_filling,
             "type_time": mt5.ORDER_TIME_GTC
         }
         
         # Enviar orden
-        result = mt5.order_send(request)
+        result = self._timed_order_send(request, order_event)
         
         # Procesar resultado
         if self._check_execution_status(result):
-            print(
-                f"{Utils.dateprint()} - ✅ PENDING ORDER COLOCADA: "
-                f"{signal} {target_order} {symbol} | "
-                f"Vol: {order_event.volume} | Precio: {order_event.target_price}"
+            LOG.info(
+                "✅ PENDING ORDER COLOCADA: {signal} {target_order} {symbol} | "
+                "Vol: {volume} | Precio: {price}",
+                signal=signal, target_order=target_order, symbol=symbol,
+                volume=order_event.volume, price=order_event.target_price
             )
             self._create_and_put_placed_pending_order_event(order_event)
         else:
-            print(
-                f"{Utils.dateprint()} - ❌ ERROR PENDING ORDER: "
-                f"{signal} {target_order} {symbol} | "
-                f"{result.comment} (code: {result.retcode})"
+            LOG.error(
+                "❌ ERROR PENDING ORDER: "
+                "{signal} {target_order} {symbol} | "
+                "{comment} (code: {retcode})",
+                signal=signal, target_order=target_order, symbol=symbol,
+                comment=result.comment, retcode=result.retcode
             )
     
     
@@ -181,9 +225,9 @@ class OrderExecutor:
         positions = mt5.positions_get(ticket=ticket)
         
         if not positions:
-            print(
-                f"{Utils.dateprint()} - ERROR: No existe posición "
-                f"con ticket {ticket}"
+            LOG.error(
+                "ERROR: No existe posición con ticket {ticket}",
+                ticket=ticket
             )
             return
         
@@ -196,8 +240,18 @@ class OrderExecutor:
         )
         
         # Obtener precio de cierre
-        symbol_info = mt5.symbol_info(position.symbol)
-        price = symbol_info.bid if close_type == mt5.ORDER_TYPE_SELL else symbol_info.ask
+        spec = self.SYMBOL_REGISTRY.get(position.symbol)
+        tick = mt5.symbol_info_tick(position.symbol)
+        
+        if spec is None or tick is None:
+            LOG.error(
+                "❌ ERROR AL CERRAR: Ticket {ticket} "
+                "| Sin especificación o tick de {symbol}",
+                ticket=ticket, symbol=position.symbol
+            )
+            return
+        
+        price = tick.bid if close_type == mt5.ORDER_TYPE_SELL else tick.ask
         
         # Crear request de cierre
         request = {
@@ -208,7 +262,7 @@ class OrderExecutor:
             "price": price,
             "type": close_type,
             "deviation": 10,
-            "type_filling": mt5.ORDER_FILLING_FOK,
+            "type_filling": spec.order_filling,
             "comment": "LIA Framework Close"
         }
         
@@ -217,18 +271,42 @@ class OrderExecutor:
         
         # Procesar resultado
         if self._check_execution_status(result):
-            print(
-                f"{Utils.dateprint()} - ✅ POSICIÓN CERRADA: "
-                f"Ticket {ticket} | {position.symbol} | Vol: {position.volume}"
+            LOG.info(
+                "✅ POSICIÓN CERRADA: Ticket {ticket} | {symbol} | Vol: {volume}",
+                ticket=ticket, symbol=position.symbol, volume=position.volume
             )
             self._create_and_put_execution_event(result)
         else:
-            print(
-                f"{Utils.dateprint()} - ❌ ERROR AL CERRAR: "
-                f"Ticket {ticket} | {result.comment} (code: {result.retcode})"
+            LOG.error(
+                "❌ ERROR AL CERRAR: "
+                "Ticket {ticket} | {comment} (code: {retcode})",
+                ticket=ticket, comment=result.comment, retcode=result.retcode
             )
     
     
+    def _timed_order_send(self, request: dict, order_event: OrderEvent):
+        """
+        Envía la request a MT5 registrando la latencia desde el cierre de
+        la barra que originó la orden hasta el envío (ORDER.bar_close_to_send)
+        y la duración de la llamada (ORDER.order_send).
+        
+        Args:
+            request: Request de mt5.order_send()
+            order_event: Orden que se envía
+        
+        Returns:
+            Resultado de mt5.order_send()
+        """
+        sent_ns = time.perf_counter_ns()
+        result = mt5.order_send(request)
+        
+        self.LATENCY.record("ORDER.order_send", time.perf_counter_ns() - sent_ns)
+        if order_event.origin_ns:
+            self.LATENCY.record("ORDER.bar_close_to_send", sent_ns - order_event.origin_ns)
+        
+        return result
+    
+    
     def _check_execution_status(self, result) -> bool:
         """
         Verifica si una orden se ejecutó correctamente.
@@ -245,42 +323,18 @@ class OrderExecutor:
         )
     
     
-    def _create_and_put_execution_event(self, result) -> None:
+    def _create_and_put_execution_event(self, result, origin_ns: int = 0) -> None:
         """
-        Crea un ExecutionEvent a partir del resultado de ejecución.
+        Registra la orden en el FillReconciler, que generará el
+        ExecutionEvent con el precio y la hora real del deal.
+        No bloquea el hilo del Trading Director.
         
         Args:
             result: Resultado de mt5.order_send()
+            origin_ns: Origen de la cadena de eventos de la orden
+                (0 = la creación del ExecutionEvent)
         """
-        # Intentar obtener deal info
-        deal = None
-        fill_time = datetime.now()
-        
-        # Esperar a que MT5 genere el deal (hasta 5 intentos)
-        for _ in range(5):
-            time.sleep(0.5)
-            try:
-                deals = mt5.history_deals_get(position=result.order)
-                if deals:
-                    deal = deals[0]
-                    break
-            except:
-                pass
-        
-        # Usar timestamp del deal si está disponible
-        if deal:
-            fill_time = pd.to_datetime(deal.time_msc, unit='ms')
-        
-        # Crear evento
-        execution_event = ExecutionEvent(
-            symbol=result.request.symbol,
-            signal=SignalType.BUY if result.request.type == mt5.DEAL_TYPE_BUY else SignalType.SELL,
-            fill_price=result.price,
-            fill_time=fill_time,
-            volume=result.request.volume
-        )
-        
-        self.events_queue.put(execution_event)
+        self.FILL_RECONCILER.track(result, origin_ns)
     
     
     def _create_and_put_placed_pending_order_event(
@@ -293,15 +347,6 @@ class OrderExecutor:
         Args:
             order_event: Orden pending que se colocó
         """
-        pending_event = PlacedPendingOrderEvent(
-            symbol=order_event.symbol,
-            signal=order_event.signal,
-            target_order=order_event.target_order,
-            target_price=order_event.target_price,
-            magic_number=order_event.magic_number,
-            sl=order_event.sl,
-            tp=order_event.tp,
-            volume=order_event.volume
-        )
+        pending_event = PlacedPendingOrderEvent.from_order(order_event)
         
         self.events_queue.put(pending_event)
@@ -3,13 +3,42 @@ LIA Engineering Solutions - Trading Framework
 Portfolio - Gestión de Posiciones
 
 Responsabilidades:
-- Consultar posiciones abiertas
+- Mantener un libro local de posiciones abiertas
+- Actualizar el libro a partir de los ExecutionEvents
+- Reconciliar periódicamente contra MT5 (cierres por SL/TP, trades manuales)
 - Filtrar posiciones por estrategia (magic number)
-- Proveer información de posiciones por símbolo
+- Proveer conteos de posiciones por símbolo en O(1)
+- Notificar cambios del libro a suscriptores (ej: ledger de exposición)
+
+Las consultas no llaman a MT5: se resuelven contra el libro local.
+Solo reconcile() consulta mt5.positions_get().
 """
 
 import MetaTrader5 as mt5
-from typing import Dict, Tuple
+import time
+from collections import defaultdict
+from dataclasses import dataclass
+from typing import Callable, Dict, List, Optional, Tuple
+from core.events.events import SignalType
+from core.events.fast_events import ExecutionEvent
+from core.utils.logger import get_logger
+
+
+LOG = get_logger("portfolio")
+
+
+@dataclass(slots=True)
+class PositionRecord:
+    """
+    Posición abierta en el libro local.
+    Expone los mismos nombres de campo que TradePosition de MT5.
+    """
+    ticket: int
+    symbol: str
+    magic: int
+    type: int
+    volume: float
+    price_open: float
 
 
 class Portfolio:
@@ -17,25 +46,225 @@ class Portfolio:
     Gestiona el acceso a posiciones abiertas y su información.
     """
     
-    def __init__(self, magic_number: int):
+    def __init__(
+        self,
+        magic_number: int,
+        reconcile_interval_s: float = 5.0,
+        clock: Callable[[], float] = time.monotonic
+    ):
         """
-        Inicializa el portfolio con un magic number único.
+        Inicializa el portfolio con un magic number único y carga
+        las posiciones abiertas desde MT5.
         
         Args:
             magic_number: Identificador único de la estrategia
+            reconcile_interval_s: Intervalo mínimo entre reconciliaciones
+                contra mt5.positions_get()
+            clock: Fuente de tiempo para el intervalo de reconciliación
+                (en un backtest, el reloj virtual del replay)
         """
         self.magic = magic_number
+        self.reconcile_interval_s = reconcile_interval_s
+        self.clock = clock
+        
+        # Libro de posiciones por ticket
+        self._positions: Dict[int, PositionRecord] = {}
+        
+        # Conteos por (símbolo, magic, dirección) y por (símbolo, dirección)
+        self._counts: Dict[Tuple[str, int, str], int] = defaultdict(int)
+        self._symbol_counts: Dict[Tuple[str, str], int] = defaultdict(int)
+        
+        # Suscriptores a cambios del libro: callback(symbol, magic, delta_volume)
+        # delta_volume > 0 agrega exposición compradora, < 0 vendedora
+        self._listeners: List[Callable[[str, int, float], None]] = []
+        
+        self._last_reconcile = 0.0
+        self.reconcile()
+    
+    
+    # ========================================================================
+    # MANTENIMIENTO DEL LIBRO
+    # ========================================================================
+    
+    def subscribe(self, callback: Callable[[str, int, float], None]) -> None:
+        """
+        Registra un callback que se invoca ante cada cambio del libro.
+        
+        Args:
+            callback: Función (symbol, magic, delta_volume) donde
+                delta_volume es el cambio de volumen neto con signo
+                (positivo = compra, negativo = venta)
+        """
+        self._listeners.append(callback)
     
     
+    def _notify(self, record: PositionRecord, delta_volume: float) -> None:
+        if record.type != mt5.ORDER_TYPE_BUY:
+            delta_volume = -delta_volume
+        
+        for callback in self._listeners:
+            callback(record.symbol, record.magic, delta_volume)
+    
+    
+    @staticmethod
+    def _direction(position_type: int) -> str:
+        return "LONG" if position_type == mt5.ORDER_TYPE_BUY else "SHORT"
+    
+    
+    def _add(self, record: PositionRecord) -> None:
+        direction = self._direction(record.type)
+        self._positions[record.ticket] = record
+        self._counts[(record.symbol, record.magic, direction)] += 1
+        self._symbol_counts[(record.symbol, direction)] += 1
+        self._notify(record, record.volume)
+    
+    
+    def _remove(self, ticket: int) -> Optional[PositionRecord]:
+        record = self._positions.pop(ticket, None)
+        
+        if record is not None:
+            direction = self._direction(record.type)
+            self._counts[(record.symbol, record.magic, direction)] -= 1
+            self._symbol_counts[(record.symbol, direction)] -= 1
+            self._notify(record, -record.volume)
+        
+        return record
+    
+    
+    def _set_volume(self, record: PositionRecord, volume: float) -> None:
+        delta_volume = volume - record.volume
+        record.volume = volume
+        self._notify(record, delta_volume)
+    
+    
+    def on_execution(self, event: ExecutionEvent) -> None:
+        """
+        Actualiza el libro con un deal ejecutado.
+        
+        - Entrada: crea la posición si no está en el libro
+        - Salida: reduce el volumen y elimina la posición si queda en cero
+        
+        Si la posición ya figura (ej: reconcile() la cargó antes de que
+        llegara el evento), el volumen de MT5 prevalece.
+        
+        Args:
+            event: Evento de ejecución confirmado
+        """
+        ticket = event.position_id
+        if not ticket:
+            return  # Sin identificador de posición: lo corrige reconcile()
+        
+        record = self._positions.get(ticket)
+        
+        if event.is_exit:
+            if record is None:
+                return
+            
+            remaining = round(record.volume - event.volume, 8)
+            if remaining <= 0:
+                self._remove(ticket)
+            else:
+                self._set_volume(record, remaining)
+            return
+        
+        if record is not None:
+            return
+        
+        self._add(PositionRecord(
+            ticket=ticket,
+            symbol=event.symbol,
+            magic=event.magic_number,
+            type=(
+                mt5.ORDER_TYPE_BUY if event.signal == SignalType.BUY
+                else mt5.ORDER_TYPE_SELL
+            ),
+            volume=event.volume,
+            price_open=event.fill_price
+        ))
+    
+    
+    def reconcile(self) -> Dict[str, int]:
+        """
+        Sincroniza el libro con las posiciones reales de MT5.
+        Detecta cierres por SL/TP, trades manuales y deals no informados.
+        
+        Returns:
+            Diccionario con contadores de diferencias:
+                - ADDED: Posiciones que faltaban en el libro
+                - REMOVED: Posiciones que ya no existen en MT5
+                - UPDATED: Posiciones con volumen distinto
+        """
+        self._last_reconcile = self.clock()
+        
+        positions = mt5.positions_get()
+        if positions is None:
+            LOG.error(
+                "ERROR: No se pudieron obtener posiciones. MT5 error: {mt5_error}",
+                mt5_error=mt5.last_error()
+            )
+            return {"ADDED": 0, "REMOVED": 0, "UPDATED": 0}
+        
+        live = {pos.ticket: pos for pos in positions}
+        diff = {"ADDED": 0, "REMOVED": 0, "UPDATED": 0}
+        
+        for ticket in list(self._positions):
+            if ticket not in live:
+                self._remove(ticket)
+                diff["REMOVED"] += 1
+        
+        for ticket, pos in live.items():
+            record = self._positions.get(ticket)
+            
+            if record is None:
+                self._add(PositionRecord(
+                    ticket=pos.ticket,
+                    symbol=pos.symbol,
+                    magic=pos.magic,
+                    type=pos.type,
+                    volume=pos.volume,
+                    price_open=pos.price_open
+                ))
+                diff["ADDED"] += 1
+            elif record.volume != pos.volume:
+                self._set_volume(record, pos.volume)
+                diff["UPDATED"] += 1
+        
+        if any(diff.values()):
+            LOG.info(
+                "🔄 Portfolio reconciliado con MT5: +{added} / -{removed} / ~{updated} posiciones",
+                added=diff['ADDED'], removed=diff['REMOVED'], updated=diff['UPDATED']
+            )
+        
+        return diff
+    
+    
+    def maybe_reconcile(self) -> bool:
+        """
+        Reconcilia si pasó el intervalo configurado desde la última vez.
+        Pensado para llamarse desde el loop principal en reposo.
+        
+        Returns:
+            True si se ejecutó la reconciliación
+        """
+        if self.clock() - self._last_reconcile < self.reconcile_interval_s:
+            return False
+        
+        self.reconcile()
+        return True
+    
+    
+    # ========================================================================
+    # CONSULTAS
+    # ========================================================================
+    
     def get_open_positions(self) -> Tuple:
         """
         Obtiene TODAS las posiciones abiertas en la cuenta.
         
         Returns:
-            Tupla con objetos TradePosition de MT5
+            Tupla con objetos PositionRecord del libro local
         """
-        positions = mt5.positions_get()
-        return positions if positions is not None else tuple()
+        return tuple(self._positions.values())
     
     
     def get_strategy_open_positions(self) -> Tuple:
@@ -45,10 +274,8 @@ class Portfolio:
         Returns:
             Tupla con posiciones que coinciden con el magic number
         """
-        all_positions = self.get_open_positions()
-        
         strategy_positions = [
-            pos for pos in all_positions 
+            pos for pos in self._positions.values()
             if pos.magic == self.magic
         ]
         
@@ -68,13 +295,8 @@ class Portfolio:
                 - SHORT: Posiciones de venta
                 - TOTAL: Total de posiciones
         """
-        positions = mt5.positions_get(symbol=symbol)
-        
-        if positions is None:
-            return {"LONG": 0, "SHORT": 0, "TOTAL": 0}
-        
-        longs = sum(1 for pos in positions if pos.type == mt5.ORDER_TYPE_BUY)
-        shorts = sum(1 for pos in positions if pos.type == mt5.ORDER_TYPE_SELL)
+        longs = self._symbol_counts.get((symbol, "LONG"), 0)
+        shorts = self._symbol_counts.get((symbol, "SHORT"), 0)
         
         return {
             "LONG": longs,
@@ -96,16 +318,8 @@ class Portfolio:
         Returns:
             Diccionario con contadores (solo de esta estrategia)
         """
-        positions = mt5.positions_get(symbol=symbol)
-        
-        if positions is None:
-            return {"LONG": 0, "SHORT": 0, "TOTAL": 0}
-        
-        # Filtrar por magic number
-        strategy_positions = [pos for pos in positions if pos.magic == self.magic]
-        
-        longs = sum(1 for pos in strategy_positions if pos.type == mt5.ORDER_TYPE_BUY)
-        shorts = sum(1 for pos in strategy_positions if pos.type == mt5.ORDER_TYPE_SELL)
+        longs = self._counts.get((symbol, self.magic, "LONG"), 0)
+        shorts = self._counts.get((symbol, self.magic, "SHORT"), 0)
         
         return {
             "LONG": longs,
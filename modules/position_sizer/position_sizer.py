@@ -6,10 +6,14 @@ Implementa método de sizing por volumen fijo.
 Puede extenderse para soportar risk-based sizing.
 """
 
-from core.events.events import SignalEvent, SizingEvent
-from core.utils.utils import Utils
+from core.events.fast_events import SignalEvent, SizingEvent
+from core.utils.logger import get_logger
+from modules.symbol_registry.symbol_registry import SymbolRegistry
 from queue import Queue
-import MetaTrader5 as mt5
+from typing import Optional
+
+
+LOG = get_logger("position_sizer")
 
 
 class PositionSizer:
@@ -17,20 +21,27 @@ class PositionSizer:
     Calcula el tamaño de posición para cada señal.
     """
     
-    def __init__(self, events_queue: Queue, fixed_volume: float = 0.01):
+    def __init__(
+        self,
+        events_queue: Queue,
+        fixed_volume: float = 0.01,
+        symbol_registry: Optional[SymbolRegistry] = None
+    ):
         """
         Inicializa el position sizer.
         
         Args:
             events_queue: Cola de eventos del sistema
             fixed_volume: Volumen fijo a operar (en lotes)
+            symbol_registry: Registro de especificaciones de símbolos
         """
         self.events_queue = events_queue
         self.fixed_volume = fixed_volume
+        self.SYMBOL_REGISTRY = symbol_registry or SymbolRegistry()
         
-        print(
-            f"{Utils.dateprint()} - ✓ Position Sizer inicializado: "
-            f"Volumen fijo = {fixed_volume} lotes"
+        LOG.info(
+            "✓ Position Sizer inicializado: Volumen fijo = {volume} lotes",
+            volume=fixed_volume
         )
     
     
@@ -44,45 +55,34 @@ class PositionSizer:
         symbol = signal_event.symbol
         
         # Validar volumen mínimo del símbolo
-        symbol_info = mt5.symbol_info(symbol)
+        spec = self.SYMBOL_REGISTRY.get(symbol)
         
-        if symbol_info is None:
-            print(
-                f"{Utils.dateprint()} - ERROR: No se pudo obtener info de {symbol}"
-            )
+        if spec is None:
+            LOG.error("ERROR: No se pudo obtener info de {symbol}", symbol=symbol)
             return
         
-        volume_min = symbol_info.volume_min
-        volume_step = symbol_info.volume_step
+        volume_min = spec.volume_min
+        volume_step = spec.volume_step
         
-        # Ajustar volumen al step permitido
-        volume = max(self.fixed_volume, volume_min)
-        volume = round(volume / volume_step) * volume_step
+        # Ajustar volumen al step y a los límites permitidos
+        volume = min(max(self.fixed_volume, volume_min), spec.volume_max)
+        volume = round(round(volume / volume_step) * volume_step, 8)
         
         # Validar volumen final
         if volume < volume_min:
-            print(
-                f"{Utils.dateprint()} - ERROR: Volumen {volume} menor al mínimo "
-                f"{volume_min} para {symbol}"
+            LOG.error(
+                "ERROR: Volumen {volume} menor al mínimo {volume_min} para {symbol}",
+                volume=volume, volume_min=volume_min, symbol=symbol
             )
             return
         
         # Crear SizingEvent
-        sizing_event = SizingEvent(
-            symbol=signal_event.symbol,
-            signal=signal_event.signal,
-            target_order=signal_event.target_order,
-            target_price=signal_event.target_price,
-            magic_number=signal_event.magic_number,
-            sl=signal_event.sl,
-            tp=signal_event.tp,
-            volume=volume
-        )
+        sizing_event = SizingEvent.from_signal(signal_event, volume)
         
         # Encolar evento
         self.events_queue.put(sizing_event)
         
-        print(
-            f"{Utils.dateprint()} - 📐 SIZING: {signal_event.signal} {symbol} "
-            f"| Volumen calculado: {volume} lotes"
+        LOG.info(
+            "📐 SIZING: {signal} {symbol} | Volumen calculado: {volume} lotes",
+            signal=signal_event.signal, symbol=symbol, volume=volume
         )
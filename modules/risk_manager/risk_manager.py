@@ -4,15 +4,31 @@ Risk Manager - Gestor de Riesgo
 
 Valida que las operaciones cumplan con límites de riesgo establecidos.
 Implementa control por máximo leverage factor.
+
+La exposición se lleva en un ledger incremental por símbolo (divisa de
+cuenta), alimentado por los cambios del libro del Portfolio y revaluado
+(mark-to-market) cada exposure_mark_interval_ms. El chequeo pre-trade
+es una suma y una comparación contra la exposición máxima.
+
+Un símbolo que no puede valuarse en divisa de cuenta se registra como NaN:
+la exposición total queda indeterminada y las órdenes se rechazan hasta
+que la valuación vuelva a estar disponible.
 """
 
-from core.events.events import SizingEvent, OrderEvent
-from core.utils.utils import Utils
+from core.events.fast_events import SizingEvent, OrderEvent
+from core.utils.logger import get_logger
+from modules.currency_converter.currency_converter import CurrencyConverter
 from modules.data_provider.data_provider import DataProvider
 from modules.portfolio.portfolio import Portfolio
+from modules.symbol_registry.symbol_registry import SymbolRegistry
 from queue import Queue
+from typing import Callable, Dict
 import MetaTrader5 as mt5
-import sys
+import math
+import time
+
+
+LOG = get_logger("risk_manager")
 
 
 class RiskManager:
@@ -25,10 +41,15 @@ class RiskManager:
         events_queue: Queue,
         data_provider: DataProvider,
         portfolio: Portfolio,
-        max_leverage_factor: float = 3.0
+        max_leverage_factor: float = 3.0,
+        mark_interval_ms: int = 1000,
+        currency_converter: CurrencyConverter = None,
+        symbol_registry: SymbolRegistry = None,
+        clock: Callable[[], float] = time.monotonic
     ):
         """
-        Inicializa el risk manager.
+        Inicializa el risk manager y construye el ledger de exposición
+        a partir de las posiciones de la estrategia en el Portfolio.
         
         Args:
             events_queue: Cola de eventos del sistema
@@ -36,79 +57,213 @@ class RiskManager:
             portfolio: Gestor de portfolio
             max_leverage_factor: Máximo factor de apalancamiento permitido
                 Ej: 3.0 = exposición máxima de 3x el equity
+            mark_interval_ms: Intervalo de revaluación del ledger a
+                precios de mercado
+            currency_converter: Conversor de divisas (si None, se crea uno)
+            symbol_registry: Registro de especificaciones (si None, se crea uno)
+            clock: Fuente de tiempo para el intervalo de revaluación
+                (en un backtest, el reloj virtual del replay)
         """
         self.events_queue = events_queue
         self.DATA_PROVIDER = data_provider
         self.PORTFOLIO = portfolio
+        self.CURRENCY_CONVERTER = currency_converter or CurrencyConverter(
+            tick_cache=data_provider.TICK_CACHE
+        )
+        self.SYMBOL_REGISTRY = symbol_registry or SymbolRegistry()
         self.max_leverage_factor = max_leverage_factor
+        self.mark_interval_s = mark_interval_ms / 1000.0
+        self.clock = clock
+        
+        # Ledger: volumen neto con signo (lotes) y exposición por símbolo
+        self._net_volume: Dict[str, float] = {}
+        self._exposure: Dict[str, float] = {}
+        self.total_exposure = 0.0
+        
+        # Valor de 1 lote en divisa de cuenta al último mark
+        self._lot_value: Dict[str, float] = {}
+        
+        # Divisa, equity y exposición máxima al último mark
+        self.account_currency = None
+        self.equity = 0.0
+        self.max_exposure = 0.0
+        self._last_mark = 0.0
         
-        print(
-            f"{Utils.dateprint()} - ✓ Risk Manager inicializado: "
-            f"Max Leverage Factor = {max_leverage_factor}x"
+        for position in self.PORTFOLIO.get_strategy_open_positions():
+            volume = (
+                position.volume if position.type == mt5.ORDER_TYPE_BUY
+                else -position.volume
+            )
+            self._net_volume[position.symbol] = (
+                self._net_volume.get(position.symbol, 0.0) + volume
+            )
+        
+        self.PORTFOLIO.subscribe(self.on_position_change)
+        self.mark_to_market()
+        
+        LOG.info(
+            "✓ Risk Manager inicializado: "
+            "Max Leverage Factor = {leverage}x | "
+            "Exposición actual: {exposure:.2f} ({symbols} símbolos)",
+            leverage=max_leverage_factor, exposure=self.total_exposure,
+            symbols=len(self._net_volume)
         )
     
     
-    def _compute_value_of_position_in_account_currency(
-        self,
-        symbol: str,
-        volume: float,
-        position_type: int
-    ) -> float:
+    # ========================================================================
+    # LEDGER DE EXPOSICIÓN
+    # ========================================================================
+    
+    def _compute_lot_value_in_account_currency(self, symbol: str) -> float:
         """
-        Calcula el valor de una posición en la divisa de la cuenta.
+        Calcula el valor de 1 lote comprado en la divisa de la cuenta.
         
         Args:
-            symbol: Símbolo de la posición
-            volume: Volumen en lotes
-            position_type: mt5.ORDER_TYPE_BUY o mt5.ORDER_TYPE_SELL
+            symbol: Símbolo a valuar
             
         Returns:
-            Valor de la posición en divisa de cuenta
-        """
-        symbol_info = mt5.symbol_info(symbol)
-        account_currency = mt5.account_info().currency
+            Valor de 1 lote en divisa de cuenta
         
-        # Unidades operadas
-        traded_units = volume * symbol_info.trade_contract_size
+        Raises:
+            ValueError: Si no hay datos del símbolo o tasa de conversión
+        """
+        spec = self.SYMBOL_REGISTRY.get(symbol)
+        if spec is None or self.account_currency is None:
+            raise ValueError(
+                f"Sin información de símbolo o cuenta para {symbol}. "
+                f"MT5 error: {mt5.last_error()}"
+            )
         
         # Valor en divisa profit del símbolo
         tick = self.DATA_PROVIDER.get_latest_tick(symbol)
         price = tick.get('bid', 0.0)
-        value_in_profit_ccy = traded_units * price
+        value_in_profit_ccy = spec.contract_size * price
         
-        # Convertir a divisa de cuenta
-        value_in_account_ccy = Utils.convert_currency_amount_to_another_currency(
+        # Convertir a divisa de cuenta (O(1) desde la matriz cacheada)
+        self.CURRENCY_CONVERTER.add_currencies(
+            (spec.currency_profit, self.account_currency)
+        )
+        return self.CURRENCY_CONVERTER.convert(
             value_in_profit_ccy,
-            symbol_info.currency_profit,
-            account_currency
+            spec.currency_profit,
+            self.account_currency
         )
+    
+    
+    def _update_lot_value(self, symbol: str) -> float:
+        """
+        Recalcula y cachea el valor de 1 lote. Si no puede valuarse,
+        registra NaN para bloquear nuevas órdenes.
+        
+        Args:
+            symbol: Símbolo a valuar
+        
+        Returns:
+            Valor de 1 lote en divisa de cuenta (NaN si no disponible)
+        """
+        try:
+            lot_value = self._compute_lot_value_in_account_currency(symbol)
+        except ValueError as e:
+            LOG.error("ERROR: No se pudo valuar {symbol}: {error}", symbol=symbol, error=e)
+            lot_value = math.nan
+        
+        self._lot_value[symbol] = lot_value
+        return lot_value
+    
+    
+    def on_position_change(self, symbol: str, magic: int, delta_volume: float) -> None:
+        """
+        Aplica al ledger un cambio del libro de posiciones.
+        Suscrito a Portfolio: cubre ejecuciones, cierres y reconciliaciones.
+        
+        Args:
+            symbol: Símbolo afectado
+            magic: Magic number de la posición
+            delta_volume: Cambio de volumen neto con signo (lotes)
+        """
+        if magic != self.PORTFOLIO.magic:
+            return
+        
+        net_volume = self._net_volume.get(symbol, 0.0) + delta_volume
+        
+        lot_value = self._lot_value.get(symbol)
+        if lot_value is None:
+            lot_value = self._update_lot_value(symbol)
+        
+        if abs(net_volume) < 1e-9:
+            self._net_volume.pop(symbol, None)
+            self._exposure.pop(symbol, None)
+        else:
+            self._net_volume[symbol] = net_volume
+            self._exposure[symbol] = net_volume * lot_value
         
-        # Invertir signo para posiciones cortas
-        if position_type == mt5.ORDER_TYPE_SELL:
-            return -value_in_account_ccy
+        if math.isnan(self.total_exposure) or math.isnan(lot_value):
+            # Recalcular: un NaN no se puede restar incrementalmente
+            self.total_exposure = sum(self._exposure.values())
         else:
-            return value_in_account_ccy
+            self.total_exposure += delta_volume * lot_value
+    
+    
+    def mark_to_market(self) -> None:
+        """
+        Revalúa el ledger a precios actuales y refresca el equity.
+        Recalcula el total desde cero para evitar deriva acumulada.
+        """
+        self._last_mark = self.clock()
+        
+        account_info = mt5.account_info()
+        if account_info is None:
+            LOG.error(
+                "ERROR: No se pudo obtener account_info. MT5 error: {mt5_error}",
+                mt5_error=mt5.last_error()
+            )
+            return
+        
+        self.account_currency = account_info.currency
+        self.equity = account_info.equity
+        self.max_exposure = max(self.equity, 0.0) * self.max_leverage_factor
+        
+        # Una sola pasada de tasas FX para todo el ciclo de revaluación
+        self.CURRENCY_CONVERTER.refresh()
+        
+        for symbol in set(self._lot_value) | set(self._net_volume):
+            self._update_lot_value(symbol)
+        
+        self._exposure = {
+            symbol: volume * self._lot_value[symbol]
+            for symbol, volume in self._net_volume.items()
+        }
+        self.total_exposure = sum(self._exposure.values())
     
     
-    def _compute_current_positions_value(self) -> float:
+    def maybe_mark_to_market(self) -> bool:
         """
-        Calcula el valor total de posiciones abiertas en divisa de cuenta.
+        Revalúa el ledger si pasó el intervalo configurado.
         
         Returns:
-            Valor total de exposición actual
+            True si se ejecutó la revaluación
         """
-        positions = self.PORTFOLIO.get_strategy_open_positions()
+        if self.clock() - self._last_mark < self.mark_interval_s:
+            return False
         
-        total_value = 0.0
-        for position in positions:
-            value = self._compute_value_of_position_in_account_currency(
-                position.symbol,
-                position.volume,
-                position.type
-            )
-            total_value += value
+        self.mark_to_market()
+        return True
+    
+    
+    def get_exposure(self, symbol: str = None) -> float:
+        """
+        Obtiene la exposición con signo en divisa de cuenta.
+        
+        Args:
+            symbol: Símbolo a consultar (None = exposición total)
+        
+        Returns:
+            Exposición al último mark
+        """
+        if symbol is None:
+            return self.total_exposure
         
-        return total_value
+        return self._exposure.get(symbol, 0.0)
     
     
     def _compute_leverage_factor(self, account_value: float) -> float:
@@ -121,13 +276,15 @@ class RiskManager:
         Returns:
             Factor de apalancamiento (exposición / equity)
         """
-        equity = mt5.account_info().equity
+        if self.equity <= 0:
+            return float("inf")  # Leverage infinito si no hay equity
         
-        if equity <= 0:
-            return sys.float_info.max  # Leverage infinito si no hay equity
-        
-        return abs(account_value) / equity
+        return abs(account_value) / self.equity
+    
     
+    # ========================================================================
+    # VALIDACIÓN PRE-TRADE
+    # ========================================================================
     
     def assess_order(self, sizing_event: SizingEvent) -> None:
         """
@@ -140,49 +297,49 @@ class RiskManager:
             sizing_event: Evento con sizing calculado
         """
         symbol = sizing_event.symbol
-        volume = sizing_event.volume
         
-        # Calcular exposición actual
-        current_value = self._compute_current_positions_value()
+        self.maybe_mark_to_market()
+        
+        lot_value = self._lot_value.get(symbol)
+        if lot_value is None:
+            lot_value = self._update_lot_value(symbol)
+        
+        if math.isnan(lot_value) or math.isnan(self.total_exposure):
+            LOG.warning(
+                "⚠️ RISK CHECK FAILED: {signal} {symbol} "
+                "| Exposición no valuable en divisa de cuenta - ORDEN RECHAZADA",
+                signal=sizing_event.signal, symbol=symbol
+            )
+            return
         
         # Calcular valor de nueva posición
-        position_type = (
-            mt5.ORDER_TYPE_BUY if sizing_event.signal == "BUY"
-            else mt5.ORDER_TYPE_SELL
-        )
-        new_position_value = self._compute_value_of_position_in_account_currency(
-            symbol, volume, position_type
-        )
+        new_position_value = sizing_event.volume * lot_value
+        if sizing_event.signal != "BUY":
+            new_position_value = -new_position_value
         
-        # Proyectar nuevo leverage
-        projected_value = current_value + new_position_value
-        projected_leverage = self._compute_leverage_factor(projected_value)
+        # Proyectar exposición y validar contra el máximo
+        projected_value = self.total_exposure + new_position_value
         
-        # Validar leverage
-        if projected_leverage <= self.max_leverage_factor:
+        if abs(projected_value) <= self.max_exposure:
             # APROBADO: Crear OrderEvent
-            order_event = OrderEvent(
-                symbol=sizing_event.symbol,
-                signal=sizing_event.signal,
-                target_order=sizing_event.target_order,
-                target_price=sizing_event.target_price,
-                magic_number=sizing_event.magic_number,
-                sl=sizing_event.sl,
-                tp=sizing_event.tp,
-                volume=sizing_event.volume
-            )
+            order_event = OrderEvent.from_sizing(sizing_event)
             
             self.events_queue.put(order_event)
             
-            print(
-                f"{Utils.dateprint()} - ✅ RISK CHECK PASSED: {sizing_event.signal} {symbol} "
-                f"| Leverage proyectado: {projected_leverage:.2f}x "
-                f"(max: {self.max_leverage_factor}x)"
+            LOG.info(
+                "✅ RISK CHECK PASSED: {signal} {symbol} "
+                "| Leverage proyectado: {leverage:.2f}x (max: {max_leverage}x)",
+                signal=sizing_event.signal, symbol=symbol,
+                leverage=self._compute_leverage_factor(projected_value),
+                max_leverage=self.max_leverage_factor
             )
         else:
             # RECHAZADO: Excede leverage máximo
-            print(
-                f"{Utils.dateprint()} - ⚠️ RISK CHECK FAILED: {sizing_event.signal} {symbol} "
-                f"| Leverage proyectado: {projected_leverage:.2f}x "
-                f"EXCEDE máximo de {self.max_leverage_factor}x - ORDEN RECHAZADA"
+            LOG.warning(
+                "⚠️ RISK CHECK FAILED: {signal} {symbol} "
+                "| Leverage proyectado: {leverage:.2f}x "
+                "EXCEDE máximo de {max_leverage}x - ORDEN RECHAZADA",
+                signal=sizing_event.signal, symbol=symbol,
+                leverage=self._compute_leverage_factor(projected_value),
+                max_leverage=self.max_leverage_factor
             )
@@ -0,0 +1,164 @@
+"""
+LIA Engineering Solutions - Trading Framework
+Bar Close Scheduler - Planificador de Consultas por Cierre de Barra
+
+Responsabilidades:
+- Calcular el próximo cierre de barra del timeframe operado
+- Indicar cuánto dormir hasta justo antes del cierre
+- Habilitar un sondeo intensivo, acotado en tiempo, hasta detectar
+  la barra nueva de todos los símbolos
+- Compensar el desfase horario del servidor del broker
+
+Las barras de MT5 están en hora del servidor. Los timeframes intradía
+de hasta 1h coinciden en cualquier zona horaria, pero 2h+, D1, W1 y MN1
+se alinean con la medianoche del servidor, por eso se aplica el offset.
+"""
+
+import time
+from typing import Callable, Optional
+from core.data.timeframes import bar_close_time, timeframe_seconds
+from core.utils.logger import get_logger
+
+
+LOG = get_logger("bar_close_scheduler")
+
+
+class BarCloseScheduler:
+    """
+    Decide cuándo consultar a MT5 por barras nuevas.
+    """
+    
+    def __init__(
+        self,
+        timeframe: str,
+        expected_symbols: int = 1,
+        server_offset_seconds: int = 0,
+        lead_time_ms: int = 50,
+        poll_interval_ms: int = 10,
+        poll_window_ms: int = 2000,
+        clock: Callable[[], float] = time.time
+    ):
+        """
+        Inicializa el planificador.
+        
+        Args:
+            timeframe: Timeframe operado (clave de TIMEFRAME_SECONDS)
+            expected_symbols: Símbolos que deben reportar barra nueva
+                para dar por completo un cierre
+            server_offset_seconds: Hora del servidor - hora UTC, en segundos
+            lead_time_ms: Anticipación con la que se despierta antes del cierre
+            poll_interval_ms: Intervalo entre consultas dentro de la ventana
+            poll_window_ms: Duración máxima de la ventana de sondeo tras el cierre
+            clock: Fuente de tiempo (epoch segundos, UTC)
+            
+        Raises:
+            ValueError: Si el timeframe no es válido
+        """
+        self.timeframe = timeframe
+        self.timeframe_seconds = timeframe_seconds(timeframe)
+        self.expected_symbols = max(1, expected_symbols)
+        self.server_offset_seconds = server_offset_seconds
+        self.lead_time = lead_time_ms / 1000.0
+        self.poll_interval = poll_interval_ms / 1000.0
+        self.poll_window = poll_window_ms / 1000.0
+        self.clock = clock
+        
+        # Estado del cierre en curso (hora local, epoch UTC)
+        self._target_close: Optional[float] = None
+        self._last_poll = 0.0
+        self._received = 0
+        
+        # Estadísticas
+        self.polls = 0
+        self.completed_windows = 0
+        self.expired_windows = 0
+        self.last_detection_latency_ms: Optional[float] = None
+        
+        LOG.info(
+            "✓ Bar Close Scheduler inicializado: "
+            "{timeframe} | Offset servidor: {offset_hours:+.1f}h",
+            timeframe=timeframe, offset_hours=server_offset_seconds / 3600
+        )
+    
+    
+    # ========================================================================
+    # CÁLCULO DE CIERRES
+    # ========================================================================
+    
+    def next_close_time(self, now: float = None) -> float:
+        """
+        Calcula el próximo cierre de barra estrictamente posterior a `now`.
+        
+        Args:
+            now: Instante de referencia (default: reloj actual)
+            
+        Returns:
+            Hora del cierre en epoch UTC (segundos)
+        """
+        now = self.clock() if now is None else now
+        server_now = now + self.server_offset_seconds
+        
+        return bar_close_time(server_now, self.timeframe) - self.server_offset_seconds
+    
+    
+    # ========================================================================
+    # PLANIFICACIÓN DE CONSULTAS
+    # ========================================================================
+    
+    def seconds_until_next_poll(self) -> float:
+        """
+        Retorna cuánto esperar antes de la próxima consulta a MT5.
+        
+        - Antes del cierre: hasta (cierre - lead_time)
+        - Dentro de la ventana: hasta cumplir poll_interval desde la última
+        - Ventana agotada: se pasa al cierre siguiente
+        
+        Returns:
+            Segundos a esperar (0 = consultar ahora)
+        """
+        if self._target_close is None:
+            return 0.0  # Consulta inicial de sincronización
+        
+        now = self.clock()
+        wake_time = self._target_close - self.lead_time
+        
+        if now < wake_time:
+            return wake_time - now
+        
+        if now > self._target_close + self.poll_window:
+            # Algunos símbolos no publicaron barra (sin ticks / mercado cerrado)
+            self.expired_windows += 1
+            self._advance(now)
+            return self.seconds_until_next_poll()
+        
+        return max(0.0, self.poll_interval - (now - self._last_poll))
+    
+    
+    def record_poll(self, new_bars: int) -> None:
+        """
+        Registra el resultado de una consulta a MT5.
+        
+        Args:
+            new_bars: Cantidad de barras nuevas detectadas en la consulta
+        """
+        now = self.clock()
+        self._last_poll = now
+        self.polls += 1
+        
+        if self._target_close is None:
+            self._advance(now)
+            return
+        
+        self._received += new_bars
+        
+        if self._received >= self.expected_symbols:
+            self.last_detection_latency_ms = (now - self._target_close) * 1000.0
+            self.completed_windows += 1
+            self._advance(now)
+    
+    
+    def _advance(self, now: float) -> None:
+        """Pasa a esperar el próximo cierre."""
+        reference = now if self._target_close is None else max(now, self._target_close)
+        self._target_close = self.next_close_time(reference)
+        self._received = 0
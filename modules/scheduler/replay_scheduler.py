@@ -0,0 +1,63 @@
+"""
+LIA Engineering Solutions - Trading Framework
+Replay Scheduler - Planificador sin Esperas para Reproducción Histórica
+
+Misma interfaz que el BarCloseScheduler, pero nunca espera: en un replay
+el próximo cierre de barra está disponible de inmediato, así que el
+Trading Director consulta el feed apenas la cola de eventos queda vacía.
+"""
+
+from typing import Optional
+from core.utils.logger import get_logger
+
+
+LOG = get_logger("replay_scheduler")
+
+
+class ReplayScheduler:
+    """
+    Planificador que habilita una consulta en cada vuelta del loop en reposo.
+    """
+    
+    def __init__(self, timeframe: str, expected_symbols: int = 1):
+        """
+        Inicializa el planificador.
+        
+        Args:
+            timeframe: Timeframe reproducido
+            expected_symbols: Símbolos que deben reportar barra nueva
+                para dar por completo un paso
+        """
+        self.timeframe = timeframe
+        self.expected_symbols = max(1, expected_symbols)
+        
+        # Estadísticas (mismos nombres que el BarCloseScheduler)
+        self.polls = 0
+        self.completed_windows = 0
+        self.expired_windows = 0
+        self.last_detection_latency_ms: Optional[float] = 0.0
+        
+        LOG.info("✓ Replay Scheduler inicializado: {timeframe}", timeframe=timeframe)
+    
+    
+    def seconds_until_next_poll(self) -> float:
+        """
+        Returns:
+            Siempre 0 (consultar ahora)
+        """
+        return 0.0
+    
+    
+    def record_poll(self, new_bars: int) -> None:
+        """
+        Registra el resultado de un paso del replay.
+        
+        Args:
+            new_bars: Barras emitidas en el paso
+        """
+        self.polls += 1
+        
+        if new_bars >= self.expected_symbols:
+            self.completed_windows += 1
+        elif new_bars > 0:
+            self.expired_windows += 1  # Paso con símbolos sin barra
@@ -10,14 +10,21 @@ Lógica:
 - Una posición abierta por símbolo a la vez
 """
 
-from core.events.events import DataEvent, SignalEvent, SignalType, OrderType
-from core.utils.utils import Utils
+from core.events.events import SignalType, OrderType
+from core.events.fast_events import DataEvent, SignalEvent
+from core.indicators.indicator_engine import UniverseIndicatorEngine
+from core.utils.logger import get_logger
 from modules.data_provider.data_provider import DataProvider
 from modules.portfolio.portfolio import Portfolio
 from modules.order_executor.order_executor import OrderExecutor
+from modules.symbol_registry.symbol_registry import SymbolRegistry
 from queue import Queue
 from typing import Optional
-import pandas as pd
+import math
+import numpy as np
+
+
+LOG = get_logger("signal_generator")
 
 
 class SignalGenerator:
@@ -37,7 +44,8 @@ class SignalGenerator:
         rsi_upper: float = 70.0,
         rsi_lower: float = 30.0,
         sl_points: int = 50,
-        tp_points: int = 100
+        tp_points: int = 100,
+        symbol_registry: Optional[SymbolRegistry] = None
     ):
         """
         Inicializa el generador de señales RSI.
@@ -52,13 +60,15 @@ class SignalGenerator:
             rsi_period: Período del RSI
             rsi_upper: Nivel de sobrecompra
             rsi_lower: Nivel de sobreventa
-            sl_points: Stop Loss en puntos
-            tp_points: Take Profit en puntos
+            sl_points: Stop Loss en pips
+            tp_points: Take Profit en pips
+            symbol_registry: Registro de especificaciones de símbolos
         """
         self.events_queue = events_queue
         self.DATA_PROVIDER = data_provider
         self.PORTFOLIO = portfolio
         self.ORDER_EXECUTOR = order_executor
+        self.SYMBOL_REGISTRY = symbol_registry or SymbolRegistry(data_provider.symbols)
         self.magic_number = magic_number
         
         # Parámetros de la estrategia
@@ -69,46 +79,60 @@ class SignalGenerator:
         self.sl_points = sl_points
         self.tp_points = tp_points
         
-        print(
-            f"{Utils.dateprint()} - ✓ Signal Generator (RSI) inicializado: "
-            f"RSI Period={rsi_period}, Upper={rsi_upper}, Lower={rsi_lower}"
+        # Motor de indicadores para todo el universo de símbolos
+        self.INDICATORS = UniverseIndicatorEngine(
+            symbols=data_provider.symbols,
+            rsi_period=rsi_period,
+            capacity=data_provider.buffer_capacity
+        )
+        
+        # Barras del buffer ya incorporadas al motor, por símbolo
+        self._bars_consumed = np.zeros(len(data_provider.symbols), dtype=np.int64)
+        
+        LOG.info(
+            "✓ Signal Generator (RSI) inicializado: "
+            "RSI Period={period}, Upper={upper}, Lower={lower}",
+            period=rsi_period, upper=rsi_upper, lower=rsi_lower
         )
     
     
-    def _calculate_rsi(self, prices: pd.Series, period: int) -> float:
+    def _refresh_indicators(self) -> None:
         """
-        Calcula el RSI (Relative Strength Index).
+        Incorpora al motor de indicadores las barras nuevas de TODO el universo.
         
-        Args:
-            prices: Serie de precios de cierre
-            period: Período del RSI
-            
-        Returns:
-            Valor del RSI (0-100)
+        Los símbolos que cerraron barra en el mismo ciclo se actualizan en
+        una única llamada vectorizada. El primer DataEvent de un ciclo hace
+        el trabajo; los siguientes solo leen el resultado ya calculado.
         """
-        if len(prices) < period + 1:
-            return 50.0  # Valor neutro si no hay suficientes datos
-        
-        # Calcular cambios
-        delta = prices.diff()
+        counts = self.DATA_PROVIDER.get_bar_counts(self.timeframe)
+        pending_rows = np.flatnonzero(counts != self._bars_consumed)
         
-        # Separar ganancias y pérdidas
-        gain = delta.where(delta > 0, 0.0)
-        loss = -delta.where(delta < 0, 0.0)
+        if len(pending_rows) == 0:
+            return
         
-        # Promedios móviles
-        avg_gain = gain.rolling(window=period).mean()
-        avg_loss = loss.rolling(window=period).mean()
+        rows, times, closes = [], [], []
         
-        # Evitar división por cero
-        if avg_loss.iloc[-1] == 0:
-            return 100.0
-        
-        # Calcular RSI
-        rs = avg_gain.iloc[-1] / avg_loss.iloc[-1]
-        rsi = 100 - (100 / (1 + rs))
+        for row in pending_rows:
+            symbol = self.INDICATORS.symbols[row]
+            buffer = self.DATA_PROVIDER.get_bar_buffer(symbol, self.timeframe)
+            new_bars = buffer.total_appended - self._bars_consumed[row]
+            
+            if new_bars == 1:
+                bar = buffer.latest()
+                rows.append(row)
+                times.append(bar['time'])
+                closes.append(bar['close'])
+            else:
+                # Primera carga o varias barras nuevas: recargar histórico
+                bars = buffer.view()
+                self.INDICATORS.load_history(symbol, bars['time'], bars['close'])
+        
+        if rows:
+            self.INDICATORS.update(
+                np.array(rows), np.array(times), np.array(closes)
+            )
         
-        return rsi
+        self._bars_consumed[pending_rows] = counts[pending_rows]
     
     
     def generate_signal(self, data_event: DataEvent) -> None:
@@ -116,8 +140,8 @@ class SignalGenerator:
         Genera señal de trading basada en RSI.
         
         Reglas:
-        1. Obtener histórico de precios
-        2. Calcular RSI
+        1. Incorporar las barras nuevas del universo al motor de indicadores
+        2. Leer RSI (Wilder, incremental y vectorizado entre símbolos)
         3. Evaluar condiciones de entrada
         4. Verificar que no haya posición abierta
         5. Generar SignalEvent si corresponde
@@ -127,18 +151,16 @@ class SignalGenerator:
         """
         symbol = data_event.symbol
         
-        # 1. Obtener datos históricos
-        bars = self.DATA_PROVIDER.get_latest_closed_bars(
-            symbol=symbol,
-            timeframe=self.timeframe,
-            num_bars=self.rsi_period + 10  # Buffer adicional
-        )
+        # Solo barras del timeframe operado (el feed puede emitir derivados)
+        if data_event.timeframe and data_event.timeframe != self.timeframe:
+            return
         
-        if bars.empty or len(bars) < self.rsi_period + 1:
-            return  # No hay suficientes datos
+        # 1-2. Actualizar indicadores del universo y leer RSI del símbolo
+        self._refresh_indicators()
+        rsi = self.INDICATORS.get_rsi(symbol)
         
-        # 2. Calcular RSI
-        rsi = self._calculate_rsi(bars['close'], self.rsi_period)
+        if math.isnan(rsi):
+            return  # No hay suficientes datos
         
         # 3. Verificar que no haya posición abierta
         open_positions = self.PORTFOLIO.get_number_of_strategy_open_positions_by_symbol(symbol)
@@ -161,17 +183,21 @@ class SignalGenerator:
         if signal_type is not None:
             # Obtener precio actual
             tick = self.DATA_PROVIDER.get_latest_tick(symbol)
-            current_price = tick.get('bid', data_event.data['close'])
+            current_price = tick.get('bid', data_event.data.close)
+            
+            # Calcular SL y TP en pips según el tipo y los dígitos del símbolo
+            spec = self.SYMBOL_REGISTRY.get(symbol)
+            if spec is None:
+                return
             
-            # Calcular SL y TP
-            point = 0.0001 if 'JPY' not in symbol else 0.01
+            pip = spec.pip
             
             if signal_type == SignalType.BUY:
-                sl = current_price - (self.sl_points * point)
-                tp = current_price + (self.tp_points * point)
+                sl = spec.normalize_price(current_price - (self.sl_points * pip))
+                tp = spec.normalize_price(current_price + (self.tp_points * pip))
             else:  # SELL
-                sl = current_price + (self.sl_points * point)
-                tp = current_price - (self.tp_points * point)
+                sl = spec.normalize_price(current_price + (self.sl_points * pip))
+                tp = spec.normalize_price(current_price - (self.tp_points * pip))
             
             # Crear evento de señal
             signal_event = SignalEvent(
@@ -181,13 +207,14 @@ class SignalGenerator:
                 target_price=current_price,
                 magic_number=self.magic_number,
                 sl=sl,
-                tp=tp
+                tp=tp,
+                origin_ns=data_event.origin_ns
             )
             
             # Encolar señal
             self.events_queue.put(signal_event)
             
-            print(
-                f"{Utils.dateprint()} - 📊 SEÑAL GENERADA: {signal_type} {symbol} "
-                f"| RSI={rsi:.2f} | SL={sl:.5f} | TP={tp:.5f}"
+            LOG.info(
+                "📊 SEÑAL GENERADA: {signal} {symbol} | RSI={rsi:.2f} | SL={sl:.5f} | TP={tp:.5f}",
+                signal=signal_type, symbol=symbol, rsi=rsi, sl=sl, tp=tp
             )
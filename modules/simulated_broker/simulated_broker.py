@@ -0,0 +1,1092 @@
+"""
+LIA Engineering Solutions - Trading Framework
+Simulated Broker - Broker Simulado en Proceso
+
+Implementa el subconjunto de la API de MetaTrader5 que usa el framework
+para correr backtests y benchmarks sin terminal (Linux, CI):
+
+- symbol_info, symbol_info_tick, symbols_get, symbol_select
+- copy_rates_from_pos
+- order_send (DEAL, PENDING, SLTP, REMOVE), positions_get, orders_get
+- history_deals_get, account_info, terminal_info
+- initialize, shutdown, last_error y las constantes usadas
+
+install(broker) registra un módulo 'MetaTrader5' que delega en el broker:
+debe llamarse ANTES de importar cualquier módulo del framework.
+
+Motor de ejecución:
+- Precios desde barras cargadas (load_rates) recorridas como ticks
+  O → L → H → C (barra alcista) u O → H → L → C (bajista), o desde
+  ticks explícitos (on_tick)
+- El mercado avanza con el reloj (time.time o un VirtualClock): cada
+  llamada a la API procesa los ticks hasta el instante actual
+- Órdenes a mercado: spread (fijo o el de la barra), slippage en puntos y
+  latencia (el fill usa el precio vigente a envío + latencia)
+- SL/TP y órdenes LIMIT/STOP se disparan en el recorrido intrabar; en un
+  gap (apertura de barra) se llenan al precio del gap
+- Cuenta hedging: balance, equity flotante, margen y curva de equity
+"""
+
+import itertools
+import sys
+import time
+import types
+from collections import namedtuple
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Callable, Dict, List, Optional, Tuple
+import numpy as np
+from core.data.bar_buffer import BAR_DTYPE
+from core.data.timeframes import TIMEFRAME_SECONDS, bar_close_time
+
+
+# ============================================================================
+# CONSTANTES (mismos valores que el paquete MetaTrader5)
+# ============================================================================
+
+MT5_CONSTANTS = {
+    'TIMEFRAME_M1': 1, 'TIMEFRAME_M2': 2, 'TIMEFRAME_M3': 3, 'TIMEFRAME_M4': 4,
+    'TIMEFRAME_M5': 5, 'TIMEFRAME_M6': 6, 'TIMEFRAME_M10': 10, 'TIMEFRAME_M12': 12,
+    'TIMEFRAME_M15': 15, 'TIMEFRAME_M20': 20, 'TIMEFRAME_M30': 30,
+    'TIMEFRAME_H1': 16385, 'TIMEFRAME_H2': 16386, 'TIMEFRAME_H3': 16387,
+    'TIMEFRAME_H4': 16388, 'TIMEFRAME_H6': 16390, 'TIMEFRAME_H8': 16392,
+    'TIMEFRAME_H12': 16396, 'TIMEFRAME_D1': 16408, 'TIMEFRAME_W1': 32769,
+    'TIMEFRAME_MN1': 49153,
+    
+    'ORDER_TYPE_BUY': 0, 'ORDER_TYPE_SELL': 1,
+    'ORDER_TYPE_BUY_LIMIT': 2, 'ORDER_TYPE_SELL_LIMIT': 3,
+    'ORDER_TYPE_BUY_STOP': 4, 'ORDER_TYPE_SELL_STOP': 5,
+    
+    'TRADE_ACTION_DEAL': 1, 'TRADE_ACTION_PENDING': 5, 'TRADE_ACTION_SLTP': 6,
+    'TRADE_ACTION_MODIFY': 7, 'TRADE_ACTION_REMOVE': 8,
+    
+    'ORDER_FILLING_FOK': 0, 'ORDER_FILLING_IOC': 1, 'ORDER_FILLING_RETURN': 2,
+    'SYMBOL_FILLING_FOK': 1, 'SYMBOL_FILLING_IOC': 2,
+    'SYMBOL_CALC_MODE_FOREX': 0, 'SYMBOL_CALC_MODE_FUTURES': 1,
+    'SYMBOL_CALC_MODE_CFD': 2, 'SYMBOL_CALC_MODE_CFDINDEX': 3,
+    'SYMBOL_CALC_MODE_CFDLEVERAGE': 4, 'SYMBOL_CALC_MODE_FOREX_NO_LEVERAGE': 5,
+    'ORDER_TIME_GTC': 0,
+    
+    'DEAL_TYPE_BUY': 0, 'DEAL_TYPE_SELL': 1,
+    'DEAL_ENTRY_IN': 0, 'DEAL_ENTRY_OUT': 1,
+    'DEAL_REASON_CLIENT': 0, 'DEAL_REASON_EXPERT': 3,
+    'DEAL_REASON_SL': 4, 'DEAL_REASON_TP': 5,
+    
+    'TRADE_RETCODE_PLACED': 10008, 'TRADE_RETCODE_DONE': 10009,
+    'TRADE_RETCODE_DONE_PARTIAL': 10010, 'TRADE_RETCODE_INVALID': 10013,
+    'TRADE_RETCODE_INVALID_VOLUME': 10014, 'TRADE_RETCODE_INVALID_PRICE': 10015,
+    'TRADE_RETCODE_INVALID_STOPS': 10016, 'TRADE_RETCODE_MARKET_CLOSED': 10018,
+    'TRADE_RETCODE_NO_MONEY': 10019, 'TRADE_RETCODE_POSITION_CLOSED': 10036,
+    
+    'ACCOUNT_TRADE_MODE_DEMO': 0, 'ACCOUNT_TRADE_MODE_CONTEST': 1,
+    'ACCOUNT_TRADE_MODE_REAL': 2,
+    
+    'COPY_TICKS_ALL': -1, 'COPY_TICKS_INFO': 1, 'COPY_TICKS_TRADE': 2,
+}
+
+C = types.SimpleNamespace(**MT5_CONSTANTS)
+
+# Timeframe del framework -> constante MT5
+TIMEFRAME_CONSTANTS = {
+    '1min': C.TIMEFRAME_M1, '2min': C.TIMEFRAME_M2, '3min': C.TIMEFRAME_M3,
+    '4min': C.TIMEFRAME_M4, '5min': C.TIMEFRAME_M5, '6min': C.TIMEFRAME_M6,
+    '10min': C.TIMEFRAME_M10, '12min': C.TIMEFRAME_M12, '15min': C.TIMEFRAME_M15,
+    '20min': C.TIMEFRAME_M20, '30min': C.TIMEFRAME_M30, '1h': C.TIMEFRAME_H1,
+    '2h': C.TIMEFRAME_H2, '3h': C.TIMEFRAME_H3, '4h': C.TIMEFRAME_H4,
+    '6h': C.TIMEFRAME_H6, '8h': C.TIMEFRAME_H8, '12h': C.TIMEFRAME_H12,
+    '1d': C.TIMEFRAME_D1, '1w': C.TIMEFRAME_W1, '1M': C.TIMEFRAME_MN1,
+}
+
+# Layout de mt5.copy_rates_*
+RATES_DTYPE = np.dtype([
+    ('time', '<i8'), ('open', '<f8'), ('high', '<f8'), ('low', '<f8'),
+    ('close', '<f8'), ('tick_volume', '<u8'), ('spread', '<i4'),
+    ('real_volume', '<u8'),
+])
+
+
+# ============================================================================
+# ESTRUCTURAS DEVUELTAS (mismos campos que MetaTrader5)
+# ============================================================================
+
+SymbolInfo = namedtuple('SymbolInfo', (
+    'name visible select digits point spread trade_contract_size volume_min '
+    'volume_step volume_max filling_mode currency_base currency_profit '
+    'currency_margin trade_calc_mode bid ask time'
+))
+Tick = namedtuple('Tick', 'time bid ask last volume time_msc flags volume_real')
+AccountInfo = namedtuple('AccountInfo', (
+    'login trade_mode leverage balance credit profit equity margin '
+    'margin_free margin_level currency server name company'
+))
+TerminalInfo = namedtuple('TerminalInfo', 'connected trade_allowed name path')
+TradePosition = namedtuple('TradePosition', (
+    'ticket time time_msc time_update time_update_msc type magic identifier '
+    'reason volume price_open sl tp price_current swap profit symbol comment '
+    'external_id'
+))
+TradeOrder = namedtuple('TradeOrder', (
+    'ticket time_setup time_setup_msc type magic volume_initial '
+    'volume_current price_open sl tp price_current symbol comment'
+))
+TradeDeal = namedtuple('TradeDeal', (
+    'ticket order time time_msc type entry magic position_id reason volume '
+    'price commission swap profit fee symbol comment external_id'
+))
+TradeRequest = namedtuple('TradeRequest', (
+    'action magic order symbol volume price stoplimit sl tp deviation type '
+    'type_filling type_time expiration comment position position_by'
+))
+OrderSendResult = namedtuple('OrderSendResult', (
+    'retcode deal order volume price bid ask comment request_id '
+    'retcode_external request'
+))
+
+
+def default_symbol_spec(symbol: str) -> Dict:
+    """
+    Especificación por defecto de un par de divisas (cuenta estándar).
+    
+    Args:
+        symbol: Símbolo tipo 'EURUSD'
+    
+    Returns:
+        Kwargs para SimulatedBroker.add_symbol()
+    """
+    jpy_quote = symbol[3:6].upper() == "JPY"
+    
+    return {
+        'point': 0.001 if jpy_quote else 0.00001,
+        'digits': 3 if jpy_quote else 5,
+        'contract_size': 100000.0,
+    }
+
+
+# Instantes del recorrido intrabar, como fracción de la duración de la barra
+PATH_FRACTIONS = (0.0, 1.0 / 3.0, 2.0 / 3.0)
+
+
+@dataclass(slots=True)
+class _SymbolState:
+    """
+    Especificación, precio vigente y recorrido de barras de un símbolo.
+    """
+    name: str
+    point: float
+    digits: int
+    contract_size: float
+    volume_min: float
+    volume_step: float
+    volume_max: float
+    filling_mode: int
+    currency_base: str
+    currency_profit: str
+    calc_mode: int
+    bid: float = 0.0
+    ask: float = 0.0
+    time_msc: int = 0
+    spread: int = 0
+    bars: Optional[np.ndarray] = None
+    times: Optional[np.ndarray] = None
+    timeframe: str = ""
+    bar_index: int = -1
+    path_index: int = 3
+
+
+@dataclass(slots=True)
+class _Position:
+    ticket: int
+    symbol: str
+    type: int
+    volume: float
+    price_open: float
+    sl: float
+    tp: float
+    magic: int
+    time_msc: int
+    comment: str
+
+
+@dataclass(slots=True)
+class _PendingOrder:
+    ticket: int
+    symbol: str
+    type: int
+    volume: float
+    price: float
+    sl: float
+    tp: float
+    magic: int
+    time_msc: int
+    comment: str
+
+
+class SimulatedBroker:
+    """
+    Broker en proceso con la API de MetaTrader5 y motor de ejecución.
+    """
+    
+    def __init__(
+        self,
+        clock: Callable[[], float] = time.time,
+        server_offset_seconds: int = 0,
+        balance: float = 10000.0,
+        currency: str = "USD",
+        leverage: int = 100,
+        spread_points: Optional[int] = None,
+        slippage_points: int = 0,
+        latency_ms: int = 0,
+        commission_per_lot: float = 0.0
+    ):
+        """
+        Inicializa una cuenta hedging vacía.
+        
+        Args:
+            clock: Fuente de tiempo (epoch segundos UTC); en un backtest,
+                el VirtualClock del replay
+            server_offset_seconds: Hora del servidor - UTC
+            balance: Balance inicial en divisa de cuenta
+            currency: Divisa de la cuenta
+            leverage: Apalancamiento para el cálculo de margen
+            spread_points: Spread fijo en puntos (None = el de cada barra)
+            slippage_points: Deslizamiento adverso en puntos para órdenes a
+                mercado, STOP y SL
+            latency_ms: Demora entre el envío y el fill de órdenes a mercado
+            commission_per_lot: Comisión por lote y por lado (divisa de cuenta)
+        """
+        self.clock = clock
+        self.server_offset_seconds = server_offset_seconds
+        self.currency = currency
+        self.leverage = leverage
+        self.spread_points = spread_points
+        self.slippage_points = slippage_points
+        self.latency_ms = latency_ms
+        self.commission_per_lot = commission_per_lot
+        
+        self.initial_balance = balance
+        self.balance = balance
+        
+        self._symbols: Dict[str, _SymbolState] = {}
+        self._positions: Dict[int, _Position] = {}
+        self._orders: Dict[int, _PendingOrder] = {}
+        self._deals: List[TradeDeal] = []
+        self._tickets = itertools.count(1)
+        self._now_msc = -1
+        self._last_error: Tuple[int, str] = (1, "Success")
+        
+        # Curva de equity: un punto por instante procesado (hora del servidor)
+        self._equity_times: List[int] = []
+        self._equity_values: List[float] = []
+    
+    
+    # ========================================================================
+    # CONFIGURACIÓN DEL MERCADO
+    # ========================================================================
+    
+    def add_symbol(
+        self,
+        name: str,
+        point: float = 0.00001,
+        digits: int = 5,
+        contract_size: float = 100000.0,
+        volume_min: float = 0.01,
+        volume_step: float = 0.01,
+        volume_max: float = 100.0,
+        currency_base: str = None,
+        currency_profit: str = None,
+        filling_mode: int = C.SYMBOL_FILLING_FOK | C.SYMBOL_FILLING_IOC,
+        calc_mode: int = C.SYMBOL_CALC_MODE_FOREX
+    ) -> None:
+        """
+        Registra un símbolo operable.
+        
+        Args:
+            name: Nombre del símbolo
+            point: Tamaño del punto
+            digits: Decimales del precio
+            contract_size: Unidades por lote
+            volume_min: Volumen mínimo
+            volume_step: Paso de volumen
+            volume_max: Volumen máximo
+            currency_base: Divisa base (default: name[:3])
+            currency_profit: Divisa de beneficio (default: name[3:6])
+            filling_mode: Máscara SYMBOL_FILLING_*
+            calc_mode: Modo de cálculo SYMBOL_CALC_MODE_* (define si el
+                pip son 10 points, ver core.data.pips)
+        """
+        self._symbols[name] = _SymbolState(
+            name=name,
+            point=point,
+            digits=digits,
+            contract_size=contract_size,
+            volume_min=volume_min,
+            volume_step=volume_step,
+            volume_max=volume_max,
+            filling_mode=filling_mode,
+            currency_base=(currency_base or name[:3]).upper(),
+            currency_profit=(currency_profit or name[3:6] or self.currency).upper(),
+            calc_mode=calc_mode
+        )
+    
+    
+    def load_rates(self, symbol: str, bars: np.ndarray, timeframe: str = "1min") -> None:
+        """
+        Asigna al símbolo las barras que definen su recorrido de precios
+        y que sirve copy_rates_from_pos.
+        
+        Args:
+            symbol: Símbolo registrado con add_symbol
+            bars: Array BAR_DTYPE ordenado por tiempo (puede ser un memmap)
+            timeframe: Timeframe de las barras
+        
+        Raises:
+            ValueError: Si el símbolo no está registrado o el timeframe
+                no es válido
+        """
+        if symbol not in self._symbols:
+            raise ValueError(f"Símbolo {symbol} no registrado")
+        
+        if timeframe not in TIMEFRAME_CONSTANTS:
+            raise ValueError(f"Timeframe '{timeframe}' no soportado por el broker")
+        
+        state = self._symbols[symbol]
+        state.bars = bars
+        state.times = bars['time']
+        state.timeframe = timeframe
+        state.bar_index = -1
+        state.path_index = 3
+    
+    
+    def on_tick(self, symbol: str, bid: float, ask: float = None, time_msc: int = None) -> None:
+        """
+        Aplica un tick explícito: actualiza el precio y dispara órdenes
+        pendientes y SL/TP del símbolo al precio del tick.
+        
+        Args:
+            symbol: Símbolo registrado
+            bid: Precio bid
+            ask: Precio ask (default: bid + spread_points)
+            time_msc: Hora del tick en ms, hora del servidor (default: reloj)
+        """
+        state = self._symbols[symbol]
+        if time_msc is None:
+            time_msc = int((self.clock() + self.server_offset_seconds) * 1000)
+        
+        if ask is None:
+            ask = bid + (self.spread_points or 0) * state.point
+        
+        state.bid, state.ask, state.time_msc = bid, ask, time_msc
+        self._match(state, gap=True)
+    
+    
+    # ========================================================================
+    # AVANCE DEL MERCADO
+    # ========================================================================
+    
+    def _bar_duration_ms(self, state: _SymbolState, bar_time: int) -> int:
+        tf_seconds = TIMEFRAME_SECONDS[state.timeframe]
+        if tf_seconds is None:
+            tf_seconds = bar_close_time(bar_time, state.timeframe) - bar_time
+        return tf_seconds * 1000
+    
+    
+    def _path_point(self, state: _SymbolState, bar_index: int, path_index: int) -> Tuple[int, float, int]:
+        """
+        Retorna (time_msc, bid, spread) de un punto del recorrido intrabar.
+        """
+        bar_time, open_, high, low, close, _, _, bar_spread = state.bars[bar_index].item()
+        duration = self._bar_duration_ms(state, bar_time)
+        
+        if path_index == 3:
+            time_msc = bar_time * 1000 + duration - 1
+            price = close
+        else:
+            time_msc = bar_time * 1000 + int(duration * PATH_FRACTIONS[path_index])
+            if path_index == 0:
+                price = open_
+            elif (path_index == 1) == (close >= open_):
+                price = low
+            else:
+                price = high
+        
+        spread = self.spread_points if self.spread_points is not None else bar_spread
+        return time_msc, price, spread
+    
+    
+    def _set_price(self, state: _SymbolState, time_msc: int, bid: float, spread: int) -> None:
+        state.time_msc = time_msc
+        state.bid = bid
+        state.ask = bid + spread * state.point
+        state.spread = spread
+    
+    
+    def _has_activity(self, symbol: str) -> bool:
+        return (
+            any(p.symbol == symbol for p in self._positions.values())
+            or any(o.symbol == symbol for o in self._orders.values())
+        )
+    
+    
+    def _advance_symbol(self, state: _SymbolState, now_msc: int) -> None:
+        """
+        Recorre los ticks del símbolo hasta now_msc. Sin posiciones ni
+        órdenes del símbolo, salta directo al último tick vigente.
+        """
+        bars = state.bars
+        if bars is None or len(bars) == 0:
+            return
+        
+        if not self._has_activity(state.name):
+            last = int(np.searchsorted(state.times, now_msc // 1000, 'right')) - 1
+            if last < 0:
+                return
+            
+            offset = now_msc - int(state.times[last]) * 1000
+            duration = self._bar_duration_ms(state, int(state.times[last]))
+            path_index = 3 if offset >= duration - 1 else sum(
+                1 for f in PATH_FRACTIONS if int(duration * f) <= offset
+            ) - 1
+            
+            if (last, path_index) > (state.bar_index, state.path_index) or state.bar_index < 0:
+                state.bar_index, state.path_index = last, path_index
+                self._set_price(state, *self._path_point(state, last, path_index))
+            return
+        
+        while True:
+            bar_index, path_index = state.bar_index, state.path_index + 1
+            if path_index > 3:
+                bar_index, path_index = bar_index + 1, 0
+            if bar_index >= len(bars):
+                return
+            
+            time_msc, bid, spread = self._path_point(state, bar_index, path_index)
+            if time_msc > now_msc:
+                return
+            
+            state.bar_index, state.path_index = bar_index, path_index
+            self._set_price(state, time_msc, bid, spread)
+            self._match(state, gap=path_index == 0)
+    
+    
+    def _advance(self) -> None:
+        """
+        Lleva el mercado al instante actual del reloj. Se invoca al inicio
+        de cada llamada a la API; es O(1) si el reloj no avanzó.
+        """
+        now_msc = int((self.clock() + self.server_offset_seconds) * 1000)
+        if now_msc <= self._now_msc:
+            return
+        
+        self._now_msc = now_msc
+        
+        for state in self._symbols.values():
+            self._advance_symbol(state, now_msc)
+        
+        self._equity_times.append(now_msc // 1000)
+        self._equity_values.append(self._equity())
+    
+    
+    def _price_at(self, state: _SymbolState, time_msc: int) -> Tuple[float, float]:
+        """
+        Retorna (bid, ask) vigentes en time_msc (para fills con latencia).
+        Sin barras posteriores, se usa el precio actual.
+        """
+        bars = state.bars
+        if bars is None or time_msc <= state.time_msc:
+            return state.bid, state.ask
+        
+        bar_index = int(np.searchsorted(state.times, time_msc // 1000, 'right')) - 1
+        if bar_index < 0:
+            return state.bid, state.ask
+        
+        for path_index in (3, 2, 1, 0):
+            point_msc, bid, spread = self._path_point(state, bar_index, path_index)
+            if point_msc <= time_msc:
+                return bid, bid + spread * state.point
+        
+        return state.bid, state.ask
+    
+    
+    # ========================================================================
+    # MOTOR DE EJECUCIÓN
+    # ========================================================================
+    
+    def _match(self, state: _SymbolState, gap: bool) -> None:
+        """
+        Dispara órdenes pendientes y SL/TP del símbolo al precio vigente.
+        
+        Args:
+            state: Símbolo con el precio actualizado
+            gap: True si el tick es una apertura (o tick explícito): los
+                fills usan el precio del tick en lugar del nivel
+        """
+        bid, ask, now = state.bid, state.ask, state.time_msc
+        slip = self.slippage_points * state.point
+        
+        for order in [o for o in self._orders.values() if o.symbol == state.name]:
+            if order.time_msc >= now:
+                continue
+            
+            kind, level = order.type, order.price
+            if kind == C.ORDER_TYPE_BUY_LIMIT and ask <= level:
+                price = ask if gap else level
+            elif kind == C.ORDER_TYPE_SELL_LIMIT and bid >= level:
+                price = bid if gap else level
+            elif kind == C.ORDER_TYPE_BUY_STOP and ask >= level:
+                price = (ask if gap else level) + slip
+            elif kind == C.ORDER_TYPE_SELL_STOP and bid <= level:
+                price = (bid if gap else level) - slip
+            else:
+                continue
+            
+            del self._orders[order.ticket]
+            direction = C.ORDER_TYPE_BUY if kind in (C.ORDER_TYPE_BUY_LIMIT, C.ORDER_TYPE_BUY_STOP) else C.ORDER_TYPE_SELL
+            self._open_position(
+                state, order.ticket, direction, order.volume, price,
+                order.sl, order.tp, order.magic, now, order.comment,
+                reason=C.DEAL_REASON_EXPERT
+            )
+        
+        for position in [p for p in self._positions.values() if p.symbol == state.name]:
+            if position.time_msc >= now:
+                continue
+            
+            sl, tp = position.sl, position.tp
+            if position.type == C.ORDER_TYPE_BUY:
+                if sl > 0 and bid <= sl:
+                    self._close_position(position, position.volume, (bid if gap else sl) - slip, now, C.DEAL_REASON_SL, 0)
+                elif tp > 0 and bid >= tp:
+                    self._close_position(position, position.volume, bid if gap else tp, now, C.DEAL_REASON_TP, 0)
+            else:
+                if sl > 0 and ask >= sl:
+                    self._close_position(position, position.volume, (ask if gap else sl) + slip, now, C.DEAL_REASON_SL, 0)
+                elif tp > 0 and ask <= tp:
+                    self._close_position(position, position.volume, ask if gap else tp, now, C.DEAL_REASON_TP, 0)
+    
+    
+    def _to_account(self, amount: float, currency: str) -> float:
+        """
+        Convierte un importe a la divisa de cuenta con el precio vigente
+        de un par registrado (directo o inverso). Sin par, no convierte.
+        """
+        if currency == self.currency or amount == 0.0:
+            return amount
+        
+        for state in self._symbols.values():
+            if state.bid <= 0:
+                continue
+            if state.currency_base == currency and state.currency_profit == self.currency:
+                return amount * state.bid
+            if state.currency_base == self.currency and state.currency_profit == currency:
+                return amount / state.bid
+        
+        return amount
+    
+    
+    def _profit(self, position: _Position, price: float, volume: float = None) -> float:
+        state = self._symbols[position.symbol]
+        direction = 1.0 if position.type == C.ORDER_TYPE_BUY else -1.0
+        volume = position.volume if volume is None else volume
+        raw = (price - position.price_open) * direction * volume * state.contract_size
+        
+        return round(self._to_account(raw, state.currency_profit), 2)
+    
+    
+    def _margin(self, symbol: str, volume: float, price: float) -> float:
+        state = self._symbols[symbol]
+        notional = volume * state.contract_size * price
+        
+        if state.currency_base == self.currency:
+            notional = volume * state.contract_size
+        else:
+            notional = self._to_account(notional, state.currency_profit)
+        
+        return notional / self.leverage
+    
+    
+    def _floating_profit(self) -> float:
+        total = 0.0
+        for position in self._positions.values():
+            state = self._symbols[position.symbol]
+            price = state.bid if position.type == C.ORDER_TYPE_BUY else state.ask
+            total += self._profit(position, price)
+        return total
+    
+    
+    def _equity(self) -> float:
+        return self.balance + self._floating_profit()
+    
+    
+    def _used_margin(self) -> float:
+        return sum(
+            self._margin(p.symbol, p.volume, p.price_open)
+            for p in self._positions.values()
+        )
+    
+    
+    def _add_deal(
+        self,
+        order: int,
+        symbol: str,
+        deal_type: int,
+        entry: int,
+        magic: int,
+        position_id: int,
+        reason: int,
+        volume: float,
+        price: float,
+        profit: float,
+        time_msc: int,
+        comment: str
+    ) -> TradeDeal:
+        commission = -round(self.commission_per_lot * volume, 2) if self.commission_per_lot else 0.0
+        self.balance += profit + commission
+        
+        deal = TradeDeal(
+            ticket=next(self._tickets), order=order, time=time_msc // 1000,
+            time_msc=time_msc, type=deal_type, entry=entry, magic=magic,
+            position_id=position_id, reason=reason, volume=volume, price=price,
+            commission=commission, swap=0.0, profit=profit, fee=0.0,
+            symbol=symbol, comment=comment, external_id=""
+        )
+        self._deals.append(deal)
+        
+        return deal
+    
+    
+    def _open_position(
+        self,
+        state: _SymbolState,
+        ticket: int,
+        direction: int,
+        volume: float,
+        price: float,
+        sl: float,
+        tp: float,
+        magic: int,
+        time_msc: int,
+        comment: str,
+        reason: int = C.DEAL_REASON_EXPERT
+    ) -> TradeDeal:
+        price = round(price, state.digits)
+        self._positions[ticket] = _Position(
+            ticket, state.name, direction, volume, price, sl, tp, magic, time_msc, comment
+        )
+        return self._add_deal(
+            ticket, state.name, direction, C.DEAL_ENTRY_IN, magic, ticket,
+            reason, volume, price, 0.0, time_msc, comment
+        )
+    
+    
+    def _close_position(
+        self,
+        position: _Position,
+        volume: float,
+        price: float,
+        time_msc: int,
+        reason: int,
+        order: int
+    ) -> TradeDeal:
+        state = self._symbols[position.symbol]
+        price = round(price, state.digits)
+        volume = min(volume, position.volume)
+        profit = self._profit(position, price, volume)
+        
+        remaining = round(position.volume - volume, 8)
+        if remaining <= 0:
+            del self._positions[position.ticket]
+        else:
+            position.volume = remaining
+        
+        close_type = C.DEAL_TYPE_SELL if position.type == C.ORDER_TYPE_BUY else C.DEAL_TYPE_BUY
+        return self._add_deal(
+            order or next(self._tickets), position.symbol, close_type,
+            C.DEAL_ENTRY_OUT, position.magic, position.ticket, reason,
+            volume, price, profit, time_msc, position.comment
+        )
+    
+    
+    # ========================================================================
+    # API MetaTrader5: CONEXIÓN Y CUENTA
+    # ========================================================================
+    
+    def initialize(self, *args, **kwargs) -> bool:
+        return True
+    
+    
+    def shutdown(self) -> None:
+        return None
+    
+    
+    def last_error(self) -> Tuple[int, str]:
+        return self._last_error
+    
+    
+    def _fail(self, code: int, message: str) -> None:
+        self._last_error = (code, message)
+        return None
+    
+    
+    def account_info(self) -> AccountInfo:
+        self._advance()
+        equity = self._equity()
+        margin = self._used_margin()
+        
+        return AccountInfo(
+            login=1, trade_mode=C.ACCOUNT_TRADE_MODE_DEMO, leverage=self.leverage,
+            balance=self.balance, credit=0.0, profit=equity - self.balance,
+            equity=equity, margin=margin, margin_free=equity - margin,
+            margin_level=(equity / margin * 100.0) if margin else 0.0,
+            currency=self.currency, server="SimulatedBroker",
+            name="LIA Backtest", company="LIA Engineering Solutions"
+        )
+    
+    
+    def terminal_info(self) -> TerminalInfo:
+        return TerminalInfo(connected=True, trade_allowed=True, name="SimulatedBroker", path="")
+    
+    
+    # ========================================================================
+    # API MetaTrader5: SÍMBOLOS Y DATOS
+    # ========================================================================
+    
+    def _symbol_info(self, state: _SymbolState) -> SymbolInfo:
+        return SymbolInfo(
+            name=state.name, visible=True, select=True, digits=state.digits,
+            point=state.point, spread=state.spread,
+            trade_contract_size=state.contract_size, volume_min=state.volume_min,
+            volume_step=state.volume_step, volume_max=state.volume_max,
+            filling_mode=state.filling_mode, currency_base=state.currency_base,
+            currency_profit=state.currency_profit,
+            currency_margin=state.currency_base, trade_calc_mode=state.calc_mode,
+            bid=state.bid, ask=state.ask,
+            time=state.time_msc // 1000
+        )
+    
+    
+    def symbol_info(self, symbol: str) -> Optional[SymbolInfo]:
+        state = self._symbols.get(symbol)
+        if state is None:
+            return self._fail(-1, f"Símbolo {symbol} desconocido")
+        
+        self._advance()
+        return self._symbol_info(state)
+    
+    
+    def symbols_get(self, group: str = None) -> Tuple[SymbolInfo, ...]:
+        self._advance()
+        return tuple(self._symbol_info(state) for state in self._symbols.values())
+    
+    
+    def symbol_select(self, symbol: str, enable: bool = True) -> bool:
+        return symbol in self._symbols
+    
+    
+    def symbol_info_tick(self, symbol: str) -> Optional[Tick]:
+        state = self._symbols.get(symbol)
+        if state is None:
+            return self._fail(-1, f"Símbolo {symbol} desconocido")
+        
+        self._advance()
+        if state.bid <= 0:
+            return self._fail(-1, f"Sin precio para {symbol}")
+        
+        return Tick(
+            state.time_msc // 1000, state.bid, state.ask, 0.0, 0,
+            state.time_msc, 0, 0.0
+        )
+    
+    
+    def copy_rates_from_pos(self, symbol: str, timeframe: int, start_pos: int, count: int) -> Optional[np.ndarray]:
+        """
+        Barras hasta el instante actual; la posición 0 es la barra en curso
+        (se entrega completa: el broker no reconstruye barras parciales).
+        """
+        state = self._symbols.get(symbol)
+        if state is None or state.bars is None:
+            return self._fail(-1, f"Sin barras cargadas para {symbol}")
+        
+        if TIMEFRAME_CONSTANTS[state.timeframe] != timeframe:
+            return self._fail(-1, f"Timeframe no cargado para {symbol}")
+        
+        self._advance()
+        bars = state.bars
+        released = int(np.searchsorted(state.times, self._now_msc // 1000, 'right'))
+        end = max(0, released - start_pos)
+        selected = bars[max(0, end - count):end]
+        
+        rates = np.empty(len(selected), dtype=RATES_DTYPE)
+        rates['time'] = selected['time']
+        for field in ('open', 'high', 'low', 'close', 'spread'):
+            rates[field] = selected[field]
+        rates['tick_volume'] = selected['tickvol']
+        rates['real_volume'] = selected['vol']
+        
+        return rates
+    
+    
+    def copy_ticks_from(self, *args, **kwargs) -> None:
+        """
+        No soportado: el recorrido intrabar no representa ticks reales
+        (por eso el backtest rechaza data_feed_mode='ticks').
+        """
+        return self._fail(-1, "El broker simulado no provee ticks históricos")
+    
+    
+    def copy_ticks_range(self, *args, **kwargs) -> None:
+        """No soportado (ver copy_ticks_from)."""
+        return self._fail(-1, "El broker simulado no provee ticks históricos")
+    
+    
+    # ========================================================================
+    # API MetaTrader5: ÓRDENES, POSICIONES Y DEALS
+    # ========================================================================
+    
+    def _result(self, retcode: int, request: TradeRequest, comment: str, deal: TradeDeal = None, order: int = 0) -> OrderSendResult:
+        state = self._symbols.get(request.symbol)
+        if retcode not in (C.TRADE_RETCODE_DONE, C.TRADE_RETCODE_PLACED):
+            self._last_error = (retcode, comment)
+        
+        return OrderSendResult(
+            retcode=retcode,
+            deal=deal.ticket if deal else 0,
+            order=order or (deal.order if deal else 0),
+            volume=deal.volume if deal else request.volume,
+            price=deal.price if deal else request.price,
+            bid=state.bid if state else 0.0,
+            ask=state.ask if state else 0.0,
+            comment=comment, request_id=0, retcode_external=0, request=request
+        )
+    
+    
+    def order_send(self, request: dict) -> OrderSendResult:
+        """
+        Procesa una solicitud de trading (dict con las claves de MT5).
+        
+        Returns:
+            OrderSendResult con retcode TRADE_RETCODE_DONE si se ejecutó
+        """
+        self._advance()
+        req = TradeRequest(
+            action=request.get("action", 0), magic=request.get("magic", 0),
+            order=request.get("order", 0), symbol=request.get("symbol", ""),
+            volume=float(request.get("volume", 0.0)), price=float(request.get("price", 0.0)),
+            stoplimit=0.0, sl=float(request.get("sl", 0.0) or 0.0),
+            tp=float(request.get("tp", 0.0) or 0.0),
+            deviation=request.get("deviation", 0), type=request.get("type", 0),
+            type_filling=request.get("type_filling", 0),
+            type_time=request.get("type_time", 0), expiration=0,
+            comment=request.get("comment", ""), position=request.get("position", 0),
+            position_by=0
+        )
+        
+        if req.action == C.TRADE_ACTION_REMOVE:
+            if self._orders.pop(req.order, None) is None:
+                return self._result(C.TRADE_RETCODE_INVALID, req, "Orden inexistente")
+            return self._result(C.TRADE_RETCODE_DONE, req, "Request executed", order=req.order)
+        
+        if req.action == C.TRADE_ACTION_SLTP:
+            position = self._positions.get(req.position)
+            if position is None:
+                return self._result(C.TRADE_RETCODE_POSITION_CLOSED, req, "Posición inexistente")
+            position.sl, position.tp = req.sl, req.tp
+            return self._result(C.TRADE_RETCODE_DONE, req, "Request executed")
+        
+        state = self._symbols.get(req.symbol)
+        if state is None:
+            return self._result(C.TRADE_RETCODE_INVALID, req, "Símbolo desconocido")
+        
+        if state.bid <= 0:
+            return self._result(C.TRADE_RETCODE_MARKET_CLOSED, req, "Sin precio")
+        
+        steps = req.volume / state.volume_step
+        if (
+            req.volume < state.volume_min - 1e-9 or req.volume > state.volume_max + 1e-9
+            or abs(steps - round(steps)) > 1e-6
+        ):
+            return self._result(C.TRADE_RETCODE_INVALID_VOLUME, req, "Volumen inválido")
+        
+        if req.action == C.TRADE_ACTION_PENDING:
+            if req.type not in (
+                C.ORDER_TYPE_BUY_LIMIT, C.ORDER_TYPE_SELL_LIMIT,
+                C.ORDER_TYPE_BUY_STOP, C.ORDER_TYPE_SELL_STOP
+            ) or req.price <= 0:
+                return self._result(C.TRADE_RETCODE_INVALID_PRICE, req, "Orden pending inválida")
+            
+            ticket = next(self._tickets)
+            self._orders[ticket] = _PendingOrder(
+                ticket, req.symbol, req.type, req.volume, req.price,
+                req.sl, req.tp, req.magic, state.time_msc, req.comment
+            )
+            return self._result(C.TRADE_RETCODE_DONE, req, "Request executed", order=ticket)
+        
+        if req.action != C.TRADE_ACTION_DEAL or req.type not in (C.ORDER_TYPE_BUY, C.ORDER_TYPE_SELL):
+            return self._result(C.TRADE_RETCODE_INVALID, req, "Acción no soportada")
+        
+        # Fill a mercado: precio vigente al envío + latencia, más slippage
+        fill_msc = max(self._now_msc, state.time_msc) + self.latency_ms
+        bid, ask = self._price_at(state, fill_msc)
+        slip = self.slippage_points * state.point
+        buying = req.type == C.ORDER_TYPE_BUY
+        price = ask + slip if buying else bid - slip
+        
+        if req.position:
+            position = self._positions.get(req.position)
+            if position is None:
+                return self._result(C.TRADE_RETCODE_POSITION_CLOSED, req, "Posición inexistente")
+            
+            order = next(self._tickets)
+            deal = self._close_position(position, req.volume, price, fill_msc, C.DEAL_REASON_EXPERT, order)
+            return self._result(C.TRADE_RETCODE_DONE, req, "Request executed", deal=deal)
+        
+        margin_free = self._equity() - self._used_margin()
+        if self._margin(req.symbol, req.volume, price) > margin_free:
+            return self._result(C.TRADE_RETCODE_NO_MONEY, req, "No money")
+        
+        ticket = next(self._tickets)
+        deal = self._open_position(
+            state, ticket, req.type, req.volume, price, req.sl, req.tp,
+            req.magic, fill_msc, req.comment
+        )
+        return self._result(C.TRADE_RETCODE_DONE, req, "Request executed", deal=deal)
+    
+    
+    def positions_get(self, symbol: str = None, group: str = None, ticket: int = None) -> Tuple[TradePosition, ...]:
+        self._advance()
+        positions = []
+        
+        for p in self._positions.values():
+            if (symbol and p.symbol != symbol) or (ticket and p.ticket != ticket):
+                continue
+            
+            state = self._symbols[p.symbol]
+            current = state.bid if p.type == C.ORDER_TYPE_BUY else state.ask
+            positions.append(TradePosition(
+                ticket=p.ticket, time=p.time_msc // 1000, time_msc=p.time_msc,
+                time_update=p.time_msc // 1000, time_update_msc=p.time_msc,
+                type=p.type, magic=p.magic, identifier=p.ticket, reason=0,
+                volume=p.volume, price_open=p.price_open, sl=p.sl, tp=p.tp,
+                price_current=current, swap=0.0, profit=self._profit(p, current),
+                symbol=p.symbol, comment=p.comment, external_id=""
+            ))
+        
+        return tuple(positions)
+    
+    
+    def orders_get(self, symbol: str = None, group: str = None, ticket: int = None) -> Tuple[TradeOrder, ...]:
+        self._advance()
+        return tuple(
+            TradeOrder(
+                ticket=o.ticket, time_setup=o.time_msc // 1000, time_setup_msc=o.time_msc,
+                type=o.type, magic=o.magic, volume_initial=o.volume,
+                volume_current=o.volume, price_open=o.price, sl=o.sl, tp=o.tp,
+                price_current=self._symbols[o.symbol].bid, symbol=o.symbol,
+                comment=o.comment
+            )
+            for o in self._orders.values()
+            if not (symbol and o.symbol != symbol) and not (ticket and o.ticket != ticket)
+        )
+    
+    
+    @staticmethod
+    def _to_epoch(value) -> int:
+        if isinstance(value, datetime):
+            if value.tzinfo is None:
+                value = value.replace(tzinfo=timezone.utc)
+            return int(value.timestamp())
+        return int(value)
+    
+    
+    def history_deals_get(self, date_from=None, date_to=None, group: str = None, ticket: int = None, position: int = None) -> Tuple[TradeDeal, ...]:
+        """
+        Deals en [date_from, date_to] (hora del servidor; datetime naive o
+        epoch), o filtrados por ticket de orden / posición.
+        """
+        self._advance()
+        
+        if ticket is not None:
+            return tuple(d for d in self._deals if d.order == ticket)
+        
+        if position is not None:
+            return tuple(d for d in self._deals if d.position_id == position)
+        
+        start = self._to_epoch(date_from) if date_from is not None else 0
+        end = self._to_epoch(date_to) if date_to is not None else sys.maxsize
+        
+        return tuple(d for d in self._deals if start <= d.time <= end)
+    
+    
+    # ========================================================================
+    # RESULTADOS
+    # ========================================================================
+    
+    @property
+    def deals(self) -> Tuple[TradeDeal, ...]:
+        """Todos los deals ejecutados, en orden."""
+        return tuple(self._deals)
+    
+    
+    def get_equity_curve(self) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Retorna la curva de equity registrada.
+        
+        Returns:
+            Tupla (tiempos epoch hora del servidor, equity en divisa de cuenta)
+        """
+        return (
+            np.array(self._equity_times, dtype=np.int64),
+            np.array(self._equity_values, dtype=np.float64)
+        )
+
+
+# ============================================================================
+# MÓDULO MetaTrader5 SIMULADO
+# ============================================================================
+
+# Funciones de la API que el módulo delega en el broker instalado
+MT5_FUNCTIONS = (
+    'initialize', 'shutdown', 'last_error', 'account_info', 'terminal_info',
+    'symbol_info', 'symbols_get', 'symbol_select', 'symbol_info_tick',
+    'copy_rates_from_pos', 'copy_ticks_from', 'copy_ticks_range',
+    'order_send', 'positions_get', 'orders_get', 'history_deals_get',
+)
+
+
+def _build_module() -> types.ModuleType:
+    module = types.ModuleType("MetaTrader5", "MetaTrader5 simulado (SimulatedBroker)")
+    module.__dict__.update(MT5_CONSTANTS)
+    module.BROKER = None
+    
+    def delegate(name):
+        def call(*args, **kwargs):
+            if module.BROKER is None:
+                raise RuntimeError("No hay SimulatedBroker instalado")
+            return getattr(module.BROKER, name)(*args, **kwargs)
+        call.__name__ = name
+        return call
+    
+    for name in MT5_FUNCTIONS:
+        setattr(module, name, delegate(name))
+    
+    return module
+
+
+_MODULE = _build_module()
+
+
+def install(broker: SimulatedBroker) -> types.ModuleType:
+    """
+    Registra el módulo 'MetaTrader5' simulado y lo conecta al broker.
+    
+    Los módulos importados después usan el broker; cambiar de broker (ej:
+    varias corridas en un mismo proceso) solo requiere otro install().
+    
+    Args:
+        broker: Broker que atenderá las llamadas
+    
+    Returns:
+        Módulo registrado en sys.modules['MetaTrader5']
+    """
+    _MODULE.BROKER = broker
+    sys.modules["MetaTrader5"] = _MODULE
+    return _MODULE
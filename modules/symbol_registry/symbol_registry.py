@@ -0,0 +1,206 @@
+"""
+LIA Engineering Solutions - Trading Framework
+Symbol Registry - Registro de Especificaciones de Símbolos
+
+Responsabilidades:
+- Cargar una vez al inicio las especificaciones de contrato (mt5.symbol_info)
+- Servir especificaciones inmutables en el camino crítico
+- Refrescar en un timer lento o bajo demanda
+
+El refresco construye un diccionario nuevo y lo reemplaza de forma
+atómica: los lectores nunca ven un registro a medio actualizar.
+"""
+
+import MetaTrader5 as mt5
+import time
+from dataclasses import dataclass
+from typing import Dict, Iterable, Optional
+from core.data.pips import pip_size
+from core.utils.logger import get_logger
+
+
+LOG = get_logger("symbol_registry")
+
+
+@dataclass(frozen=True, slots=True)
+class SymbolSpec:
+    """
+    Especificación de contrato de un símbolo.
+    """
+    name: str
+    contract_size: float
+    point: float
+    digits: int
+    volume_min: float
+    volume_step: float
+    volume_max: float
+    filling_mode: int
+    currency_base: str
+    currency_profit: str
+    calc_mode: int
+    
+    @classmethod
+    def from_symbol_info(cls, info) -> "SymbolSpec":
+        """
+        Construye la especificación desde un SymbolInfo de MT5.
+        
+        Args:
+            info: Resultado de mt5.symbol_info()
+        
+        Returns:
+            SymbolSpec inmutable
+        """
+        return cls(
+            name=info.name,
+            contract_size=info.trade_contract_size,
+            point=info.point,
+            digits=info.digits,
+            volume_min=info.volume_min,
+            volume_step=info.volume_step,
+            volume_max=info.volume_max,
+            filling_mode=info.filling_mode,
+            currency_base=info.currency_base,
+            currency_profit=info.currency_profit,
+            calc_mode=info.trade_calc_mode
+        )
+    
+    
+    @property
+    def order_filling(self) -> int:
+        """
+        Política de llenado a usar en order_send según los modos
+        permitidos por el símbolo (FOK > IOC > RETURN).
+        """
+        if self.filling_mode & mt5.SYMBOL_FILLING_FOK:
+            return mt5.ORDER_FILLING_FOK
+        if self.filling_mode & mt5.SYMBOL_FILLING_IOC:
+            return mt5.ORDER_FILLING_IOC
+        return mt5.ORDER_FILLING_RETURN
+    
+    
+    @property
+    def pip(self) -> float:
+        """
+        Tamaño del pip: 10 points en divisas con cotización fraccional
+        (5 dígitos, o 3 en pares JPY), 1 point en el resto (ver core.data.pips).
+        """
+        return pip_size(self.point, self.digits, self.calc_mode)
+    
+    
+    def normalize_price(self, price: float) -> float:
+        """
+        Redondea un precio a los dígitos del símbolo.
+        
+        Args:
+            price: Precio a normalizar
+        
+        Returns:
+            Precio redondeado
+        """
+        return round(price, self.digits)
+
+
+class SymbolRegistry:
+    """
+    Cache de especificaciones de símbolos compartida por todos los módulos.
+    """
+    
+    def __init__(self, symbols: Iterable[str] = (), refresh_interval_s: float = 3600.0):
+        """
+        Inicializa el registro y carga los símbolos indicados.
+        
+        Args:
+            symbols: Símbolos a cargar al inicio
+            refresh_interval_s: Intervalo de refresco automático
+        """
+        self.refresh_interval_s = refresh_interval_s
+        self._specs: Dict[str, SymbolSpec] = {}
+        self._last_refresh = 0.0
+        
+        for symbol in symbols:
+            self._load(symbol)
+        self._last_refresh = time.monotonic()
+        
+        LOG.info(
+            "✓ Symbol Registry inicializado: {symbols} símbolos",
+            symbols=len(self._specs)
+        )
+    
+    
+    def _load(self, symbol: str) -> Optional[SymbolSpec]:
+        """
+        Carga un símbolo desde MT5 y lo agrega al registro.
+        
+        Args:
+            symbol: Símbolo a cargar
+        
+        Returns:
+            SymbolSpec o None si MT5 no lo provee
+        """
+        info = mt5.symbol_info(symbol)
+        
+        if info is None:
+            LOG.error(
+                "ERROR: No se pudo obtener info de {symbol}. MT5 error: {mt5_error}",
+                symbol=symbol, mt5_error=mt5.last_error()
+            )
+            return None
+        
+        spec = SymbolSpec.from_symbol_info(info)
+        self._specs = {**self._specs, symbol: spec}
+        return spec
+    
+    
+    def get(self, symbol: str) -> Optional[SymbolSpec]:
+        """
+        Obtiene la especificación de un símbolo.
+        Un símbolo no registrado se carga bajo demanda.
+        
+        Args:
+            symbol: Símbolo a consultar
+        
+        Returns:
+            SymbolSpec o None si no está disponible en MT5
+        """
+        spec = self._specs.get(symbol)
+        if spec is None:
+            spec = self._load(symbol)
+        return spec
+    
+    
+    def refresh(self) -> int:
+        """
+        Recarga todas las especificaciones desde MT5.
+        Un símbolo que falla conserva su especificación anterior.
+        
+        Returns:
+            Número de símbolos actualizados
+        """
+        self._last_refresh = time.monotonic()
+        specs = dict(self._specs)
+        updated = 0
+        
+        for symbol in specs:
+            info = mt5.symbol_info(symbol)
+            if info is None:
+                continue
+            specs[symbol] = SymbolSpec.from_symbol_info(info)
+            updated += 1
+        
+        self._specs = specs
+        return updated
+    
+    
+    def maybe_refresh(self) -> bool:
+        """
+        Refresca si pasó el intervalo configurado.
+        Pensado para llamarse desde el loop principal en reposo.
+        
+        Returns:
+            True si se ejecutó el refresco
+        """
+        if time.monotonic() - self._last_refresh < self.refresh_interval_s:
+            return False
+        
+        self.refresh()
+        return True
@@ -6,25 +6,31 @@ Responsabilidades:
 - Gestionar loop principal del sistema
 - Despachar eventos a los handlers correspondientes
 - Coordinar flujo entre módulos
-- Controlar ciclo de vida del sistema
+- Controlar ciclo de vida del sistema (incluye el fin de un replay)
 """
 
-from core.events.events import (
+from core.events.fast_events import (
     DataEvent, SignalEvent, SizingEvent, OrderEvent,
     ExecutionEvent, PlacedPendingOrderEvent
 )
-from core.utils.utils import Utils
+from core.utils.latency import LatencyMonitor
+from core.utils.logger import get_log_writer, get_logger
 from modules.data_provider.data_provider import DataProvider
 from modules.signal_generator.signal_generator import SignalGenerator
 from modules.position_sizer.position_sizer import PositionSizer
 from modules.risk_manager.risk_manager import RiskManager
 from modules.order_executor.order_executor import OrderExecutor
 from modules.notifications.notifications import NotificationService
+from modules.portfolio.portfolio import Portfolio
+from modules.scheduler.bar_close_scheduler import BarCloseScheduler
 from queue import Queue, Empty
-from typing import Dict, Callable, Any
+from typing import Dict, Callable, Any, Optional
 import time
 
 
+LOG = get_logger("trading_director")
+
+
 class TradingDirector:
     """
     Orquestador central del framework de trading.
@@ -39,7 +45,11 @@ class TradingDirector:
         position_sizer: PositionSizer,
         risk_manager: RiskManager,
         order_executor: OrderExecutor,
-        notification_service: NotificationService
+        notification_service: NotificationService,
+        scheduler: Optional[BarCloseScheduler] = None,
+        dispatch_mode: str = "drain",
+        portfolio: Optional[Portfolio] = None,
+        latency_monitor: Optional[LatencyMonitor] = None
     ):
         """
         Inicializa el Trading Director con todos los módulos.
@@ -52,7 +62,23 @@ class TradingDirector:
             risk_manager: Gestor de riesgo
             order_executor: Ejecutor de órdenes
             notification_service: Servicio de notificaciones
+            scheduler: Planificador de consultas por cierre de barra
+                (default: uno para el timeframe del data provider)
+            dispatch_mode: 'drain' (despacho en lote, espera bloqueante
+                solo con la cola vacía) o 'poll' (sleep de 10ms por evento)
+            portfolio: Libro de posiciones a actualizar con cada ejecución
+                (default: el del signal generator)
+            latency_monitor: Histogramas de latencia por evento y etapa
+                (default: el del order executor)
+            
+        Raises:
+            ValueError: Si el modo de despacho no es válido
         """
+        if dispatch_mode not in ("drain", "poll"):
+            raise ValueError(
+                f"dispatch_mode '{dispatch_mode}' no válido. Opciones: drain, poll"
+            )
+        
         self.events_queue = events_queue
         
         # Referencias a módulos
@@ -62,10 +88,35 @@ class TradingDirector:
         self.RISK_MANAGER = risk_manager
         self.ORDER_EXECUTOR = order_executor
         self.NOTIFICATIONS = notification_service
+        self.PORTFOLIO = portfolio or signal_generator.PORTFOLIO
+        self.SYMBOL_REGISTRY = signal_generator.SYMBOL_REGISTRY
+        self.LATENCY = latency_monitor or order_executor.LATENCY
+        self.LOG_WRITER = get_log_writer()
+        
+        # Planificador de consultas de datos
+        if scheduler is None:
+            scheduler = BarCloseScheduler(
+                timeframe=data_provider.timeframe,
+                expected_symbols=len(data_provider.symbols),
+                server_offset_seconds=data_provider.server_offset_seconds
+            )
+        self.SCHEDULER = scheduler
         
         # Control de ejecución
         self.continue_trading = True
         
+        # Máxima espera continua en reposo (mantiene el loop reactivo)
+        self.max_idle_sleep = 0.25
+        
+        # Modo de despacho y estadísticas por despertar del loop
+        self.dispatch_mode = dispatch_mode
+        self.dispatch_stats: Dict[str, int] = {
+            "wakeups": 0,
+            "events": 0,
+            "last_batch": 0,
+            "max_batch": 0
+        }
+        
         # Mapeo de eventos a handlers
         self.event_handlers: Dict[str, Callable] = {
             "DATA": self._handle_data_event,
@@ -76,7 +127,8 @@ class TradingDirector:
             "PENDING": self._handle_pending_order_event
         }
         
-        print(f"\n{Utils.dateprint()} - ✓ Trading Director inicializado")
+        print()
+        LOG.info("✓ Trading Director inicializado")
         print(f"{'='*60}")
         print("SISTEMA LISTO PARA OPERAR")
         print(f"{'='*60}\n")
@@ -97,11 +149,11 @@ class TradingDirector:
             event: Evento con nuevos datos OHLCV
         """
         symbol = event.symbol
-        close_price = event.data['close']
+        close_price = event.data.close
         
-        print(
-            f"{Utils.dateprint()} - 📊 DATA: {symbol} | "
-            f"Close: {close_price:.5f}"
+        LOG.info(
+            "📊 DATA: {symbol} {timeframe} | Close: {close:.5f}",
+            symbol=symbol, timeframe=event.timeframe, close=close_price
         )
         
         # Pasar al generador de señales
@@ -118,9 +170,9 @@ class TradingDirector:
         Args:
             event: Señal de trading generada
         """
-        print(
-            f"{Utils.dateprint()} - 🎯 SIGNAL: {event.signal} {event.symbol} | "
-            f"Tipo: {event.target_order}"
+        LOG.info(
+            "🎯 SIGNAL: {signal} {symbol} | Tipo: {target_order}",
+            signal=event.signal, symbol=event.symbol, target_order=event.target_order
         )
         
         # Pasar al position sizer
@@ -137,9 +189,9 @@ class TradingDirector:
         Args:
             event: Evento con volumen calculado
         """
-        print(
-            f"{Utils.dateprint()} - 📏 SIZING: {event.signal} {event.symbol} | "
-            f"Volumen: {event.volume}"
+        LOG.info(
+            "📏 SIZING: {signal} {symbol} | Volumen: {volume}",
+            signal=event.signal, symbol=event.symbol, volume=event.volume
         )
         
         # Pasar al risk manager
@@ -156,9 +208,9 @@ class TradingDirector:
         Args:
             event: Orden lista para ejecutar
         """
-        print(
-            f"{Utils.dateprint()} - 📋 ORDER: {event.signal} {event.symbol} | "
-            f"Volumen: {event.volume}"
+        LOG.info(
+            "📋 ORDER: {signal} {symbol} | Volumen: {volume}",
+            signal=event.signal, symbol=event.symbol, volume=event.volume
         )
         
         # Ejecutar orden
@@ -169,6 +221,9 @@ class TradingDirector:
         """
         Procesa eventos de ejecución exitosa.
         
+        Flujo:
+        ExecutionEvent → Portfolio (libro de posiciones) → Notificación
+        
         Args:
             event: Evento de ejecución completada
         """
@@ -179,11 +234,15 @@ class TradingDirector:
             f"Hora: {event.fill_time}"
         )
         
-        print(
-            f"{Utils.dateprint()} - 💰 EXECUTION: {event.signal} {event.symbol} | "
-            f"Vol: {event.volume} | Precio: {event.fill_price}"
+        LOG.info(
+            "💰 EXECUTION: {signal} {symbol} | Vol: {volume} | Precio: {price}",
+            signal=event.signal, symbol=event.symbol, volume=event.volume,
+            price=event.fill_price
         )
         
+        # Actualizar libro de posiciones
+        self.PORTFOLIO.on_execution(event)
+        
         # Enviar notificación
         self.NOTIFICATIONS.send_notification(
             title=f"MARKET ORDER - {event.symbol}",
@@ -205,9 +264,10 @@ class TradingDirector:
             f"SL: {event.sl} | TP: {event.tp}"
         )
         
-        print(
-            f"{Utils.dateprint()} - 📌 PENDING: {event.signal} {event.target_order} "
-            f"{event.symbol} | Precio: {event.target_price}"
+        LOG.info(
+            "📌 PENDING: {signal} {target_order} {symbol} | Precio: {price}",
+            signal=event.signal, target_order=event.target_order,
+            symbol=event.symbol, price=event.target_price
         )
         
         # Enviar notificación
@@ -224,9 +284,9 @@ class TradingDirector:
         Args:
             event: Evento no reconocido
         """
-        print(
-            f"{Utils.dateprint()} - ❌ ERROR CRÍTICO: "
-            f"Evento desconocido recibido: {event}"
+        LOG.critical(
+            "❌ ERROR CRÍTICO: Evento desconocido recibido: {event}",
+            event=event
         )
         self.continue_trading = False
     
@@ -238,56 +298,249 @@ class TradingDirector:
         Args:
             event: Evento nulo
         """
-        print(f"{Utils.dateprint()} - ❌ ERROR CRÍTICO: Evento nulo recibido")
+        LOG.critical("❌ ERROR CRÍTICO: Evento nulo recibido")
         self.continue_trading = False
     
     
+    # ========================================================================
+    # DISPATCH
+    # ========================================================================
+    
+    def _dispatch(self, event: Any) -> None:
+        """
+        Envía un evento al handler correspondiente y registra su espera
+        en cola, la duración del handler y la latencia desde el origen.
+        
+        Args:
+            event: Evento obtenido de la cola
+        """
+        if event is None:
+            self._handle_none_event(event)
+            return
+        
+        handler = self.event_handlers.get(
+            event.event_type,
+            self._handle_unknown_event
+        )
+        
+        started_ns = time.perf_counter_ns()
+        handler(event)
+        self.LATENCY.record_dispatch(event, started_ns, time.perf_counter_ns())
+    
+    
+    def _drain_events(self) -> int:
+        """
+        Despacha todos los eventos listos en la cola sin esperar entre ellos.
+        Incluye los eventos que los propios handlers encolan (ej: DATA →
+        SIGNAL → SIZING → ORDER → EXECUTION se procesa en una sola pasada).
+        
+        Returns:
+            Cantidad de eventos despachados
+        """
+        dispatched = 0
+        
+        while self.continue_trading:
+            try:
+                event = self.events_queue.get_nowait()
+            except Empty:
+                break
+            
+            self._dispatch(event)
+            dispatched += 1
+        
+        return dispatched
+    
+    
+    def _record_wakeup(self, dispatched: int) -> None:
+        """
+        Registra cuántos eventos se despacharon en un despertar del loop.
+        
+        Args:
+            dispatched: Eventos despachados en el lote
+        """
+        stats = self.dispatch_stats
+        stats["wakeups"] += 1
+        stats["events"] += dispatched
+        stats["last_batch"] = dispatched
+        stats["max_batch"] = max(stats["max_batch"], dispatched)
+    
+    
+    def get_latency_stats(self) -> Dict[str, Dict[str, float]]:
+        """
+        Retorna los histogramas de latencia acumulados.
+        
+        Returns:
+            Diccionario '<etapa>.<medida>' -> count, media, mínimo, máximo
+            y percentiles en microsegundos (ver LatencyMonitor.snapshot)
+        """
+        return self.LATENCY.snapshot()
+    
+    
+    def get_dispatch_stats(self) -> Dict[str, float]:
+        """
+        Retorna estadísticas de despacho por despertar del loop.
+        
+        Returns:
+            Diccionario con wakeups, events, last_batch, max_batch y
+            avg_batch (eventos promedio por despertar)
+        """
+        stats = dict(self.dispatch_stats)
+        stats["avg_batch"] = (
+            stats["events"] / stats["wakeups"] if stats["wakeups"] else 0.0
+        )
+        return stats
+    
+    
     # ========================================================================
     # MAIN EXECUTION LOOP
     # ========================================================================
     
+    def _run_drain_loop(self) -> None:
+        """
+        Loop en modo drain.
+        
+        1. Despachar en lote todos los eventos listos
+        2. Cola vacía → bloquear en la cola hasta el próximo sondeo
+           (un evento encolado por otro hilo despierta el loop al instante)
+        3. Ventana de sondeo activa → consultar nuevos datos
+        """
+        while self.continue_trading:
+            self.DATA_PROVIDER.TICK_CACHE.begin_cycle()
+            dispatched = self._drain_events()
+            
+            if dispatched:
+                self._record_wakeup(dispatched)
+                continue
+            
+            # Reposo: reconciliación del libro y revaluación de exposición
+            self.PORTFOLIO.maybe_reconcile()
+            self.RISK_MANAGER.maybe_mark_to_market()
+            self.SYMBOL_REGISTRY.maybe_refresh()
+            self.LATENCY.maybe_dump()
+            
+            wait = self.SCHEDULER.seconds_until_next_poll()
+            
+            if wait > 0:
+                try:
+                    event = self.events_queue.get(
+                        timeout=min(wait, self.max_idle_sleep)
+                    )
+                except Empty:
+                    continue
+                
+                # Evento externo tras la espera: nuevo ciclo de precios
+                self.DATA_PROVIDER.TICK_CACHE.begin_cycle()
+                self._dispatch(event)
+                self._record_wakeup(1 + self._drain_events())
+                continue
+            
+            new_bars = self.DATA_PROVIDER.check_for_new_data()
+            self.SCHEDULER.record_poll(new_bars)
+            
+            if self.DATA_PROVIDER.finished:
+                self.continue_trading = False
+    
+    
+    def _run_poll_loop(self) -> None:
+        """
+        Loop en modo poll (comportamiento original).
+        
+        Procesa un evento por iteración y duerme 10ms después de cada una.
+        """
+        while self.continue_trading:
+            self.DATA_PROVIDER.TICK_CACHE.begin_cycle()
+            
+            try:
+                event = self.events_queue.get(block=False)
+                self._dispatch(event)
+                self._record_wakeup(1)
+            
+            except Empty:
+                # Reposo: reconciliación del libro y revaluación de exposición
+                self.PORTFOLIO.maybe_reconcile()
+                self.RISK_MANAGER.maybe_mark_to_market()
+                self.SYMBOL_REGISTRY.maybe_refresh()
+                self.LATENCY.maybe_dump()
+                
+                # No hay eventos en cola → esperar al cierre de barra
+                wait = self.SCHEDULER.seconds_until_next_poll()
+                
+                if wait > 0:
+                    time.sleep(min(wait, self.max_idle_sleep))
+                    continue
+                
+                # Ventana de sondeo activa → verificar nuevos datos
+                new_bars = self.DATA_PROVIDER.check_for_new_data()
+                self.SCHEDULER.record_poll(new_bars)
+                
+                if self.DATA_PROVIDER.finished:
+                    self.continue_trading = False
+                    continue
+            
+            # Control de frecuencia del loop
+            time.sleep(0.01)  # 10ms entre iteraciones
+    
+    
     def execute(self) -> None:
         """
         Loop principal del sistema de trading.
         
         Ciclo:
-        1. Intentar obtener evento de la cola
-        2. Si hay evento → procesarlo con handler correspondiente
-        3. Si no hay evento → verificar nuevos datos de mercado
-        4. Repetir hasta interrupción
+        1. Obtener eventos de la cola
+        2. Si hay eventos → procesarlos con el handler correspondiente
+        3. Si no hay eventos → esperar hasta el próximo cierre de barra
+           y consultar nuevos datos según el BarCloseScheduler
+        4. Repetir hasta interrupción o hasta que el feed termine
+           (DATA_PROVIDER.finished, ej: fin de un replay)
         
-        La velocidad del loop está controlada por sleep() al final.
+        El modo 'drain' (default) despacha en lote y solo espera con la
+        cola vacía; el modo 'poll' conserva el sleep de 10ms por iteración.
         """
-        print(f"{Utils.dateprint()} - ▶️ Iniciando loop principal...\n")
+        LOG.info("▶️ Iniciando loop principal (modo: {mode})...", mode=self.dispatch_mode)
+        print()
+        
+        # Durante el loop los logs se escriben en el hilo de logging
+        self.LOG_WRITER.start()
         
         try:
-            while self.continue_trading:
-                try:
-                    # Intentar obtener evento (non-blocking)
-                    event = self.events_queue.get(block=False)
-                    
-                    if event is not None:
-                        # Obtener handler apropiado
-                        handler = self.event_handlers.get(
-                            event.event_type,
-                            self._handle_unknown_event
-                        )
-                        
-                        # Procesar evento
-                        handler(event)
-                    else:
-                        self._handle_none_event(event)
-                
-                except Empty:
-                    # No hay eventos en cola → verificar nuevos datos
-                    self.DATA_PROVIDER.check_for_new_data()
-                
-                # Control de frecuencia del loop
-                time.sleep(0.01)  # 10ms entre iteraciones
+            if self.dispatch_mode == "drain":
+                self._run_drain_loop()
+            else:
+                self._run_poll_loop()
         
         except KeyboardInterrupt:
-            print(f"\n{Utils.dateprint()} - ⚠️ Interrupción manual detectada")
+            LOG.warning("⚠️ Interrupción manual detectada")
         
         finally:
-            print(f"\n{Utils.dateprint()} - 🛑 Sistema detenido")
+            self.DATA_PROVIDER.shutdown()
+            self.ORDER_EXECUTOR.FILL_RECONCILER.stop()
+            self.NOTIFICATIONS.shutdown()
+            self.LOG_WRITER.stop()
+            
+            stats = self.get_dispatch_stats()
+            print()
+            LOG.info(
+                "📈 Despacho: {events} eventos en {wakeups} despertares | "
+                "Promedio: {avg_batch:.2f} | Máximo: {max_batch}",
+                events=stats['events'], wakeups=stats['wakeups'],
+                avg_batch=stats['avg_batch'], max_batch=stats['max_batch']
+            )
+            tick_stats = self.DATA_PROVIDER.TICK_CACHE.get_stats()
+            LOG.info(
+                "📈 Ticks: {hits} aciertos / {misses} consultas a MT5 | "
+                "Tasa de acierto: {hit_rate:.1%}",
+                hits=tick_stats['hits'], misses=tick_stats['misses'],
+                hit_rate=tick_stats['hit_rate']
+            )
+            
+            send = self.LATENCY.snapshot().get("ORDER.bar_close_to_send")
+            if send:
+                LOG.info(
+                    "📈 Cierre de barra → order_send: "
+                    "{count} órdenes | p50: {p50_ms:.2f} ms | p99: {p99_ms:.2f} ms",
+                    count=send['count'], p50_ms=send['p50_us'] / 1e3,
+                    p99_ms=send['p99_us'] / 1e3
+                )
+            self.LATENCY.dump()
+            LOG.info("🛑 Sistema detenido")
             print(f"{'='*60}\n")
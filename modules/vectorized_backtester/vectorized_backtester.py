@@ -0,0 +1,785 @@
+"""
+LIA Engineering Solutions - Trading Framework
+Vectorized Backtester - Backtest Vectorizado de la Estrategia RSI
+
+Camino rápido para investigación: evalúa la estrategia del Signal Generator
+(RSI de Wilder, una posición por símbolo, SL/TP en puntos) con operaciones
+de NumPy sobre la serie completa, sin cola de eventos ni broker.
+
+Reproduce las reglas del backtest event-driven (ReplayDataProvider +
+SimulatedBroker) para obtener la misma lista de trades:
+- Señal al cierre de la barra k: RSI < rsi_lower → BUY, > rsi_upper → SELL,
+  con SL/TP calculados desde el close de la barra
+- Entrada al precio vigente al cierre + latencia (recorrido intrabar
+  O → L → H → C / O → H → L → C del broker), con spread y slippage
+- Salida en el primer punto del recorrido que toca SL o TP (SL primero);
+  en la apertura de una barra (gap) se llena al precio del gap
+- El cierre solo libera el símbolo cuando el Portfolio lo reconcilia
+  (antes del paso siguiente del replay)
+
+Implementación:
+- RSI de la serie completa con wilder_rsi() (cacheado por período)
+- Candidatas = todas las barras con RSI fuera de rango; la salida de todas
+  se busca a la vez sobre una pirámide de mínimos/máximos del recorrido
+- Encadenamiento: un único recorrido por índices enteros salta de cada
+  trade a la primera candidata posterior a su cierre visible
+
+Supuestos: los checks del Risk Manager y el margen siempre aprueban;
+la conversión a divisa de cuenta de los cruces usa el precio del par de
+conversión en el instante de la salida.
+"""
+
+import json
+import os
+import numpy as np
+from typing import Dict, List, Optional, Tuple
+from core.data.pips import pip_size
+from core.data.timeframes import TIMEFRAME_SECONDS, bar_close_time
+from core.indicators.rsi import wilder_rsi
+from modules.simulated_broker.simulated_broker import C, PATH_FRACTIONS, default_symbol_spec
+
+
+# Trade del backtest vectorizado (tiempos en ms, hora del servidor)
+TRADE_DTYPE = np.dtype([
+    ('symbol', 'i4'),           # Fila del símbolo (orden de symbols)
+    ('type', 'i1'),             # ORDER_TYPE_BUY / ORDER_TYPE_SELL
+    ('signal_time', 'i8'),      # Epoch de la barra que generó la señal
+    ('entry_time_msc', 'i8'),
+    ('entry_price', 'f8'),
+    ('sl', 'f8'),
+    ('tp', 'f8'),
+    ('volume', 'f8'),
+    ('exit_time_msc', 'i8'),    # -1 = posición abierta al final
+    ('exit_price', 'f8'),
+    ('exit_reason', 'i1'),      # DEAL_REASON_SL / DEAL_REASON_TP (0 = abierta)
+    ('profit', 'f8'),           # Divisa de cuenta, sin comisiones
+    ('commission', 'f8'),       # Ambos lados
+])
+
+# Ramificación de la pirámide de mínimos/máximos del recorrido
+PYRAMID_BRANCHING = 32
+
+# Candidatas procesadas por bloque en la búsqueda de salidas
+SEARCH_CHUNK = 1 << 16
+
+# Arrays de cada nivel de la pirámide (en orden)
+LEVEL_ARRAYS = ('bid_min', 'bid_max', 'ask_min', 'ask_max')
+
+
+class PricePath:
+    """
+    Recorrido de ticks de un símbolo: 4 puntos por barra, igual que el
+    SimulatedBroker (apertura, extremo, extremo, cierre).
+    """
+    
+    # Arrays persistidos por save() / load()
+    ARRAYS = ('times_msc', 'bid', 'ask', 'spread', 'bar_times', 'bar_close_times', 'closes')
+    
+    def __init__(
+        self,
+        bars: np.ndarray,
+        timeframe: str,
+        point: float,
+        spread_points: Optional[int] = None
+    ):
+        """
+        Construye los arrays del recorrido.
+        
+        Args:
+            bars: Barras BAR_DTYPE ordenadas por tiempo
+            timeframe: Timeframe de las barras
+            point: Tamaño del punto (ask = bid + spread * point)
+            spread_points: Spread fijo en puntos (None = el de cada barra)
+        """
+        times = np.asarray(bars['time'], dtype=np.int64)
+        opens = np.asarray(bars['open'], dtype=np.float64)
+        highs = np.asarray(bars['high'], dtype=np.float64)
+        lows = np.asarray(bars['low'], dtype=np.float64)
+        closes = np.asarray(bars['close'], dtype=np.float64)
+        
+        tf_seconds = TIMEFRAME_SECONDS[timeframe]
+        if tf_seconds is None:
+            duration = np.array(
+                [bar_close_time(int(t), timeframe) - int(t) for t in times], dtype=np.int64
+            ) * 1000
+        else:
+            duration = np.full(len(times), tf_seconds * 1000, dtype=np.int64)
+        
+        n = len(times)
+        start = times * 1000
+        bullish = closes >= opens
+        
+        self.times_msc = np.empty(4 * n, dtype=np.int64)
+        self.times_msc[0::4] = start
+        self.times_msc[1::4] = start + (duration * PATH_FRACTIONS[1]).astype(np.int64)
+        self.times_msc[2::4] = start + (duration * PATH_FRACTIONS[2]).astype(np.int64)
+        self.times_msc[3::4] = start + duration - 1
+        
+        self.bid = np.empty(4 * n, dtype=np.float64)
+        self.bid[0::4] = opens
+        self.bid[1::4] = np.where(bullish, lows, highs)
+        self.bid[2::4] = np.where(bullish, highs, lows)
+        self.bid[3::4] = closes
+        
+        if spread_points is None:
+            self.spread = np.repeat(np.asarray(bars['spread'], dtype=np.int64), 4)
+        else:
+            self.spread = np.full(4 * n, spread_points, dtype=np.int64)
+        
+        self.ask = self.bid + self.spread * point
+        self._levels = None
+        
+        self.bar_times = times
+        self.bar_close_times = (start + duration) // 1000
+        self.closes = closes
+    
+    
+    def __len__(self) -> int:
+        return len(self.times_msc)
+    
+    
+    @property
+    def levels(self) -> List[Tuple[np.ndarray, ...]]:
+        """
+        Pirámide (bid_min, bid_max, ask_min, ask_max) por nivel: el nivel 0
+        son los puntos y cada nivel resume PYRAMID_BRANCHING del anterior,
+        hasta que uno entra en un solo bloque. Se construye bajo demanda.
+        """
+        if self._levels is None:
+            branching = PYRAMID_BRANCHING
+            levels = [(self.bid, self.bid, self.ask, self.ask)]
+            
+            while len(levels[-1][0]) > branching:
+                previous = levels[-1]
+                n = len(previous[0])
+                blocks = -(-n // branching)
+                level = []
+                
+                for array, fill, reduce in zip(
+                    previous, (np.inf, -np.inf, np.inf, -np.inf), (np.min, np.max, np.min, np.max)
+                ):
+                    padded = np.full(blocks * branching, fill)
+                    padded[:n] = array
+                    level.append(reduce(padded.reshape(blocks, branching), axis=1))
+                
+                levels.append(tuple(level))
+            
+            self._levels = levels
+        
+        return self._levels
+    
+    
+    def save(self, directory: str) -> None:
+        """
+        Guarda el recorrido y su pirámide como archivos .npy.
+        
+        Args:
+            directory: Directorio destino (se crea si no existe)
+        """
+        os.makedirs(directory, exist_ok=True)
+        
+        for name in self.ARRAYS:
+            np.save(os.path.join(directory, name + ".npy"), getattr(self, name))
+        
+        for k, level in enumerate(self.levels[1:], start=1):
+            for name, array in zip(LEVEL_ARRAYS, level):
+                np.save(os.path.join(directory, f"level{k}_{name}.npy"), array)
+    
+    
+    @classmethod
+    def load(cls, directory: str) -> "PricePath":
+        """
+        Abre un recorrido guardado con save() como memmaps de solo lectura
+        (los procesos que lo abren comparten las páginas del archivo).
+        
+        Args:
+            directory: Directorio de save()
+        
+        Returns:
+            PricePath respaldado por los archivos
+        """
+        path = cls.__new__(cls)
+        
+        for name in cls.ARRAYS:
+            setattr(path, name, np.load(os.path.join(directory, name + ".npy"), mmap_mode="r"))
+        
+        levels = [(path.bid, path.bid, path.ask, path.ask)]
+        while os.path.exists(os.path.join(directory, f"level{len(levels)}_bid_min.npy")):
+            k = len(levels)
+            levels.append(tuple(
+                np.load(os.path.join(directory, f"level{k}_{name}.npy"), mmap_mode="r")
+                for name in LEVEL_ARRAYS
+            ))
+        
+        path._levels = levels
+        return path
+
+
+class VectorizedBacktester:
+    """
+    Backtest vectorizado de la estrategia RSI sobre un universo de símbolos.
+    """
+    
+    # Configuración persistida por save() / load()
+    SETTINGS = (
+        'symbols', 'timeframe', 'account_currency', 'slippage_points',
+        'latency_ms', 'commission_per_lot', 'specs',
+    )
+    
+    def __init__(
+        self,
+        bars: Dict[str, np.ndarray],
+        timeframe: str,
+        symbol_specs: Optional[Dict[str, Dict]] = None,
+        account_currency: str = "USD",
+        spread_points: Optional[int] = None,
+        slippage_points: int = 0,
+        latency_ms: int = 0,
+        commission_per_lot: float = 0.0,
+        reconcile_interval_s: float = 5.0
+    ):
+        """
+        Prepara recorridos, línea de tiempo y relojes de reconciliación.
+        
+        Args:
+            bars: Barras BAR_DTYPE por símbolo (el orden define la fila)
+            timeframe: Timeframe de las barras
+            symbol_specs: Kwargs de SimulatedBroker.add_symbol() por símbolo
+                (point, digits, contract_size, volume_*, currency_*, calc_mode)
+            account_currency: Divisa de la cuenta
+            spread_points: Spread fijo en puntos (None = el de cada barra)
+            slippage_points: Deslizamiento adverso (mercado y SL)
+            latency_ms: Demora entre la señal y el fill de la entrada
+            commission_per_lot: Comisión por lote y por lado
+            reconcile_interval_s: Intervalo de reconciliación del Portfolio
+        
+        Raises:
+            ValueError: Si el timeframe no es válido o un símbolo no tiene barras
+        """
+        if timeframe not in TIMEFRAME_SECONDS:
+            raise ValueError(f"Timeframe '{timeframe}' no válido")
+        
+        self.symbols: List[str] = list(bars)
+        self.timeframe = timeframe
+        self.account_currency = account_currency.upper()
+        self.slippage_points = slippage_points
+        self.latency_ms = latency_ms
+        self.commission_per_lot = commission_per_lot
+        
+        symbol_specs = symbol_specs or {}
+        self.specs: List[Dict] = []
+        self.paths: List[PricePath] = []
+        
+        for symbol in self.symbols:
+            if len(bars[symbol]) == 0:
+                raise ValueError(f"Sin barras de {symbol}")
+            
+            spec = dict(symbol_specs.get(symbol) or default_symbol_spec(symbol))
+            spec.setdefault('volume_min', 0.01)
+            spec.setdefault('volume_step', 0.01)
+            spec.setdefault('volume_max', 100.0)
+            spec.setdefault('calc_mode', C.SYMBOL_CALC_MODE_FOREX)
+            spec['currency_base'] = (spec.get('currency_base') or symbol[:3]).upper()
+            spec['currency_profit'] = (spec.get('currency_profit') or symbol[3:6] or account_currency).upper()
+            
+            self.specs.append(spec)
+            self.paths.append(PricePath(bars[symbol], timeframe, spec['point'], spread_points))
+        
+        self._reconcile_msc = self._reconcile_clocks(reconcile_interval_s)
+        self._conversions = [self._conversion_source(spec) for spec in self.specs]
+        self._rsi_period = None
+        self._rsi_cache: Dict[int, np.ndarray] = {}
+    
+    
+    @classmethod
+    def from_config(cls, config, bars: Dict[str, np.ndarray], symbol_specs: Optional[Dict[str, Dict]] = None) -> "VectorizedBacktester":
+        """
+        Crea el backtester con los costos de ejecución de un TradingConfig.
+        
+        Args:
+            config: TradingConfig (campos backtest_* y de portfolio)
+            bars: Barras por símbolo de config.timeframe
+            symbol_specs: Especificaciones por símbolo
+        
+        Returns:
+            VectorizedBacktester
+        """
+        return cls(
+            bars=bars,
+            timeframe=config.timeframe,
+            symbol_specs=symbol_specs,
+            spread_points=config.backtest_spread_points,
+            slippage_points=config.backtest_slippage_points,
+            latency_ms=config.backtest_latency_ms,
+            commission_per_lot=config.backtest_commission_per_lot,
+            reconcile_interval_s=config.portfolio_reconcile_interval_s
+        )
+    
+    
+    def save(self, directory: str) -> None:
+        """
+        Guarda el estado preparado (recorridos, pirámides, relojes de
+        reconciliación y configuración) para abrirlo en otros procesos.
+        
+        Args:
+            directory: Directorio destino (se crea si no existe)
+        """
+        os.makedirs(directory, exist_ok=True)
+        
+        for row, path in enumerate(self.paths):
+            row_dir = os.path.join(directory, str(row))
+            path.save(row_dir)
+            np.save(os.path.join(row_dir, "reconcile_msc.npy"), self._reconcile_msc[row])
+        
+        with open(os.path.join(directory, "settings.json"), "w") as f:
+            json.dump({name: getattr(self, name) for name in self.SETTINGS}, f)
+    
+    
+    @classmethod
+    def load(cls, directory: str) -> "VectorizedBacktester":
+        """
+        Abre un estado guardado con save() sin recalcular nada: los arrays
+        son memmaps de solo lectura compartidos entre procesos.
+        
+        Args:
+            directory: Directorio de save()
+        
+        Returns:
+            VectorizedBacktester listo para run()
+        """
+        backtester = cls.__new__(cls)
+        
+        with open(os.path.join(directory, "settings.json")) as f:
+            for name, value in json.load(f).items():
+                setattr(backtester, name, value)
+        
+        backtester.paths = []
+        backtester._reconcile_msc = []
+        for row in range(len(backtester.symbols)):
+            row_dir = os.path.join(directory, str(row))
+            backtester.paths.append(PricePath.load(row_dir))
+            backtester._reconcile_msc.append(
+                np.load(os.path.join(row_dir, "reconcile_msc.npy"), mmap_mode="r")
+            )
+        
+        backtester._conversions = [backtester._conversion_source(spec) for spec in backtester.specs]
+        backtester._rsi_period = None
+        backtester._rsi_cache = {}
+        
+        return backtester
+    
+    
+    # ========================================================================
+    # PREPARACIÓN
+    # ========================================================================
+    
+    def _reconcile_clocks(self, interval_s: float) -> List[np.ndarray]:
+        """
+        Para cada barra de cada símbolo, hora (ms) de la última reconciliación
+        del Portfolio antes de evaluar su señal: un cierre es visible si
+        ocurrió hasta ese instante.
+        
+        El replay recorre la línea de tiempo común y reconcilia, antes de
+        cada paso, con el reloj en el cierre del paso anterior (si pasó el
+        intervalo desde la reconciliación previa).
+        """
+        timeline = np.sort(np.concatenate([path.bar_times for path in self.paths]))
+        timeline = timeline[np.concatenate(([True], timeline[1:] != timeline[:-1]))]
+        closes = np.array(
+            [bar_close_time(int(t), self.timeframe) for t in timeline]
+            if TIMEFRAME_SECONDS[self.timeframe] is None
+            else timeline + TIMEFRAME_SECONDS[self.timeframe],
+            dtype=np.int64
+        )
+        
+        # Reloj antes del paso s = cierre del paso s-1 (inicial: primera apertura)
+        before_step = np.concatenate(([timeline[0]], closes[:-1]))
+        
+        if len(before_step) > 1 and np.min(np.diff(before_step)) >= interval_s:
+            reconciled = before_step.copy()
+            reconciled[0] = -1  # Reconciliación inicial: sin posiciones
+        else:
+            reconciled = np.empty_like(before_step)
+            last = float(timeline[0])
+            for step, clock in enumerate(before_step):
+                if clock - last >= interval_s:
+                    last = float(clock)
+                reconciled[step] = last if step else -1
+        
+        steps = [np.searchsorted(timeline, path.bar_times) for path in self.paths]
+        return [reconciled[step] * 1000 for step in steps]
+    
+    
+    def _conversion_source(self, spec: Dict) -> Optional[Tuple[int, bool]]:
+        """
+        Par para convertir la divisa de beneficio a la de cuenta (mismo
+        criterio que el SimulatedBroker: primer símbolo directo o inverso).
+        
+        Returns:
+            (fila, multiplicar) o None si no hace falta conversión
+        """
+        currency = spec['currency_profit']
+        if currency == self.account_currency:
+            return None
+        
+        for row, other in enumerate(self.specs):
+            if other['currency_base'] == currency and other['currency_profit'] == self.account_currency:
+                return row, True
+            if other['currency_base'] == self.account_currency and other['currency_profit'] == currency:
+                return row, False
+        
+        return None
+    
+    
+    def rsi(self, row: int, period: int) -> np.ndarray:
+        """
+        RSI de Wilder de la serie completa de un símbolo.
+        
+        Se cachea el último período pedido (una serie por símbolo): las
+        corridas con el mismo período reutilizan el cálculo sin acumular
+        memoria por cada período evaluado.
+        
+        Args:
+            row: Fila del símbolo
+            period: Período del RSI
+        
+        Returns:
+            Array de RSI (NaN durante el warm-up)
+        """
+        if period != self._rsi_period:
+            self._rsi_cache = {}
+            self._rsi_period = period
+        
+        rsi = self._rsi_cache.get(row)
+        
+        if rsi is None:
+            rsi = wilder_rsi(self.paths[row].closes, period)
+            self._rsi_cache[row] = rsi
+        
+        return rsi
+    
+    
+    # ========================================================================
+    # SIMULACIÓN
+    # ========================================================================
+    
+    @staticmethod
+    def _first_hit(
+        level: Tuple[np.ndarray, ...],
+        idx: np.ndarray,
+        valid: np.ndarray,
+        buy: np.ndarray,
+        sl: np.ndarray,
+        tp: np.ndarray
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Primer índice de cada fila de idx cuyo bloque toca SL o TP.
+        
+        Returns:
+            Tupla (encontrado, índice del primer bloque que toca)
+        """
+        bid_min, bid_max, ask_min, ask_max = level
+        safe = np.minimum(idx, len(bid_min) - 1)
+        hit = np.empty(idx.shape, dtype=bool)
+        
+        # Compras: bid contra SL/TP; ventas: ask contra SL/TP
+        for rows, low, high, at_low, at_high in (
+            (np.flatnonzero(buy), bid_min, bid_max, sl, tp),
+            (np.flatnonzero(~buy), ask_min, ask_max, tp, sl),
+        ):
+            if len(rows):
+                points = safe[rows]
+                hit[rows] = (
+                    (low[points] <= at_low[rows, None]) | (high[points] >= at_high[rows, None])
+                )
+        
+        hit &= valid
+        
+        return hit.any(axis=1), idx[np.arange(len(idx)), hit.argmax(axis=1)]
+    
+    
+    def _find_exits(
+        self,
+        path: PricePath,
+        start: np.ndarray,
+        buy: np.ndarray,
+        sl: np.ndarray,
+        tp: np.ndarray
+    ) -> np.ndarray:
+        """
+        Primer punto del recorrido (desde start) que toca el SL o el TP de
+        cada candidata.
+        
+        Sube por la pirámide revisando el resto de cada bloque hasta hallar
+        uno que toque, y baja dentro de él hasta el punto: O(B · log n)
+        por candidata, sin importar la duración del trade.
+        
+        Returns:
+            Índice del punto de salida (-1 si nunca toca)
+        """
+        levels = path.levels
+        branching = PYRAMID_BRANCHING
+        offsets = np.arange(branching)
+        exit_point = np.full(len(start), -1, dtype=np.int64)
+        
+        for chunk in range(0, len(start), SEARCH_CHUNK):
+            rows = np.arange(chunk, min(chunk + SEARCH_CHUNK, len(start)))
+            c_buy, c_sl, c_tp = buy[rows], sl[rows], tp[rows]
+            pos = start[rows].copy()
+            found_level = np.full(len(rows), -1, dtype=np.int64)
+            block = np.zeros(len(rows), dtype=np.int64)
+            active = np.flatnonzero(pos < len(path))
+            
+            # 1. Subida: resto del bloque padre en cada nivel
+            for k, level in enumerate(levels):
+                if len(active) == 0:
+                    break
+                
+                p = pos[active]
+                idx = p[:, None] + offsets
+                parent_end = (p // branching + 1) * branching
+                valid = (idx < parent_end[:, None]) & (idx < len(level[0]))
+                found, first = self._first_hit(level, idx, valid, c_buy[active], c_sl[active], c_tp[active])
+                
+                found_level[active[found]] = k
+                block[active[found]] = first[found]
+                
+                rest = active[~found]
+                pos[rest] = pos[rest] // branching + 1
+                upper = len(levels[k + 1][0]) if k + 1 < len(levels) else 0
+                active = rest[pos[rest] < upper]
+            
+            # 2. Bajada: primer hijo que toca, hasta el nivel de puntos
+            for k in range(len(levels) - 1, 0, -1):
+                sel = np.flatnonzero(found_level == k)
+                if len(sel) == 0:
+                    continue
+                
+                idx = block[sel][:, None] * branching + offsets
+                valid = idx < len(levels[k - 1][0])
+                _, first = self._first_hit(levels[k - 1], idx, valid, c_buy[sel], c_sl[sel], c_tp[sel])
+                
+                block[sel] = first
+                found_level[sel] = k - 1
+            
+            exit_point[rows] = np.where(found_level == 0, block, -1)
+        
+        return exit_point
+    
+    
+    def _run_symbol(
+        self,
+        row: int,
+        rsi_period: int,
+        rsi_upper: float,
+        rsi_lower: float,
+        sl_points: int,
+        tp_points: int,
+        volume: float,
+        start_time: int = None,
+        end_time: int = None
+    ) -> np.ndarray:
+        path = self.paths[row]
+        spec = self.specs[row]
+        point, digits = spec['point'], spec['digits']
+        slip = self.slippage_points * point
+        # SL/TP en pips, misma regla que SymbolSpec.pip
+        pip = pip_size(point, digits, spec['calc_mode'])
+        
+        # 1. Candidatas: barras con RSI fuera de rango
+        rsi = self.rsi(row, rsi_period)
+        with np.errstate(invalid='ignore'):
+            signal = (rsi < rsi_lower) | (rsi > rsi_upper)
+        
+        if start_time is not None or end_time is not None:
+            lo = 0 if start_time is None else np.searchsorted(path.bar_times, start_time, 'left')
+            hi = len(path.bar_times) if end_time is None else np.searchsorted(path.bar_times, end_time, 'left')
+            signal[:lo] = False
+            signal[hi:] = False
+        
+        cand = np.flatnonzero(signal)
+        if len(cand) == 0:
+            return np.empty(0, dtype=TRADE_DTYPE)
+        
+        buy = rsi[cand] < rsi_lower
+        close = path.closes[cand]
+        sl = np.round(np.where(buy, close - sl_points * pip, close + sl_points * pip), digits)
+        tp = np.round(np.where(buy, close + tp_points * pip, close - tp_points * pip), digits)
+        
+        # 2. Entrada: último punto vigente a cierre + latencia
+        fill_msc = path.bar_close_times[cand] * 1000 + self.latency_ms
+        fill_point = np.searchsorted(path.times_msc, fill_msc, 'right') - 1
+        bid = path.bid[fill_point]
+        ask = path.ask[fill_point]
+        entry = np.round(np.where(buy, ask + slip, bid - slip), digits)
+        
+        # 3. Salida: primer punto posterior al fill que toca SL o TP
+        start = np.searchsorted(path.times_msc, fill_msc, 'right')
+        exit_point = self._find_exits(path, start, buy, sl, tp)
+        
+        has_exit = exit_point >= 0
+        point_idx = np.maximum(exit_point, 0)
+        gap = point_idx % 4 == 0
+        exit_bid = path.bid[point_idx]
+        exit_ask = path.ask[point_idx]
+        exit_sl = np.where(buy, exit_bid <= sl, exit_ask >= sl)
+        market = np.where(buy, exit_bid, exit_ask)
+        level = np.where(exit_sl, sl, tp)
+        price = np.where(gap, market, level)
+        price = np.where(exit_sl, np.where(buy, price - slip, price + slip), price)
+        exit_price = np.where(has_exit, np.round(price, digits), np.nan)
+        exit_msc = np.where(has_exit, path.times_msc[point_idx], -1)
+        
+        # 4. Encadenamiento: una posición por símbolo
+        visible = np.where(
+            has_exit,
+            np.searchsorted(self._reconcile_msc[row], exit_msc, 'left'),
+            len(path.bar_times)
+        )
+        next_cand = np.searchsorted(cand, np.maximum(visible, cand + 1), 'left')
+        
+        taken = []
+        c, n_cand = 0, len(cand)
+        next_list = next_cand.tolist()
+        while c < n_cand:
+            taken.append(c)
+            c = next_list[c]
+        taken = np.array(taken, dtype=np.intp)
+        
+        # 5. Resultado en divisa de cuenta (mismas operaciones que el broker)
+        trades = np.zeros(len(taken), dtype=TRADE_DTYPE)
+        trades['symbol'] = row
+        trades['type'] = np.where(buy[taken], C.ORDER_TYPE_BUY, C.ORDER_TYPE_SELL)
+        trades['signal_time'] = path.bar_times[cand[taken]]
+        trades['entry_time_msc'] = fill_msc[taken]
+        trades['entry_price'] = entry[taken]
+        trades['sl'] = sl[taken]
+        trades['tp'] = tp[taken]
+        trades['volume'] = volume
+        trades['exit_time_msc'] = exit_msc[taken]
+        trades['exit_price'] = exit_price[taken]
+        trades['exit_reason'] = np.where(
+            has_exit[taken], np.where(exit_sl[taken], C.DEAL_REASON_SL, C.DEAL_REASON_TP), 0
+        )
+        
+        direction = np.where(buy[taken], 1.0, -1.0)
+        raw = (trades['exit_price'] - trades['entry_price']) * direction * volume * spec['contract_size']
+        trades['profit'] = np.round(self._to_account(row, raw, trades['exit_time_msc']), 2)
+        
+        commission = -round(self.commission_per_lot * volume, 2) if self.commission_per_lot else 0.0
+        trades['commission'] = np.where(has_exit[taken], 2 * commission, commission)
+        
+        return trades
+    
+    
+    def _to_account(self, row: int, amount: np.ndarray, time_msc: np.ndarray) -> np.ndarray:
+        source = self._conversions[row]
+        if source is None:
+            return amount
+        
+        conv_row, multiply = source
+        conv = self.paths[conv_row]
+        point = np.maximum(np.searchsorted(conv.times_msc, time_msc, 'right') - 1, 0)
+        rate = conv.bid[point]
+        
+        return amount * rate if multiply else amount / rate
+    
+    
+    def run(
+        self,
+        rsi_period: int = 14,
+        rsi_upper: float = 70.0,
+        rsi_lower: float = 30.0,
+        sl_points: int = 50,
+        tp_points: int = 100,
+        volume: float = 0.01,
+        start_time: int = None,
+        end_time: int = None
+    ) -> np.ndarray:
+        """
+        Ejecuta la estrategia RSI sobre todos los símbolos.
+        
+        Args:
+            rsi_period: Período del RSI
+            rsi_upper: Nivel de sobrecompra (SELL)
+            rsi_lower: Nivel de sobreventa (BUY)
+            sl_points: Stop Loss en pips
+            tp_points: Take Profit en pips
+            volume: Volumen por trade (se ajusta a los límites del símbolo)
+            start_time: Señales desde este epoch (el RSI usa todo el histórico)
+            end_time: Señales antes de este epoch (las salidas pueden ser posteriores)
+        
+        Returns:
+            Array TRADE_DTYPE ordenado por hora de entrada
+        """
+        results = []
+        
+        for row, spec in enumerate(self.specs):
+            lots = min(max(volume, spec['volume_min']), spec['volume_max'])
+            lots = round(round(lots / spec['volume_step']) * spec['volume_step'], 8)
+            
+            results.append(self._run_symbol(
+                row, rsi_period, rsi_upper, rsi_lower, sl_points, tp_points,
+                lots, start_time, end_time
+            ))
+        
+        trades = np.concatenate(results)
+        return trades[np.argsort(trades['entry_time_msc'], kind='stable')]
+    
+    
+    def run_config(self, config, start_time: int = None, end_time: int = None) -> np.ndarray:
+        """
+        Ejecuta la estrategia con los parámetros de un TradingConfig.
+        """
+        return self.run(
+            rsi_period=config.rsi_period,
+            rsi_upper=config.rsi_upper,
+            rsi_lower=config.rsi_lower,
+            sl_points=config.sl_points,
+            tp_points=config.tp_points,
+            volume=config.fixed_volume,
+            start_time=start_time,
+            end_time=end_time
+        )
+    
+    
+    # ========================================================================
+    # MÉTRICAS
+    # ========================================================================
+    
+    @staticmethod
+    def summarize(trades: np.ndarray) -> Dict[str, float]:
+        """
+        Métricas de los trades cerrados.
+        
+        Args:
+            trades: Resultado de run()
+        
+        Returns:
+            Diccionario con trades, win_rate, net_profit, profit_factor,
+            max_drawdown y sharpe (por trade)
+        """
+        closed = trades[trades['exit_reason'] != 0]
+        closed = closed[np.argsort(closed['exit_time_msc'], kind='stable')]
+        pnl = closed['profit'] + closed['commission']
+        
+        if len(pnl) == 0:
+            return {
+                'trades': 0, 'win_rate': 0.0, 'net_profit': 0.0,
+                'profit_factor': 0.0, 'max_drawdown': 0.0, 'sharpe': 0.0,
+            }
+        
+        equity = np.cumsum(pnl)
+        drawdown = np.maximum.accumulate(np.concatenate(([0.0], equity)))[1:] - equity
+        gross_win = pnl[pnl > 0].sum()
+        gross_loss = -pnl[pnl < 0].sum()
+        std = pnl.std()
+        
+        return {
+            'trades': int(len(pnl)),
+            'win_rate': float((pnl > 0).mean()),
+            'net_profit': float(equity[-1]),
+            'profit_factor': float(gross_win / gross_loss) if gross_loss > 0 else float('inf'),
+            'max_drawdown': float(drawdown.max()),
+            'sharpe': float(pnl.mean() / std * np.sqrt(len(pnl))) if std > 0 else 0.0,
+        }
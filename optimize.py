@@ -0,0 +1,78 @@
+"""
+LIA Engineering Solutions - Trading Framework
+Optimize - Barrido de Parámetros de la Estrategia RSI
+
+Evalúa en paralelo una grilla de parámetros alrededor de los valores de
+TradingConfig con el VectorizedBacktester, sobre el almacén local de
+barras (sin MT5). Con --train-days/--test-days corre un walk-forward.
+
+Uso:
+    python optimize.py [--start 2024-01-01] [--end 2024-06-01] [--workers 8]
+    python optimize.py --train-days 60 --test-days 15
+"""
+
+import argparse
+import sys
+from typing import Dict, List
+import pandas as pd
+
+from backtest import parse_date
+from config.trading_config import get_default_config, TradingConfig
+from core.data.bar_store import BarStore
+from modules.optimizer.optimizer import ParameterOptimizer, parameter_grid
+
+
+def default_space(config: TradingConfig) -> Dict[str, List]:
+    """
+    Grilla por defecto alrededor de los parámetros del config.
+    
+    Args:
+        config: Configuración con los valores centrales
+    
+    Returns:
+        Valores a barrer por parámetro
+    """
+    return {
+        'rsi_period': sorted({max(2, config.rsi_period + d) for d in (-7, 0, 7)}),
+        'rsi_upper': [config.rsi_upper - 5, config.rsi_upper, config.rsi_upper + 5],
+        'rsi_lower': [config.rsi_lower - 5, config.rsi_lower, config.rsi_lower + 5],
+        'sl_points': [config.sl_points // 2, config.sl_points, config.sl_points * 2],
+        'tp_points': [config.tp_points // 2, config.tp_points, config.tp_points * 2],
+    }
+
+
+def main(argv: List[str] = None):
+    parser = argparse.ArgumentParser(description="Barrido de parámetros de la estrategia RSI")
+    parser.add_argument("--start", type=parse_date, default=None, help="Fecha inicial (YYYY-MM-DD)")
+    parser.add_argument("--end", type=parse_date, default=None, help="Fecha final exclusiva (YYYY-MM-DD)")
+    parser.add_argument("--workers", type=int, default=0, help="Procesos (0 = uno por CPU)")
+    parser.add_argument("--rank-by", default="sharpe", help="Métrica para ordenar")
+    parser.add_argument("--min-trades", type=int, default=10, help="Trades mínimos por combinación")
+    parser.add_argument("--train-days", type=float, default=None, help="Walk-forward: días de entrenamiento")
+    parser.add_argument("--test-days", type=float, default=None, help="Walk-forward: días de prueba")
+    parser.add_argument("--top", type=int, default=20, help="Filas a mostrar")
+    args = parser.parse_args(argv)
+    
+    config = get_default_config()
+    if not config.bar_store_dir:
+        print("ERROR: La optimización requiere bar_store_dir (ej: 'data/bars') con barras descargadas")
+        sys.exit(1)
+    
+    bar_store = BarStore(config.bar_store_dir)
+    combos = parameter_grid(default_space(config))
+    
+    with ParameterOptimizer.from_config(config, bar_store, args.start, args.end, workers=args.workers) as optimizer:
+        if args.train_days and args.test_days:
+            table = optimizer.walk_forward(
+                combos, args.train_days, args.test_days,
+                rank_by=args.rank_by, min_trades=args.min_trades
+            )
+        else:
+            table = optimizer.sweep(combos, rank_by=args.rank_by, min_trades=args.min_trades).head(args.top)
+    
+    with pd.option_context('display.width', 200, 'display.max_columns', None):
+        print(table.to_string())
+
+
+if __name__ == "__main__":
+    main()
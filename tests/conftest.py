@@ -0,0 +1,33 @@
+"""
+LIA Engineering Solutions - Trading Framework
+Configuración de pytest
+
+Los módulos del framework importan MetaTrader5 al cargarse: se instala el
+broker simulado antes de cualquier import y cada test que lo necesite
+instala el suyo con el fixture `broker`.
+"""
+
+import pytest
+from modules.simulated_broker import simulated_broker
+from modules.simulated_broker.simulated_broker import SimulatedBroker
+from core.utils.virtual_clock import VirtualClock
+
+simulated_broker.install(SimulatedBroker())
+
+
+# 2024-01-02 00:00:00 UTC (martes)
+START_TIME = 1704153600
+
+
+@pytest.fixture
+def clock() -> VirtualClock:
+    """Reloj virtual en START_TIME."""
+    return VirtualClock(START_TIME)
+
+
+@pytest.fixture
+def broker(clock) -> SimulatedBroker:
+    """Broker simulado sobre el reloj virtual, instalado como MetaTrader5."""
+    broker = SimulatedBroker(clock=clock)
+    simulated_broker.install(broker)
+    return broker
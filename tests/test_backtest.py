@@ -0,0 +1,106 @@
+"""
+Tests del backtest: modos de datos soportados y equivalencia entre el
+camino event-driven y el vectorizado.
+"""
+
+import numpy as np
+import pytest
+import backtest
+from config.trading_config import get_default_config
+from core.data.bar_buffer import BAR_DTYPE
+from core.data.bar_store import BarStore
+from modules.simulated_broker.simulated_broker import C
+from tests.conftest import START_TIME
+
+
+def test_ticks_feed_mode_is_rejected():
+    config = get_default_config()
+    config.data_feed_mode = "ticks"
+    
+    with pytest.raises(ValueError, match="data_feed_mode"):
+        backtest.run_backtest(config, bar_store=None)
+    
+    with pytest.raises(ValueError, match="data_feed_mode"):
+        backtest.run_vectorized(config, bar_store=None)
+
+
+SYMBOLS = ["EURUSD", "USDJPY"]
+
+
+def make_store(root: str, count: int = 2000, seed: int = 7) -> BarStore:
+    """
+    Almacén con un paseo aleatorio M1 por símbolo. Falta media hora de
+    barras a mitad de la serie y el precio reabre 30 pips más arriba:
+    las posiciones abiertas cierran por gap en la apertura.
+    """
+    rng = np.random.default_rng(seed)
+    store = BarStore(root)
+    
+    for symbol in SYMBOLS:
+        base = 150.0 if symbol.endswith("JPY") else 1.08
+        pip = 0.01 if symbol.endswith("JPY") else 0.0001
+        close = base + np.cumsum(rng.normal(0, 2 * pip, count))
+        close[count // 2:] += 30 * pip
+        open_ = np.r_[base, close[:-1]]
+        
+        bars = np.zeros(count, dtype=BAR_DTYPE)
+        bars['time'] = START_TIME + 60 * np.arange(count)
+        bars['open'] = open_
+        bars['high'] = np.maximum(open_, close) + np.abs(rng.normal(0, pip, count))
+        bars['low'] = np.minimum(open_, close) - np.abs(rng.normal(0, pip, count))
+        bars['close'] = close
+        bars['tickvol'] = 100
+        bars['spread'] = rng.integers(5, 20, count)
+        
+        keep = np.ones(count, dtype=bool)
+        keep[count // 2 - 30:count // 2] = False
+        store.series(symbol, "1min").append(bars[keep])
+    
+    return store
+
+
+def test_vectorized_trades_match_event_driven_deals(tmp_path):
+    config = get_default_config()
+    config.symbols = SYMBOLS
+    config.rsi_upper = 65
+    config.rsi_lower = 35
+    config.sl_points = 10
+    config.tp_points = 15
+    config.backtest_slippage_points = 3
+    config.backtest_latency_ms = 700
+    config.latency_log_dir = str(tmp_path / "logs")
+    store = make_store(str(tmp_path / "bars"))
+    
+    broker = backtest.run_backtest(config, store)
+    trades = backtest.run_vectorized(config, store)
+    
+    exits = {deal.position_id: deal for deal in broker.deals if deal.entry == C.DEAL_ENTRY_OUT}
+    event_trades = sorted(
+        (
+            SYMBOLS.index(deal.symbol), deal.type, deal.time_msc, deal.price,
+            exits[deal.position_id].time_msc if deal.position_id in exits else -1,
+            exits[deal.position_id].reason if deal.position_id in exits else -1,
+        )
+        for deal in broker.deals if deal.entry == C.DEAL_ENTRY_IN
+    )
+    vector_trades = sorted(
+        (
+            int(trade['symbol']), int(trade['type']), int(trade['entry_time_msc']),
+            float(trade['entry_price']), int(trade['exit_time_msc']),
+            int(trade['exit_reason']) if trade['exit_time_msc'] >= 0 else -1,
+        )
+        for trade in trades
+    )
+    assert vector_trades == event_trades
+    
+    # Precio y resultado de cada salida
+    exit_deals = sorted(exits.values(), key=lambda deal: (deal.time_msc, SYMBOLS.index(deal.symbol)))
+    closed = np.sort(trades[trades['exit_time_msc'] >= 0], order=('exit_time_msc', 'symbol'))
+    np.testing.assert_array_equal(closed['exit_price'], [deal.price for deal in exit_deals])
+    np.testing.assert_allclose(closed['profit'], [deal.profit for deal in exit_deals], atol=1e-9)
+    
+    # El escenario cubre SL, TP y salidas por gap en la apertura de barra
+    reasons = closed['exit_reason']
+    assert (reasons == C.DEAL_REASON_SL).any()
+    assert (reasons == C.DEAL_REASON_TP).any()
+    assert (closed['exit_time_msc'] % 60000 == 0).any()
@@ -0,0 +1,100 @@
+"""
+Tests del BarRingBuffer: doble escritura al rotar, vistas zero-copy de
+solo lectura y extend() a través del límite de capacidad.
+"""
+
+import numpy as np
+import pytest
+from core.data.bar_buffer import BAR_DTYPE, BarRingBuffer
+
+
+def make_bars(first: int, count: int) -> np.ndarray:
+    """Barras M1 con close igual al número de minuto."""
+    bars = np.zeros(count, dtype=BAR_DTYPE)
+    bars['time'] = 60 * np.arange(first, first + count)
+    bars['close'] = np.arange(first, first + count)
+    return bars
+
+
+def minutes(bars: np.ndarray) -> list:
+    return (bars['time'] // 60).tolist()
+
+
+def test_wraparound_keeps_last_bars_contiguous_and_mirrored():
+    buffer = BarRingBuffer(4)
+    
+    for bar in make_bars(0, 11):
+        assert buffer.append_bar(bar)
+    
+    assert len(buffer) == 4
+    assert buffer.total_appended == 11
+    assert buffer.last_time == 600
+    assert minutes(buffer.view()) == [7, 8, 9, 10]
+    assert buffer.view()['close'].tolist() == [7.0, 8.0, 9.0, 10.0]
+    assert buffer.latest()['time'] == 600
+    
+    # Cada slot tiene su réplica en i + capacidad
+    data = buffer._data
+    np.testing.assert_array_equal(data[:4], data[4:])
+
+
+def test_append_rejects_bars_not_after_the_last():
+    buffer = BarRingBuffer(4)
+    buffer.extend(make_bars(0, 3))
+    
+    assert not buffer.append_bar(make_bars(2, 1)[0])
+    assert not buffer.append_bar(make_bars(1, 1)[0])
+    assert minutes(buffer.view()) == [0, 1, 2]
+    assert buffer.total_appended == 3
+
+
+def test_view_is_read_only_and_zero_copy():
+    buffer = BarRingBuffer(4)
+    buffer.extend(make_bars(0, 4))
+    
+    view = buffer.view(2)
+    
+    assert minutes(view) == [2, 3]
+    assert not view.flags.writeable
+    assert np.shares_memory(view, buffer._data)
+    with pytest.raises(ValueError):
+        view['close'][0] = 0.0
+    
+    # La vista referencia la memoria interna: refleja la rotación
+    buffer.extend(make_bars(4, 2))
+    assert minutes(view) == [2, 3]
+    buffer.append_bar(make_bars(6, 1)[0])
+    assert minutes(view) == [6, 3]
+
+
+def test_view_clamps_requested_bars():
+    buffer = BarRingBuffer(4)
+    
+    assert len(buffer.view()) == 0
+    assert buffer.latest() is None
+    
+    buffer.extend(make_bars(0, 3))
+    
+    assert minutes(buffer.view(10)) == [0, 1, 2]
+    assert len(buffer.view(0)) == 0
+
+
+def test_extend_across_capacity_boundary():
+    buffer = BarRingBuffer(5)
+    buffer.extend(make_bars(0, 3))
+    
+    # Solapa con lo almacenado: solo se agregan los minutos 3 a 6
+    assert buffer.extend(make_bars(1, 6)) == 4
+    assert minutes(buffer.view()) == [2, 3, 4, 5, 6]
+    assert buffer.total_appended == 7
+    np.testing.assert_array_equal(buffer._data[:5], buffer._data[5:])
+
+
+def test_extend_larger_than_capacity_counts_discarded_bars():
+    buffer = BarRingBuffer(5)
+    buffer.extend(make_bars(0, 2))
+    
+    assert buffer.extend(make_bars(2, 12)) == 12
+    assert minutes(buffer.view()) == [9, 10, 11, 12, 13]
+    assert buffer.total_appended == 14
+    assert buffer.extend(make_bars(0, 14)) == 0
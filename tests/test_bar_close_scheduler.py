@@ -0,0 +1,105 @@
+"""
+Tests del BarCloseScheduler: cálculo del próximo cierre y ventana de
+sondeo acotada.
+"""
+
+import calendar
+import pytest
+from modules.scheduler.bar_close_scheduler import BarCloseScheduler
+from tests.conftest import START_TIME
+
+
+# Servidor en UTC+2
+OFFSET = 7200
+
+
+def server_epoch(*fields) -> int:
+    """Epoch UTC de una hora del servidor (año, mes, día, hora, ...)."""
+    return calendar.timegm(fields + (0,) * (6 - len(fields))) - OFFSET
+
+
+def test_next_close_intraday():
+    scheduler = BarCloseScheduler("5min", server_offset_seconds=OFFSET)
+    
+    assert scheduler.next_close_time(START_TIME + 61) == START_TIME + 300
+    # En el cierre exacto se pasa al siguiente (estrictamente posterior)
+    assert scheduler.next_close_time(START_TIME + 300) == START_TIME + 600
+
+
+def test_next_close_daily_follows_server_midnight():
+    scheduler = BarCloseScheduler("1d", server_offset_seconds=OFFSET)
+    
+    # 2024-01-02 23:00 UTC ya es miércoles 01:00 en el servidor
+    assert scheduler.next_close_time(START_TIME + 23 * 3600) == server_epoch(2024, 1, 4)
+
+
+def test_next_close_weekly_is_anchored_on_sunday():
+    scheduler = BarCloseScheduler("1w", server_offset_seconds=OFFSET)
+    
+    # Martes 2024-01-02: la semana del servidor cierra el domingo 7
+    assert scheduler.next_close_time(START_TIME) == server_epoch(2024, 1, 7)
+    # Sábado 22:00 UTC = domingo 00:00 del servidor: cierra el domingo 14
+    assert scheduler.next_close_time(server_epoch(2024, 1, 7)) == server_epoch(2024, 1, 14)
+
+
+@pytest.mark.parametrize("now, expected", [
+    (server_epoch(2024, 1, 15, 12), server_epoch(2024, 2, 1)),
+    (server_epoch(2024, 2, 10), server_epoch(2024, 3, 1)),
+    (server_epoch(2024, 12, 31, 23, 59), server_epoch(2025, 1, 1)),
+])
+def test_next_close_monthly_uses_calendar_months(now, expected):
+    scheduler = BarCloseScheduler("1M", server_offset_seconds=OFFSET)
+    
+    assert scheduler.next_close_time(now) == expected
+
+
+def make_scheduler(clock) -> BarCloseScheduler:
+    scheduler = BarCloseScheduler(
+        "1min", expected_symbols=2, lead_time_ms=50,
+        poll_interval_ms=10, poll_window_ms=2000, clock=clock
+    )
+    # Consulta inicial de sincronización
+    assert scheduler.seconds_until_next_poll() == 0.0
+    scheduler.record_poll(0)
+    return scheduler
+
+
+def test_sleeps_until_lead_time_before_close(clock):
+    clock.advance_to(START_TIME + 30)
+    scheduler = make_scheduler(clock)
+    
+    assert scheduler.seconds_until_next_poll() == pytest.approx(29.95)
+
+
+def test_window_completes_when_all_symbols_report(clock):
+    scheduler = make_scheduler(clock)
+    
+    clock.advance_to(START_TIME + 60.2)
+    assert scheduler.seconds_until_next_poll() == 0.0
+    scheduler.record_poll(1)
+    assert scheduler.seconds_until_next_poll() == pytest.approx(0.01)
+    
+    clock.advance_to(START_TIME + 60.3)
+    scheduler.record_poll(1)
+    
+    assert scheduler.completed_windows == 1
+    assert scheduler.last_detection_latency_ms == pytest.approx(300)
+    assert scheduler.seconds_until_next_poll() == pytest.approx(59.65)
+
+
+def test_window_expires_after_poll_window(clock):
+    scheduler = make_scheduler(clock)
+    
+    clock.advance_to(START_TIME + 61)
+    scheduler.record_poll(1)
+    
+    # Un símbolo sin barra: se reintenta solo dentro de la ventana de 2s
+    clock.advance_to(START_TIME + 62.5)
+    assert scheduler.seconds_until_next_poll() == pytest.approx(57.45)
+    assert scheduler.expired_windows == 1
+    assert scheduler.completed_windows == 0
+    
+    # El conteo del cierre vencido no se arrastra al siguiente
+    clock.advance_to(START_TIME + 120)
+    scheduler.record_poll(1)
+    assert scheduler.completed_windows == 0
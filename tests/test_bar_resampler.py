@@ -0,0 +1,98 @@
+"""
+Tests del BarResampler: agregación incremental a timeframes superiores.
+"""
+
+import numpy as np
+import pytest
+from core.data.bar_buffer import BAR_DTYPE
+from core.data.bar_resampler import BarResampler, can_resample
+from tests.conftest import START_TIME
+
+
+def make_bars(minutes, start: int = START_TIME) -> np.ndarray:
+    """Barras M1 en los minutos indicados; open = minuto, close = minuto + 0.5."""
+    minutes = np.asarray(minutes)
+    bars = np.zeros(len(minutes), dtype=BAR_DTYPE)
+    bars['time'] = start + 60 * minutes
+    bars['open'] = minutes
+    bars['high'] = minutes + 1
+    bars['low'] = minutes - 1
+    bars['close'] = minutes + 0.5
+    bars['tickvol'] = 10
+    bars['spread'] = 20 - minutes
+    return bars
+
+
+def test_can_resample():
+    assert can_resample("1min", "5min")
+    assert can_resample("1min", "1w")
+    assert not can_resample("5min", "1min")
+    assert not can_resample("1min", "1min")
+    assert not can_resample("2min", "5min")
+
+
+def test_invalid_target_raises():
+    with pytest.raises(ValueError):
+        BarResampler("5min", "1min")
+
+
+def test_closes_when_last_base_bar_of_period_arrives():
+    resampler = BarResampler("1min", "5min")
+    
+    assert len(resampler.update(make_bars([0, 1, 2, 3]))) == 0
+    assert resampler.forming_bar['time'] == START_TIME
+    
+    closed = resampler.update(make_bars([4]))
+    assert len(closed) == 1
+    bar = closed[0]
+    assert bar['time'] == START_TIME
+    assert bar['open'] == 0
+    assert bar['high'] == 5
+    assert bar['low'] == -1
+    assert bar['close'] == 4.5
+    assert bar['tickvol'] == 50
+    assert bar['spread'] == 16
+    assert resampler.forming_bar is None
+
+
+def test_missing_last_base_bar_closes_on_next_period():
+    resampler = BarResampler("1min", "5min")
+    
+    assert len(resampler.update(make_bars([0, 1, 2]))) == 0
+    
+    closed = resampler.update(make_bars([5, 6]))
+    assert list(closed['time']) == [START_TIME]
+    assert closed[0]['close'] == 2.5
+    assert resampler.forming_bar['time'] == START_TIME + 300
+
+
+def test_single_batch_matches_incremental_updates():
+    bars = make_bars(np.arange(23))
+    
+    batch = BarResampler("1min", "5min").update(bars)
+    
+    resampler = BarResampler("1min", "5min")
+    incremental = np.concatenate([resampler.update(bars[i:i + 1]) for i in range(len(bars))])
+    
+    np.testing.assert_array_equal(batch, incremental)
+    assert list(batch['time']) == [START_TIME + 300 * k for k in range(4)]
+
+
+def test_seed_forming_keeps_partial_bar_open():
+    resampler = BarResampler("1min", "5min")
+    seed = make_bars([0, 1, 2])
+    forming = np.zeros(1, dtype=BAR_DTYPE)[0]
+    forming['time'] = START_TIME
+    forming['open'] = -10
+    forming['high'] = 100
+    forming['low'] = -100
+    forming['tickvol'] = 30
+    resampler.seed_forming(forming)
+    
+    # Las barras base ya incluidas en la barra sembrada se toman igual
+    closed = resampler.update(np.concatenate((seed[2:], make_bars([3, 4]))))
+    assert len(closed) == 1
+    assert closed[0]['open'] == -10
+    assert closed[0]['high'] == 100
+    assert closed[0]['low'] == -100
+    assert closed[0]['close'] == 4.5
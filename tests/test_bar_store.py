@@ -0,0 +1,74 @@
+"""
+Tests del BarStore: escritura append-only, reapertura e índice por tiempo.
+"""
+
+import numpy as np
+import pytest
+from core.data.bar_buffer import BAR_DTYPE
+from core.data.bar_store import BarSeries, BarStore
+from tests.conftest import START_TIME
+
+
+def make_bars(count: int, start: int = START_TIME) -> np.ndarray:
+    bars = np.zeros(count, dtype=BAR_DTYPE)
+    bars['time'] = start + 60 * np.arange(count)
+    bars['close'] = 1.1 + 0.0001 * np.arange(count)
+    return bars
+
+
+def test_append_and_reopen(tmp_path):
+    store = BarStore(str(tmp_path))
+    bars = make_bars(10)
+    
+    assert store.series("EURUSD", "1min").append(bars[:6]) == 6
+    # Solapadas: solo se escriben las posteriores a la última almacenada
+    assert store.series("EURUSD", "1min").append(bars[4:]) == 4
+    store.close()
+    
+    reopened = BarStore(str(tmp_path)).series("EURUSD", "1min")
+    assert len(reopened) == 10
+    assert reopened.first_time == START_TIME
+    assert reopened.last_time == int(bars['time'][-1])
+    np.testing.assert_array_equal(reopened.bars, bars)
+
+
+def test_reopen_discards_partial_record(tmp_path):
+    store = BarStore(str(tmp_path))
+    store.series("EURUSD", "1min").append(make_bars(3))
+    store.close()
+    
+    with open(store.path("EURUSD", "1min"), "ab") as f:
+        f.write(b"\x00" * (BAR_DTYPE.itemsize // 2))
+    
+    series = BarStore(str(tmp_path)).series("EURUSD", "1min")
+    assert len(series) == 3
+    assert series.append(make_bars(1, START_TIME + 180)) == 1
+    np.testing.assert_array_equal(series.bars['time'], START_TIME + 60 * np.arange(4))
+
+
+def test_out_of_order_bars_are_rejected(tmp_path):
+    series = BarStore(str(tmp_path)).series("EURUSD", "1min")
+    bars = make_bars(3)[::-1]
+    
+    with pytest.raises(ValueError):
+        series.append(bars)
+
+
+def test_slice_across_index_blocks(tmp_path, monkeypatch):
+    monkeypatch.setattr(BarSeries, "INDEX_STRIDE", 4)
+    store = BarStore(str(tmp_path))
+    bars = make_bars(50)
+    series = store.series("EURUSD", "1min")
+    for chunk in np.array_split(bars, 7):
+        series.append(chunk)
+    store.close()
+    
+    series = BarStore(str(tmp_path)).series("EURUSD", "1min")
+    for lo, hi in ((0, 50), (3, 17), (8, 9), (21, 49), (49, 50)):
+        start, end = START_TIME + 60 * lo, START_TIME + 60 * hi
+        np.testing.assert_array_equal(series.slice(start, end), bars[lo:hi])
+    
+    # Límites fuera de la serie y entre barras
+    np.testing.assert_array_equal(series.slice(START_TIME - 600, START_TIME + 90), bars[:2])
+    assert len(series.slice(START_TIME + 6000)) == 0
+    np.testing.assert_array_equal(series.tail(3), bars[-3:])
@@ -0,0 +1,93 @@
+"""
+Tests del CurrencyConverter: tasas directas, inversas y trianguladas
+por las divisas puente sobre los pares de SimulatedBroker.symbols_get,
+y rechazo de órdenes cuando no hay camino de conversión.
+"""
+
+from queue import Queue
+import pytest
+from core.events.events import OrderType, SignalType
+from core.events.fast_events import SizingEvent
+from modules.currency_converter.currency_converter import CurrencyConverter
+from modules.data_provider.data_provider import DataProvider
+from modules.portfolio.portfolio import Portfolio
+from modules.risk_manager.risk_manager import RiskManager
+from tests.test_portfolio import MAGIC
+
+
+PRICES = {
+    "EURUSD": 1.10,
+    "USDJPY": 150.0,
+    "EURGBP": 0.85,
+    # Variante con sufijo del mismo par: se usa el nombre más corto
+    "EURUSD.m": 1.50,
+    # Par aislado de las divisas puente
+    "AUDNZD": 1.08,
+}
+
+
+@pytest.fixture
+def market(broker):
+    for symbol, price in PRICES.items():
+        broker.add_symbol(symbol)
+        broker.on_tick(symbol, price)
+    # Par sin cotización: no aporta tasa
+    broker.add_symbol("USDCHF")
+    return broker
+
+
+@pytest.fixture
+def converter(market) -> CurrencyConverter:
+    converter = CurrencyConverter()
+    converter.add_currencies(["JPY", "GBP", "AUD", "NZD", "CHF"])
+    return converter
+
+
+def test_direct_and_inverse_rates(converter):
+    assert converter.get_rate("EUR", "USD") == pytest.approx(1.10)
+    assert converter.get_rate("USD", "EUR") == pytest.approx(1 / 1.10)
+    assert converter.get_rate("usd", "jpy") == pytest.approx(150.0)
+    assert converter.get_rate("AUD", "NZD") == pytest.approx(1.08)
+    assert converter.convert(1000.0, "JPY", "USD") == pytest.approx(1000.0 / 150.0)
+    assert converter.convert(5.0, "GBP", "GBP") == 5.0
+
+
+def test_rates_triangulated_through_hubs(converter):
+    # Vía USD
+    assert converter.get_rate("EUR", "JPY") == pytest.approx(1.10 * 150.0)
+    # Vía EUR
+    assert converter.get_rate("GBP", "USD") == pytest.approx(1.10 / 0.85)
+    # Vía EUR y USD
+    assert converter.get_rate("GBP", "JPY") == pytest.approx(1.10 / 0.85 * 150.0)
+    assert converter.get_rate("JPY", "GBP") == pytest.approx(0.85 / (1.10 * 150.0))
+
+
+@pytest.mark.parametrize("from_ccy, to_ccy", [
+    ("AUD", "USD"),
+    ("NZD", "JPY"),
+    ("CHF", "USD"),
+    ("USD", "CAD"),
+])
+def test_missing_path_raises(converter, from_ccy, to_ccy):
+    with pytest.raises(ValueError):
+        converter.convert(1.0, from_ccy, to_ccy)
+
+
+def test_risk_manager_rejects_orders_without_conversion_path(market, clock):
+    provider = DataProvider(
+        Queue(), ["EURUSD", "AUDNZD"], "1min", buffer_capacity=10, server_offset_seconds=0
+    )
+    risk_manager = RiskManager(
+        Queue(), provider, Portfolio(magic_number=MAGIC, clock=clock),
+        max_leverage_factor=30.0, clock=clock
+    )
+    
+    risk_manager.assess_order(
+        SizingEvent("AUDNZD", SignalType.BUY, OrderType.MARKET, 0.0, MAGIC, volume=0.1)
+    )
+    assert risk_manager.events_queue.empty()
+    
+    risk_manager.assess_order(
+        SizingEvent("EURUSD", SignalType.BUY, OrderType.MARKET, 0.0, MAGIC, volume=0.1)
+    )
+    assert risk_manager.events_queue.get_nowait().symbol == "EURUSD"
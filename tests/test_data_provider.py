@@ -0,0 +1,93 @@
+"""
+Tests del DataProvider: detección del desfase horario del servidor y
+siembra de timeframes derivados.
+"""
+
+import threading
+import time
+from queue import Queue
+import numpy as np
+import pytest
+from core.data.bar_buffer import rates_to_bars
+from modules.data_provider.data_provider import DataProvider
+from modules.simulated_broker import simulated_broker
+from modules.simulated_broker.simulated_broker import C, RATES_DTYPE, SimulatedBroker
+from tests.conftest import START_TIME
+
+
+@pytest.fixture
+def live_broker():
+    """Broker simulado sobre el reloj real (la detección usa time.time)."""
+    broker = SimulatedBroker()
+    simulated_broker.install(broker)
+    broker.add_symbol("EURUSD")
+    return broker
+
+
+@pytest.fixture
+def provider(live_broker, monkeypatch):
+    monkeypatch.setattr(DataProvider, "OFFSET_DETECTION_TIMEOUT_S", 0.5)
+    return DataProvider(Queue(), ["EURUSD"], "1min", server_offset_seconds=0)
+
+
+def server_msc(offset_seconds: int, age_seconds: float = 0.0) -> int:
+    return int((time.time() + offset_seconds - age_seconds) * 1000)
+
+
+def test_stale_tick_falls_back_to_utc(provider, live_broker):
+    # Último tick del viernes: 2 días y 7 minutos atrás en un servidor UTC+2
+    live_broker.on_tick("EURUSD", 1.1, 1.1, server_msc(7200, age_seconds=2 * 86400 + 420))
+    
+    assert provider.get_server_time_offset() == 0
+
+
+def test_offset_from_tick_arriving_during_detection(provider, live_broker):
+    live_broker.on_tick("EURUSD", 1.1, 1.1, server_msc(7200, age_seconds=3 * 3600))
+    
+    timer = threading.Timer(
+        0.1, lambda: live_broker.on_tick("EURUSD", 1.1001, 1.1001, server_msc(7200))
+    )
+    timer.start()
+    try:
+        assert provider.get_server_time_offset() == 7200
+    finally:
+        timer.cancel()
+
+
+def make_rates(times, tick_volume: int) -> np.ndarray:
+    rates = np.zeros(len(times), dtype=RATES_DTYPE)
+    rates['time'] = times
+    rates[['open', 'high', 'low', 'close']] = (1.1, 1.1, 1.1, 1.1)
+    rates['tick_volume'] = tick_volume
+    return rates
+
+
+def test_derived_bar_seeded_from_mt5_excludes_open_base_bar(broker):
+    # M1 de 10:00 a 10:29 cerradas (10 ticks) y la de 10:30 abierta (4 ticks)
+    m1 = make_rates(START_TIME + 36000 + 60 * np.arange(31), 10)
+    m1['tick_volume'][-1] = 4
+    # D1 en curso según MT5: incluye las 600 M1 anteriores y la abierta
+    d1_current = make_rates([START_TIME], 6000 + 300 + 4)
+    d1_previous = make_rates([START_TIME - 86400], 9000)
+    
+    def copy_rates_from_pos(symbol, timeframe, start_pos, count):
+        if timeframe == C.TIMEFRAME_M1:
+            return m1[:len(m1) - start_pos][-count:]
+        return d1_current if start_pos == 0 else d1_previous
+    
+    broker.copy_rates_from_pos = copy_rates_from_pos
+    
+    provider = DataProvider(
+        Queue(), ["EURUSD"], "1min", buffer_capacity=30,
+        server_offset_seconds=0, derived_timeframes=["1d"]
+    )
+    resampler = provider._resamplers[("EURUSD", "1d")]
+    
+    assert resampler.forming_bar['time'] == START_TIME
+    assert resampler.forming_bar['tickvol'] == 6300
+    
+    # Al cerrarse, la barra base abierta se cuenta una sola vez
+    closed = m1[-1:].copy()
+    closed['tick_volume'] = 10
+    resampler.update(rates_to_bars(closed))
+    assert resampler.forming_bar['tickvol'] == 6310
@@ -0,0 +1,146 @@
+"""
+Tests del FillReconciler: confirmación de deals por consulta periódica.
+"""
+
+from datetime import datetime
+from queue import Queue
+import pytest
+from core.events.events import SignalType
+from modules.order_executor.fill_reconciler import FillReconciler
+from modules.simulated_broker.simulated_broker import C, OrderSendResult, TradeDeal, TradeRequest
+
+
+ORDER_TICKET = 1001
+
+
+def make_result(volume: float = 1.0, order_type: int = C.ORDER_TYPE_BUY, position: int = 0) -> OrderSendResult:
+    request = TradeRequest(
+        action=C.TRADE_ACTION_DEAL, magic=7, order=0, symbol="EURUSD",
+        volume=volume, price=1.1, stoplimit=0.0, sl=0.0, tp=0.0, deviation=0,
+        type=order_type, type_filling=0, type_time=0, expiration=0,
+        comment="", position=position, position_by=0
+    )
+    return OrderSendResult(
+        retcode=C.TRADE_RETCODE_DONE, deal=0, order=ORDER_TICKET, volume=volume,
+        price=1.1, bid=1.1, ask=1.1, comment="", request_id=0,
+        retcode_external=0, request=request
+    )
+
+
+def make_deal(ticket: int, volume: float, time: int, price: float = 1.1001) -> TradeDeal:
+    return TradeDeal(
+        ticket=ticket, order=ORDER_TICKET, time=time, time_msc=time * 1000,
+        type=C.DEAL_TYPE_BUY, entry=C.DEAL_ENTRY_IN, magic=7,
+        position_id=ORDER_TICKET, reason=C.DEAL_REASON_EXPERT, volume=volume,
+        price=price, commission=0.0, swap=0.0, profit=0.0, fee=0.0,
+        symbol="EURUSD", comment="", external_id=""
+    )
+
+
+@pytest.fixture
+def deals(broker):
+    """Deals que devuelve history_deals_get (se completan en cada test)."""
+    deals = []
+    broker.history_deals_get = lambda *args, **kwargs: tuple(deals)
+    return deals
+
+
+@pytest.fixture
+def reconciler(clock):
+    return FillReconciler(
+        Queue(), timeout_s=10.0, server_offset_seconds=7200, clock=clock, background=False
+    )
+
+
+def drain(queue: Queue) -> list:
+    events = []
+    while not queue.empty():
+        events.append(queue.get_nowait())
+    return events
+
+
+def test_partial_fill_is_emitted_once_across_polls(reconciler, deals, clock):
+    deals.append(make_deal(1, 0.3, int(clock())))
+    reconciler.track(make_result(volume=1.0))
+    
+    for _ in range(3):
+        clock.advance_to(clock() + 1)
+        reconciler.reconcile()
+    
+    events = drain(reconciler.events_queue)
+    assert [event.volume for event in events] == [0.3]
+    assert reconciler.pending == 1
+
+
+def test_partial_fill_finishes_on_timeout_without_fallback(reconciler, deals, clock):
+    deals.append(make_deal(1, 0.3, int(clock())))
+    reconciler.track(make_result(volume=1.0))
+    
+    clock.advance_to(clock() + 11)
+    reconciler.reconcile()
+    
+    events = drain(reconciler.events_queue)
+    assert sum(event.volume for event in events) == pytest.approx(0.3)
+    assert reconciler.pending == 0
+    assert reconciler.timed_out == 1
+
+
+def test_order_finishes_when_fills_reach_volume(reconciler, deals, clock):
+    deals.append(make_deal(1, 0.3, int(clock())))
+    reconciler.track(make_result(volume=1.0))
+    
+    deals.append(make_deal(2, 0.7, int(clock()) + 1))
+    clock.advance_to(clock() + 2)
+    reconciler.reconcile()
+    
+    events = drain(reconciler.events_queue)
+    assert [event.volume for event in events] == [0.3, 0.7]
+    assert reconciler.pending == 0
+    assert reconciler.timed_out == 0
+
+
+def test_missing_deal_falls_back_to_order_send_after_timeout(reconciler, deals, clock):
+    reconciler.track(make_result(volume=0.5, order_type=C.ORDER_TYPE_SELL))
+    assert drain(reconciler.events_queue) == []
+    
+    clock.advance_to(clock() + 11)
+    reconciler.reconcile()
+    
+    (event,) = drain(reconciler.events_queue)
+    assert event.volume == 0.5
+    assert event.fill_price == 1.1
+    assert event.signal == SignalType.SELL
+    # Hora del servidor según el reloj del reconciliador: START_TIME + 11s en UTC+2
+    assert event.fill_time == datetime(2024, 1, 2, 2, 0, 11)
+    assert reconciler.pending == 0
+
+
+def test_stop_joins_background_thread(clock):
+    reconciler = FillReconciler(Queue(), poll_interval_ms=10, clock=clock)
+    reconciler.start()
+    assert reconciler._thread.is_alive()
+    
+    reconciler.stop()
+    
+    assert not reconciler._thread.is_alive()
+
+
+def test_fill_against_simulated_broker(broker, clock):
+    broker.add_symbol("EURUSD")
+    broker.on_tick("EURUSD", bid=1.1000, ask=1.1002)
+    reconciler = FillReconciler(Queue(), clock=clock, background=False)
+    
+    result = broker.order_send({
+        "action": C.TRADE_ACTION_DEAL, "symbol": "EURUSD", "volume": 0.1,
+        "type": C.ORDER_TYPE_BUY, "price": 1.1002, "magic": 7,
+    })
+    reconciler.track(result)
+    clock.advance_to(clock() + 1)
+    reconciler.reconcile()
+    
+    (event,) = drain(reconciler.events_queue)
+    assert event.signal == SignalType.BUY
+    assert event.volume == 0.1
+    assert event.fill_price == pytest.approx(1.1002)
+    assert event.position_id == result.order
+    assert reconciler.pending == 0
@@ -0,0 +1,73 @@
+"""
+Tests del UniverseIndicatorEngine: la matriz de RSI del universo contra
+wilder_rsi símbolo por símbolo.
+"""
+
+import numpy as np
+import pytest
+from core.indicators.indicator_engine import UniverseIndicatorEngine
+from core.indicators.rsi import wilder_rsi
+
+
+PERIOD = 14
+SYMBOLS = ["EURUSD", "GBPUSD", "USDJPY", "AUDUSD", "NZDUSD"]
+
+
+def random_walk(seed: int, count: int) -> np.ndarray:
+    return 1.1 + np.cumsum(np.random.default_rng(seed).normal(0, 0.0005, count))
+
+
+@pytest.fixture
+def engine():
+    engine = UniverseIndicatorEngine(SYMBOLS, PERIOD, capacity=100)
+    times = 60 * np.arange(150)
+    
+    # Historia que supera la capacidad
+    engine.load_history("EURUSD", times, random_walk(0, 150))
+    engine.load_history("GBPUSD", times[:80], random_walk(1, 80))
+    # Cierre faltante (NaN) a mitad de la historia
+    closes = random_walk(2, 120)
+    closes[90] = np.nan
+    engine.load_history("USDJPY", times[:120], closes)
+    # En warm-up: pocos cierres
+    engine.load_history("AUDUSD", times[:10], random_walk(3, 10))
+    
+    # Barras nuevas para todos salvo NZDUSD (sin historia): el buffer rota
+    rows = np.arange(4)
+    extra = np.stack([random_walk(seed, 30) for seed in range(4, 8)], axis=1)
+    for i, closes in enumerate(extra):
+        engine.update(rows, np.full(4, 60 * (150 + i)), closes)
+    
+    return engine
+
+
+def expected_rsi(engine: UniverseIndicatorEngine, symbol: str, num_bars: int) -> np.ndarray:
+    """RSI de un símbolo sobre sus cierres disponibles, alineado a la derecha."""
+    closes = engine.row_view(symbol, num_bars)
+    expected = np.full(num_bars, np.nan)
+    expected[num_bars - len(closes):] = wilder_rsi(closes, PERIOD)
+    return expected
+
+
+@pytest.mark.parametrize("num_bars", [15, 40, 100])
+def test_rsi_matrix_matches_per_symbol_wilder_rsi(engine, num_bars):
+    matrix = engine.rsi_matrix(num_bars)
+    
+    assert matrix.shape == (len(SYMBOLS), num_bars)
+    for row, symbol in enumerate(SYMBOLS):
+        np.testing.assert_array_equal(matrix[row], expected_rsi(engine, symbol, num_bars))
+
+
+def test_rsi_matrix_rows_in_warm_up(engine):
+    matrix = engine.rsi_matrix(100)
+    
+    # AUDUSD: 40 cierres, RSI desde el cierre PERIOD
+    assert np.isnan(matrix[3, :60 + PERIOD]).all()
+    assert not np.isnan(matrix[3, 60 + PERIOD:]).any()
+    # Toda su historia entra en la ventana: coincide con el RSI incremental
+    assert matrix[3, -1] == pytest.approx(engine.get_rsi("AUDUSD"), abs=1e-10)
+    # NZDUSD: sin cierres
+    assert np.isnan(matrix[4]).all()
+    # USDJPY: el cierre faltante no corta la serie
+    assert not np.isnan(matrix[2, -1])
+
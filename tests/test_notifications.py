@@ -0,0 +1,174 @@
+"""
+Tests del NotificationService contra un servidor HTTP local: envío sin
+bloqueo, agrupación de ráfagas y vaciado al cerrar.
+"""
+
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qsl
+import pytest
+from modules.notifications.notifications import NotificationService
+from modules.notifications.sinks import HttpSink
+
+
+class StubServer:
+    """
+    Endpoint HTTP en localhost que registra cada request. Con gate
+    cerrado, las respuestas esperan hasta abrirlo (canal lento).
+    """
+    
+    def __init__(self):
+        self.requests = []
+        self.arrived = threading.Event()
+        self.gate = threading.Event()
+        self.gate.set()
+        stub = self
+        
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+            
+            def do_POST(self):
+                body = self.rfile.read(int(self.headers.get("Content-Length", 0)))
+                stub.arrived.set()
+                stub.gate.wait(10)
+                stub.requests.append((self.path, body))
+                
+                if self.path.endswith("/getMe"):
+                    result = {"id": 1, "is_bot": True, "first_name": "stub", "username": "stub_bot"}
+                else:
+                    result = {"message_id": len(stub.requests), "date": 0, "chat": {"id": 1, "type": "private"}}
+                payload = json.dumps({"ok": True, "result": result}).encode()
+                
+                self.send_response(200)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(payload)))
+                self.end_headers()
+                self.wfile.write(payload)
+            
+            def log_message(self, *args):
+                pass
+        
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.url = f"http://127.0.0.1:{self.server.server_address[1]}"
+        self._thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self._thread.start()
+    
+    
+    def posts(self, suffix: str = "") -> list:
+        """Cuerpos (JSON o formulario) de los requests a rutas con ese sufijo."""
+        return [
+            json.loads(body) if body.startswith(b"{") else dict(parse_qsl(body.decode()))
+            for path, body in self.requests if path.endswith(suffix)
+        ]
+    
+    
+    def wait_for(self, count: int, timeout: float = 5.0) -> None:
+        deadline = time.monotonic() + timeout
+        while len(self.requests) < count and time.monotonic() < deadline:
+            time.sleep(0.01)
+    
+    
+    def close(self) -> None:
+        self.gate.set()
+        self.server.shutdown()
+        self.server.server_close()
+
+
+@pytest.fixture
+def stub():
+    stub = StubServer()
+    yield stub
+    stub.close()
+
+
+def make_service(stub: StubServer, digest_window_s: float = 0.05, **kwargs) -> NotificationService:
+    return NotificationService(
+        http_url=stub.url + "/notify",
+        digest_window_s=digest_window_s,
+        rate_limit_per_min=0,
+        **kwargs
+    )
+
+
+def test_send_notification_does_not_block_on_slow_channel(stub):
+    service = make_service(stub)
+    stub.gate.clear()
+    
+    service.send_notification("Orden", "primera")
+    
+    # El canal HTTP queda bloqueado en la primera entrega
+    assert stub.arrived.wait(2)
+    start = time.perf_counter()
+    for i in range(100):
+        service.send_notification("Orden", f"#{i}")
+    elapsed = time.perf_counter() - start
+    
+    assert elapsed < 0.5
+    assert stub.requests == []
+    
+    stub.gate.set()
+    service.shutdown()
+    
+    assert sum(post["count"] for post in stub.posts("/notify")) == 101
+    assert service.get_stats()["http"]["sent"] == 101
+
+
+def test_burst_is_sent_as_one_digest(stub):
+    service = make_service(stub, digest_window_s=0.2)
+    
+    for i in range(5):
+        service.send_notification("Señal", f"#{i}")
+    
+    stub.wait_for(1)
+    time.sleep(0.3)
+    
+    posts = stub.posts("/notify")
+    assert len(posts) == 1
+    assert posts[0]["count"] == 5
+    assert posts[0]["title"] == "5 notificaciones"
+    assert service.get_stats()["http"]["digests"] == 1
+    
+    service.shutdown()
+
+
+def test_shutdown_drains_pending_notifications(stub):
+    # Ventana de agrupación larga: sin el cierre no se enviaría nada aún
+    service = make_service(stub, digest_window_s=60.0)
+    
+    for i in range(3):
+        service.send_notification("Cierre", f"#{i}")
+    
+    start = time.perf_counter()
+    service.shutdown()
+    
+    assert time.perf_counter() - start < 2.0
+    posts = stub.posts("/notify")
+    assert len(posts) == 1
+    assert posts[0]["count"] == 3
+    
+    # Tras el cierre no se aceptan notificaciones nuevas
+    service.send_notification("Tarde", "ignorada")
+    assert service.get_stats()["queue"]["pending"] == 0
+
+
+def test_http_sink_rejects_invalid_url():
+    with pytest.raises(ValueError):
+        HttpSink("ftp://localhost/notify")
+
+
+def test_telegram_sink_burst_and_drain(stub):
+    pytest.importorskip("telegram")
+    from modules.notifications.sinks import TelegramSink
+    
+    sink = TelegramSink("123:abc", "1", min_interval_s=0.0, base_url=stub.url + "/bot")
+    service = NotificationService(sinks=[sink], digest_window_s=60.0)
+    
+    for i in range(3):
+        service.send_notification("Señal", f"#{i}")
+    service.shutdown()
+    
+    messages = stub.posts("/sendMessage")
+    assert len(messages) == 1
+    assert "3 notificaciones" in messages[0]["text"]
@@ -0,0 +1,59 @@
+"""
+Tests del ParameterOptimizer: selección por ventana en walk-forward.
+"""
+
+import numpy as np
+import pytest
+from config.trading_config import get_default_config
+from core.data.bar_buffer import BAR_DTYPE
+from modules.optimizer.optimizer import PARAMETER_NAMES, ParameterOptimizer
+from modules.vectorized_backtester.vectorized_backtester import VectorizedBacktester
+from tests.conftest import START_TIME
+
+
+def make_bars(days: int) -> np.ndarray:
+    """Barras M1 de una onda con período de 2 horas (RSI en extremos seguido)."""
+    minutes = np.arange(days * 1440)
+    close = 1.1 + 0.02 * np.sin(2 * np.pi * minutes / 120)
+    bars = np.zeros(len(minutes), dtype=BAR_DTYPE)
+    bars['time'] = START_TIME + 60 * minutes
+    bars['open'] = np.r_[close[0], close[:-1]]
+    bars['high'] = np.maximum(bars['open'], close) + 0.00005
+    bars['low'] = np.minimum(bars['open'], close) - 0.00005
+    bars['close'] = close
+    bars['spread'] = 10
+    return bars
+
+
+@pytest.fixture
+def optimizer():
+    config = get_default_config()
+    config.symbols = ["EURUSD"]
+    backtester = VectorizedBacktester.from_config(config, {"EURUSD": make_bars(3)})
+    defaults = {name: getattr(config, name) for name in PARAMETER_NAMES}
+    with ParameterOptimizer(backtester, defaults, workers=1) as optimizer:
+        yield optimizer
+
+
+def test_walk_forward_selects_best_combo_per_window(optimizer):
+    combos = [{'rsi_period': 14}, {'rsi_period': 7}]
+    
+    table = optimizer.walk_forward(combos, train_days=1, test_days=0.5, rank_by='net_profit')
+    
+    assert len(table) == 4
+    assert table['selected'].all()
+    assert set(table['rsi_period']) <= {14, 7}
+    assert (table['oos_trades'] > 0).all()
+
+
+def test_walk_forward_flags_windows_without_eligible_combo(optimizer):
+    combos = [{'rsi_period': 14}, {'rsi_period': 7}]
+    
+    table = optimizer.walk_forward(combos, train_days=1, test_days=0.5, min_trades=10**6)
+    
+    assert len(table) == 4
+    assert not table['selected'].any()
+    assert table['rsi_period'].isna().all()
+    assert table['train_sharpe'].isna().all()
+    assert (table['oos_trades'] == 0).all()
+    assert table['oos_net_profit'].isna().all()
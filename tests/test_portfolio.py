@@ -0,0 +1,91 @@
+"""
+Tests del Portfolio: libro local actualizado por ejecuciones y
+reconciliado contra MT5.
+"""
+
+from datetime import datetime, timezone
+import pytest
+from core.events.events import SignalType
+from core.events.fast_events import ExecutionEvent
+from modules.portfolio.portfolio import Portfolio
+from modules.simulated_broker.simulated_broker import C
+from tests.conftest import START_TIME
+from tests.test_simulated_broker import FLAT, make_bars
+
+
+MAGIC = 1
+
+
+def execution(symbol: str, signal: SignalType, position_id: int, volume: float = 0.1,
+              magic: int = MAGIC, is_exit: bool = False) -> ExecutionEvent:
+    return ExecutionEvent(
+        symbol, signal, 1.1, datetime.fromtimestamp(START_TIME, tz=timezone.utc), volume,
+        magic_number=magic, position_id=position_id, is_exit=is_exit
+    )
+
+
+@pytest.fixture
+def portfolio(broker, clock):
+    portfolio = Portfolio(magic_number=MAGIC, clock=clock)
+    portfolio.deltas = []
+    portfolio.subscribe(lambda symbol, magic, delta: portfolio.deltas.append((symbol, magic, delta)))
+    return portfolio
+
+
+def test_on_execution_counts_by_symbol_magic_and_direction(portfolio):
+    portfolio.on_execution(execution("EURUSD", SignalType.BUY, 10))
+    portfolio.on_execution(execution("EURUSD", SignalType.SELL, 11, magic=2))
+    portfolio.on_execution(execution("EURUSD", SignalType.SELL, 12))
+    portfolio.on_execution(execution("GBPUSD", SignalType.BUY, 13))
+    # Entrada repetida (ej: ya cargada por reconcile): no cuenta dos veces
+    portfolio.on_execution(execution("EURUSD", SignalType.BUY, 10))
+    
+    assert portfolio.get_number_of_open_positions_by_symbol("EURUSD") == {"LONG": 1, "SHORT": 2, "TOTAL": 3}
+    assert portfolio.get_number_of_strategy_open_positions_by_symbol("EURUSD") == {"LONG": 1, "SHORT": 1, "TOTAL": 2}
+    assert portfolio.get_number_of_strategy_open_positions_by_symbol("GBPUSD") == {"LONG": 1, "SHORT": 0, "TOTAL": 1}
+    assert portfolio.has_open_position("EURUSD", "SHORT")
+    
+    # Cierre parcial de la compra y total de la venta de la estrategia
+    portfolio.on_execution(execution("EURUSD", SignalType.SELL, 10, volume=0.04, is_exit=True))
+    portfolio.on_execution(execution("EURUSD", SignalType.BUY, 12, is_exit=True))
+    
+    assert portfolio.get_number_of_strategy_open_positions_by_symbol("EURUSD") == {"LONG": 1, "SHORT": 0, "TOTAL": 1}
+    assert not portfolio.has_open_position("EURUSD", "SHORT")
+    assert [pos.volume for pos in portfolio.get_strategy_open_positions() if pos.ticket == 10] == [0.06]
+    assert portfolio.deltas == [
+        ("EURUSD", MAGIC, 0.1), ("EURUSD", 2, -0.1), ("EURUSD", MAGIC, -0.1),
+        ("GBPUSD", MAGIC, 0.1), ("EURUSD", MAGIC, pytest.approx(-0.04)), ("EURUSD", MAGIC, 0.1),
+    ]
+
+
+def test_reconcile_detects_sl_close_and_manual_trade(portfolio, broker, clock):
+    drop = (1.1000, 1.1000, 1.0950, 1.0960)
+    for symbol in ("EURUSD", "GBPUSD"):
+        broker.add_symbol(symbol)
+        broker.load_rates(symbol, make_bars([FLAT, drop]))
+    clock.advance_to(START_TIME + 30)
+    
+    result = broker.order_send({
+        "action": C.TRADE_ACTION_DEAL, "symbol": "EURUSD", "volume": 0.1,
+        "type": C.ORDER_TYPE_BUY, "sl": 1.0990, "magic": MAGIC
+    })
+    portfolio.on_execution(execution("EURUSD", SignalType.BUY, broker.deals[-1].position_id))
+    
+    # Trade manual (sin magic) que la estrategia no informa
+    broker.order_send({
+        "action": C.TRADE_ACTION_DEAL, "symbol": "GBPUSD", "volume": 0.2,
+        "type": C.ORDER_TYPE_SELL
+    })
+    assert result.retcode == C.TRADE_RETCODE_DONE
+    
+    # La barra siguiente toca el SL de la compra
+    clock.advance_to(START_TIME + 120)
+    
+    assert portfolio.reconcile() == {"ADDED": 1, "REMOVED": 1, "UPDATED": 0}
+    assert portfolio.get_number_of_open_positions_by_symbol("EURUSD")["TOTAL"] == 0
+    assert portfolio.get_number_of_open_positions_by_symbol("GBPUSD") == {"LONG": 0, "SHORT": 1, "TOTAL": 1}
+    assert portfolio.get_number_of_strategy_open_positions_by_symbol("GBPUSD")["TOTAL"] == 0
+    assert portfolio.deltas[1:] == [("EURUSD", MAGIC, -0.1), ("GBPUSD", 0, -0.2)]
+    
+    # Sin cambios en MT5, una nueva reconciliación no altera el libro
+    assert portfolio.reconcile() == {"ADDED": 0, "REMOVED": 0, "UPDATED": 0}
@@ -0,0 +1,125 @@
+"""
+Tests del ReplayDataProvider: línea de tiempo común entre símbolos,
+consultas sin barras posteriores al reloj y fin del loop del director.
+"""
+
+from queue import Queue
+import numpy as np
+import pytest
+import backtest
+from config.trading_config import get_default_config
+from core.data.bar_buffer import BAR_DTYPE
+from core.data.bar_store import BarStore
+from modules.data_provider.replay_data_provider import ReplayDataProvider
+from tests.conftest import START_TIME
+
+
+# Servidor en UTC+2
+OFFSET = 7200
+
+# Minutos con barra por símbolo: huecos distintos en cada serie
+MINUTES = {
+    "EURUSD": [0, 1, 2, 4],
+    "USDJPY": [1, 3, 4],
+}
+
+
+def make_bars(minutes, base: float) -> np.ndarray:
+    bars = np.zeros(len(minutes), dtype=BAR_DTYPE)
+    bars['time'] = START_TIME + 60 * np.asarray(minutes)
+    bars[['open', 'high', 'low', 'close']] = (base, base, base, base)
+    bars['close'] += np.arange(len(minutes))
+    bars['tickvol'] = 10
+    return bars
+
+
+@pytest.fixture
+def store(tmp_path) -> BarStore:
+    store = BarStore(str(tmp_path))
+    for symbol, minutes in MINUTES.items():
+        store.series(symbol, "1min").append(make_bars(minutes, 100.0))
+    return store
+
+
+@pytest.fixture
+def replay(store, broker):
+    def no_mt5(*args):
+        raise AssertionError("El replay no debe consultar barras a MT5")
+    
+    broker.copy_rates_from_pos = no_mt5
+    
+    return ReplayDataProvider(
+        Queue(), list(MINUTES), "1min", bar_store=store,
+        server_offset_seconds=OFFSET, derived_timeframes=["2min"]
+    )
+
+
+def drain(queue: Queue) -> list:
+    events = []
+    while not queue.empty():
+        event = queue.get()
+        events.append((event.symbol, event.timeframe, (event.data.time - START_TIME) // 60))
+    return events
+
+
+def test_constructor_runs_base_initialization(replay):
+    assert replay.feed_mode == "replay"
+    assert replay.BAR_STORE is None
+    assert replay._poll_pool is None
+    assert replay._tick_cursor_msc == {}
+    assert replay.derived_timeframes == ["2min"]
+    assert replay.clock() == START_TIME - OFFSET
+
+
+def test_timeline_merges_symbols_with_gaps(replay):
+    steps = []
+    while not replay.finished:
+        count = replay.check_for_new_data()
+        steps.append((count, drain(replay.events_queue), replay.clock() + OFFSET))
+    
+    assert steps == [
+        (1, [("EURUSD", "1min", 0)], START_TIME + 60),
+        (2, [("EURUSD", "1min", 1), ("EURUSD", "2min", 0),
+             ("USDJPY", "1min", 1), ("USDJPY", "2min", 0)], START_TIME + 120),
+        (1, [("EURUSD", "1min", 2)], START_TIME + 180),
+        (1, [("USDJPY", "1min", 3), ("USDJPY", "2min", 2)], START_TIME + 240),
+        # EURUSD sin el minuto 3: su barra de 2min cierra con el minuto 4
+        (2, [("EURUSD", "1min", 4), ("EURUSD", "2min", 2),
+             ("USDJPY", "1min", 4)], START_TIME + 300),
+        (0, [], START_TIME + 300),
+    ]
+    assert replay.progress == 1.0
+    assert replay.get_bar_counts().tolist() == [4, 3]
+
+
+def test_queries_never_see_bars_after_the_clock(replay):
+    replay.check_for_new_data()
+    replay.check_for_new_data()
+    
+    future = START_TIME + 3600
+    history = replay.get_history("EURUSD", end_time=future)
+    
+    assert (history['time'] - START_TIME).tolist() == [0, 60]
+    assert not history.flags.writeable
+    assert (replay.get_history("USDJPY")['time'] - START_TIME).tolist() == [60]
+    assert len(replay.get_history("EURUSD", start_time=START_TIME + 120, end_time=future)) == 0
+    assert len(replay.get_latest_closed_bars("EURUSD", "1min", 10)) == 2
+    assert replay.get_latest_closed_bar("USDJPY", "1min").time == START_TIME + 60
+    
+    tick = replay.TICK_CACHE.get("EURUSD")
+    assert tick.bid == 101.0
+    assert tick.time == START_TIME + 120
+
+
+@pytest.mark.parametrize("dispatch_mode", ["drain", "poll"])
+def test_finished_replay_ends_director_loop(store, tmp_path, dispatch_mode):
+    config = get_default_config()
+    config.symbols = list(MINUTES)
+    config.dispatch_mode = dispatch_mode
+    config.server_time_offset_hours = OFFSET / 3600
+    config.latency_log_dir = str(tmp_path / "logs")
+    
+    broker = backtest.run_backtest(config, store)
+    
+    # El loop terminó tras reproducir la última barra (cierre del minuto 4)
+    assert broker.clock() == START_TIME + 300 - OFFSET
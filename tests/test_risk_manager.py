@@ -0,0 +1,109 @@
+"""
+Tests del RiskManager: ledger de exposición alimentado por el Portfolio,
+revaluación a mercado y chequeo pre-trade contra la exposición máxima.
+"""
+
+from queue import Queue
+import pytest
+from core.events.events import OrderType, SignalType
+from core.events.fast_events import OrderEvent, SizingEvent
+from modules.data_provider.data_provider import DataProvider
+from modules.portfolio.portfolio import Portfolio
+from modules.risk_manager.risk_manager import RiskManager
+from tests.conftest import START_TIME
+from tests.test_portfolio import MAGIC, execution
+
+
+# 1 lote = 100000 unidades de la divisa base: vale 110000, 100000 y
+# 125000 USD respectivamente
+PRICES = {"EURUSD": 1.10, "USDJPY": 150.0, "GBPUSD": 1.25}
+
+
+@pytest.fixture
+def risk_manager(broker, clock):
+    for symbol, price in PRICES.items():
+        broker.add_symbol(symbol)
+        broker.on_tick(symbol, price)
+    
+    provider = DataProvider(
+        Queue(), list(PRICES), "1min", buffer_capacity=10, server_offset_seconds=0
+    )
+    portfolio = Portfolio(magic_number=MAGIC, clock=clock)
+    
+    # Equity de 10000 USD: exposición máxima de 300000 USD
+    return RiskManager(
+        Queue(), provider, portfolio, max_leverage_factor=30.0, clock=clock
+    )
+
+
+def sizing(symbol: str, signal: SignalType, volume: float) -> SizingEvent:
+    return SizingEvent(symbol, signal, OrderType.MARKET, 0.0, MAGIC, volume=volume)
+
+
+def test_ledger_follows_portfolio_deltas(risk_manager):
+    portfolio = risk_manager.PORTFOLIO
+    
+    portfolio.on_execution(execution("EURUSD", SignalType.BUY, 10, volume=0.5))
+    portfolio.on_execution(execution("USDJPY", SignalType.SELL, 11, volume=1.0))
+    # Otra estrategia: fuera del ledger
+    portfolio.on_execution(execution("GBPUSD", SignalType.BUY, 12, volume=2.0, magic=2))
+    
+    assert risk_manager._net_volume == {"EURUSD": 0.5, "USDJPY": -1.0}
+    assert risk_manager.get_exposure("EURUSD") == pytest.approx(55000.0)
+    assert risk_manager.get_exposure("USDJPY") == pytest.approx(-100000.0)
+    assert risk_manager.get_exposure() == pytest.approx(-45000.0)
+    
+    # Cierre parcial y cierre total
+    portfolio.on_execution(execution("EURUSD", SignalType.SELL, 10, volume=0.2, is_exit=True))
+    portfolio.on_execution(execution("USDJPY", SignalType.BUY, 11, volume=1.0, is_exit=True))
+    
+    assert risk_manager._net_volume == {"EURUSD": pytest.approx(0.3)}
+    assert set(risk_manager._exposure) == {"EURUSD"}
+    assert risk_manager.get_exposure() == pytest.approx(33000.0)
+    assert risk_manager.get_exposure("USDJPY") == 0.0
+
+
+def test_mark_to_market_revalues_ledger(risk_manager, broker, clock):
+    risk_manager.PORTFOLIO.on_execution(execution("EURUSD", SignalType.BUY, 10, volume=1.0))
+    risk_manager.PORTFOLIO.on_execution(execution("USDJPY", SignalType.SELL, 11, volume=1.0))
+    
+    broker.on_tick("EURUSD", 1.20)
+    broker.on_tick("USDJPY", 125.0)
+    risk_manager.DATA_PROVIDER.TICK_CACHE.begin_cycle()
+    
+    # Antes del intervalo de revaluación el ledger conserva el último mark
+    assert not risk_manager.maybe_mark_to_market()
+    assert risk_manager.get_exposure() == pytest.approx(10000.0)
+    
+    clock.advance_to(START_TIME + 1)
+    assert risk_manager.maybe_mark_to_market()
+    
+    assert risk_manager.get_exposure("EURUSD") == pytest.approx(120000.0)
+    assert risk_manager.get_exposure("USDJPY") == pytest.approx(-100000.0)
+    assert risk_manager.get_exposure() == pytest.approx(20000.0)
+    assert risk_manager.max_exposure == pytest.approx(300000.0)
+
+
+@pytest.mark.parametrize("signal, symbol, volume, approved", [
+    # 110000 + 1.7 * 110000 = 297000
+    (SignalType.BUY, "EURUSD", 1.7, True),
+    # 110000 + 1.8 * 110000 = 308000
+    (SignalType.BUY, "EURUSD", 1.8, False),
+    # 110000 - 4.0 * 100000 = -290000
+    (SignalType.SELL, "USDJPY", 4.0, True),
+    # 110000 - 4.2 * 100000 = -310000
+    (SignalType.SELL, "USDJPY", 4.2, False),
+    # 110000 + 1.52 * 125000 = 300000 (en el límite)
+    (SignalType.BUY, "GBPUSD", 1.52, True),
+])
+def test_assess_order_against_max_exposure(risk_manager, signal, symbol, volume, approved):
+    risk_manager.PORTFOLIO.on_execution(execution("EURUSD", SignalType.BUY, 10, volume=1.0))
+    
+    risk_manager.assess_order(sizing(symbol, signal, volume))
+    
+    queue = risk_manager.events_queue
+    if approved:
+        order = queue.get_nowait()
+        assert isinstance(order, OrderEvent)
+        assert (order.symbol, order.signal, order.volume) == (symbol, signal, volume)
+    assert queue.empty()
@@ -0,0 +1,66 @@
+"""
+Tests del RSI de Wilder: equivalencia con la recursión explícita y
+casos borde.
+"""
+
+import numpy as np
+import pytest
+from core.indicators.rsi import wilder_rsi
+
+
+def reference_rsi(closes: np.ndarray, period: int) -> np.ndarray:
+    """Recursión de Wilder barra a barra (semilla = media simple)."""
+    rsi = np.full(len(closes), np.nan)
+    delta = np.diff(closes)
+    gains = np.maximum(delta, 0.0)
+    losses = np.maximum(-delta, 0.0)
+    
+    avg_gain = gains[:period].mean()
+    avg_loss = losses[:period].mean()
+    
+    for i in range(period, len(closes)):
+        if i > period:
+            avg_gain = (avg_gain * (period - 1) + gains[i - 1]) / period
+            avg_loss = (avg_loss * (period - 1) + losses[i - 1]) / period
+        
+        if avg_loss == 0.0:
+            rsi[i] = 50.0 if avg_gain == 0.0 else 100.0
+        else:
+            rsi[i] = 100.0 - 100.0 / (1.0 + avg_gain / avg_loss)
+    
+    return rsi
+
+
+@pytest.mark.parametrize("period", [2, 14, 50])
+def test_matches_explicit_wilder_loop(period):
+    closes = 1.1 + np.cumsum(np.random.default_rng(period).normal(0, 0.0005, 2000))
+    
+    rsi = wilder_rsi(closes, period)
+    
+    assert np.isnan(rsi[:period]).all()
+    np.testing.assert_allclose(rsi[period:], reference_rsi(closes, period)[period:], rtol=0, atol=1e-13)
+
+
+def test_matrix_rows_match_single_series():
+    closes = 1.1 + np.cumsum(np.random.default_rng(0).normal(0, 0.0005, (3, 300)), axis=1)
+    
+    rsi = wilder_rsi(closes, 14)
+    
+    for row in range(3):
+        np.testing.assert_array_equal(rsi[row], wilder_rsi(closes[row], 14))
+
+
+def test_flat_window_is_neutral():
+    # Sin ganancias ni pérdidas el RSI es 50 (no 100)
+    closes = np.r_[np.full(20, 1.1), 1.1 + 0.0001 * np.arange(1, 6)]
+    
+    rsi = wilder_rsi(closes, 14)
+    reference = reference_rsi(closes, 14)
+    
+    assert (rsi[14:20] == 50.0).all()
+    assert (rsi[20:] == 100.0).all()
+    np.testing.assert_array_equal(rsi[14:], reference[14:])
+
+
+def test_short_history_is_all_nan():
+    assert np.isnan(wilder_rsi(np.arange(14.0), 14)).all()
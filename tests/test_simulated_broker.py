@@ -0,0 +1,118 @@
+"""
+Tests del SimulatedBroker: recorrido intrabar, SL/TP, gaps y latencia.
+"""
+
+import numpy as np
+import pytest
+from core.data.bar_buffer import BAR_DTYPE
+from modules.simulated_broker import simulated_broker
+from modules.simulated_broker.simulated_broker import C, SimulatedBroker
+from tests.conftest import START_TIME
+
+
+def make_bars(prices, start: int = START_TIME) -> np.ndarray:
+    """Barras M1 consecutivas desde start a partir de tuplas (O, H, L, C)."""
+    bars = np.zeros(len(prices), dtype=BAR_DTYPE)
+    bars['time'] = start + 60 * np.arange(len(prices))
+    for field, column in zip(('open', 'high', 'low', 'close'), zip(*prices)):
+        bars[field] = column
+    return bars
+
+
+def make_broker(clock, bars: np.ndarray, **kwargs) -> SimulatedBroker:
+    broker = SimulatedBroker(clock=clock, spread_points=0, **kwargs)
+    simulated_broker.install(broker)
+    broker.add_symbol("EURUSD")
+    broker.load_rates("EURUSD", bars)
+    return broker
+
+
+def buy(broker: SimulatedBroker, sl: float = 0.0, tp: float = 0.0):
+    return broker.order_send({
+        "action": C.TRADE_ACTION_DEAL, "symbol": "EURUSD", "volume": 0.1,
+        "type": C.ORDER_TYPE_BUY, "sl": sl, "tp": tp
+    })
+
+
+FLAT = (1.1000, 1.1000, 1.1000, 1.1000)
+
+
+def test_bar_touching_sl_and_tp_closes_at_sl_on_bullish_bar(clock):
+    # Alcista: O → L → H → C, el low toca el SL antes que el high el TP
+    broker = make_broker(clock, make_bars([FLAT, (1.1000, 1.1020, 1.0980, 1.1010)]))
+    clock.advance_to(START_TIME + 30)
+    result = buy(broker, sl=1.0990, tp=1.1010)
+    assert result.retcode == C.TRADE_RETCODE_DONE
+    
+    clock.advance_to(START_TIME + 120)
+    assert broker.positions_get() == ()
+    
+    exit_deal = broker.deals[-1]
+    assert exit_deal.entry == C.DEAL_ENTRY_OUT
+    assert exit_deal.reason == C.DEAL_REASON_SL
+    assert exit_deal.price == pytest.approx(1.0990)
+
+
+def test_bar_touching_sl_and_tp_closes_at_tp_on_bearish_bar(clock):
+    # Bajista: O → H → L → C, el high toca el TP primero
+    broker = make_broker(clock, make_bars([FLAT, (1.1000, 1.1020, 1.0980, 1.0990)]))
+    clock.advance_to(START_TIME + 30)
+    buy(broker, sl=1.0990, tp=1.1010)
+    
+    clock.advance_to(START_TIME + 120)
+    assert broker.positions_get() == ()
+    exit_deal = broker.deals[-1]
+    assert exit_deal.reason == C.DEAL_REASON_TP
+    assert exit_deal.price == pytest.approx(1.1010)
+
+
+def test_gap_through_sl_fills_at_open_price(clock):
+    broker = make_broker(clock, make_bars([FLAT, (1.0980, 1.0985, 1.0975, 1.0980)]))
+    clock.advance_to(START_TIME + 30)
+    buy(broker, sl=1.0990)
+    
+    clock.advance_to(START_TIME + 120)
+    assert broker.positions_get() == ()
+    exit_deal = broker.deals[-1]
+    assert exit_deal.reason == C.DEAL_REASON_SL
+    assert exit_deal.price == pytest.approx(1.0980)
+    assert exit_deal.time_msc == (START_TIME + 60) * 1000
+
+
+def test_explicit_tick_through_sl_fills_at_tick_price(clock):
+    broker = make_broker(clock, make_bars([FLAT]))
+    clock.advance_to(START_TIME + 30)
+    buy(broker, sl=1.0990)
+    
+    broker.on_tick("EURUSD", bid=1.0970, ask=1.0970, time_msc=(START_TIME + 40) * 1000)
+    exit_deal = broker.deals[-1]
+    assert exit_deal.reason == C.DEAL_REASON_SL
+    assert exit_deal.price == pytest.approx(1.0970)
+
+
+def test_market_fill_uses_price_after_latency(clock):
+    higher = (1.1050, 1.1050, 1.1050, 1.1050)
+    broker = make_broker(clock, make_bars([FLAT, higher]), latency_ms=30000)
+    clock.advance_to(START_TIME + 50)
+    
+    result = buy(broker)
+    
+    # Enviada a los 50s de la barra 0: se ejecuta a los 80s, dentro de la barra 1
+    assert result.retcode == C.TRADE_RETCODE_DONE
+    assert result.price == pytest.approx(1.1050)
+    assert broker.deals[-1].time_msc == (START_TIME + 80) * 1000
+
+
+def test_market_fill_without_latency_uses_current_price(clock):
+    higher = (1.1050, 1.1050, 1.1050, 1.1050)
+    broker = make_broker(clock, make_bars([FLAT, higher]))
+    clock.advance_to(START_TIME + 50)
+    
+    assert buy(broker).price == pytest.approx(1.1000)
+
+
+def test_copy_ticks_is_not_supported(clock):
+    broker = make_broker(clock, make_bars([FLAT]))
+    
+    assert broker.copy_ticks_from("EURUSD", START_TIME, 10, C.COPY_TICKS_INFO) is None
+    assert broker.last_error()[0] == -1
@@ -0,0 +1,23 @@
+"""
+Tests del SymbolRegistry: tamaño del pip según el tipo de símbolo.
+"""
+
+import pytest
+from modules.simulated_broker.simulated_broker import C
+from modules.symbol_registry.symbol_registry import SymbolRegistry
+
+
+@pytest.mark.parametrize("symbol, point, digits, calc_mode, pip", [
+    ("EURUSD", 0.00001, 5, C.SYMBOL_CALC_MODE_FOREX, 0.0001),
+    ("USDJPY", 0.001, 3, C.SYMBOL_CALC_MODE_FOREX, 0.01),
+    ("EURGBP", 0.0001, 4, C.SYMBOL_CALC_MODE_FOREX, 0.0001),
+    ("US500", 0.001, 3, C.SYMBOL_CALC_MODE_CFDINDEX, 0.001),
+    ("XAUUSD", 0.01, 2, C.SYMBOL_CALC_MODE_CFD, 0.01),
+])
+def test_pip_is_ten_points_only_on_fractional_fx(broker, symbol, point, digits, calc_mode, pip):
+    broker.add_symbol(symbol, point=point, digits=digits, calc_mode=calc_mode)
+    
+    spec = SymbolRegistry([symbol]).get(symbol)
+    
+    assert spec.calc_mode == calc_mode
+    assert spec.pip == pytest.approx(pip)
@@ -0,0 +1,71 @@
+"""
+Tests del TickBarAggregator: barras desde ticks, cierre por tiempo y ticks tardíos.
+"""
+
+import numpy as np
+from core.data.tick_aggregator import TickBarAggregator
+from tests.conftest import START_TIME
+
+
+START_MSC = START_TIME * 1000
+
+
+def test_bar_closes_on_first_tick_of_next_bar():
+    aggregator = TickBarAggregator("1min")
+    
+    closed = aggregator.update(
+        [START_MSC, START_MSC + 10_000, START_MSC + 20_000, START_MSC + 59_999],
+        [1.10, 1.12, 1.09, 1.11],
+        [1, 2, 3, 4]
+    )
+    assert len(closed) == 0
+    assert aggregator.forming_bar['close'] == 1.11
+    
+    closed = aggregator.update([START_MSC + 60_000], [1.13])
+    assert len(closed) == 1
+    bar = closed[0]
+    assert bar['time'] == START_TIME
+    assert (bar['open'], bar['high'], bar['low'], bar['close']) == (1.10, 1.12, 1.09, 1.11)
+    assert bar['tickvol'] == 4
+    assert bar['vol'] == 10
+    assert aggregator.forming_bar['time'] == START_TIME + 60
+
+
+def test_batch_spanning_several_bars():
+    aggregator = TickBarAggregator("10s")
+    times = START_MSC + np.arange(0, 35_000, 5_000)
+    prices = 1.0 + np.arange(len(times)) / 100
+    
+    closed = aggregator.update(times, prices)
+    
+    assert list(closed['time']) == [START_TIME, START_TIME + 10, START_TIME + 20]
+    assert list(closed['open']) == [1.00, 1.02, 1.04]
+    assert list(closed['close']) == [1.01, 1.03, 1.05]
+    assert list(closed['tickvol']) == [2, 2, 2]
+    assert aggregator.forming_bar['time'] == START_TIME + 30
+    assert aggregator.ticks_processed == 7
+
+
+def test_close_due_emits_bar_without_next_tick():
+    aggregator = TickBarAggregator("1min")
+    aggregator.update([START_MSC + 1_000], [1.10])
+    
+    assert len(aggregator.close_due(START_TIME + 59.9)) == 0
+    
+    closed = aggregator.close_due(START_TIME + 60)
+    assert list(closed['time']) == [START_TIME]
+    assert aggregator.forming_bar is None
+    assert len(aggregator.close_due(START_TIME + 120)) == 0
+
+
+def test_late_ticks_are_discarded():
+    aggregator = TickBarAggregator("1min")
+    aggregator.update([START_MSC + 1_000], [1.10])
+    aggregator.close_due(START_TIME + 60)
+    
+    # Tick de la barra ya emitida
+    closed = aggregator.update([START_MSC + 50_000, START_MSC + 61_000], [9.99, 1.20])
+    
+    assert len(closed) == 0
+    assert aggregator.late_ticks == 1
+    assert aggregator.forming_bar['open'] == 1.20